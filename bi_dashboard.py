@@ -13,12 +13,79 @@ import json
 from pathlib import Path
 import logging
 from typing import Dict, List, Tuple, Optional
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+
+from core.lazy_loading import lazy_attribute, lazy_module
+
+# plotly는 첫 대시보드 생성 시 import (Power BI/RPA 산출물만 만들 때는 로드하지 않음)
+go = lazy_module('plotly.graph_objects')
+px = lazy_module('plotly.express')
+make_subplots = lazy_attribute('plotly.subplots', 'make_subplots')
 
 logger = logging.getLogger(__name__)
 
+# 경량 대시보드 모드 설정
+LIGHT_ASSET_DIR = "assets"
+PLOTLY_ASSET_NAME = "plotly.min.js"
+DEFAULT_MAX_POINTS = 500
+# light 모드 데이터 파일 (<script src>로 로드되는 JS 페이로드)
+LIGHT_DATA_SUFFIX = ".data.js"
+LIGHT_DATA_VAR = "__DASHBOARD_DATA__"
+
+LIGHT_DASHBOARD_SHELL = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <script src="{asset}"></script>
+</head>
+<body>
+    <div id="dashboard" style="width:100%;height:800px;"></div>
+    <p id="status" style="font-family: Arial, sans-serif; color: #888;"></p>
+    <script>
+        // file:// 에서도 열리도록 fetch 대신 <script>로 데이터 로드 (갱신 시 캐시 우회)
+        var payload = document.createElement("script");
+        payload.src = "{data_file}?t=" + Date.now();
+        payload.onload = function () {{
+            var fig = window.{data_var};
+            Plotly.newPlot("dashboard", fig.data, fig.layout, {{responsive: true}});
+        }};
+        payload.onerror = function () {{
+            document.getElementById("status").innerText = "데이터 로드 실패: {data_file}";
+        }};
+        document.body.appendChild(payload);
+    </script>
+</body>
+</html>
+"""
+
+
+def downsample_series(x: List, y: List, max_points: int = DEFAULT_MAX_POINTS) -> Tuple[List, List]:
+    """
+    긴 트렌드 시계열 다운샘플링 (구간별 최소/최대값 보존)
+
+    첫/마지막 포인트와 각 구간의 최소·최대 포인트를 원래 순서대로 유지하여
+    급등/급락(오차 스파이크)이 사라지지 않도록 합니다.
+    """
+    n = len(y)
+    if max_points is None or n <= max_points or max_points < 4:
+        return list(x), list(y)
+
+    values = np.asarray(y, dtype=float)
+    buckets = (max_points - 2) // 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+
+    keep = {0, n - 1}
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        segment = values[start:end]
+        keep.add(start + int(np.nanargmin(segment)) if not np.isnan(segment).all() else start)
+        keep.add(start + int(np.nanargmax(segment)) if not np.isnan(segment).all() else start)
+
+    idx = sorted(keep)
+    return [x[i] for i in idx], [y[i] for i in idx]
+
+
 class BIDashboard:
     """BI 대시보드 자동화 시스템"""
     
@@ -26,19 +93,25 @@ class BIDashboard:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
-    def create_variance_dashboard(self, variance_data: Dict, output_file: str = None) -> str:
+    def create_variance_dashboard(self, variance_data: Dict, output_file: str = None,
+                                  mode: str = "standalone", max_points: Optional[int] = None) -> str:
         """
         월별 오차 분석 대시보드 생성
         
         Args:
             variance_data: VarianceAnalyzer에서 생성된 데이터
             output_file: 출력 파일 경로
+            mode: "standalone" (plotly.js 포함 단일 HTML) | "light" (공유 asset + HTML 셸 + JS 데이터)
+            max_points: 트렌드 시계열 최대 포인트 수 (light 모드 기본 500)
             
         Returns:
             str: 생성된 대시보드 파일 경로
         """
         print("📊 BI 대시보드 생성 중...")
         
+        if mode == "light":
+            return self._create_light_dashboard(variance_data, output_file, max_points or DEFAULT_MAX_POINTS)
+        
         if output_file is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_file = f"월별오차분석_대시보드_{timestamp}.html"
@@ -46,7 +119,7 @@ class BIDashboard:
         output_path = self.output_dir / output_file
         
         # 대시보드 생성
-        fig = self._create_dashboard_figure(variance_data)
+        fig = self._create_dashboard_figure(variance_data, max_points=max_points)
         
         # HTML 파일로 저장
         fig.write_html(str(output_path))
@@ -54,8 +127,48 @@ class BIDashboard:
         print(f"✅ 대시보드 생성 완료: {output_path}")
         return str(output_path)
     
-    def _create_dashboard_figure(self, variance_data: Dict) -> go.Figure:
-        """대시보드 차트 생성"""
+    def _create_light_dashboard(self, variance_data: Dict, output_file: Optional[str], max_points: int) -> str:
+        """
+        경량 대시보드 생성
+
+        plotly.js는 output_dir/assets에 한 번만 기록하고, HTML 셸은 없을 때만 작성합니다.
+        갱신 시에는 다운샘플링된 figure 데이터 파일(<이름>.data.js)만 다시 씁니다.
+        데이터는 window.__DASHBOARD_DATA__ 대입문으로 기록되어 file://로 열어도 로드됩니다.
+        """
+        if output_file is None:
+            output_file = "월별오차분석_대시보드.html"
+        
+        html_path = self.output_dir / output_file
+        data_path = html_path.with_name(html_path.stem + LIGHT_DATA_SUFFIX)
+        asset_path = self._ensure_plotly_asset()
+        
+        fig = self._create_dashboard_figure(variance_data, max_points=max_points)
+        data_path.write_text(f"window.{LIGHT_DATA_VAR} = {fig.to_json()};\n", encoding='utf-8')
+        
+        if not html_path.exists():
+            shell = LIGHT_DASHBOARD_SHELL.format(
+                title='HVDC 월별 오차 분석 대시보드',
+                asset=asset_path.relative_to(self.output_dir).as_posix(),
+                data_file=data_path.name,
+                data_var=LIGHT_DATA_VAR
+            )
+            html_path.write_text(shell, encoding='utf-8')
+        
+        print(f"✅ 경량 대시보드 갱신 완료: {html_path} (데이터 {data_path.stat().st_size:,} bytes)")
+        return str(html_path)
+    
+    def _ensure_plotly_asset(self) -> Path:
+        """공유 plotly.js asset 준비 (최초 1회만 기록)"""
+        asset_path = self.output_dir / LIGHT_ASSET_DIR / PLOTLY_ASSET_NAME
+        if not asset_path.exists():
+            from plotly.offline import get_plotlyjs
+            asset_path.parent.mkdir(exist_ok=True)
+            asset_path.write_text(get_plotlyjs(), encoding='utf-8')
+            print(f"  📦 plotly.js asset 생성: {asset_path}")
+        return asset_path
+    
+    def _create_dashboard_figure(self, variance_data: Dict, max_points: Optional[int] = None) -> 'go.Figure':
+        """대시보드 차트 생성 (max_points 지정 시 월별 시계열 다운샘플링)"""
         df_merge = variance_data['merged_data']
         dashboard_data = variance_data['dashboard_data']
         
@@ -78,6 +191,7 @@ class BIDashboard:
         if 'trend_analysis' in dashboard_data:
             months = dashboard_data['trend_analysis']['months']
             variance_trend = dashboard_data['trend_analysis']['variance_trend']
+            months, variance_trend = downsample_series(months, variance_trend, max_points)
             
             fig.add_trace(
                 go.Scatter(
@@ -107,6 +221,15 @@ class BIDashboard:
         months = df_merge['년월'].tolist()
         invoice_amounts = df_merge['Invoice_Amount'].tolist()
         report_amounts = df_merge['Report_Amount'].tolist()
+        if max_points is not None and len(months) > max_points:
+            # 청구액/실적액은 같은 x축을 공유하므로 오차 기준으로 포인트 선택
+            variance = [inv - rep for inv, rep in zip(invoice_amounts, report_amounts)]
+            kept_months, _ = downsample_series(months, variance, max_points)
+            kept = set(kept_months)
+            idx = [i for i, m in enumerate(months) if m in kept]
+            months = [months[i] for i in idx]
+            invoice_amounts = [invoice_amounts[i] for i in idx]
+            report_amounts = [report_amounts[i] for i in idx]
         
         fig.add_trace(
             go.Bar(
@@ -263,13 +386,14 @@ class BIDashboard:
         
         return html_template
     
-    def create_powerbi_data(self, variance_data: Dict, output_file: str = None) -> str:
+    def create_powerbi_data(self, variance_data: Dict, output_file: str = None, cube=None) -> str:
         """
         PowerBI 연동용 데이터 생성
         
         Args:
             variance_data: VarianceAnalyzer에서 생성된 데이터
             output_file: 출력 파일 경로
+            cube: core.olap_cube.InventoryCube (있으면 재고/금액 큐브 시트 추가)
             
         Returns:
             str: 생성된 PowerBI 데이터 파일 경로
@@ -305,6 +429,12 @@ class BIDashboard:
                     '오차율(%)': trend_data['variance_trend']
                 })
                 trend_df.to_excel(writer, sheet_name='트렌드', index=False)
+            
+            # 5. OLAP 큐브 (PowerBI 피벗용 사전 집계 셀 + 월별 롤업)
+            if cube is not None:
+                cube.cells.to_excel(writer, sheet_name='큐브_전체셀', index=False)
+                cube.rollup(['월', 'Location', 'TxType_Refined']).to_excel(writer, sheet_name='큐브_월별창고', index=False)
+                cube.rollup(['월', 'Vendor']).to_excel(writer, sheet_name='큐브_월별공급사', index=False)
         
         print(f"✅ PowerBI 데이터 생성 완료: {output_path}")
         return str(output_path)
@@ -370,7 +500,8 @@ class BIDashboard:
         }
 
 # 편의 함수들
-def create_comprehensive_dashboard(variance_data: Dict, alerts: Dict, output_dir: str = "dashboard_output") -> Dict:
+def create_comprehensive_dashboard(variance_data: Dict, alerts: Dict, output_dir: str = "dashboard_output",
+                                   cube=None, dashboard_mode: str = "standalone") -> Dict:
     """
     종합 대시보드 생성 (모든 기능 통합)
     
@@ -378,6 +509,8 @@ def create_comprehensive_dashboard(variance_data: Dict, alerts: Dict, output_dir
         variance_data: VarianceAnalyzer 결과
         alerts: 알람 데이터
         output_dir: 출력 디렉토리
+        cube: 런 단위 OLAP 큐브 (PowerBI 데이터에 포함)
+        dashboard_mode: "standalone" | "light" (공유 plotly asset + JSON 데이터 갱신)
         
     Returns:
         Dict: 생성된 모든 파일 경로
@@ -387,13 +520,13 @@ def create_comprehensive_dashboard(variance_data: Dict, alerts: Dict, output_dir
     dashboard = BIDashboard(output_dir)
     
     # 1. 대시보드 생성
-    dashboard_file = dashboard.create_variance_dashboard(variance_data)
+    dashboard_file = dashboard.create_variance_dashboard(variance_data, mode=dashboard_mode)
     
     # 2. 알람 리포트 생성
     alert_file = dashboard.generate_alert_report(alerts)
     
     # 3. PowerBI 데이터 생성
-    powerbi_file = dashboard.create_powerbi_data(variance_data)
+    powerbi_file = dashboard.create_powerbi_data(variance_data, cube=cube)
     
     # 4. RPA 명령어 생성
     rpa_commands = dashboard.generate_rpa_commands(alerts)
@@ -1,6 +1,6 @@
 # config.py
 from pathlib import Path
-import yaml, datetime as dt
+import datetime as dt
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -13,6 +13,8 @@ def load_expected_stock(as_of: str | None = None) -> dict:
     cfg_file = BASE_DIR / "expected_stock.yml"
     
     try:
+        import yaml  # 기대값 조회 시에만 로드
+
         with open(cfg_file, "r", encoding="utf-8") as fp:
             data: dict = yaml.safe_load(fp)
         
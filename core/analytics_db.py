@@ -0,0 +1,270 @@
+"""
+HVDC 임베디드 SQL 분석 백엔드 (DuckDB / SQLite)
+
+런당 1회 트랜잭션 프레임과 인보이스를 임베디드 DB에 적재하고, 리포트 집계
+(월별 IN/OUT/재고, 공급사별 월별, 현장별 월별, 월별정산집계, 인보이스 월별 대사)를
+SQL 뷰로 정의합니다. DuckDB가 설치되어 있으면 병렬 벡터화 실행을 사용하고,
+없으면 표준 라이브러리 sqlite3로 같은 뷰를 만듭니다. DB 파일은 실행 후에도 남아
+리포트 외 임의 SQL 조회에 쓸 수 있습니다.
+
+    db = AnalyticsDB().load(transaction_df, invoice_df)
+    db.view('v_monthly_settlement')
+    db.query('SELECT * FROM v_vendor_monthly WHERE "Vendor" = ?', ['HITACHI'])
+
+    python integrated_automation_pipeline.py --sql [duckdb|sqlite]
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import pandas as pd
+
+from core.lazy_loading import lazy_module, module_available
+from core.mapping_utils import normalize_str
+from core.olap_cube import CUBE_MEASURES
+from core.transaction_log import infer_vendor
+from variance_analyzer import VarianceAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DUCKDB_AVAILABLE = module_available('duckdb')
+duckdb = lazy_module('duckdb')
+
+SQL_ENGINES = ('auto', 'duckdb', 'sqlite')
+DEFAULT_DB_STEM = "artifacts/hvdc_analytics"
+ENGINE_SUFFIXES = {'duckdb': '.duckdb', 'sqlite': '.sqlite'}
+
+OUT_TX_TYPES = ['TRANSFER_OUT', 'FINAL_OUT']
+SITE_LOCATIONS = ['AGI', 'DAS', 'MIR', 'SHU']
+# excel_reporter.generate_monthly_summary_report와 같은 정산 기준
+SETTLEMENT_WAREHOUSES = ['DSV OUTDOOR', 'DSV INDOOR', 'DSV AL MARKAZ', 'DSV MZP', 'MOSB', 'HAULER INDOOR']
+HANDLING_FEE_VENDORS = ['HE', 'HITACHI', 'SIM', 'SIMENS']
+
+
+def _sql_list(values: Sequence[str]) -> str:
+    return ', '.join("'" + v.replace("'", "''") + "'" for v in values)
+
+
+def _sum(column: str, condition: Optional[str] = None) -> str:
+    """조건부 합계 (빈 그룹은 0, pandas groupby sum과 동일)"""
+    value = f'"{column}"' if condition is None else f'CASE WHEN {condition} THEN "{column}" END'
+    return f'COALESCE(SUM({value}), 0)'
+
+
+_IS_IN = "\"TxType_Refined\" = 'IN'"
+_IS_OUT = f'"TxType_Refined" IN ({_sql_list(OUT_TX_TYPES)})'
+_IS_RENT = f'UPPER(TRIM("Location")) IN ({_sql_list(SETTLEMENT_WAREHOUSES)})'
+_IS_HANDLING = f'"Vendor" IN ({_sql_list(HANDLING_FEE_VENDORS)})'
+
+# 뷰 이름 → SELECT 문 (DuckDB/SQLite 공통 SQL)
+TRANSACTION_VIEWS: Dict[str, str] = {
+    # generate_monthly_in_out_stock_report IN / OUT / 재고 표
+    'v_monthly_in': f'''
+        SELECT "월", "Location" AS "창고/현장", {_sum('Qty')} AS "IN수량", {_sum('Amount')} AS "IN금액",
+               {_sum('Handling Fee')} AS "IN하역비"
+        FROM transactions WHERE {_IS_IN} GROUP BY "월", "Location" ORDER BY "월", "Location"''',
+    'v_monthly_out': f'''
+        SELECT "월", "Location" AS "창고/현장", {_sum('Qty')} AS "OUT수량", {_sum('Amount')} AS "OUT금액",
+               {_sum('Handling Fee')} AS "OUT하역비"
+        FROM transactions WHERE {_IS_OUT} GROUP BY "월", "Location" ORDER BY "월", "Location"''',
+    'v_monthly_stock': f'''
+        SELECT "월", "창고/현장", "IN수량", "OUT수량", "IN수량" - "OUT수량" AS "재고수량",
+               CASE WHEN "IN수량" - "OUT수량" >= 0 THEN '양호' ELSE '부족' END AS "재고상태"
+        FROM (SELECT "월", "Location" AS "창고/현장", {_sum('Qty', _IS_IN)} AS "IN수량",
+                     {_sum('Qty', _IS_OUT)} AS "OUT수량"
+              FROM transactions GROUP BY "월", "Location") AS monthly
+        ORDER BY "창고/현장", "월"''',
+    # aggregate_vendor_monthly 기준 (금액은 입고 기준)
+    'v_vendor_monthly': f'''
+        SELECT "Vendor", "월", "Location", {_sum('Qty', _IS_IN)} AS "입고", {_sum('Qty', _IS_OUT)} AS "출고",
+               {_sum('Amount', _IS_IN)} AS "금액"
+        FROM transactions GROUP BY "Vendor", "월", "Location" ORDER BY "Vendor", "월", "Location"''',
+    'v_site_monthly': f'''
+        SELECT "월", "Location" AS "현장명", {_sum('Qty', _IS_IN)} AS "입고", {_sum('Qty', _IS_OUT)} AS "출고",
+               {_sum('Amount')} AS "월별청구금액"
+        FROM transactions WHERE "Location" IN ({_sql_list(SITE_LOCATIONS)})
+        GROUP BY "월", "Location" ORDER BY "월", "Location"''',
+    # 월별정산집계: 하역비(HE/SIM) / 창고 임대료 / 기타
+    'v_monthly_settlement': f'''
+        SELECT "월", "월별Handling Fee합계(HITACHI,SIMENS)", "RENT FEE", "OTHERS",
+               "월별Handling Fee합계(HITACHI,SIMENS)" + "RENT FEE" + "OTHERS" AS "TOTAL"
+        FROM (SELECT "정산월" AS "월",
+                     {_sum('Handling Fee', _IS_HANDLING)} AS "월별Handling Fee합계(HITACHI,SIMENS)",
+                     {_sum('Amount', _IS_RENT)} AS "RENT FEE",
+                     {_sum('Amount', f'NOT ({_IS_HANDLING}) AND NOT ({_IS_RENT})')} AS "OTHERS"
+              FROM transactions WHERE "정산월" IS NOT NULL GROUP BY "정산월") AS settlement
+        ORDER BY "월"''',
+}
+INVOICE_VIEWS: Dict[str, str] = {
+    'v_invoice_monthly': '''
+        SELECT "년월", COALESCE(SUM("Invoice_Amount"), 0) AS "Invoice_Amount", COUNT(*) AS "건수"
+        FROM invoices GROUP BY "년월" ORDER BY "년월"''',
+    # 인보이스 청구액 vs 트랜잭션 금액 (VarianceAnalyzer 오차 정의)
+    'v_invoice_vs_report': f'''
+        SELECT m."년월", COALESCE(i."Invoice_Amount", 0) AS "Invoice_Amount",
+               COALESCE(r."Report_Amount", 0) AS "Report_Amount",
+               COALESCE(i."Invoice_Amount", 0) - COALESCE(r."Report_Amount", 0) AS "오차"
+        FROM (SELECT "년월" FROM invoices UNION SELECT "월" FROM transactions WHERE "월" IS NOT NULL) AS m
+        LEFT JOIN (SELECT "년월", SUM("Invoice_Amount") AS "Invoice_Amount" FROM invoices GROUP BY "년월") AS i
+               ON i."년월" = m."년월"
+        LEFT JOIN (SELECT "월", {_sum('Amount')} AS "Report_Amount" FROM transactions GROUP BY "월") AS r
+               ON r."월" = m."년월"
+        ORDER BY m."년월"''',
+}
+
+
+def resolve_engine(engine: str = 'auto') -> str:
+    """auto → duckdb(설치 시) / sqlite"""
+    if engine not in SQL_ENGINES:
+        raise ValueError(f"지원하지 않는 SQL 엔진: {engine} ({'/'.join(SQL_ENGINES)})")
+    if engine == 'auto':
+        return 'duckdb' if DUCKDB_AVAILABLE else 'sqlite'
+    if engine == 'duckdb' and not DUCKDB_AVAILABLE:
+        raise ImportError("duckdb 엔진에는 duckdb가 필요합니다 (pip install duckdb)")
+    return engine
+
+
+def _month(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m')
+
+
+def transaction_table(df: pd.DataFrame, measures: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    리포트 뷰 입력 테이블 (문자열 차원 + 수치 측정값)
+
+    월: Date 기준 (generate_monthly_in_out_stock_report와 동일) / 정산월: Billing month → Operation Month → 월
+    Vendor: 통합 리포트와 같은 정규화(normalize_str + 대문자), 컬럼이 없으면 Source_File로 추정
+    """
+    table = pd.DataFrame(index=df.index)
+    if 'Date' in df.columns:
+        dates = pd.to_datetime(df['Date'], errors='coerce')
+        table['Date'] = dates.dt.strftime('%Y-%m-%d')
+        table['월'] = dates.dt.strftime('%Y-%m')
+    else:
+        table['Date'] = None
+        table['월'] = 'Unknown'
+    for source in ['Billing month', 'Operation Month']:
+        if source in df.columns:
+            table['정산월'] = _month(df[source])
+            break
+    else:
+        table['정산월'] = table['월']
+    if 'Vendor' in df.columns:
+        table['Vendor'] = df['Vendor'].map(normalize_str).str.upper()
+    else:
+        table['Vendor'] = infer_vendor(df)
+    table['Location'] = df['Location'].astype(str).str.strip() if 'Location' in df.columns else None
+    for column in ['Case_No', 'TxType_Refined', 'Storage_Type', 'Source_File']:
+        table[column] = df[column].astype(str).where(df[column].notnull()) if column in df.columns else None
+    for measure in dict.fromkeys(list(CUBE_MEASURES) + list(measures)):
+        table[measure] = pd.to_numeric(df[measure], errors='coerce') if measure in df.columns else 0
+    return table.reset_index(drop=True)
+
+
+def invoice_table(df_invoice: pd.DataFrame) -> pd.DataFrame:
+    """인보이스 → (년월, Invoice_Amount, Vendor) (VarianceAnalyzer 인보이스 전처리와 같은 기준)"""
+    prepared = VarianceAnalyzer()._prepare_invoice_data(df_invoice)
+    vendor = (prepared['Vendor'].astype(str).str.strip().str.upper() if 'Vendor' in prepared.columns
+              else 'UNKNOWN')
+    return pd.DataFrame({
+        '년월': prepared['년월'].astype(str),
+        'Invoice_Amount': prepared['Invoice_Amount'].astype(float),
+        'Vendor': vendor,
+    }).reset_index(drop=True)
+
+
+class AnalyticsDB:
+    """트랜잭션/인보이스 임베디드 DB + 리포트 집계 SQL 뷰"""
+
+    def __init__(self, path: Union[str, Path, None] = None, engine: str = 'auto', threads: Optional[int] = None):
+        """
+        Args:
+            path: DB 파일 경로 (기본: artifacts/hvdc_analytics.duckdb|.sqlite, ':memory:'는 메모리 DB)
+            engine: auto / duckdb / sqlite
+            threads: DuckDB 병렬 스레드 수 (기본: 전체 코어)
+        """
+        self.engine = resolve_engine(engine)
+        if path is None:
+            path = DEFAULT_DB_STEM + ENGINE_SUFFIXES[self.engine]
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        if self.engine == 'duckdb':
+            self._conn = duckdb.connect(self.path)
+            if threads:
+                self._conn.execute(f"SET threads TO {int(threads)}")
+        else:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.views = []
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'AnalyticsDB':
+        """실행 후 남은 DB 파일 열기 (확장자로 엔진 결정)"""
+        engine = 'duckdb' if str(path).endswith(ENGINE_SUFFIXES['duckdb']) else 'sqlite'
+        db = cls(path, engine=engine)
+        db.views = db._view_names()
+        return db
+
+    def load(self, transaction_df: pd.DataFrame, invoice_df: Optional[pd.DataFrame] = None,
+             measures: Sequence[str] = ()) -> 'AnalyticsDB':
+        """트랜잭션(+인보이스) 적재 후 뷰 재생성 (런당 1회)"""
+        table = transaction_table(transaction_df, measures)
+        self._replace_table('transactions', table)
+        views = dict(TRANSACTION_VIEWS)
+        if invoice_df is not None and not invoice_df.empty:
+            self._replace_table('invoices', invoice_table(invoice_df))
+            views.update(INVOICE_VIEWS)
+        for name in INVOICE_VIEWS:
+            self._conn.execute(f'DROP VIEW IF EXISTS {name}')
+        for name, select in views.items():
+            self._conn.execute(f'DROP VIEW IF EXISTS {name}')
+            self._conn.execute(f'CREATE VIEW {name} AS {select}')
+        if self.engine == 'sqlite':
+            self._conn.commit()
+        self.views = list(views)
+        print(f"🗃️ SQL 분석 DB 적재 ({self.engine}): 트랜잭션 {len(table):,}건"
+              + (f", 인보이스 {len(invoice_df):,}건" if 'v_invoice_monthly' in views else '')
+              + f", 뷰 {len(views)}개 → {self.path}")
+        return self
+
+    def _replace_table(self, name: str, frame: pd.DataFrame):
+        self._conn.execute(f'DROP TABLE IF EXISTS {name}')
+        if self.engine == 'duckdb':
+            self._conn.register('_hvdc_frame', frame)
+            try:
+                self._conn.execute(f'CREATE TABLE {name} AS SELECT * FROM _hvdc_frame')
+            finally:
+                self._conn.unregister('_hvdc_frame')
+        else:
+            frame.to_sql(name, self._conn, index=False)
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """임의 SQL 조회 → DataFrame"""
+        if self.engine == 'duckdb':
+            return self._conn.execute(sql, list(params)).df()
+        return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def _view_names(self):
+        """DB에 정의된 뷰 이름 목록"""
+        if self.engine == 'duckdb':
+            names = self.query("SELECT view_name FROM duckdb_views() WHERE NOT internal")['view_name']
+        else:
+            names = self.query("SELECT name FROM sqlite_master WHERE type = 'view'")['name']
+        return sorted(names.tolist())
+
+    def view(self, name: str) -> pd.DataFrame:
+        """리포트 집계 뷰 조회"""
+        if name not in self.views:
+            raise KeyError(f"정의되지 않은 뷰: {name} (사용 가능: {self.views})")
+        return self.query(f'SELECT * FROM {name}')
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'AnalyticsDB':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,170 @@
+"""
+HVDC 케이스 위치 인덱스 (Case Position Index)
+
+케이스별 이벤트를 (케이스 코드, 시각) 복합 키로 정렬한 배열로 보관하고
+searchsorted로 "케이스 X는 D일에 어디 있었나", "D일에 현장 S에 있던 케이스는?"
+질의를 전체 정렬/groupby 없이 처리합니다. 신규 이벤트는 정렬 위치에 삽입하여
+인덱스를 증분 갱신합니다.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STOCK_TX_TYPES = ['IN', 'TRANSFER_IN']
+DEFAULT_EXTRA_COLUMNS = ['Vendor', 'Storage_Type']
+
+# 복합 키 = 케이스 코드 << TIME_BITS | 기준일 이후 초
+_EPOCH = pd.Timestamp('1900-01-01')
+_TIME_BITS = 34
+_MAX_SECONDS = (1 << _TIME_BITS) - 1
+
+
+def _to_seconds(values) -> np.ndarray:
+    """시각 → 기준일(1900-01-01) 이후 초 (int64)"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    return ((dates - _EPOCH).dt.total_seconds()).to_numpy(dtype=np.float64)
+
+
+class CasePositionIndex:
+    """케이스별 정렬 이벤트 배열 기반 위치 조회 인덱스"""
+
+    def __init__(self, extra_columns: Optional[Sequence[str]] = None):
+        self.extra_columns = list(DEFAULT_EXTRA_COLUMNS if extra_columns is None else extra_columns)
+        self.cases = pd.Index([], dtype=object)
+        self._keys = np.array([], dtype=np.int64)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.array([], dtype=object)
+            for name in ['Location', 'TxType_Refined'] + self.extra_columns
+        }
+        self._dates = np.array([], dtype='datetime64[ns]')
+
+    @classmethod
+    def from_transactions(cls, df: pd.DataFrame, extra_columns: Optional[Sequence[str]] = None) -> 'CasePositionIndex':
+        """트랜잭션 프레임(Case_No, Date, Location, TxType_Refined)에서 인덱스 생성"""
+        index = cls(extra_columns)
+        index.add_events(df)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add_events(self, df: pd.DataFrame) -> int:
+        """
+        신규 이벤트 증분 반영
+
+        기존 배열은 재정렬하지 않고 신규 이벤트만 정렬한 뒤 삽입 위치에 병합합니다.
+        같은 시각의 이벤트는 입력 순서(기존 → 신규)를 유지합니다.
+
+        Returns:
+            int: 반영된 이벤트 수
+        """
+        seconds = _to_seconds(df['Date'])
+        valid = ~np.isnan(seconds)
+        if not valid.any():
+            return 0
+        df = df[valid]
+        seconds = seconds[valid].astype(np.int64)
+        if seconds.min() < 0 or seconds.max() > _MAX_SECONDS:
+            raise ValueError("CasePositionIndex 지원 범위를 벗어난 날짜가 있습니다")
+
+        case_labels = df['Case_No'].astype(str)
+        new_cases = pd.Index(case_labels.unique()).difference(self.cases, sort=False)
+        if len(new_cases):
+            self.cases = self.cases.append(new_cases)
+        codes = self.cases.get_indexer(case_labels).astype(np.int64)
+        keys = (codes << _TIME_BITS) | seconds
+
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        positions = np.searchsorted(self._keys, keys, side='right')
+
+        self._keys = np.insert(self._keys, positions, keys)
+        self._dates = np.insert(self._dates, positions,
+                                pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[ns]')[order])
+        for name in self._columns:
+            values = df[name].to_numpy(dtype=object) if name in df.columns else np.full(len(df), None, dtype=object)
+            self._columns[name] = np.insert(self._columns[name], positions, values[order])
+
+        logger.info(f"📍 케이스 위치 인덱스 갱신: +{len(keys)}건 (총 {len(self._keys)}건, {len(self.cases)}개 케이스)")
+        return len(keys)
+
+    def _last_event_positions(self, as_of=None) -> np.ndarray:
+        """케이스별 as_of 시점 이전 마지막 이벤트 위치 (없으면 -1)"""
+        if as_of is None:
+            seconds = _MAX_SECONDS
+        else:
+            seconds = int(_to_seconds([as_of])[0])
+        codes = np.arange(len(self.cases), dtype=np.int64)
+        query = (codes << _TIME_BITS) | seconds
+        last = np.searchsorted(self._keys, query, side='right') - 1
+
+        # 해당 케이스의 첫 이벤트보다 앞이면 위치 없음
+        first = np.searchsorted(self._keys, codes << _TIME_BITS, side='left')
+        return np.where(last >= first, last, -1)
+
+    def position_of(self, case_no: str, as_of=None) -> Optional[Dict]:
+        """케이스의 as_of 시점 위치 (이벤트 없으면 None)"""
+        start, end = self._case_range(case_no, as_of)
+        if end <= start:
+            return None
+        last = end - 1
+        position = {'Case_No': str(case_no), 'Date': pd.Timestamp(self._dates[last])}
+        position.update({name: values[last] for name, values in self._columns.items()})
+        return position
+
+    def _case_range(self, case_no: str, as_of=None) -> Tuple[int, int]:
+        """케이스의 as_of 시점까지 이벤트 배열 구간 [start, end) (케이스 없으면 빈 구간)"""
+        code = self.cases.get_indexer([str(case_no)])[0]
+        if code < 0:
+            return 0, 0
+        seconds = _MAX_SECONDS if as_of is None else int(_to_seconds([as_of])[0])
+        start = np.searchsorted(self._keys, code << _TIME_BITS, side='left')
+        end = np.searchsorted(self._keys, (code << _TIME_BITS) | seconds, side='right')
+        return int(start), int(end)
+
+    def history(self, case_no: str, as_of=None) -> pd.DataFrame:
+        """케이스의 as_of 시점까지 이벤트 이력 (시각 오름차순)"""
+        start, end = self._case_range(case_no, as_of)
+        result = pd.DataFrame({'Date': self._dates[start:end]})
+        for name, values in self._columns.items():
+            result[name] = values[start:end]
+        return result
+
+    def events(self, case_no: str, as_of=None) -> List[Dict]:
+        """history와 같은 이력을 딕셔너리 목록으로 (DataFrame 생성 없이, 단건 조회용)"""
+        start, end = self._case_range(case_no, as_of)
+        columns = [('Date', self._dates)] + list(self._columns.items())
+        return [{name: values[i] for name, values in columns} for i in range(start, end)]
+
+    def snapshot(self, as_of=None) -> pd.DataFrame:
+        """as_of 시점 전체 케이스의 마지막 이벤트 (Case_No, Date, Location, TxType_Refined, 추가 컬럼)"""
+        positions = self._last_event_positions(as_of)
+        found = positions >= 0
+        rows = positions[found]
+        result = pd.DataFrame({'Case_No': self.cases[found].to_numpy(), 'Date': self._dates[rows]})
+        for name, values in self._columns.items():
+            result[name] = values[rows]
+        return result
+
+    def cases_at(self, locations, as_of=None, tx_types: Optional[Iterable[str]] = None) -> List[str]:
+        """as_of 시점 지정 위치에 있던 케이스 목록"""
+        locations = [locations] if isinstance(locations, str) else list(locations)
+        positions = self._last_event_positions(as_of)
+        found = positions >= 0
+        mask = np.zeros(len(positions), dtype=bool)
+        mask[found] = np.isin(self._columns['Location'][positions[found]], locations)
+        if tx_types is not None:
+            mask[found] &= np.isin(self._columns['TxType_Refined'][positions[found]], list(tx_types))
+        return self.cases[mask].tolist()
+
+    def in_stock(self, locations, as_of=None, tx_types: Sequence[str] = STOCK_TX_TYPES) -> pd.DataFrame:
+        """as_of 시점 지정 위치에 입고 상태로 남아 있는 케이스의 마지막 이벤트"""
+        locations = [locations] if isinstance(locations, str) else list(locations)
+        snapshot = self.snapshot(as_of)
+        mask = snapshot['Location'].isin(locations) & snapshot['TxType_Refined'].isin(list(tx_types))
+        return snapshot[mask].reset_index(drop=True)
@@ -15,6 +15,8 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 import logging
 
+from core.lazy_loading import LazyObject
+
 logger = logging.getLogger(__name__)
 
 class ConfigManager:
@@ -181,4 +183,4 @@ class ConfigManager:
         return self.get("validation", "missing_reference_action", "warn")
 
 # 전역 설정 인스턴스
-config_manager = ConfigManager() 
\ No newline at end of file
+config_manager = LazyObject(ConfigManager)  # 첫 사용 시 settings.toml 로드 
\ No newline at end of file
@@ -8,6 +8,7 @@ import hashlib
 import logging
 from datetime import datetime, timedelta
 from .config_manager import config_manager
+from .dtypes import contains_mask, fill_missing, restore_dtype_policy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,8 +28,8 @@ def drop_duplicate_transfers(df: pd.DataFrame) -> pd.DataFrame:
         logger.warning("트랜잭션 타입 컬럼이 없어 중복 제거를 건너뜁니다")
         return df
     
-    # TRANSFER 마스크
-    transfer_mask = df[tx_col].str.contains('TRANSFER', na=False, case=False)
+    # TRANSFER 마스크 (카테고리 컬럼은 코드 비교)
+    transfer_mask = contains_mask(df[tx_col], 'TRANSFER')
     
     if not transfer_mask.any():
         return df
@@ -44,9 +45,9 @@ def drop_duplicate_transfers(df: pd.DataFrame) -> pd.DataFrame:
             else:
                 df[col] = 'UNKNOWN'
     
-    # Target_Warehouse 결측값 처리
-    df.loc[transfer_mask, 'Target_Warehouse'] = (
-        df.loc[transfer_mask, 'Target_Warehouse'].fillna('UNKNOWN')
+    # Target_Warehouse 결측값 처리 (TRANSFER 행만)
+    df['Target_Warehouse'] = fill_missing(df['Target_Warehouse'], 'UNKNOWN').where(
+        transfer_mask | df['Target_Warehouse'].notnull()
     )
     
     # TRANSFER 트랜잭션 중복 제거
@@ -60,7 +61,7 @@ def drop_duplicate_transfers(df: pd.DataFrame) -> pd.DataFrame:
     if removed_count > 0:
         logger.info(f"🗑️ TRANSFER 중복 제거: {removed_count}건 제거")
     
-    return result_df
+    return restore_dtype_policy(result_df, df)
 
 def reconcile_orphan_transfers(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -88,12 +89,13 @@ def reconcile_orphan_transfers(df: pd.DataFrame) -> pd.DataFrame:
                 df[col] = 'UNKNOWN'
     
     # 결측값 처리
-    df['Location'] = df['Location'].fillna('UNKNOWN')
-    df['Target_Warehouse'] = df['Target_Warehouse'].fillna('UNKNOWN')
+    df['Location'] = fill_missing(df['Location'], 'UNKNOWN')
+    df['Target_Warehouse'] = fill_missing(df['Target_Warehouse'], 'UNKNOWN')
     df['Qty'] = pd.to_numeric(df['Qty'], errors='coerce').fillna(1).astype(int)
+    df = restore_dtype_policy(df, df)
     
     # TRANSFER 트랜잭션 마스크
-    transfer_mask = df[tx_col].str.contains('TRANSFER', na=False, case=False)
+    transfer_mask = contains_mask(df[tx_col], 'TRANSFER')
     
     if not transfer_mask.any():
         logger.info("TRANSFER 트랜잭션이 없습니다")
@@ -111,7 +113,8 @@ def reconcile_orphan_transfers(df: pd.DataFrame) -> pd.DataFrame:
             columns=tx_col,
             values='Qty',
             aggfunc='sum',
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
     except Exception as e:
         logger.warning(f"피벗 테이블 생성 실패: {e}")
@@ -195,7 +198,7 @@ def reconcile_orphan_transfers(df: pd.DataFrame) -> pd.DataFrame:
         result_df = pd.concat([df, fix_df], ignore_index=True)
         
         logger.info(f"✅ TRANSFER 보정 완료: {len(fixes)}건 추가")
-        return result_df
+        return restore_dtype_policy(result_df, df)
     else:
         logger.info("✅ TRANSFER 짝이 이미 완전함")
         return df
@@ -216,7 +219,7 @@ def validate_transfer_pairs_fixed(df: pd.DataFrame) -> None:
         return
     
     # TRANSFER 마스크
-    transfer_mask = df[tx_col].str.contains('TRANSFER', na=False, case=False)
+    transfer_mask = contains_mask(df[tx_col], 'TRANSFER')
     
     if not transfer_mask.any():
         logger.info("TRANSFER 트랜잭션이 없습니다")
@@ -224,9 +227,10 @@ def validate_transfer_pairs_fixed(df: pd.DataFrame) -> None:
     
     # 케이스별 TRANSFER IN/OUT 집계
     transfer_summary = (df[transfer_mask]
-                       .groupby(['Case_No', tx_col])['Qty']
+                       .groupby(['Case_No', tx_col], observed=True)['Qty']
                        .sum()
                        .unstack(fill_value=0))
+    transfer_summary.columns = transfer_summary.columns.astype(str)
     
     # 컬럼 확인 및 생성
     if 'TRANSFER_IN' not in transfer_summary.columns:
@@ -262,7 +266,7 @@ def validate_date_sequence_fixed(df: pd.DataFrame) -> None:
     
     bad_cases = []
     
-    for case_id, group in df.groupby(case_col):
+    for case_id, group in df.groupby(case_col, observed=True):
         if len(group) <= 1:
             continue
             
@@ -281,7 +285,7 @@ def validate_date_sequence_fixed(df: pd.DataFrame) -> None:
             print(f"   예시: {bad_cases[:5]}... (총 {len(bad_cases)}개)")
         
         # AUTO_FIX 케이스는 경고만 출력
-        auto_fix_cases = df[df.get('Source_File', '').str.contains('AUTO_FIX', na=False)]['Case_No'].unique()
+        auto_fix_cases = df[contains_mask(df.get('Source_File', pd.Series('', index=df.index)), 'AUTO_FIX', case=True)]['Case_No'].unique()
         auto_fix_bad = [case for case in bad_cases if case in auto_fix_cases]
         
         if len(auto_fix_bad) == len(bad_cases):
@@ -688,7 +692,7 @@ class InventoryEngine:
         transaction_df['Date'] = pd.to_datetime(transaction_df['Date']).dt.date
         
         # TxType_Refined별 집계
-        daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined']).agg({
+        daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined'], observed=True).agg({
             'Qty': 'sum'
         }).reset_index()
         
@@ -697,7 +701,8 @@ class InventoryEngine:
             index=['Location', 'Date'],
             columns='TxType_Refined', 
             values='Qty',
-            fill_value=0
+            fill_value=0,
+            observed=True
         ).reset_index()
         
         # 컬럼명 정리
@@ -0,0 +1,129 @@
+"""
+HVDC 진단 이벤트 수집기
+
+로더/매핑의 행 단위 루프에서 발생하는 이벤트(이벤트 없는 행, 수량 변환 실패,
+날짜 파싱 실패, 매핑되지 않은 Location 등)를 콘솔에 바로 출력하지 않고
+건수 + 샘플로만 모은 뒤, 파일 처리 끝에 한 번 요약을 출력합니다.
+
+출력 수준 (verbosity):
+    quiet   - 요약 출력 없음 (건수/샘플은 계속 수집)
+    summary - 경고 이벤트 건수 + 샘플 요약 (기본값)
+    verbose - summary + 정보성 이벤트(발견된 날짜 컬럼 등) 전체 샘플
+기본값은 환경변수 HVDC_VERBOSITY 또는 set_default_verbosity()로 바꿀 수 있습니다.
+"""
+
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+VERBOSITY_LEVELS = {'quiet': 0, 'summary': 1, 'verbose': 2}
+DEFAULT_SAMPLE_SIZE = 5
+VERBOSE_SAMPLE_SIZE = 50
+SAMPLE_VALUE_WIDTH = 60
+
+# 이벤트 키 → (표시 이름, 정보성 여부)
+DIAGNOSTIC_EVENTS = {
+    'no_events': ('이벤트 없는 행', False),
+    'qty_conversion_failed': ('수량 변환 실패 (기본값 1 사용)', False),
+    'date_parse_failed': ('날짜 파싱 실패', False),
+    'unmapped_location': ('매핑되지 않은 Location', False),
+    'date_column': ('날짜 컬럼 발견', True),
+}
+
+_default_verbosity = os.getenv('HVDC_VERBOSITY', 'summary')
+
+
+def set_default_verbosity(verbosity: str):
+    """이후 생성되는 수집기의 기본 출력 수준 지정 (CLI --verbosity용)"""
+    global _default_verbosity
+    _check_verbosity(verbosity)
+    _default_verbosity = verbosity
+
+
+def get_default_verbosity() -> str:
+    return _default_verbosity
+
+
+def _check_verbosity(verbosity: str):
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"지원하지 않는 출력 수준: {verbosity} ({'/'.join(VERBOSITY_LEVELS)})")
+
+
+class DiagnosticsCollector:
+    """이벤트별 건수 + 샘플 수집 (record는 출력 없이 카운터만 갱신)"""
+
+    def __init__(self, scope: str, verbosity: Optional[str] = None, sample_size: Optional[int] = None):
+        """
+        Args:
+            scope: 요약 머리말에 표시할 범위 (보통 파일명)
+            verbosity: quiet / summary / verbose (기본: get_default_verbosity())
+            sample_size: 이벤트별 보관 샘플 수 (기본: verbose 50, 그 외 5)
+        """
+        verbosity = verbosity or _default_verbosity
+        _check_verbosity(verbosity)
+        self.scope = scope
+        self.verbosity = verbosity
+        if sample_size is None:
+            sample_size = VERBOSE_SAMPLE_SIZE if verbosity == 'verbose' else DEFAULT_SAMPLE_SIZE
+        self.sample_size = sample_size
+        self.counts: Counter = Counter()
+        self._records: Counter = Counter()
+        self.samples: Dict[str, List[Dict[str, Any]]] = {}
+
+    def record(self, event: str, count: int = 1, **detail):
+        """이벤트 count건 기록 (샘플은 sample_size개까지만 보관)"""
+        self.counts[event] += count
+        self._records[event] += 1
+        samples = self.samples.setdefault(event, [])
+        if len(samples) < self.sample_size:
+            samples.append(detail)
+
+    def count(self, event: str) -> int:
+        return self.counts.get(event, 0)
+
+    @property
+    def total(self) -> int:
+        """경고 이벤트 총 건수 (정보성 이벤트 제외)"""
+        return sum(n for event, n in self.counts.items() if not DIAGNOSTIC_EVENTS.get(event, ('', False))[1])
+
+    def merge(self, other: 'DiagnosticsCollector'):
+        """다른 수집기의 건수/샘플 합산"""
+        for event, n in other.counts.items():
+            self.counts[event] += n
+            self._records[event] += other._records[event]
+            samples = self.samples.setdefault(event, [])
+            samples.extend(other.samples.get(event, [])[:max(self.sample_size - len(samples), 0)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scope': self.scope,
+            'counts': dict(self.counts),
+            'samples': {event: list(samples) for event, samples in self.samples.items()},
+        }
+
+    def summary_lines(self) -> List[str]:
+        """요약 출력 줄 (정보성 이벤트는 verbose에서만)"""
+        level = VERBOSITY_LEVELS[self.verbosity]
+        lines = []
+        for event, n in self.counts.items():
+            label, informational = DIAGNOSTIC_EVENTS.get(event, (event, False))
+            if informational and level < VERBOSITY_LEVELS['verbose']:
+                continue
+            samples = ', '.join(_format_sample(s) for s in self.samples.get(event, []))
+            more = ' ...' if self._records[event] > len(self.samples.get(event, [])) else ''
+            lines.append(f"   {'ℹ️' if informational else '⚠️'} {label}: {n:,}건" + (f" (예: {samples}{more})" if samples else ''))
+        return lines
+
+    def report(self) -> Dict[str, Any]:
+        """범위당 1회 요약 출력 (quiet는 출력 없음) 후 수집 결과 반환"""
+        if VERBOSITY_LEVELS[self.verbosity] > VERBOSITY_LEVELS['quiet']:
+            lines = self.summary_lines()
+            if lines:
+                print(f"   🩺 {self.scope} 진단 요약")
+                for line in lines:
+                    print(line)
+        return self.to_dict()
+
+
+def _format_sample(detail: Dict[str, Any]) -> str:
+    return ' '.join(f"{key}={str(value)[:SAMPLE_VALUE_WIDTH]}" for key, value in detail.items())
@@ -0,0 +1,126 @@
+"""
+HVDC 트랜잭션 프레임 dtype 정책
+
+변환 직후 트랜잭션 프레임에 메모리 최적화 dtype을 적용합니다.
+- TxType_Refined: 순서형 enum 카테고리 (IN < TRANSFER_IN < TRANSFER_OUT < FINAL_OUT)
+- Case_No: 사전(dictionary) 인코딩 카테고리 (케이스 문자열 1회만 보관)
+- Location/Source_File/Loc_From/Target_Warehouse 등 저카디널리티 컬럼: 카테고리
+- Qty: 정수 다운캐스트 (int64 → int32)
+TRANSFER 판정 등 문자열 조건은 카테고리 값에 한 번만 평가하고 코드로 매핑합니다.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TX_TYPES = ['IN', 'TRANSFER_IN', 'TRANSFER_OUT', 'FINAL_OUT']
+TX_TYPE_DTYPE = pd.CategoricalDtype(TX_TYPES, ordered=True)
+TX_TYPE_COLUMNS = ['TxType_Refined', 'Transaction_Type']
+CASE_COLUMNS = ['Case_No']
+CATEGORICAL_COLUMNS = ['Location', 'Source_File', 'Loc_From', 'Target_Warehouse',
+                       'Storage_Type', 'Vendor', 'Site']
+INTEGER_COLUMNS = ['Qty', 'Incoming', 'Outgoing']
+# 정수 다운캐스트 하한 (int8/int16은 Qty × 부호/배수 연산에서 오버플로 위험)
+MIN_INTEGER_DTYPE = np.int32
+# 카테고리 변환 대상 최대 고유값 비율 (이보다 높으면 object 유지)
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _tx_type_dtype(values: pd.Series) -> pd.CategoricalDtype:
+    """표준 TxType enum + 데이터에만 있는 값은 뒤에 추가 (순서 유지)"""
+    extra = [v for v in pd.unique(values.dropna().astype(str)) if v not in TX_TYPES]
+    if not extra:
+        return TX_TYPE_DTYPE
+    return pd.CategoricalDtype(TX_TYPES + sorted(extra), ordered=True)
+
+
+def apply_dtype_policy(df: pd.DataFrame, report: bool = True) -> pd.DataFrame:
+    """
+    트랜잭션 프레임 dtype 정책 적용 (새 프레임 반환)
+
+    Args:
+        df: 트랜잭션 DataFrame
+        report: 메모리 절감 결과 출력 여부
+    """
+    before = df.memory_usage(deep=True).sum() if report else 0
+    result = df.copy()
+
+    for col in TX_TYPE_COLUMNS:
+        if col in result.columns and not _is_tx_type_enum(result[col].dtype):
+            result[col] = result[col].astype(object).where(result[col].notnull(), None)
+            result[col] = result[col].astype(_tx_type_dtype(result[col]))
+
+    for col in CASE_COLUMNS:
+        if col in result.columns and not isinstance(result[col].dtype, pd.CategoricalDtype):
+            values = result[col]
+            result[col] = values.where(values.isnull(), values.astype(str)).astype('category')
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in result.columns and not isinstance(result[col].dtype, pd.CategoricalDtype):
+            values = result[col]
+            if values.dtype == object or pd.api.types.is_string_dtype(values):
+                if len(values) and values.nunique(dropna=True) > len(values) * MAX_CATEGORY_RATIO:
+                    continue
+                result[col] = values.where(values.isnull(), values.astype(str)).astype('category')
+
+    for col in INTEGER_COLUMNS:
+        if col in result.columns and pd.api.types.is_integer_dtype(result[col]):
+            downcast = pd.to_numeric(result[col], downcast='integer')
+            if downcast.dtype.itemsize < np.dtype(MIN_INTEGER_DTYPE).itemsize:
+                downcast = downcast.astype(MIN_INTEGER_DTYPE)
+            result[col] = downcast
+
+    if report:
+        after = result.memory_usage(deep=True).sum()
+        ratio = before / after if after else 0
+        print(f"🧮 dtype 정책 적용: {before / 1024:,.0f}KB → {after / 1024:,.0f}KB ({ratio:.1f}x 절감)")
+    return result
+
+
+def _is_tx_type_enum(dtype) -> bool:
+    return (isinstance(dtype, pd.CategoricalDtype) and dtype.ordered
+            and list(dtype.categories[:len(TX_TYPES)]) == TX_TYPES)
+
+
+def has_dtype_policy(df: pd.DataFrame) -> bool:
+    """dtype 정책이 적용된 프레임인지 (TxType enum 카테고리 여부)"""
+    for col in TX_TYPE_COLUMNS:
+        if col in df.columns:
+            return _is_tx_type_enum(df[col].dtype)
+    return False
+
+
+def contains_mask(values: pd.Series, pattern: str, case: bool = False) -> pd.Series:
+    """
+    str.contains 동등 마스크 (결측은 False)
+
+    카테고리 컬럼은 카테고리 값에만 문자열 검사를 하고 코드 배열로 매핑합니다.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = pd.Series(values.cat.categories.astype(str))
+        category_mask = categories.str.contains(pattern, case=case, regex=False).to_numpy(dtype=bool)
+        # 결측 코드(-1)는 끝에 덧붙인 False를 가리킴
+        category_mask = np.append(category_mask, False)
+        return pd.Series(category_mask[values.cat.codes.to_numpy()], index=values.index)
+    return values.str.contains(pattern, na=False, case=case)
+
+
+def fill_missing(values: pd.Series, fill_value) -> pd.Series:
+    """fillna (카테고리 컬럼이면 채움값을 카테고리에 추가)"""
+    if isinstance(values.dtype, pd.CategoricalDtype) and fill_value not in values.cat.categories:
+        values = values.cat.add_categories([fill_value])
+    return values.fillna(fill_value)
+
+
+def restore_dtype_policy(result: pd.DataFrame, source: pd.DataFrame) -> pd.DataFrame:
+    """
+    source에 정책이 적용되어 있으면 결합/보정 결과에도 다시 적용
+
+    pd.concat은 카테고리가 다른 컬럼을 object로 되돌리므로 보정/중복 제거 단계 끝에서 호출합니다.
+    """
+    if has_dtype_policy(source):
+        return apply_dtype_policy(result, report=False)
+    return result
@@ -0,0 +1,245 @@
+"""
+HVDC 이동 흐름(OD) 매트릭스 및 체류시간 인덱스
+
+컬럼형 케이스 타임라인(TimelineTracker.create_case_timeline_frame)의 이동 행을
+출발지 → 도착지 경로별 건수/수량/소요시간 히스토그램과 창고별 체류시간
+히스토그램으로 한 번 집계해 두고, 신규 타임라인 배치는 update()로 누적합니다.
+케이스별 마지막 위치/시각을 보관하므로 같은 케이스가 여러 배치에 걸쳐 있어도
+배치 경계의 이동이 누락되지 않습니다 (케이스별로 시간 순서대로 적재해야 함).
+"DSV Indoor → MIR 중앙 소요일" 같은 질의는 원본 재스캔 없이 인덱스 조회로 처리합니다.
+"""
+
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.histogram import counter_quantile
+
+logger = logging.getLogger(__name__)
+
+# 소요/체류시간 히스토그램 해상도 (시간 단위 반올림)
+DURATION_RESOLUTION_HOURS = 1
+DEFAULT_DWELL_BINS_DAYS = [0, 1, 3, 7, 14, 30, 60, 90, 180, 365]
+ROUTE_STATS_COLUMNS = ['from', 'to', 'count', 'qty', 'mean_hours', 'p50_days', 'p90_days']
+
+
+def _duration_keys(hours: pd.Series) -> np.ndarray:
+    """소요시간을 히스토그램 키(해상도 단위 정수 시간)로 변환"""
+    return (np.round(hours.to_numpy(dtype=float) / DURATION_RESOLUTION_HOURS) * DURATION_RESOLUTION_HOURS).astype(np.int64)
+
+
+class MovementFlowIndex:
+    """출발지→도착지 흐름 매트릭스 + 창고별 체류시간 히스토그램 인덱스"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Dict] = {}
+        self.dwell: Dict[str, Counter] = {}
+        self.total_movements = 0
+        self.last_seen: Dict[str, Tuple[str, pd.Timestamp]] = {}  # case_id -> (마지막 위치, 시각)
+
+    @classmethod
+    def from_timeline(cls, timeline: pd.DataFrame) -> 'MovementFlowIndex':
+        """컬럼형 타임라인에서 인덱스 생성"""
+        index = cls()
+        index.update(timeline)
+        return index
+
+    def update(self, timeline: pd.DataFrame) -> int:
+        """
+        신규 타임라인 배치 누적
+
+        수량은 도착 엔트리의 incoming, 소요시간은 movement_duration_hours
+        (출발지 체류시간과 동일)을 사용합니다. 이전 배치에 나온 케이스는 배치의 첫 엔트리와
+        보관된 마지막 위치/시각을 비교해 배치 경계 이동을 추가합니다.
+
+        Returns:
+            int: 누적된 이동 건수
+
+        Raises:
+            ValueError: 케이스의 첫 엔트리가 이전 배치의 마지막 시각보다 앞선 경우
+        """
+        moves = timeline.loc[timeline['movement_from'].notnull(),
+                             ['movement_from', 'movement_to', 'incoming', 'movement_duration_hours']]
+        moves = pd.DataFrame({
+            'from': moves['movement_from'].astype(str).to_numpy(),
+            'to': moves['movement_to'].astype(str).to_numpy(),
+            'qty': pd.to_numeric(moves['incoming'], errors='coerce').fillna(0).to_numpy(),
+            'hours': moves['movement_duration_hours'].to_numpy(dtype=float),
+        })
+        boundary = self._boundary_moves(timeline)
+        if not boundary.empty:
+            moves = pd.concat([boundary, moves], ignore_index=True)
+        self._remember_last_seen(timeline)
+        if moves.empty:
+            return 0
+        moves['hours'] = _duration_keys(moves['hours'])
+
+        # 경로별 건수/수량
+        totals = moves.groupby(['from', 'to'], sort=False, observed=True).agg(count=('qty', 'size'), qty=('qty', 'sum'))
+        for (src, dst), row in totals.iterrows():
+            route = self.routes.setdefault((src, dst), {'count': 0, 'qty': 0.0, 'hours': Counter()})
+            route['count'] += int(row['count'])
+            route['qty'] += float(row['qty'])
+
+        # 경로별/출발지별 소요시간 히스토그램
+        histogram = moves.groupby(['from', 'to', 'hours'], sort=False, observed=True).size()
+        for (src, dst, hours), count in histogram.items():
+            self.routes[(src, dst)]['hours'][int(hours)] += int(count)
+            self.dwell.setdefault(src, Counter())[int(hours)] += int(count)
+
+        self.total_movements += len(moves)
+        logger.info(f"🔀 흐름 인덱스 갱신: {len(moves)}건 이동, {len(self.routes)}개 경로")
+        return len(moves)
+
+    def _boundary_moves(self, timeline: pd.DataFrame) -> pd.DataFrame:
+        """이전 배치 마지막 위치 → 이번 배치 첫 위치 이동 (위치가 바뀐 케이스만)"""
+        columns = ['from', 'to', 'qty', 'hours']
+        if not self.last_seen or timeline.empty:
+            return pd.DataFrame(columns=columns)
+        heads = timeline.drop_duplicates('case_id', keep='first')
+        rows = []
+        for case_id, location, timestamp, incoming in zip(
+                heads['case_id'].astype(str), heads['location'].astype(str),
+                heads['timestamp'], pd.to_numeric(heads['incoming'], errors='coerce').fillna(0)):
+            previous = self.last_seen.get(case_id)
+            if previous is None:
+                continue
+            prev_location, prev_timestamp = previous
+            if timestamp < prev_timestamp:
+                raise ValueError(f"케이스 {case_id}: 배치 첫 엔트리({timestamp})가 "
+                                 f"이전 배치 마지막 엔트리({prev_timestamp})보다 앞섭니다")
+            if location != prev_location:
+                rows.append((prev_location, location, float(incoming),
+                             (timestamp - prev_timestamp).total_seconds() / 3600))
+        return pd.DataFrame(rows, columns=columns)
+
+    def _remember_last_seen(self, timeline: pd.DataFrame):
+        """케이스별 마지막 위치/시각 보관 (타임라인은 케이스 내 시각 순)"""
+        tails = timeline.drop_duplicates('case_id', keep='last')
+        self.last_seen.update(zip(tails['case_id'].astype(str),
+                                  zip(tails['location'].astype(str), tails['timestamp'])))
+
+    def merge(self, other: 'MovementFlowIndex') -> 'MovementFlowIndex':
+        """
+        다른 인덱스 병합 (프로세스별 인덱스 결합)
+
+        두 인덱스 사이의 이동 순서를 알 수 없으므로 케이스가 겹치지 않는 인덱스만 병합합니다.
+        같은 케이스의 연속 배치는 update()로 누적하세요.
+
+        Raises:
+            ValueError: 두 인덱스에 같은 케이스가 있는 경우
+        """
+        shared = self.last_seen.keys() & other.last_seen.keys()
+        if shared:
+            raise ValueError(f"케이스가 겹치는 인덱스는 병합할 수 없습니다: {sorted(shared)[:5]}")
+        for key, route in other.routes.items():
+            target = self.routes.setdefault(key, {'count': 0, 'qty': 0.0, 'hours': Counter()})
+            target['count'] += route['count']
+            target['qty'] += route['qty']
+            target['hours'].update(route['hours'])
+        for location, histogram in other.dwell.items():
+            self.dwell.setdefault(location, Counter()).update(histogram)
+        self.total_movements += other.total_movements
+        self.last_seen.update(other.last_seen)
+        return self
+
+    def route_count(self, src: str, dst: str) -> int:
+        route = self.routes.get((src, dst))
+        return route['count'] if route else 0
+
+    def duration_percentile(self, src: str, dst: str, q: float = 0.5, unit: str = 'days') -> Optional[float]:
+        """경로 소요시간 분위수 (unit: 'days' 또는 'hours', 경로 없으면 None)"""
+        route = self.routes.get((src, dst))
+        hours = counter_quantile(route['hours'], q) if route else None
+        if hours is None:
+            return None
+        return hours / 24 if unit == 'days' else hours
+
+    def median_days(self, src: str, dst: str) -> Optional[float]:
+        """경로 중앙 소요일"""
+        return self.duration_percentile(src, dst, 0.5)
+
+    def dwell_percentile(self, location: str, q: float = 0.5, unit: str = 'days') -> Optional[float]:
+        """창고별 체류시간 분위수"""
+        hours = counter_quantile(self.dwell.get(location, Counter()), q)
+        if hours is None:
+            return None
+        return hours / 24 if unit == 'days' else hours
+
+    def dwell_histogram(self, location: str, bins_days: Optional[List[float]] = None) -> pd.Series:
+        """창고별 체류일 구간 히스토그램 (마지막 구간은 상한 없음)"""
+        bins_days = bins_days or DEFAULT_DWELL_BINS_DAYS
+        histogram = self.dwell.get(location, Counter())
+        edges = np.array(bins_days, dtype=float) * 24
+        labels = [f"{lo}-{hi}d" for lo, hi in zip(bins_days[:-1], bins_days[1:])] + [f"{bins_days[-1]}d+"]
+        counts = np.zeros(len(labels), dtype=np.int64)
+        for hours, count in histogram.items():
+            position = np.searchsorted(edges, hours, side='right') - 1
+            counts[max(position, 0)] += count
+        return pd.Series(counts, index=labels, name=location)
+
+    def flow_matrix(self, measure: str = 'count') -> pd.DataFrame:
+        """출발지 × 도착지 매트릭스 (measure: 'count', 'qty', 'p50_days', 'p90_days', 'mean_hours')"""
+        stats = self.route_stats()
+        if stats.empty:
+            return pd.DataFrame()
+        return stats.pivot(index='from', columns='to', values=measure)
+
+    def route_stats(self) -> pd.DataFrame:
+        """경로별 건수/수량/소요시간 통계"""
+        rows = []
+        for (src, dst), route in self.routes.items():
+            total_hours = sum(hours * count for hours, count in route['hours'].items())
+            rows.append({
+                'from': src,
+                'to': dst,
+                'count': route['count'],
+                'qty': route['qty'],
+                'mean_hours': total_hours / route['count'] if route['count'] else None,
+                'p50_days': self.duration_percentile(src, dst, 0.5),
+                'p90_days': self.duration_percentile(src, dst, 0.9),
+            })
+        return pd.DataFrame(rows, columns=ROUTE_STATS_COLUMNS)
+
+    def save(self, path: Union[str, Path]) -> str:
+        """인덱스 저장 (JSON)"""
+        path = Path(path).with_suffix('.json')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'resolution_hours': DURATION_RESOLUTION_HOURS,
+            'total_movements': self.total_movements,
+            'routes': [
+                {'from': src, 'to': dst, 'count': r['count'], 'qty': r['qty'],
+                 'hours': {str(h): c for h, c in r['hours'].items()}}
+                for (src, dst), r in self.routes.items()
+            ],
+            'dwell': {loc: {str(h): c for h, c in hist.items()} for loc, hist in self.dwell.items()},
+            'last_seen': {case: [loc, ts.isoformat()] for case, (loc, ts) in self.last_seen.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        print(f"💾 흐름 인덱스 저장: {path}")
+        return str(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'MovementFlowIndex':
+        """저장된 인덱스 로드"""
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        index = cls()
+        index.total_movements = payload['total_movements']
+        for r in payload['routes']:
+            index.routes[(r['from'], r['to'])] = {
+                'count': r['count'], 'qty': r['qty'],
+                'hours': Counter({int(h): c for h, c in r['hours'].items()}),
+            }
+        for loc, hist in payload['dwell'].items():
+            index.dwell[loc] = Counter({int(h): c for h, c in hist.items()})
+        for case, (loc, ts) in payload.get('last_seen', {}).items():
+            index.last_seen[case] = (loc, pd.Timestamp(ts))
+        return index
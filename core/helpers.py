@@ -13,42 +13,29 @@ logger = logging.getLogger(__name__)
 def get_latest_inventory_summary(expected_values=None, tolerance=2):
     """
     최신 데이터 기준 DSV Al Markaz, DSV Indoor의 최신 재고 집계
-    main.py의 로직을 단순화한 버전
+    main.py와 같은 스테이지 그래프(core.pipeline_dag) 산출물을 사용
     """
     from config import load_expected_stock
-    from core.loader import DataLoader
-    from core.deduplication import reconcile_orphan_transfers, drop_duplicate_transfers
-    from core.inventory_engine import validate_transfer_pairs, validate_date_sequence
+    from core.deduplication import validate_transfer_pairs_fixed, validate_date_sequence_fixed
+    from core.pipeline_dag import build_transaction_graph
     
     try:
         print("🚀 재고 요약 생성 중...")
         
-        # 1. 데이터 로딩
-        loader = DataLoader()
-        excel_files = loader.load_excel_files("data")
+        # 1~4. 로딩 → 변환 → TRANSFER 보정 → 중복 제거 (main.py와 스테이지 캐시 공유)
+        graph = build_transaction_graph("data")
+        transaction_df = graph.run('dedup')
         
-        if not excel_files:
+        if transaction_df.empty:
             print("❌ Excel 파일이 없습니다!")
             return None
         
-        raw_transactions = loader.extract_transactions(excel_files)
-        print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
-        
-        # 2. DataFrame 변환
-        transaction_df = transactions_to_dataframe_simple(raw_transactions)
-        
-        # 3. TRANSFER 보정
-        transaction_df = reconcile_orphan_transfers(transaction_df)
-        
-        # 4. 중복 제거
-        transaction_df = drop_duplicate_transfers(transaction_df)
-        
         # 5. 검증
-        validate_transfer_pairs(transaction_df)
-        validate_date_sequence(transaction_df)
+        validate_transfer_pairs_fixed(transaction_df)
+        validate_date_sequence_fixed(transaction_df)
         
         # 6. 재고 계산
-        daily_stock = calculate_simple_inventory(transaction_df)
+        daily_stock = graph.run('inventory')
         
         # 7. 기대값 비교
         today = datetime.now().strftime("%Y-%m-%d")
@@ -165,7 +152,7 @@ def calculate_simple_inventory(transaction_df):
     transaction_df['Date'] = pd.to_datetime(transaction_df['Date']).dt.date
     
     # 트랜잭션 타입별 집계
-    daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined']).agg({
+    daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined'], observed=True).agg({
         'Qty': 'sum'
     }).reset_index()
     
@@ -174,7 +161,8 @@ def calculate_simple_inventory(transaction_df):
         index=['Location', 'Date'],
         columns='TxType_Refined', 
         values='Qty',
-        fill_value=0
+        fill_value=0,
+        observed=True
     ).reset_index()
     
     daily_pivot.columns.name = None
@@ -0,0 +1,32 @@
+"""
+HVDC 히스토그램 통계 유틸리티
+
+값 → 빈도 히스토그램(정렬된 값 배열 + 빈도 배열 또는 Counter)에서 원본을 펼치지 않고
+pandas와 같은 분위수를 계산합니다. 스트리밍 검증(IQR 이상치)과 흐름 인덱스(소요/체류시간)가 공유합니다.
+"""
+
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+
+def quantile_from_histogram(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """히스토그램에서 pandas 기본(linear) 보간 분위수 계산 (values는 오름차순)"""
+    total = counts.sum()
+    position = q * (total - 1)
+    lower_rank = int(np.floor(position))
+    frac = position - lower_rank
+    cumulative = np.cumsum(counts)
+    lower = values[np.searchsorted(cumulative, lower_rank + 1)]
+    upper = values[np.searchsorted(cumulative, min(lower_rank + 2, total))]
+    return float(lower + (upper - lower) * frac)
+
+
+def counter_quantile(histogram: Counter, q: float) -> Optional[float]:
+    """Counter 히스토그램(값 → 빈도) 분위수 (비어 있으면 None)"""
+    if not histogram:
+        return None
+    values = np.array(sorted(histogram))
+    counts = np.array([histogram[v] for v in values])
+    return quantile_from_histogram(values, counts, q)
@@ -0,0 +1,186 @@
+"""
+HVDC 지연 로딩 유틸리티
+
+rdflib / plotly / pyarrow.dataset / yaml 같은 무거운 의존성과 mapping_rules JSON,
+설정 싱글턴을 모듈 import 시점이 아니라 처음 사용할 때 불러옵니다.
+재고 계산/검증만 하는 CLI는 리포트·RDF·대시보드 의존성 비용을 내지 않습니다.
+
+    pa = lazy_module('pyarrow')                 # 첫 속성 접근 시 import
+    Graph = lazy_attribute('rdflib', 'Graph')   # 첫 호출/속성 접근 시 import
+    FIELD_MAP = rules_section('field_map', {})  # 첫 조회 시 mapping_rules 로드 (프로세스당 1회)
+
+import 시간 점검: python scripts/import_audit.py
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import weakref
+from collections import UserString
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+MAPPING_RULES_FILE = "mapping_rules_v2.6.json"
+# reload_mapping_rules 시 캐시를 비울 LazyMapping / LazySequence / LazyString 인스턴스
+_LAZY_CONTAINERS = weakref.WeakValueDictionary()
+
+
+def module_available(name: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인 (*_AVAILABLE 플래그용)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyObject:
+    """첫 속성 접근/호출 시 factory()로 실제 객체를 만들어 위임하는 프록시"""
+
+    __slots__ = ('_factory', '_target')
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_target', None)
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, '_target')
+        if target is None:
+            target = object.__getattribute__(self, '_factory')()
+            object.__setattr__(self, '_target', target)
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return object.__getattribute__(self, '_target') is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if self.loaded:
+            return repr(self._resolve())
+        return f"<lazy {object.__getattribute__(self, '_factory')!r}>"
+
+
+def lazy_module(name: str) -> LazyObject:
+    """첫 사용 시 import되는 모듈 프록시"""
+    return LazyObject(lambda: importlib.import_module(name))
+
+
+def lazy_attribute(module: str, attribute: str) -> LazyObject:
+    """첫 사용 시 import되는 모듈 속성 프록시 (클래스/함수/네임스페이스)"""
+    return LazyObject(lambda: getattr(importlib.import_module(module), attribute))
+
+
+@lru_cache(maxsize=None)
+def load_mapping_rules(path: str = MAPPING_RULES_FILE) -> Dict[str, Any]:
+    """mapping_rules JSON 로드 (경로별 1회 캐시, 실패 시 빈 딕셔너리)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"{path} 로드 실패, 기본값 사용: {e}")
+        return {}
+
+
+def reload_mapping_rules():
+    """규칙 파일 변경 반영 - JSON 캐시와 지연 딕셔너리/리스트 캐시를 비움 (다음 조회 시 다시 로드)"""
+    load_mapping_rules.cache_clear()
+    for container in list(_LAZY_CONTAINERS.values()):
+        container.reset()
+
+
+class LazyMapping(Mapping):
+    """첫 조회 시 loader()를 호출하는 읽기 전용 딕셔너리"""
+
+    def __init__(self, loader: Callable[[], Mapping]):
+        self._loader = loader
+        self._data = None
+        _LAZY_CONTAINERS[id(self)] = self
+
+    def reset(self):
+        self._data = None
+
+    def _resolve(self) -> Mapping:
+        if self._data is None:
+            self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __repr__(self) -> str:
+        return repr(self._resolve())
+
+
+class LazySequence(Sequence):
+    """첫 조회 시 loader()를 호출하는 읽기 전용 리스트"""
+
+    def __init__(self, loader: Callable[[], Sequence]):
+        self._loader = loader
+        self._data = None
+        _LAZY_CONTAINERS[id(self)] = self
+
+    def reset(self):
+        self._data = None
+
+    def _resolve(self) -> Sequence:
+        if self._data is None:
+            self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __repr__(self) -> str:
+        return repr(self._resolve())
+
+
+class LazyString(UserString):
+    """첫 조회 시 loader()를 호출하는 읽기 전용 문자열 (str 비교/메서드 지원)"""
+
+    def __init__(self, loader: Union[Callable[[], str], str]):
+        # UserString 메서드(upper 등)는 결과 문자열로 같은 클래스를 만들므로 문자열도 허용
+        self._loader = loader if callable(loader) else (lambda: loader)
+        self._value = None
+        _LAZY_CONTAINERS[id(self)] = self
+
+    def reset(self):
+        self._value = None
+
+    @property
+    def data(self) -> str:
+        if self._value is None:
+            self._value = str(self._loader())
+        return self._value
+
+
+def rules_section(key: str, default: Union[dict, list, str],
+                  path: str = MAPPING_RULES_FILE) -> Union[LazyMapping, LazySequence, LazyString]:
+    """mapping_rules의 한 섹션을 지연 로딩 (딕셔너리 → LazyMapping, 리스트 → LazySequence, 문자열 → LazyString)"""
+    def loader():
+        return load_mapping_rules(path).get(key, default)
+    if isinstance(default, dict):
+        return LazyMapping(loader)
+    if isinstance(default, str):
+        return LazyString(loader)
+    return LazySequence(loader)
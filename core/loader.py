@@ -5,14 +5,28 @@ import logging
 import os
 import glob
 from mapping_utils import mapping_manager
+from core.diagnostics import DiagnosticsCollector
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HVDC 창고 파일 패턴
+SOURCE_FILE_PATTERNS = [
+    "HVDC WAREHOUSE_HITACHI*.xlsx",
+    "HVDC WAREHOUSE_SIMENSE*.xlsx"
+]
+
 class DataLoader:
-    def __init__(self):
+    def __init__(self, verbosity=None):
+        """
+        Args:
+            verbosity: 파일별 진단 요약 출력 수준 (quiet / summary / verbose, 기본: core.diagnostics 기본값)
+        """
         # ✅ 통합 매핑 매니저 사용
         self.mapping_manager = mapping_manager
+        self.verbosity = verbosity
+        # 파일명 → 마지막 추출의 진단 결과 (DiagnosticsCollector.to_dict)
+        self.diagnostics = {}
         logger.info("✅ DataLoader 초기화 완료 - 통합 매핑 시스템 적용")
 
     def load_excel_files(self, data_dir: str = "data"):
@@ -23,50 +37,59 @@ class DataLoader:
             logger.error(f"데이터 디렉토리 없음: {data_dir}")
             return excel_files
             
-        # HVDC 창고 파일 패턴
-        file_patterns = [
-            "HVDC WAREHOUSE_HITACHI*.xlsx",
-            "HVDC WAREHOUSE_SIMENSE*.xlsx"
-        ]
-        
-        for pattern in file_patterns:
+        for filepath in self.source_files(data_dir):
+            df = self.load_excel_file(filepath)
+            if df is not None:
+                excel_files[os.path.basename(filepath)] = df
+                    
+        return excel_files
+
+    @staticmethod
+    def source_files(data_dir: str = "data"):
+        """로딩 대상 창고 Excel 경로 목록 (패턴 순서, 인보이스/Excel 잠금 파일 제외)"""
+        paths = []
+        for pattern in SOURCE_FILE_PATTERNS:
             for filepath in glob.glob(os.path.join(data_dir, pattern)):
                 filename = os.path.basename(filepath)
-                
-                # 인보이스 파일 스킵
-                if 'invoice' in filename.lower():
+                # 인보이스 파일 / Excel 편집 중 잠금 파일(~$) 스킵
+                if 'invoice' in filename.lower() or filename.startswith('~$'):
                     continue
-                    
-                try:
-                    print(f"📄 파일 처리 중: {filename}")
-                    
-                    # Excel 파일 로드
-                    xl_file = pd.ExcelFile(filepath)
-                    
-                    # Case List 시트 우선 선택
-                    sheet_name = xl_file.sheet_names[0]
-                    for sheet in xl_file.sheet_names:
-                        if 'case' in sheet.lower() and 'list' in sheet.lower():
-                            sheet_name = sheet
-                            break
-                    
-                    df = pd.read_excel(filepath, sheet_name=sheet_name)
-                    
-                    if not df.empty:
-                        excel_files[filename] = df
-                        
-                        # 간단한 통계 출력
-                        print(f"   📊 {len(df)}행 데이터 로드")
-                        
-                        case_col = self._find_case_column(df)
-                        if case_col:
-                            case_count = df[case_col].nunique()
-                            print(f"   📦 고유 케이스 {case_count}개")
-                    
-                except Exception as e:
-                    logger.error(f"Excel 파일 로드 실패 {filename}: {e}")
-                    
-        return excel_files
+                paths.append(filepath)
+        return paths
+
+    def load_excel_file(self, filepath: str):
+        """Excel 파일 1개 로드 (Case List 시트 우선, 빈 시트/실패 시 None)"""
+        filename = os.path.basename(filepath)
+        try:
+            print(f"📄 파일 처리 중: {filename}")
+            
+            # Excel 파일 로드
+            xl_file = pd.ExcelFile(filepath)
+            
+            # Case List 시트 우선 선택
+            sheet_name = xl_file.sheet_names[0]
+            for sheet in xl_file.sheet_names:
+                if 'case' in sheet.lower() and 'list' in sheet.lower():
+                    sheet_name = sheet
+                    break
+            
+            df = pd.read_excel(filepath, sheet_name=sheet_name)
+            
+            if df.empty:
+                return None
+                
+            # 간단한 통계 출력
+            print(f"   📊 {len(df)}행 데이터 로드")
+            
+            case_col = self._find_case_column(df)
+            if case_col:
+                case_count = df[case_col].nunique()
+                print(f"   📦 고유 케이스 {case_count}개")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Excel 파일 로드 실패 {filename}: {e}")
+            return None
     
     def _find_case_column(self, df):
         """케이스 컬럼 찾기"""
@@ -78,11 +101,11 @@ class DataLoader:
                 return col
         return None
 
-    def classify_storage_type(self, location):
+    def classify_storage_type(self, location, diagnostics=None):
         """
         창고/현장 Location명을 Storage Type으로 분류 (통합 매핑 사용)
         """
-        return self.mapping_manager.classify_storage_type(location)
+        return self.mapping_manager.classify_storage_type(location, diagnostics)
 
     def add_storage_type(self, df):
         """
@@ -128,6 +151,9 @@ class DataLoader:
         date_columns = []
         warehouse_locations = self.mapping_manager.get_warehouse_locations() + self.mapping_manager.get_site_locations()
         
+        # 행 단위 이벤트는 출력 없이 수집 → 파일 끝에서 1회 요약
+        diagnostics = DiagnosticsCollector(filename, self.verbosity)
+        
         print(f"🔍 {filename} 파일 분석 중...")
         print(f"   📋 전체 컬럼 수: {len(df.columns)}개")
         
@@ -136,7 +162,7 @@ class DataLoader:
             # 창고명이 포함된 컬럼을 날짜 컬럼으로 인식
             if any(warehouse.lower() in col_str.lower() for warehouse in warehouse_locations):
                 date_columns.append(col)
-                print(f"   📅 날짜 컬럼 발견: {col}")
+                diagnostics.record('date_column', column=col)
         
         print(f"   📊 발견된 날짜 컬럼: {len(date_columns)}개")
         
@@ -177,6 +203,17 @@ class DataLoader:
             qty_col = 'Pkg'  # 기본값
             print(f"   📦 수량 컬럼 기본값 사용: {qty_col}")
         
+        # 날짜 컬럼별 창고 / Storage_Type은 행마다 같으므로 루프 밖에서 1회 분류
+        column_targets = {}
+        unmapped_columns = set()
+        for date_col in date_columns:
+            warehouse = self._extract_warehouse_from_column(date_col)
+            storage_type = self.mapping_manager.match_storage_type(warehouse)
+            if storage_type is None:
+                storage_type = 'Unknown'
+                unmapped_columns.add(date_col)
+            column_targets[date_col] = (warehouse, storage_type)
+        
         print(f"   🔄 트랜잭션 추출 시작...")
         
         for idx, row in df.iterrows():
@@ -188,7 +225,7 @@ class DataLoader:
                 quantity = int(row[qty_col]) if pd.notna(row[qty_col]) else 1
             except (ValueError, TypeError):
                 quantity = 1
-                print(f"   ⚠️ 행 {idx}: 수량 변환 실패, 기본값 1 사용")
+                diagnostics.record('qty_conversion_failed', row=idx, value=row[qty_col])
             
             # 가이드 A안: 각 창고별 날짜 컬럼에서 이벤트 추출
             events_found = 0
@@ -196,10 +233,9 @@ class DataLoader:
                 if pd.notna(row[date_col]):
                     try:
                         event_date = pd.to_datetime(row[date_col])
-                        warehouse = self._extract_warehouse_from_column(date_col)
-                        
-                        # 통합 매핑으로 storage_type 분류
-                        storage_type = self.classify_storage_type(warehouse)
+                        warehouse, storage_type = column_targets[date_col]
+                        if date_col in unmapped_columns:
+                            diagnostics.record('unmapped_location', row=idx, location=warehouse)
                         
                         if warehouse != 'UNKNOWN':
                             # 트랜잭션 데이터 생성 (가이드 A안 방식)
@@ -223,13 +259,14 @@ class DataLoader:
                             events_found += 1
                             
                     except Exception as e:
-                        logger.debug(f"날짜 파싱 실패 {date_col}: {e}")
+                        diagnostics.record('date_parse_failed', row=idx, column=date_col, error=str(e))
                         continue
             
             if events_found == 0:
-                print(f"   ⚠️ 행 {idx}: 이벤트 없음 (케이스: {case_id}, 수량: {quantity})")
+                diagnostics.record('no_events', row=idx, case=case_id, qty=quantity)
         
         print(f"   ✅ {filename}: {len(transactions)}건 트랜잭션 추출 완료")
+        self.diagnostics[filename] = diagnostics.report()
         return transactions
     
     def _find_quantity_column(self, df):
@@ -1,14 +1,10 @@
 import pandas as pd
-import json
 
-# (전역, 파일 상단에서)
-try:
-    with open('mapping_rules_v2.6.json', encoding='utf-8') as f:
-        RULES = json.load(f)
-    WAREHOUSE_CLASS = RULES.get('warehouse_classification', {})
-except Exception as e:
-    print(f"⚠️ 매핑룰 로드 실패: {e}")
-    WAREHOUSE_CLASS = {}
+from core.lazy_loading import LazyMapping, load_mapping_rules, rules_section
+
+# (전역, 첫 조회 시 로드)
+RULES = LazyMapping(load_mapping_rules)
+WAREHOUSE_CLASS = rules_section('warehouse_classification', {})
 
 def normalize_str(val):
     """모든 주요 key(벤더, 스토리지, 현장명 등) 소문자·공백 표준화"""
@@ -0,0 +1,142 @@
+"""
+HVDC 사전 집계 OLAP 큐브
+
+월 × 창고/현장 × 공급사 × 저장유형 × 트랜잭션유형 차원으로 수치 필드를
+한 번만 집계하여 보관하고, 대시보드/PowerBI/엑셀 리포트가 원본 프레임을
+반복 groupby 하지 않고 큐브에서 슬라이스·롤업하도록 합니다.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from core.lazy_loading import module_available
+
+PARQUET_AVAILABLE = module_available('pyarrow')
+
+logger = logging.getLogger(__name__)
+
+CUBE_DIMENSIONS = ['월', 'Location', 'Vendor', 'Storage_Type', 'TxType_Refined']
+CUBE_MEASURES = ['Qty', 'Amount', 'Handling Fee', 'SQM', 'CBM']
+ROW_COUNT_MEASURE = '_rows'
+
+
+class InventoryCube:
+    """월×창고×공급사×저장유형×TxType 사전 집계 큐브"""
+
+    def __init__(self, cells: pd.DataFrame, measures: List[str]):
+        self.cells = cells
+        self.measures = list(measures)
+        self.dimensions = list(CUBE_DIMENSIONS)
+
+    @classmethod
+    def from_transactions(cls, df: pd.DataFrame, measures: Optional[List[str]] = None) -> 'InventoryCube':
+        """
+        트랜잭션 프레임에서 큐브 생성 (런당 1회)
+
+        Args:
+            df: 트랜잭션 DataFrame (Date 또는 월 컬럼 필요)
+            measures: 추가 집계 필드 (기본 측정값에 합쳐짐)
+        """
+        print("🧊 OLAP 큐브 생성 중...")
+
+        wanted = list(dict.fromkeys(CUBE_MEASURES + list(measures or [])))
+        present = [m for m in wanted if m in df.columns]
+
+        base = pd.DataFrame(index=df.index)
+        if '월' in df.columns:
+            base['월'] = df['월']
+        elif 'Date' in df.columns:
+            base['월'] = pd.to_datetime(df['Date'], errors='coerce').dt.strftime('%Y-%m')
+        else:
+            base['월'] = 'UNKNOWN'
+        for dim in CUBE_DIMENSIONS[1:]:
+            base[dim] = df[dim] if dim in df.columns else 'UNKNOWN'
+        for measure in present:
+            base[measure] = pd.to_numeric(df[measure], errors='coerce')
+        base[ROW_COUNT_MEASURE] = 1
+
+        # 결측 차원 값도 하나의 셀로 보존 (롤업 시 원본 groupby와 동일하게 제외됨)
+        cells = base.groupby(CUBE_DIMENSIONS, dropna=False, observed=True, sort=True)[
+            present + [ROW_COUNT_MEASURE]
+        ].sum().reset_index()
+
+        print(f"✅ OLAP 큐브 생성 완료: {len(df):,}행 → {len(cells):,}셀, 측정값 {present}")
+        return cls(cells, present)
+
+    def has_measure(self, measure: str) -> bool:
+        return measure in self.measures
+
+    def total(self, measure: str) -> float:
+        """측정값 전체 합계"""
+        return self.cells[measure].sum()
+
+    def slice(self, **filters) -> 'InventoryCube':
+        """
+        차원 값으로 큐브 슬라이스
+
+        사용 예: cube.slice(TxType_Refined=['TRANSFER_OUT', 'FINAL_OUT'], Location='MIR')
+        """
+        mask = pd.Series(True, index=self.cells.index)
+        for dim, value in filters.items():
+            if dim not in self.dimensions:
+                raise KeyError(f"알 수 없는 차원: {dim}")
+            if isinstance(value, (list, tuple, set)):
+                mask &= self.cells[dim].isin(list(value))
+            else:
+                mask &= self.cells[dim] == value
+        return InventoryCube(self.cells[mask].reset_index(drop=True), self.measures)
+
+    def rollup(self, dims: Union[str, List[str]], measures: Union[str, List[str], None] = None) -> pd.DataFrame:
+        """
+        지정 차원으로 롤업 (원본 groupby(dims)[measures].sum()과 동일한 결과)
+
+        Args:
+            dims: 유지할 차원 (나머지 차원은 합산)
+            measures: 집계할 측정값 (기본: 전체)
+        """
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        if measures is None:
+            measures = self.measures
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        if not dims:
+            return self.cells[measures].sum().to_frame().T
+        return self.cells.groupby(dims, observed=True)[measures].sum().reset_index()
+
+    def count(self, dims: Union[str, List[str]]) -> pd.DataFrame:
+        """차원별 원본 트랜잭션 건수"""
+        return self.rollup(dims, ROW_COUNT_MEASURE).rename(columns={ROW_COUNT_MEASURE: '트랜잭션수'})
+
+    def save(self, path: Union[str, Path]) -> str:
+        """큐브 저장 (Parquet, pyarrow 미설치 시 CSV)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if PARQUET_AVAILABLE:
+            path = path.with_suffix('.parquet')
+            self.cells.to_parquet(path, index=False)
+        else:
+            logger.warning("pyarrow 미설치 - 큐브를 CSV로 저장합니다")
+            path = path.with_suffix('.csv')
+            self.cells.to_csv(path, index=False, encoding='utf-8-sig')
+        print(f"💾 OLAP 큐브 저장: {path}")
+        return str(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'InventoryCube':
+        """저장된 큐브 로드"""
+        path = Path(path)
+        if path.suffix == '.parquet':
+            cells = pd.read_parquet(path)
+        else:
+            cells = pd.read_csv(path, encoding='utf-8-sig')
+        measures = [c for c in cells.columns if c not in CUBE_DIMENSIONS and c != ROW_COUNT_MEASURE]
+        return cls(cells, measures)
+
+    def summary(self) -> Dict:
+        return {
+            'cells': len(self.cells),
+            'rows': int(self.cells[ROW_COUNT_MEASURE].sum()) if ROW_COUNT_MEASURE in self.cells.columns else None,
+            'measures': self.measures,
+        }
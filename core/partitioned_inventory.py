@@ -0,0 +1,173 @@
+"""
+HVDC 월 파티션 단위 재고 계산 (out-of-core)
+
+프로젝트 기간이 길어져 전체 이벤트 이력을 리포트 작업과 함께 메모리에 올리기 어려울 때,
+트랜잭션 로그(artifacts/transaction_log.parquet)의 month 파티션을 한 달씩 읽어 일별 재고를 계산합니다.
+위치별 기말재고는 다음 달 기초재고로 이월되고, 한 달 처리가 끝날 때마다 그 달의
+일별 재고 / 월별 재고 요약을 출력 폴더에 바로 기록합니다. 한 번에 메모리에 올라오는
+트랜잭션은 가장 큰 한 달 분량(재고 계산에 필요한 4개 컬럼)뿐입니다.
+최종 일별 재고는 calculate_daily_inventory와 값·dtype·행 순서까지 같습니다.
+
+    python main.py --partitioned
+"""
+
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.transaction_log import TRANSACTION_LOG_PATH, read_transaction_log
+from core.transactions import DAILY_STOCK_COLUMNS, INVENTORY_FLOWS, SKIP_LOCATIONS, daily_stock_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = "artifacts/partitioned_inventory"
+INVENTORY_COLUMNS = ['Location', 'Date', 'TxType_Refined', 'Qty']
+# 날짜가 없는 행의 month 파티션 (일별 재고 계산에서 제외)
+UNKNOWN_MONTH = 'UNKNOWN'
+
+
+def log_months(log_path: Union[str, Path] = TRANSACTION_LOG_PATH) -> List[str]:
+    """트랜잭션 로그의 month 파티션 목록 (날짜 순, UNKNOWN 제외)"""
+    path = Path(log_path)
+    if not path.exists():
+        raise FileNotFoundError(f"트랜잭션 로그가 없습니다: {path} (파이프라인을 먼저 실행하세요)")
+    months = {p.name.split('=', 1)[1] for p in path.glob('month=*') if p.is_dir()}
+    months.discard(UNKNOWN_MONTH)
+    return sorted(months)
+
+
+class PartitionedInventory:
+    """월 파티션 순차 재고 계산기 (위치별 기말재고 이월)"""
+
+    def __init__(self, log_path: Union[str, Path] = TRANSACTION_LOG_PATH,
+                 output_dir: Optional[Union[str, Path]] = DEFAULT_OUTPUT_DIR):
+        """
+        Args:
+            log_path: 트랜잭션 로그 데이터셋 경로
+            output_dir: 월별 산출물 폴더 (None이면 기록하지 않음)
+        """
+        self.log_path = Path(log_path)
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.balances: Dict[str, float] = {}
+        self.flow_types = set()
+        self.months_done: List[str] = []
+        self.partition_rows: Dict[str, int] = {}
+        self._daily: List[pd.DataFrame] = []
+        self._monthly: List[pd.DataFrame] = []
+
+    @property
+    def peak_partition_rows(self) -> int:
+        """한 번에 메모리에 올린 최대 트랜잭션 수 (가장 큰 월)"""
+        return max(self.partition_rows.values(), default=0)
+
+    def run(self, months: Optional[List[str]] = None) -> pd.DataFrame:
+        """전체 월 순차 처리 → calculate_daily_inventory와 같은 일별 재고"""
+        months = log_months(self.log_path) if months is None else sorted(months)
+        print(f"🗓️ 월 파티션 재고 계산: {len(months)}개월 ({self.log_path})")
+        if self.output_dir is not None and self.output_dir.exists():
+            shutil.rmtree(self.output_dir)
+        for month in months:
+            self.process_month(month)
+        daily_stock = self.daily_stock()
+        print(f"✅ {len(daily_stock)}개 일별 재고 스냅샷 생성 "
+              f"(최대 월 파티션 {self.peak_partition_rows:,}건 / 전체 {sum(self.partition_rows.values()):,}건)")
+        return daily_stock
+
+    def process_month(self, month: str) -> pd.DataFrame:
+        """한 달 파티션 처리 (기초재고 = 직전 월까지의 위치별 기말재고), 월 산출물 기록"""
+        frame = read_transaction_log(self.log_path, columns=INVENTORY_COLUMNS, months=[month],
+                                     decode_categories=True)
+        self.partition_rows[month] = len(frame)
+        daily = self._carry_balances(self._daily_flows(frame))
+        del frame
+
+        monthly = self._monthly_summary(month, daily)
+        self._daily.append(daily)
+        self._monthly.append(monthly)
+        self.months_done.append(month)
+        if self.output_dir is not None:
+            self._write(month, daily, monthly)
+        logger.info("월 파티션 %s: 트랜잭션 %d건 → 일별 재고 %d행", month, self.partition_rows[month], len(daily))
+        return daily
+
+    def _daily_flows(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """위치·일자별 IN/TRANSFER_OUT/FINAL_OUT 합계 (결측 키 행 제외, 위치·일자 정렬)"""
+        frame['Date'] = pd.to_datetime(frame['Date']).dt.date
+        frame = frame.dropna(subset=['Location', 'Date', 'TxType_Refined'])
+        # calculate_daily_inventory 피벗 컬럼 (UNKNOWN 위치 행 포함) → 최종 dtype 결정용
+        self.flow_types.update(frame['TxType_Refined'].unique())
+
+        sums = frame.groupby(['Location', 'Date', 'TxType_Refined'], observed=True)['Qty'].sum().unstack(fill_value=0)
+        sums = sums.reindex(columns=list(INVENTORY_FLOWS), fill_value=0).astype(np.float64)
+        daily = sums.rename(columns=INVENTORY_FLOWS).reset_index()
+        daily.columns.name = None
+        daily = daily[~daily['Location'].isin(SKIP_LOCATIONS)]
+        return daily.sort_values(['Location', 'Date'], kind='stable').reset_index(drop=True)
+
+    def _carry_balances(self, daily: pd.DataFrame) -> pd.DataFrame:
+        """위치별 누적 (기말 = 이월 기초 + 위치별 누적 순입고, 위치 마지막 행 기말을 다음 달 기초로 이월)"""
+        daily['Total_Outbound'] = daily['Transfer_Out'] + daily['Final_Out']
+        locations = daily['Location'].astype(object)
+        carried = locations.map(self.balances).fillna(0).astype(float)
+        net = daily['Inbound'] - daily['Total_Outbound']
+        closing = carried + net.groupby(locations, sort=False).cumsum()
+        daily['Opening_Stock'] = closing.groupby(locations, sort=False).shift(1).fillna(carried)
+        daily['Closing_Stock'] = closing
+        self.balances.update(closing.groupby(locations, sort=False).last().to_dict())
+        return daily[DAILY_STOCK_COLUMNS]
+
+    def _monthly_summary(self, month: str, daily: pd.DataFrame) -> pd.DataFrame:
+        """위치별 월 재고 요약 (거래 없는 위치도 이월 재고로 포함)"""
+        flows = daily.groupby('Location').agg(
+            Opening_Stock=('Opening_Stock', 'first'), Inbound=('Inbound', 'sum'),
+            Transfer_Out=('Transfer_Out', 'sum'), Final_Out=('Final_Out', 'sum'),
+            Total_Outbound=('Total_Outbound', 'sum'), Closing_Stock=('Closing_Stock', 'last'),
+            Active_Days=('Date', 'nunique'))
+        locations = sorted(self.balances)
+        carried = pd.Series(self.balances).reindex(locations)
+        summary = flows.reindex(locations)
+        summary['Opening_Stock'] = summary['Opening_Stock'].fillna(carried)
+        summary['Closing_Stock'] = summary['Closing_Stock'].fillna(carried)
+        summary = summary.fillna(0).astype({'Active_Days': np.int64}).rename_axis('Location').reset_index()
+        summary.insert(0, '월', month)
+        return summary
+
+    def _write(self, month: str, daily: pd.DataFrame, monthly: pd.DataFrame):
+        for name, frame in (('daily_stock', daily), ('monthly_stock', monthly)):
+            path = self.output_dir / name / f"month={month}" / "part-0.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            frame.to_parquet(path, index=False)
+
+    def monthly_stock(self) -> pd.DataFrame:
+        """처리한 월의 위치별 월 재고 요약"""
+        if not self._monthly:
+            return pd.DataFrame()
+        return pd.concat(self._monthly, ignore_index=True)
+
+    def daily_stock(self) -> pd.DataFrame:
+        """월별 일별 재고 결합 → calculate_daily_inventory와 같은 값·dtype (전체 월의 TxType 기준)"""
+        if not self._daily or not sum(len(daily) for daily in self._daily):
+            print("❌ 계산할 트랜잭션이 없습니다")
+            return pd.DataFrame()
+        daily = pd.concat(self._daily, ignore_index=True)
+        daily = daily.sort_values('Location', kind='stable').reset_index(drop=True)
+        return daily_stock_frame({name: daily[name].tolist() if name in ('Location', 'Date') else daily[name].to_numpy()
+                                  for name in daily.columns}, self.flow_types)
+
+
+def calculate_partitioned_inventory(log_path: Union[str, Path] = TRANSACTION_LOG_PATH,
+                                    output_dir: Optional[Union[str, Path]] = DEFAULT_OUTPUT_DIR) -> pd.DataFrame:
+    """트랜잭션 로그 월 파티션 순차 처리 일별 재고 (calculate_daily_inventory와 같은 결과)"""
+    return PartitionedInventory(log_path, output_dir).run()
+
+
+def read_monthly_stock(output_dir: Union[str, Path] = DEFAULT_OUTPUT_DIR) -> pd.DataFrame:
+    """기록된 월별 재고 요약 읽기 (월 순)"""
+    paths = sorted(Path(output_dir).glob('monthly_stock/month=*/*.parquet'))
+    if not paths:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
@@ -0,0 +1,275 @@
+"""
+HVDC 파이프라인 스테이지 DAG 실행기
+
+load → convert → reconcile → dedup → inventory 체인을 선언형 스테이지 그래프로
+정의하고, 각 스테이지 출력을 (입력 해시 + 코드 버전 + 설정) 키로 디스크에 캐시합니다.
+main.py 실행 후 검증 스크립트를 같은 데이터로 돌리면 상위 스테이지 산출물을
+재계산 없이 재사용합니다.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+from contextlib import nullcontext
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+import core.lazy_loading as lazy_loading
+from core.polars_engine import resolve_engine
+from core.profiler import row_count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "artifacts/stage_cache"
+# 캐시 포맷 버전 (피클 구조 변경 시 증가)
+CACHE_FORMAT_VERSION = 1
+
+
+def _hash_bytes(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _code_fingerprint(obj: Union[Callable, ModuleType]) -> bytes:
+    """함수/모듈 소스 해시 (모듈은 파일 전체)"""
+    try:
+        if isinstance(obj, ModuleType):
+            return Path(inspect.getsourcefile(obj)).read_bytes()
+        return inspect.getsource(obj).encode('utf-8')
+    except (OSError, TypeError):
+        return repr(obj).encode('utf-8')
+
+
+def file_fingerprint(paths: Sequence[Union[str, Path]]) -> str:
+    """파일 내용 해시 (경로명 + 바이트, 정렬 순서)"""
+    digest = hashlib.sha256()
+    for path in sorted(str(p) for p in paths):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def excel_sources_fingerprint(src: Union[str, Path]) -> str:
+    """원본 Excel 폴더 내용 해시"""
+    paths = sorted(Path(src).glob('*.xlsx')) if Path(src).is_dir() else []
+    return file_fingerprint(paths)
+
+
+def mapping_rules_fingerprint() -> str:
+    """매핑 규칙 파일 해시 (로딩 날짜 컬럼 선택 / Storage_Type 분류가 규칙에 의존, 파일이 없으면 빈 목록 해시)"""
+    path = lazy_loading.MAPPING_RULES_FILE
+    return file_fingerprint([path] if os.path.exists(path) else [])
+
+
+class Stage:
+    """파이프라인 스테이지 정의"""
+
+    def __init__(self, name: str, func: Callable, inputs: Sequence[str] = (),
+                 code: Sequence[Union[Callable, ModuleType]] = (), config: Optional[Dict] = None,
+                 fingerprint: Optional[Callable[[], str]] = None):
+        """
+        Args:
+            name: 스테이지 이름
+            func: func(*상위 스테이지 출력, **config) 형태의 실행 함수
+            inputs: 상위 스테이지 이름 (func 위치 인자 순서)
+            code: 코드 버전에 포함할 함수/모듈 (func 자체는 항상 포함)
+            config: 스테이지 설정 (키워드 인자로 전달, 캐시 키에 포함)
+            fingerprint: 외부 입력(원본 파일 등) 해시 함수
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.code = list(code)
+        self.config = dict(config or {})
+        self.fingerprint = fingerprint
+
+    def code_version(self) -> str:
+        return _hash_bytes(*[_code_fingerprint(obj) for obj in [self.func] + self.code])
+
+
+class StageGraph:
+    """스테이지 DAG + 내용 주소 기반 산출물 캐시"""
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, use_cache: bool = True,
+                 profiler=None):
+        """
+        Args:
+            cache_dir: 산출물 캐시 폴더
+            use_cache: 캐시 사용 여부
+            profiler: core.profiler.StageProfiler (지정 시 스테이지별 성능 측정)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self.profiler = profiler
+        self.stages: Dict[str, Stage] = {}
+        self.last_run: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        self._results: Dict[str, Any] = {}
+
+    def add_stage(self, name: str, func: Callable, inputs: Sequence[str] = (), **kwargs) -> Stage:
+        """스테이지 등록 (상위 스테이지는 먼저 등록되어 있어야 함)"""
+        missing = [dep for dep in inputs if dep not in self.stages]
+        if missing:
+            raise KeyError(f"등록되지 않은 상위 스테이지: {missing}")
+        stage = Stage(name, func, inputs, **kwargs)
+        self.stages[name] = stage
+        self._invalidate()
+        return stage
+
+    def _invalidate(self):
+        self._keys.clear()
+        self._results.clear()
+
+    def release(self):
+        """메모리에 보관한 스테이지 결과 해제 (디스크 캐시는 유지)"""
+        self._results.clear()
+
+    def stage_key(self, name: str) -> str:
+        """스테이지 캐시 키 (상위 키 + 코드 버전 + 설정 + 외부 입력 해시)"""
+        if name not in self._keys:
+            stage = self.stages[name]
+            parts = [
+                f"format={CACHE_FORMAT_VERSION}".encode('utf-8'),
+                name.encode('utf-8'),
+                stage.code_version().encode('utf-8'),
+                json.dumps(stage.config, sort_keys=True, default=str).encode('utf-8'),
+            ]
+            parts += [self.stage_key(dep).encode('utf-8') for dep in stage.inputs]
+            if stage.fingerprint is not None:
+                parts.append(stage.fingerprint().encode('utf-8'))
+            self._keys[name] = _hash_bytes(*parts)
+        return self._keys[name]
+
+    def artifact_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}-{self.stage_key(name)[:24]}.pkl"
+
+    def run(self, target: str) -> Any:
+        """대상 스테이지까지 실행 (캐시 적중 스테이지는 디스크에서 로드)"""
+        if target in self._results:
+            return self._fresh(self._results[target])
+
+        stage = self.stages[target]
+        path = self.artifact_path(target)
+
+        if self.use_cache and path.exists():
+            with self._measure(target, 'hit') as record:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                record['rows_out'] = row_count(result)
+            self.last_run[target] = 'hit'
+            print(f"♻️ 스테이지 캐시 재사용: {target} ({path.name})")
+        else:
+            args = [self.run(dep) for dep in stage.inputs]
+            print(f"⚙️ 스테이지 실행: {target}")
+            with self._measure(target, 'miss', rows_in=row_count(args[0]) if args else None) as record:
+                result = stage.func(*args, **stage.config)
+                record['rows_out'] = row_count(result)
+            self.last_run[target] = 'miss'
+            if self.use_cache:
+                self._store(path, result)
+
+        self._results[target] = result
+        return self._fresh(result)
+
+    def _measure(self, target: str, cache: str, rows_in: Optional[int] = None):
+        """프로파일러가 있으면 스테이지 측정 컨텍스트, 없으면 빈 컨텍스트"""
+        if self.profiler is None:
+            return nullcontext({})
+        return self.profiler.stage(target, rows_in=rows_in, cache=cache)
+
+    def _store(self, path: Path, result: Any):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _fresh(result: Any) -> Any:
+        """하위 스테이지가 공유 산출물을 변경하지 않도록 DataFrame은 복사본 전달"""
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+
+    def clear_cache(self) -> int:
+        """캐시 파일 전체 삭제"""
+        removed = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink()
+                removed += 1
+        self._invalidate()
+        return removed
+
+
+def build_transaction_graph(src: Union[str, Path] = "data", cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                            use_cache: bool = True, profiler=None, engine: str = 'pandas') -> StageGraph:
+    """
+    HVDC 표준 트랜잭션 스테이지 그래프
+
+    load(원시 트랜잭션) → convert(표준 DataFrame) → reconcile(TRANSFER 짝 보정)
+    → dedup(중복 제거) → inventory(일별 재고)
+
+    load/convert 캐시 키에는 매핑 규칙 파일 해시와 스테이지 함수가 호출하는 모듈 소스가 포함됩니다.
+
+    engine='polars'이면 reconcile/dedup/inventory를 lazy_stages 스테이지의 Polars 쿼리 계획
+    1회 실행으로 계산하고 각 스테이지는 그 결과를 꺼내 씁니다 (pandas 경로와 같은 결과).
+    """
+    import core.deduplication as deduplication
+    import core.diagnostics as diagnostics
+    import core.dtypes as dtypes
+    import core.loader as loader_module
+    import core.mapping_utils as core_mapping_utils
+    import core.transactions as transactions
+    import mapping_utils
+
+    graph = StageGraph(cache_dir=cache_dir, use_cache=use_cache, profiler=profiler)
+    graph.add_stage('load', _load_raw_transactions, config={'src': str(src)},
+                    code=[loader_module, mapping_utils, diagnostics, lazy_loading],
+                    fingerprint=lambda: excel_sources_fingerprint(src) + mapping_rules_fingerprint())
+    graph.add_stage('convert', transactions.prepare_transaction_frame, inputs=['load'],
+                    code=[transactions, dtypes, core_mapping_utils, mapping_utils, diagnostics, lazy_loading],
+                    fingerprint=mapping_rules_fingerprint)
+    if resolve_engine(engine) == 'polars':
+        import core.polars_engine as polars_engine
+
+        graph.add_stage('lazy_stages', polars_engine.run_lazy_stages, inputs=['convert'],
+                        code=[polars_engine, dtypes])
+        for name in ['reconcile', 'dedup', 'inventory']:
+            graph.add_stage(name, _select_output, inputs=['lazy_stages'], config={'name': name})
+        return graph
+    graph.add_stage('reconcile', deduplication.reconcile_orphan_transfers, inputs=['convert'],
+                    code=[deduplication, dtypes])
+    graph.add_stage('dedup', deduplication.drop_duplicate_transfers, inputs=['reconcile'],
+                    code=[deduplication, dtypes])
+    graph.add_stage('inventory', transactions.calculate_daily_inventory, inputs=['dedup'],
+                    code=[transactions])
+    return graph
+
+
+def _select_output(outputs: Dict[str, Any], name: str) -> Any:
+    """여러 스테이지 산출물을 한 번에 만드는 스테이지 결과에서 하나 선택"""
+    return outputs[name]
+
+
+def _load_raw_transactions(src: str) -> List[Dict]:
+    """원본 Excel 폴더 → DataLoader 원시 트랜잭션"""
+    from core.loader import DataLoader
+
+    loader = DataLoader()
+    excel_files = loader.load_excel_files(src)
+    if not excel_files:
+        print("❌ 로딩할 Excel 파일이 없습니다!")
+        return []
+    raw_transactions = loader.extract_transactions(excel_files)
+    print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
+    return raw_transactions
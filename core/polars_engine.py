@@ -0,0 +1,259 @@
+"""
+HVDC 트랜잭션 스테이지 Polars 지연(lazy) 엔진
+
+convert 산출물(dtype 정책 적용 프레임)에서 TRANSFER 짝 보정 → 중복 제거 → 일별 재고를
+하나의 Polars LazyFrame 쿼리 계획으로 표현하고 collect_all 1회로 실행합니다.
+스테이지 사이에 pandas 복사본(df.copy / pd.concat / reset_index)을 만들지 않고,
+재고 계산은 필요한 컬럼만 읽는 projection/predicate pushdown과 멀티스레드 실행을 사용합니다.
+결과는 회귀 비교를 위해 pandas 경로(core.deduplication / core.transactions)와
+값·dtype·행 순서까지 같은 pandas DataFrame으로 돌려줍니다.
+
+    python main.py --engine polars
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.dtypes import (CASE_COLUMNS, CATEGORICAL_COLUMNS, MAX_CATEGORY_RATIO, TX_TYPE_COLUMNS,
+                         apply_dtype_policy, has_dtype_policy, restore_dtype_policy)
+from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
+from core.lazy_loading import lazy_module, module_available
+from core.transactions import INVENTORY_FLOWS, SKIP_LOCATIONS, calculate_daily_inventory, daily_stock_frame
+
+logger = logging.getLogger(__name__)
+
+POLARS_AVAILABLE = module_available('polars')
+pl = lazy_module('polars')
+
+TRANSACTION_ENGINES = ('pandas', 'polars')
+DEFAULT_ENGINE = 'pandas'
+FIX_LABELS = {'TRANSFER_OUT': 'AUTO_FIX_IN_TO_OUT', 'TRANSFER_IN': 'AUTO_FIX_OUT_TO_IN'}
+_ROW = '__row'
+
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """트랜잭션 엔진 이름 검증 (polars 미설치 시 ImportError)"""
+    engine = engine or DEFAULT_ENGINE
+    if engine not in TRANSACTION_ENGINES:
+        raise ValueError(f"지원하지 않는 엔진: {engine} ({'/'.join(TRANSACTION_ENGINES)})")
+    if engine == 'polars' and not POLARS_AVAILABLE:
+        raise ImportError("polars 엔진에는 polars가 필요합니다 (pip install polars)")
+    return engine
+
+
+def _tx_column(columns) -> Optional[str]:
+    return next((c for c in TX_TYPE_COLUMNS if c in columns), None)
+
+
+def _is_transfer(tx_col: str):
+    """contains_mask(..., 'TRANSFER') 동등 (대소문자 무시, 결측은 False)"""
+    return pl.col(tx_col).str.to_lowercase().str.contains('transfer', literal=True).fill_null(False)
+
+
+def _to_polars(df: pd.DataFrame):
+    """pandas 트랜잭션 프레임 → 문자열 컬럼 Polars 프레임 (+ 원래 행 순서)"""
+    frame = pl.from_pandas(df.reset_index(drop=True))
+    strings = [name for name, dtype in frame.schema.items() if dtype == pl.Categorical or dtype == pl.Enum]
+    return frame.with_columns(pl.col(strings).cast(pl.String)).with_row_index(_ROW)
+
+
+def reconcile_plan(lf, tx_col: str, columns: List[str]):
+    """
+    reconcile_orphan_transfers 쿼리 계획
+
+    TRANSFER 행을 (Case_No, Location, Target_Warehouse)로 집계해 IN만/OUT만 있는 키에
+    반대 방향 보정 행을 만들고 원본 뒤에 붙입니다 (IN→OUT 보정, OUT→IN 보정 순, 키 정렬).
+    보정일은 케이스의 첫 유효 Date입니다.
+    """
+    lf = lf.with_columns(
+        pl.col('Location').fill_null('UNKNOWN'),
+        pl.col('Target_Warehouse').fill_null('UNKNOWN'),
+        pl.col('Qty').cast(pl.Float64, strict=False).fill_null(1).cast(pl.Int64),
+    )
+    keys = ['Case_No', 'Location', 'Target_Warehouse']
+    pairs = (lf.filter(_is_transfer(tx_col) & pl.col('Case_No').is_not_null())
+               .group_by(keys)
+               .agg(pl.col('Qty').filter(pl.col(tx_col) == 'TRANSFER_IN').sum().alias('in_qty'),
+                    pl.col('Qty').filter(pl.col(tx_col) == 'TRANSFER_OUT').sum().alias('out_qty')))
+    first_dates = (lf.filter(pl.col('Date').is_not_null())
+                     .group_by('Case_No')
+                     .agg(pl.col('Date').sort_by(_ROW).first().alias('fix_date')))
+    fallback = pl.lit(datetime.now()).cast(lf.collect_schema()['Date'])
+
+    fixes = []
+    for part, (fix_type, qty, other, location, target) in enumerate([
+            ('TRANSFER_OUT', 'in_qty', 'out_qty', 'Location', 'Target_Warehouse'),
+            ('TRANSFER_IN', 'out_qty', 'in_qty', 'Target_Warehouse', 'Location')], start=1):
+        orphan = (pl.col(qty) > 0) & (pl.col(other) == 0)
+        values = {
+            'Case_No': pl.col('Case_No'),
+            'Date': pl.col('fix_date').fill_null(fallback),
+            'Qty': pl.col(qty),
+            tx_col: pl.lit(fix_type),
+            'Location': pl.col(location),
+            'Target_Warehouse': pl.col(target),
+            'Loc_From': pl.col('Location'),
+            'Source_File': pl.lit(FIX_LABELS[fix_type]),
+            'Site': pl.lit('AUTO_FIX'),
+        }
+        fixes.append(pairs.filter(orphan)
+                          .sort(keys)
+                          .join(first_dates, on='Case_No', how='left', maintain_order='left')
+                          .select([values.get(name, pl.lit(None)).alias(name) for name in columns])
+                          .with_columns(pl.lit(part).alias('__part')))
+    base = lf.drop(_ROW).with_columns(pl.lit(0).alias('__part'))
+    schema = base.collect_schema()
+    fixes = [fix.cast({name: dtype for name, dtype in schema.items()}) for fix in fixes]
+    return pl.concat([base] + fixes, how='vertical')
+
+
+def dedup_plan(lf, tx_col: str):
+    """drop_duplicate_transfers 쿼리 계획 (비TRANSFER 행 → 첫 등장 기준 중복 제거한 TRANSFER 행)"""
+    transfer = _is_transfer(tx_col)
+    lf = lf.with_columns(
+        pl.when(transfer).then(pl.col('Target_Warehouse').fill_null('UNKNOWN'))
+          .otherwise(pl.col('Target_Warehouse')).alias('Target_Warehouse'))
+    dedup_columns = ['Case_No', 'Qty', 'Location', 'Target_Warehouse', tx_col]
+    return pl.concat([lf.filter(~transfer),
+                      lf.filter(transfer).unique(subset=dedup_columns, keep='first', maintain_order=True)])
+
+
+def daily_inventory_plan(lf, tx_col: str):
+    """
+    calculate_daily_inventory 쿼리 계획 (Location, Date별 IN/TRANSFER_OUT/FINAL_OUT 합계 → 누적 재고)
+
+    Location/Date/TxType/Qty 4개 컬럼만 읽고 (projection pushdown) 결측 키 행은 집계 전에 제외합니다.
+    """
+    daily = (lf.select('Location', pl.col('Date').dt.date(), tx_col, 'Qty')
+               .drop_nulls(['Location', 'Date', tx_col])
+               .group_by(['Location', 'Date'])
+               .agg([pl.col('Qty').filter(pl.col(tx_col) == tx).sum().cast(pl.Float64).alias(column)
+                     for tx, column in INVENTORY_FLOWS.items()])
+               .filter(~pl.col('Location').is_in(SKIP_LOCATIONS))
+               .sort(['Location', 'Date']))
+    total = pl.col('Transfer_Out') + pl.col('Final_Out')
+    closing = (pl.col('Inbound') - total).cum_sum().over('Location')
+    return (daily.with_columns(total.alias('Total_Outbound'), closing.alias('Closing_Stock'))
+                 .with_columns(pl.col('Closing_Stock').shift(1, fill_value=0.0).over('Location')
+                               .alias('Opening_Stock')))
+
+
+def _flow_types(lf, tx_col: str):
+    """피벗 컬럼으로 나타나는 TxType (일별 재고 컬럼 dtype 결정용)"""
+    return lf.drop_nulls(['Location', 'Date', tx_col]).select(pl.col(tx_col).unique())
+
+
+def _pandas_inventory(daily, flow_types) -> pd.DataFrame:
+    """
+    Polars 일별 재고 → calculate_daily_inventory와 같은 pandas 프레임 (dtype 규칙은 daily_stock_frame)
+
+    누적 합계는 정수값 float 덧셈이라 순차 계산과 비트 단위로 같습니다.
+    """
+    return daily_stock_frame({name: daily[name].to_list() if name in ('Location', 'Date') else daily[name].to_numpy()
+                              for name in daily.columns}, flow_types)
+
+
+def _cast_like(frame, dtypes: pd.Series) -> pd.DataFrame:
+    """Polars 결과 → pandas (카테고리 컬럼은 지정 카테고리로)"""
+    result = frame.to_pandas()
+    for name, dtype in dtypes.items():
+        values = result[name]
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == object:
+            values = values.astype(object).where(values.notnull(), None)
+        result[name] = values.astype(dtype)
+    return result
+
+
+def _policy_dtypes(frame, fixed, source: pd.DataFrame) -> pd.Series:
+    """
+    보정 행이 붙은 결과의 dtype (pd.concat으로 풀린 카테고리 컬럼에 dtype 정책을 다시 적용한 결과)
+
+    카테고리는 결과 값의 정렬 목록입니다. 고유값 비율이 MAX_CATEGORY_RATIO를 넘는 컬럼은
+    pd.concat 결과 그대로 (보정 행에 문자열이 있으면 문자열 dtype, 모두 결측이면 object) 남습니다.
+    """
+    dtypes = source.dtypes.copy()
+    for name in dtypes.index:
+        dtype = source[name].dtype
+        is_text = isinstance(dtype, pd.CategoricalDtype) or dtype == object or pd.api.types.is_string_dtype(dtype)
+        if not is_text or name not in TX_TYPE_COLUMNS + CASE_COLUMNS + CATEGORICAL_COLUMNS:
+            continue
+        values = sorted(frame[name].drop_nulls().unique().to_list())
+        if name in TX_TYPE_COLUMNS:
+            dtypes[name] = apply_dtype_policy(pd.DataFrame({name: pd.Series(values, dtype=object)}),
+                                              report=False)[name].dtype
+        elif name in CATEGORICAL_COLUMNS and frame.height and len(values) > frame.height * MAX_CATEGORY_RATIO:
+            dtypes[name] = pd.Series(['']).dtype if fixed[name].null_count() < fixed.height else np.dtype(object)
+        else:
+            dtypes[name] = pd.Series(values, dtype=object).astype(str).astype('category').dtype
+    return dtypes
+
+
+def _with_unknown(dtypes: pd.Series, columns: List[str]) -> pd.Series:
+    """fill_missing(..., 'UNKNOWN')가 카테고리 끝에 추가하는 'UNKNOWN' 반영"""
+    dtypes = dtypes.copy()
+    for name in columns:
+        dtype = dtypes[name]
+        if isinstance(dtype, pd.CategoricalDtype) and 'UNKNOWN' not in dtype.categories:
+            dtypes[name] = pd.CategoricalDtype(dtype.categories.append(pd.Index(['UNKNOWN'], dtype=dtype.categories.dtype)),
+                                               ordered=dtype.ordered)
+    return dtypes
+
+
+def run_lazy_stages(transaction_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    reconcile → dedup → inventory를 한 쿼리 계획으로 실행 (collect_all 1회, 공통 하위 계획 공유)
+
+    Returns:
+        {'reconcile': 보정 결과, 'dedup': 중복 제거 결과, 'inventory': 일별 재고}
+        (각각 reconcile_orphan_transfers / drop_duplicate_transfers / calculate_daily_inventory와 동일)
+    """
+    tx_col = _tx_column(transaction_df.columns)
+    required = {'Case_No', 'Date', 'Qty', 'Location', 'Target_Warehouse'}
+    if tx_col is None or transaction_df.empty or not required.issubset(transaction_df.columns):
+        # 빈 프레임/필수 컬럼 누락은 pandas 구현의 예외 처리 경로를 그대로 사용
+        reconcile_df = reconcile_orphan_transfers(transaction_df.copy())
+        dedup_df = drop_duplicate_transfers(reconcile_df.copy())
+        return {'reconcile': reconcile_df, 'dedup': dedup_df,
+                'inventory': calculate_daily_inventory(dedup_df.copy())}
+    if not has_dtype_policy(transaction_df):
+        transaction_df = apply_dtype_policy(transaction_df, report=False)
+    source = transaction_df
+
+    lf = _to_polars(source).lazy()
+    columns = list(source.columns)
+    reconciled = reconcile_plan(lf, tx_col, columns)
+    deduped = dedup_plan(reconciled.drop('__part'), tx_col)
+    inventory = daily_inventory_plan(deduped, tx_col)
+    reconciled, deduped, inventory, flow_types, has_transfer = pl.collect_all([
+        reconciled, deduped, inventory, _flow_types(deduped, tx_col),
+        lf.select(_is_transfer(tx_col).any()),
+    ])
+    fixed = reconciled.filter(pl.col('__part') > 0)
+    reconciled = reconciled.drop('__part')
+    has_transfer = bool(has_transfer.item())
+    if fixed.height:
+        print(f"🛠️ AUTO-FIX 추가: IN→OUT {fixed.filter(pl.col('__part') == 1).height}건 / "
+              f"OUT→IN {fixed.filter(pl.col('__part') == 2).height}건")
+        recon_dtypes = _policy_dtypes(reconciled, fixed, source)
+    else:
+        recon_dtypes = _with_unknown(source.dtypes, ['Location', 'Target_Warehouse'])
+    recon_dtypes['Qty'] = apply_dtype_policy(pd.DataFrame({'Qty': reconciled['Qty'].to_numpy()}), report=False)['Qty'].dtype
+    reconcile_df = _cast_like(reconciled, recon_dtypes)
+
+    if has_transfer:
+        dedup_df = restore_dtype_policy(_cast_like(deduped, _with_unknown(recon_dtypes, ['Target_Warehouse'])),
+                                        reconcile_df)
+        removed = len(reconcile_df) - len(dedup_df)
+        if removed > 0:
+            logger.info(f"🗑️ TRANSFER 중복 제거: {removed}건 제거")
+    else:
+        dedup_df = reconcile_df.copy()
+
+    print("📊 일별 재고 계산 중... (polars)")
+    daily_stock = _pandas_inventory(inventory, flow_types[tx_col].to_list())
+    print(f"✅ {len(daily_stock)}개 일별 재고 스냅샷 생성")
+    return {'reconcile': reconcile_df, 'dedup': dedup_df, 'inventory': daily_stock}
@@ -0,0 +1,514 @@
+"""
+HVDC 스테이지 성능 프로파일러
+
+로딩 → 변환 → TRANSFER 보정 → 중복 제거 → 재고 → 리포트 → RDF 각 스테이지의
+벽시계 시간, CPU 시간, 스테이지 피크 RSS/RSS 증감, tracemalloc 상위 할당, 입출력 행 수를 측정하고
+실행마다 JSON 프로파일(artifacts/profiles)을 남깁니다.
+릴리스 간 비교는 diff_profiles로 스테이지별 증감 비율을 계산합니다.
+
+profile_mode('cpu' / 'mem' / 'both')를 지정하면 스테이지마다 cProfile + 스택 샘플링,
+tracemalloc 스냅샷을 추가로 수집하여 flamegraph용 collapsed-stack 파일과
+상위 핫스팟 요약(write_profile_reports)을 리포트 옆에 남깁니다.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from core.logger import log_performance_metric, log_transaction_processing
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "artifacts/profiles"
+PROFILE_SCHEMA_VERSION = 1
+# 스테이지 지표 (process_peak_rss_mb는 프로세스 누적 최고치라 스테이지 비교에서 제외)
+STAGE_METRICS = ['wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'rss_delta_mb', 'traced_peak_mb']
+DEFAULT_TOP_ALLOCATIONS = 5
+PROFILE_MODES = ('cpu', 'mem', 'both')
+DEFAULT_HOT_FUNCTIONS = 25
+STAGE_HOT_FUNCTIONS = 5
+SAMPLE_INTERVAL = 0.005
+# tracemalloc 프레임 수 - 프레임이 늘수록 추적 비용이 급증 (로더 기준 1프레임 ~7배, 8프레임 ~35배)
+DEFAULT_TRACE_FRAMES = 1
+# Linux 피크 RSS(VmHWM) 조회/리셋 경로 - 리셋은 커널 4.0+ ('5' 기록)
+PROC_STATUS = "/proc/self/status"
+PROC_STATM = "/proc/self/statm"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _process_peak_rss_mb() -> Optional[float]:
+    """프로세스 누적 피크 RSS (MB, ru_maxrss) - resource 없으면 psutil 현재 RSS"""
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 byte 단위
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+
+def _current_rss_mb() -> Optional[float]:
+    """현재 RSS (MB) - psutil 우선, 없으면 /proc/self/statm (둘 다 없으면 None)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open(PROC_STATM, 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _rss_high_water_mb() -> Optional[float]:
+    """마지막 리셋 이후 피크 RSS (MB, /proc/self/status VmHWM)"""
+    try:
+        with open(PROC_STATUS, 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_rss_high_water() -> bool:
+    """피크 RSS(VmHWM)를 현재 RSS로 리셋 (지원하지 않으면 False)"""
+    try:
+        with open(PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def row_count(value: Any) -> Optional[int]:
+    """스테이지 입출력 행 수 (DataFrame/리스트/딕셔너리 외에는 None)"""
+    if isinstance(value, (pd.DataFrame, pd.Series, list, tuple, dict)):
+        return len(value)
+    return None
+
+
+def _function_label(key) -> str:
+    """pstats 키 (파일, 줄, 함수) → 'func (file.py:줄)'"""
+    filename, lineno, funcname = key
+    if filename == '~':  # 내장 함수
+        return funcname
+    return f"{funcname} ({Path(filename).name}:{lineno})"
+
+
+def hot_functions(stats: 'pstats.Stats', limit: int = DEFAULT_HOT_FUNCTIONS,
+                  sort: str = 'tottime') -> List[Dict[str, Any]]:
+    """cProfile 통계 상위 함수 (tottime: 자체 시간 / cumtime: 누적 시간 기준)"""
+    index = 2 if sort == 'tottime' else 3
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)
+    return [{
+        'function': _function_label(key),
+        'calls': nc,
+        'tottime': round(tt, 4),
+        'cumtime': round(ct, 4),
+    } for key, (cc, nc, tt, ct, callers) in entries[:limit]]
+
+
+class StackSampler:
+    """대상 스레드 호출 스택을 주기적으로 샘플링하여 collapsed-stack 형태로 집계"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.counts: Counter = Counter()
+        self._label = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, label: str):
+        self._label = label
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hvdc-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.counts[';'.join([self._label] + frames[::-1])] += 1
+
+
+class StageProfiler:
+    """스테이지별 성능 측정 + JSON 프로파일 작성"""
+
+    def __init__(self, run_name: str = "main", trace_memory: bool = False,
+                 top_allocations: int = DEFAULT_TOP_ALLOCATIONS, profile_mode: Optional[str] = None,
+                 sample_interval: float = SAMPLE_INTERVAL, trace_frames: int = DEFAULT_TRACE_FRAMES):
+        """
+        Args:
+            run_name: 실행 이름 (프로파일 파일명 접두사)
+            trace_memory: tracemalloc 할당 추적 여부 (추적 중에는 실행이 느려짐)
+            top_allocations: 스테이지별 기록할 상위 할당 위치 수
+            profile_mode: 'cpu'(cProfile + 스택 샘플링) / 'mem'(tracemalloc 스냅샷) / 'both' / None
+            sample_interval: 스택 샘플링 주기 (초)
+            trace_frames: tracemalloc 할당 스택 프레임 수 (mem 모드 collapsed-stack 깊이)
+        """
+        if profile_mode is not None and profile_mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일 모드: {profile_mode} ({'/'.join(PROFILE_MODES)})")
+        self.run_name = run_name
+        self.profile_mode = profile_mode
+        self.profile_cpu = profile_mode in ('cpu', 'both')
+        self.profile_memory = profile_mode in ('mem', 'both')
+        self.trace_memory = trace_memory or self.profile_memory
+        self.top_allocations = top_allocations
+        self.trace_frames = trace_frames
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._started_tracing = False
+        self._depth = 0
+        self._cpu_stats: Optional[pstats.Stats] = None
+        self._sampler = StackSampler(sample_interval) if self.profile_cpu else None
+        self._memory_stacks: Counter = Counter()
+        # 열린 스테이지별 피크 RSS (VmHWM 리셋 전에 읽은 값 누적), 리셋 지원 여부는 첫 스테이지에서 결정
+        self._rss_peaks: List[float] = []
+        self._rss_reset: Optional[bool] = None
+        self._process_peak_mb: Optional[float] = None
+
+    def __enter__(self) -> 'StageProfiler':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """이 프로파일러가 시작한 tracemalloc 추적 종료"""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    def _ensure_tracing(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None, **extra):
+        """
+        스테이지 측정 컨텍스트
+
+        yield된 레코드에 rows_out 등 추가 항목을 기록할 수 있습니다.
+        peak_rss_mb는 스테이지 구간의 피크 RSS(Linux VmHWM 리셋, 미지원 플랫폼은 None),
+        rss_delta_mb는 종료/시작 RSS 차이, process_peak_rss_mb는 종료 시점 프로세스 누적 피크입니다.
+        """
+        record: Dict[str, Any] = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+        record.update(extra)
+
+        self._ensure_tracing()
+        snapshot = None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        # 중첩 스테이지는 바깥 스테이지의 CPU 프로파일에 포함
+        cpu_profile = None
+        if self.profile_cpu and self._depth == 0:
+            cpu_profile = cProfile.Profile()
+            self._sampler.start(name)
+            cpu_profile.enable()
+        rss_start = _current_rss_mb()
+        tracks_peak = self._begin_rss_peak()
+        self._depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        status = 'ok'
+        try:
+            yield record
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            record['wall_seconds'] = round(time.perf_counter() - wall_start, 4)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+            self._depth -= 1
+            if cpu_profile is not None:
+                cpu_profile.disable()
+                self._sampler.stop()
+            peak = self._end_rss_peak() if tracks_peak else None
+            rss_end = _current_rss_mb()
+            process_peak = self._process_peak_rss()
+            record['peak_rss_mb'] = round(peak, 2) if peak is not None else None
+            record['rss_delta_mb'] = (round(rss_end - rss_start, 2)
+                                      if rss_start is not None and rss_end is not None else None)
+            record['process_peak_rss_mb'] = round(process_peak, 2) if process_peak is not None else None
+            if snapshot is not None:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                record['traced_peak_mb'] = round(traced_peak / (1024 * 1024), 3)
+                record['top_allocations'] = self._top_allocations(snapshot, name)
+            if cpu_profile is not None:
+                record['hot_functions'] = self._collect_cpu(cpu_profile)
+            record['status'] = status
+            self.stages.append(record)
+            self._log(record)
+
+    def _begin_rss_peak(self) -> bool:
+        """스테이지 시작: 지금까지의 피크를 열린 스테이지에 반영한 뒤 VmHWM 리셋"""
+        if self._rss_reset is False:
+            return False
+        high_water = _rss_high_water_mb()
+        if high_water is None:
+            self._rss_reset = False
+            return False
+        self._fold_rss_peak(high_water)
+        if self._rss_reset is None:
+            self._rss_reset = _reset_rss_high_water()
+        elif not _reset_rss_high_water():
+            self._rss_reset = False
+        if not self._rss_reset:
+            return False
+        self._rss_peaks.append(0.0)
+        return True
+
+    def _end_rss_peak(self) -> Optional[float]:
+        """스테이지 종료: 시작 이후 피크 RSS (중첩 스테이지 구간 포함)"""
+        high_water = _rss_high_water_mb()
+        peak = self._rss_peaks.pop()
+        if high_water is None:
+            return None
+        self._fold_rss_peak(high_water)
+        return max(peak, high_water)
+
+    def _fold_rss_peak(self, high_water: float):
+        """리셋 전 VmHWM 값을 열린 스테이지/프로세스 피크에 반영"""
+        self._rss_peaks = [max(peak, high_water) for peak in self._rss_peaks]
+        self._process_peak_mb = max(self._process_peak_mb or 0.0, high_water)
+
+    def _process_peak_rss(self) -> Optional[float]:
+        """프로세스 누적 피크 RSS (VmHWM 리셋으로 줄어든 ru_maxrss는 추적한 최고치로 보정)"""
+        values = [v for v in (_process_peak_rss_mb(), self._process_peak_mb, _rss_high_water_mb()) if v is not None]
+        return max(values) if values else None
+
+    def track(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """func(*args, **kwargs)를 스테이지로 측정 (첫 인자/결과에서 행 수 자동 기록)"""
+        with self.stage(name, rows_in=row_count(args[0]) if args else None) as record:
+            result = func(*args, **kwargs)
+            record['rows_out'] = row_count(result)
+        return result
+
+    def _collect_cpu(self, cpu_profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        """스테이지 cProfile 결과를 실행 전체 통계에 합산하고 스테이지 상위 함수 반환"""
+        stats = pstats.Stats(cpu_profile, stream=io.StringIO())
+        if self._cpu_stats is None:
+            self._cpu_stats = pstats.Stats(cpu_profile, stream=io.StringIO())
+        else:
+            self._cpu_stats.add(cpu_profile)
+        return hot_functions(stats, STAGE_HOT_FUNCTIONS)
+
+    def _top_allocations(self, before: 'tracemalloc.Snapshot', stage: str = '') -> List[Dict[str, Any]]:
+        """스테이지 전후 스냅샷 차이 기준 상위 증가 할당 위치 (tracemalloc/프로파일러 자체 할당 제외)"""
+        filters = [tracemalloc.Filter(False, module_file)
+                   for module_file in (tracemalloc.__file__, cProfile.__file__, threading.__file__, __file__)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        before = before.filter_traces(filters)
+        stats = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff > 0]
+        if self.profile_memory:
+            # 호출 스택별 증가 바이트 → 메모리 flamegraph (KB 단위 가중치, 1프레임이면 lineno 결과 재사용)
+            stacks = stats if self.trace_frames == 1 else after.compare_to(before, 'traceback')
+            for stat in stacks:
+                if stat.size_diff >= 1024:
+                    frames = [f"{Path(frame.filename).name}:{frame.lineno}" for frame in stat.traceback]
+                    self._memory_stacks[';'.join([stage] + frames)] += stat.size_diff // 1024
+        stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+        top = []
+        for stat in stats[:self.top_allocations]:
+            frame = stat.traceback[0]
+            top.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_diff_kb': round(stat.size_diff / 1024, 1),
+                'count_diff': stat.count_diff,
+            })
+        return top
+
+    def _log(self, record: Dict[str, Any]):
+        name = record['stage']
+        if record.get('rows_out') is not None:
+            log_transaction_processing(name, record['rows_out'], record['wall_seconds'])
+        log_performance_metric(f"{name} CPU", record['cpu_seconds'], "s")
+        if record.get('peak_rss_mb') is not None:
+            log_performance_metric(f"{name} 피크 RSS", record['peak_rss_mb'], "MB")
+        if record.get('rss_delta_mb') is not None:
+            log_performance_metric(f"{name} RSS 증감", record['rss_delta_mb'], "MB")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 프로파일 구조 (totals.peak_rss_mb는 프로세스 누적 피크)"""
+        process_peak = self._process_peak_rss()
+        return {
+            'schema_version': PROFILE_SCHEMA_VERSION,
+            'run': self.run_name,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'environment': {
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'trace_memory': self.trace_memory,
+                'profile_mode': self.profile_mode,
+            },
+            'totals': {
+                'wall_seconds': round(time.perf_counter() - self._started, 4),
+                'stage_wall_seconds': round(sum(s['wall_seconds'] for s in self.stages), 4),
+                'cpu_seconds': round(sum(s['cpu_seconds'] for s in self.stages), 4),
+                'peak_rss_mb': round(process_peak, 2) if process_peak is not None else None,
+            },
+            'stages': self.stages,
+        }
+
+    def write(self, path: Optional[Union[str, Path]] = None) -> str:
+        """JSON 프로파일 저장 (기본: artifacts/profiles/<run>_<시각>.json)"""
+        if path is None:
+            path = Path(PROFILE_DIR) / f"{self.run_name}_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        print(f"⏱️ 스테이지 프로파일 저장: {path}")
+        return str(path)
+
+    def write_profile_reports(self, output_dir: Optional[Union[str, Path]] = None,
+                              top_n: int = DEFAULT_HOT_FUNCTIONS) -> Dict[str, str]:
+        """
+        profile_mode 산출물 저장 (기본: artifacts/profiles, 보통 생성된 리포트 폴더를 지정)
+
+        - <run>_<시각>_cpu.collapsed: 스택 샘플 (flamegraph.pl / speedscope 입력)
+        - <run>_<시각>_cpu.prof: cProfile 통계 (pstats / snakeviz)
+        - <run>_<시각>_mem.collapsed: 호출 스택별 증가 메모리 (KB 가중치)
+        - <run>_<시각>_hotspots.txt: 상위 N개 함수 / 할당 위치 요약
+
+        Returns:
+            dict: 산출물 종류 → 경로 (profile_mode가 없으면 빈 딕셔너리)
+        """
+        if self.profile_mode is None:
+            return {}
+        output_dir = Path(output_dir or PROFILE_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = output_dir / f"{self.run_name}_{self.started_at.strftime('%Y%m%d_%H%M%S')}"
+        paths = {}
+
+        if self.profile_cpu:
+            paths['cpu_collapsed'] = _write_collapsed(f"{prefix}_cpu.collapsed", self._sampler.counts)
+            if self._cpu_stats is not None:
+                self._cpu_stats.dump_stats(f"{prefix}_cpu.prof")
+                paths['cpu_stats'] = f"{prefix}_cpu.prof"
+        if self.profile_memory:
+            paths['mem_collapsed'] = _write_collapsed(f"{prefix}_mem.collapsed", self._memory_stacks)
+
+        lines = [f"# HVDC 프로파일 핫스팟 - {self.run_name} "
+                 f"({self.started_at.isoformat(timespec='seconds')}, mode={self.profile_mode})", ""]
+        if self._cpu_stats is not None:
+            for sort, title in (('tottime', '자체 시간'), ('cumtime', '누적 시간')):
+                lines.append(f"## CPU 상위 {top_n}개 함수 ({title} 기준)")
+                lines.append(f"{'tottime':>10}{'cumtime':>10}{'calls':>10}  function")
+                for item in hot_functions(self._cpu_stats, top_n, sort):
+                    lines.append(f"{item['tottime']:>10.3f}{item['cumtime']:>10.3f}{item['calls']:>10}  {item['function']}")
+                lines.append("")
+        if self.profile_memory:
+            lines.append("## 스테이지별 상위 메모리 증가 위치")
+            for record in self.stages:
+                lines.append(f"[{record['stage']}] 피크 {record.get('traced_peak_mb', 0)}MB")
+                for alloc in record.get('top_allocations', []):
+                    lines.append(f"{alloc['size_diff_kb']:>12,.1f}KB{alloc['count_diff']:>10}  {alloc['location']}")
+            lines.append("")
+        with open(f"{prefix}_hotspots.txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        paths['hotspots'] = f"{prefix}_hotspots.txt"
+
+        for kind, path in paths.items():
+            print(f"🔥 프로파일 산출물 ({kind}): {path}")
+        return paths
+
+    def print_summary(self):
+        """스테이지별 측정 요약 출력"""
+        print("\n⏱️ 스테이지 프로파일")
+        print(f"{'스테이지':<20}{'시간(s)':>10}{'CPU(s)':>10}{'RSS(MB)':>10}{'증감(MB)':>10}{'입력':>10}{'출력':>10}")
+        for s in self.stages:
+            rss = f"{s['peak_rss_mb']:.1f}" if s.get('peak_rss_mb') is not None else '-'
+            delta = f"{s['rss_delta_mb']:+.1f}" if s.get('rss_delta_mb') is not None else '-'
+            rows_in = f"{s['rows_in']:,}" if s.get('rows_in') is not None else '-'
+            rows_out = f"{s['rows_out']:,}" if s.get('rows_out') is not None else '-'
+            print(f"{s['stage']:<20}{s['wall_seconds']:>10.2f}{s['cpu_seconds']:>10.2f}{rss:>10}{delta:>10}{rows_in:>10}{rows_out:>10}")
+
+
+def _write_collapsed(path: Union[str, Path], stacks: Counter) -> str:
+    """collapsed-stack 형식 ('frame;frame;... 가중치') 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, weight in sorted(stacks.items()):
+            f.write(f"{stack} {weight}\n")
+    return str(path)
+
+
+def load_profile(path: Union[str, Path]) -> Dict[str, Any]:
+    """JSON 프로파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_profiles(baseline: Dict[str, Any], current: Dict[str, Any],
+                  metrics: List[str] = STAGE_METRICS) -> pd.DataFrame:
+    """
+    두 프로파일의 스테이지별 지표 비교 (같은 이름 스테이지는 합산)
+
+    Returns:
+        DataFrame: stage, metric, baseline, current, ratio (current / baseline)
+    """
+    def _by_stage(profile):
+        stages = pd.DataFrame(profile.get('stages', []))
+        if stages.empty:
+            return pd.DataFrame(columns=['stage'] + metrics).set_index('stage')
+        stages = stages.reindex(columns=['stage'] + metrics)
+        aggregations = {m: ('max' if m.startswith('peak') or m.startswith('traced') else 'sum') for m in metrics}
+        return stages.groupby('stage', sort=False).agg(aggregations)
+
+    base, curr = _by_stage(baseline), _by_stage(current)
+    rows = []
+    for stage in base.index.union(curr.index, sort=False):
+        for metric in metrics:
+            b = base[metric].get(stage) if stage in base.index else None
+            c = curr[metric].get(stage) if stage in curr.index else None
+            b = None if b is None or pd.isna(b) else float(b)
+            c = None if c is None or pd.isna(c) else float(c)
+            ratio = c / b if b and c is not None else None
+            rows.append({'stage': stage, 'metric': metric, 'baseline': b, 'current': c, 'ratio': ratio})
+    return pd.DataFrame(rows, columns=['stage', 'metric', 'baseline', 'current', 'ratio'])
@@ -0,0 +1,325 @@
+"""
+HVDC 로컬 조회 API (HTTP/JSON)
+
+창고 재고 하나, 케이스 위치 하나를 확인하려고 수 MB 엑셀 리포트를 여는 대신,
+파이프라인 계산 결과(트랜잭션 로그 / 일별 재고 / 오차 원장)에서 미리 만든 인덱스로
+밀리초 단위 응답을 주는 표준 라이브러리 HTTP 서비스입니다.
+
+    GET /health
+    GET /stock?date=2024-06-30[&warehouse=DSV Indoor]     창고별 기준일 재고
+    GET /cases/<Case_No>[?date=2024-06-30]                케이스 위치 + 이력
+    GET /vendors/monthly?vendor=HITACHI[&month=2024-06]    공급사 월별 입고/출고/금액
+    GET /variance[?month=2024-06]                          월별 청구-실적 오차
+
+인덱스는 불변 객체로 만들어 통째로 교체하므로, 감시 모드(core.watch_service) 갱신 중에도
+요청은 항상 한 세대의 일관된 결과를 받습니다.
+
+    python main.py --serve [--port 8765] [--watch]
+"""
+
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.case_position import CasePositionIndex
+from core.olap_cube import InventoryCube
+from core.transaction_log import infer_vendor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+OUT_TX_TYPES = ['TRANSFER_OUT', 'FINAL_OUT']
+VARIANCE_FIELDS = ['Invoice_Amount', 'Report_Amount', '오차', '오차율(%)', '절대오차율(%)', '오차사유']
+
+
+def _parse_date(value: Optional[str]) -> Optional[pd.Timestamp]:
+    """쿼리 문자열 날짜 → Timestamp (없으면 None, 형식 오류 시 ValueError)"""
+    if value in (None, ''):
+        return None
+    try:
+        return pd.Timestamp(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"날짜 형식 오류: {value} (YYYY-MM-DD)")
+
+
+def _json_value(value: Any) -> Any:
+    """numpy/pandas 스칼라 → JSON 기본 타입"""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    return [{key: _json_value(value) for key, value in row.items()} for row in df.to_dict('records')]
+
+
+class InventoryQueryIndex:
+    """조회 API용 사전 계산 인덱스 (생성 후 변경하지 않음)"""
+
+    def __init__(self, transaction_df: pd.DataFrame, daily_stock: pd.DataFrame,
+                 variance: Optional[pd.DataFrame] = None, generation: int = 0):
+        """
+        Args:
+            transaction_df: 중복 제거 후 트랜잭션 프레임 (Case_No, Date, Location, TxType_Refined, Qty)
+            daily_stock: calculate_daily_inventory 결과 (Location, Date, Closing_Stock)
+            variance: 월별 오차 원장 (VarianceLedger.get_ledger 결과, 없으면 오차 조회 불가)
+            generation: 원본 데이터 세대 (감시 모드 갱신 횟수)
+        """
+        started = time.perf_counter()
+        self.generation = generation
+        self._build_stock(daily_stock)
+        self.positions = CasePositionIndex.from_transactions(transaction_df) if not transaction_df.empty \
+            else CasePositionIndex()
+        self._build_vendor_monthly(transaction_df)
+        self._build_variance(variance)
+        self.build_seconds = round(time.perf_counter() - started, 3)
+        self.transactions = len(transaction_df)
+        logger.info(f"🔎 조회 인덱스 생성: 창고 {len(self._stock)}개, 케이스 {len(self.positions.cases):,}개, "
+                    f"공급사 {len(self._vendor_rows)}개 ({self.build_seconds}s)")
+
+    @classmethod
+    def from_service(cls, service, variance: Optional[pd.DataFrame] = None) -> 'InventoryQueryIndex':
+        """WarehouseService 현재 세대로 인덱스 생성"""
+        state = service.snapshot()
+        return cls(state['transaction_df'], state['daily_stock'], variance=variance, generation=state['generation'])
+
+    def _build_stock(self, daily_stock: pd.DataFrame):
+        """창고별 (정렬된 날짜 배열, 기말재고 배열) → 기준일 재고는 searchsorted"""
+        self._stock: Dict[str, tuple] = {}
+        if daily_stock.empty:
+            return
+        frame = daily_stock[['Location', 'Date', 'Closing_Stock']].assign(
+            Date=pd.to_datetime(daily_stock['Date']).to_numpy(dtype='datetime64[D]'))
+        for location, group in frame.sort_values(['Location', 'Date'], kind='stable').groupby('Location', sort=True):
+            self._stock[str(location)] = (group['Date'].to_numpy(dtype='datetime64[D]'),
+                                          group['Closing_Stock'].to_numpy())
+
+    def _build_vendor_monthly(self, transaction_df: pd.DataFrame):
+        """공급사 × 월 입고/출고 수량, 입고 금액 (aggregate_vendor_monthly와 같은 기준, OLAP 큐브 롤업)"""
+        self._vendor_rows: Dict[str, List[Dict[str, Any]]] = {}
+        if transaction_df.empty:
+            return
+        frame = transaction_df.assign(Vendor=infer_vendor(transaction_df))
+        cube = InventoryCube.from_transactions(frame)
+        measures = [m for m in ['Qty', 'Amount'] if cube.has_measure(m)]
+        cells = cube.rollup(['Vendor', '월', 'TxType_Refined'], measures)
+        cells['TxType_Refined'] = cells['TxType_Refined'].astype(str)
+        if 'Amount' not in cells.columns:
+            cells['Amount'] = 0.0
+        is_in = cells['TxType_Refined'] == 'IN'
+        is_out = cells['TxType_Refined'].isin(OUT_TX_TYPES)
+        monthly = cells.assign(
+            IN=cells['Qty'].where(is_in, 0),
+            OUT=cells['Qty'].where(is_out, 0),
+            Amount=cells['Amount'].where(is_in, 0),
+        ).groupby(['Vendor', '월'], observed=True, sort=True)[['IN', 'OUT', 'Amount']].sum().reset_index()
+        for vendor, group in monthly.groupby('Vendor', observed=True, sort=True):
+            self._vendor_rows[str(vendor)] = _records(group.drop(columns='Vendor'))
+
+    def _build_variance(self, variance: Optional[pd.DataFrame]):
+        self._variance: Optional[Dict[str, Dict[str, Any]]] = None
+        if variance is None:
+            return
+        columns = [c for c in VARIANCE_FIELDS if c in variance.columns]
+        self._variance = {str(row['년월']): row for row in _records(variance[['년월'] + columns].sort_values('년월'))}
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'generation': self.generation,
+            'transactions': self.transactions,
+            'warehouses': len(self._stock),
+            'cases': len(self.positions.cases),
+            'vendors': sorted(self._vendor_rows),
+            'variance_loaded': self._variance is not None,
+            'build_seconds': self.build_seconds,
+        }
+
+    def stock(self, date: Optional[str] = None, warehouse: Optional[str] = None) -> Dict[str, Any]:
+        """기준일(기본: 최신) 창고별 기말재고"""
+        as_of = _parse_date(date)
+        if warehouse is not None and warehouse not in self._stock:
+            raise KeyError(f"창고 없음: {warehouse}")
+        targets = [warehouse] if warehouse is not None else list(self._stock)
+        stock = {}
+        for location in targets:
+            dates, closing = self._stock[location]
+            if as_of is None:
+                pos = len(dates) - 1
+            else:
+                pos = np.searchsorted(dates, np.datetime64(as_of.date(), 'D'), side='right') - 1
+            stock[location] = int(closing[pos]) if pos >= 0 else 0
+        return {'date': as_of.date().isoformat() if as_of is not None else None,
+                'stock': stock, 'total': sum(stock.values())}
+
+    def case(self, case_no: str, date: Optional[str] = None) -> Dict[str, Any]:
+        """케이스 기준일 위치 + 이벤트 이력"""
+        events = self.positions.events(case_no, _parse_date(date))
+        if not events:
+            raise KeyError(f"케이스 없음: {case_no}")
+        history = [{key: _json_value(value) for key, value in event.items()} for event in events]
+        return {'case_no': str(case_no), 'position': history[-1], 'history': history}
+
+    def vendor_monthly(self, vendor: Optional[str] = None, month: Optional[str] = None) -> Dict[str, Any]:
+        """공급사별 월별 입고/출고 수량 + 입고 금액"""
+        if vendor is not None and vendor.upper() not in self._vendor_rows:
+            raise KeyError(f"공급사 없음: {vendor}")
+        vendors = [vendor.upper()] if vendor is not None else list(self._vendor_rows)
+        result = {}
+        for name in vendors:
+            rows = self._vendor_rows[name]
+            result[name] = [row for row in rows if row['월'] == month] if month else rows
+        return {'month': month, 'vendors': result}
+
+    def variance(self, month: Optional[str] = None) -> Dict[str, Any]:
+        """월별 청구(Invoice)-실적(Report) 오차"""
+        if self._variance is None:
+            raise KeyError("오차 원장이 로드되지 않았습니다 (--ledger)")
+        if month is not None:
+            if month not in self._variance:
+                raise KeyError(f"오차 원장에 없는 월: {month}")
+            return {'months': [self._variance[month]]}
+        return {'months': list(self._variance.values())}
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """GET 라우팅 → InventoryQueryIndex 조회 → JSON 응답"""
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        parts = [urllib.parse.unquote(p) for p in url.path.strip('/').split('/') if p]
+        index = self.server.index
+        try:
+            if index is None:
+                self._send(503, {'error': '인덱스 준비 중'})
+                return
+            if parts == ['health']:
+                body = index.health()
+            elif parts == ['stock']:
+                body = index.stock(params.get('date'), params.get('warehouse'))
+            elif len(parts) == 2 and parts[0] == 'cases':
+                body = index.case(parts[1], params.get('date'))
+            elif parts == ['vendors', 'monthly']:
+                body = index.vendor_monthly(params.get('vendor'), params.get('month'))
+            elif parts == ['variance']:
+                body = index.variance(params.get('month'))
+            else:
+                self._send(404, {'error': f"알 수 없는 경로: {url.path}"})
+                return
+        except KeyError as e:
+            self._send(404, {'error': e.args[0] if e.args else str(e)})
+            return
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        body['generation'] = index.generation
+        self._send(200, body)
+
+    def _send(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("query_api %s - " + format, self.address_string(), *args)
+
+
+class QueryAPIServer(ThreadingHTTPServer):
+    """조회 인덱스를 들고 있는 스레드 HTTP 서버 (update_index로 원자적 교체)"""
+
+    daemon_threads = True
+
+    def __init__(self, index: Optional[InventoryQueryIndex] = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        super().__init__((host, port), _QueryHandler)
+        self.index = index
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def update_index(self, index: InventoryQueryIndex):
+        self.index = index
+
+    def attach(self, service, variance: Optional[pd.DataFrame] = None):
+        """감시 모드 갱신 때마다 인덱스 재생성 (현재 세대가 있으면 즉시 생성)"""
+        service.add_listener(lambda svc: self.update_index(InventoryQueryIndex.from_service(svc, variance)))
+        if service.generation:
+            self.update_index(InventoryQueryIndex.from_service(service, variance))
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 요청 처리 시작"""
+        thread = threading.Thread(target=self.serve_forever, name="hvdc-query-api", daemon=True)
+        thread.start()
+        print(f"🌐 조회 API 시작: {self.url} (/health, /stock, /cases/<Case_No>, /vendors/monthly, /variance)")
+        return thread
+
+
+def load_variance_ledger(path: Union[str, Path, None]) -> Optional[pd.DataFrame]:
+    """오차 원장 SQLite가 있으면 전체 원장 로드 (없으면 None)"""
+    if path is None or not Path(path).exists():
+        return None
+    from variance_ledger import VarianceLedger
+
+    return VarianceLedger(str(path)).get_ledger()
+
+
+class QueryClient:
+    """조회 API 로컬 클라이언트 (표준 라이브러리 urllib)"""
+
+    def __init__(self, base_url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _get(self, path: str, **params) -> Dict[str, Any]:
+        query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        url = f"{self.base_url}{path}" + (f"?{query}" if query else '')
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            message = json.loads(e.read().decode('utf-8') or '{}').get('error', e.reason)
+            if e.code == 404:
+                raise KeyError(message) from None
+            if e.code == 400:
+                raise ValueError(message) from None
+            raise RuntimeError(f"조회 API 오류 {e.code}: {message}") from None
+
+    def health(self) -> Dict[str, Any]:
+        return self._get('/health')
+
+    def stock(self, date: Optional[str] = None, warehouse: Optional[str] = None) -> Dict[str, Any]:
+        return self._get('/stock', date=date, warehouse=warehouse)
+
+    def case(self, case_no: str, date: Optional[str] = None) -> Dict[str, Any]:
+        return self._get(f"/cases/{urllib.parse.quote(str(case_no), safe='')}", date=date)
+
+    def vendor_monthly(self, vendor: Optional[str] = None, month: Optional[str] = None) -> Dict[str, Any]:
+        return self._get('/vendors/monthly', vendor=vendor, month=month)
+
+    def variance(self, month: Optional[str] = None) -> Dict[str, Any]:
+        return self._get('/variance', month=month)
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 import pandas as pd
 
 class StorageType(str, Enum):
@@ -171,8 +172,8 @@ def validate_transaction_dataframe(df: pd.DataFrame) -> ValidationResult:
             warnings.append(f"알 수 없는 트랜잭션 타입: {invalid_types}")
     
     # 중복 검사
-    if len(df) != len(df.drop_duplicates()):
-        duplicate_count = len(df) - len(df.drop_duplicates())
+    duplicate_count = int(df.duplicated().sum())
+    if duplicate_count > 0:
         warnings.append(f"중복 레코드 {duplicate_count}건 발견")
     
     is_valid = len(errors) == 0
@@ -192,6 +193,67 @@ def validate_transaction_dataframe(df: pd.DataFrame) -> ValidationResult:
         }
     )
 
+def validate_transaction_chunks(chunks, exact_case_counts: bool = False) -> ValidationResult:
+    """
+    트랜잭션 로그 청크 스트리밍 검증 (validate_transaction_dataframe과 동일 규칙)
+    
+    Args:
+        chunks: DataFrame 청크 이터러블 또는 트랜잭션 로그 경로(CSV/Parquet)
+        exact_case_counts: False면 고유 Case 수를 HyperLogLog로 근사 (고정 메모리)
+        
+    Returns:
+        ValidationResult: 검증 결과
+    """
+    from .streaming_validation import ValidationProfileAccumulator, iter_transaction_chunks
+    
+    if isinstance(chunks, (str, Path)):
+        chunks = iter_transaction_chunks(chunks)
+    
+    errors = []
+    accumulator = ValidationProfileAccumulator(exact_case_counts=exact_case_counts)
+    qty_has_nan = False
+    for chunk in chunks:
+        if 'Date' in chunk.columns:
+            try:
+                pd.to_datetime(chunk['Date'])
+            except Exception as e:
+                errors.append(f"날짜 컬럼 형식 오류: {e}")
+        if 'Qty' in chunk.columns:
+            qty_has_nan = qty_has_nan or bool(chunk['Qty'].isna().any())
+        accumulator.update(chunk)
+    
+    valid_types = [t.value for t in TransactionType]
+    profile = accumulator.to_profile(valid_tx_types=valid_types)
+    warnings = []
+    
+    missing_columns = [col for col in ['Case_No', 'Date', 'Qty', 'TxType_Refined', 'Location']
+                       if col not in profile['columns']]
+    if missing_columns:
+        errors.insert(0, f"필수 컬럼 누락: {missing_columns}")
+    if qty_has_nan:
+        warnings.append("수량 컬럼에 NaN 값이 있습니다")
+    invalid_types = profile.get('invalid_tx_types')
+    if invalid_types is not None and len(invalid_types) > 0:
+        warnings.append(f"알 수 없는 트랜잭션 타입: {invalid_types}")
+    if profile['duplicate_count'] > 0:
+        warnings.append(f"중복 레코드 {profile['duplicate_count']}건 발견")
+    
+    date_profile = profile.get('date')
+    return ValidationResult(
+        is_valid=len(errors) == 0,
+        errors=errors,
+        warnings=warnings,
+        summary={
+            "total_records": profile['total_records'],
+            "unique_cases": accumulator.unique_cases() if 'Case_No' in profile['columns'] else 0,
+            "unique_locations": profile['location']['unique_count'] if 'location' in profile else 0,
+            "date_range": {
+                "start": date_profile['min'] if date_profile else None,
+                "end": date_profile['max'] if date_profile else None
+            }
+        }
+    )
+
 def validate_expected_stock_data(data: Dict[str, Any]) -> ValidationResult:
     """
     기대 재고 데이터 검증
@@ -249,6 +311,133 @@ def validate_expected_stock_data(data: Dict[str, Any]) -> ValidationResult:
         }
     )
 
+# ===== 컬럼 단위(벡터화) 스키마 검증 =====
+# 모델 필드 → DataFrame 컬럼 후보 (loader 원시 키 / 트랜잭션 DataFrame 컬럼)
+COLUMN_ALIASES = {
+    'case': ['case', 'Case_No'],
+    'date': ['date', 'Date'],
+    'warehouse': ['warehouse', 'Location'],
+    'incoming': ['incoming'],
+    'outgoing': ['outgoing'],
+    'inventory': ['inventory'],
+    'qty': ['Qty', 'qty'],
+    'storage_type': ['storage_type', 'Storage_Type'],
+    'transaction_type': ['TxType_Refined', 'transaction_type'],
+}
+
+MAX_QUANTITY = 10000
+VIOLATION_COLUMNS = ['row', 'column', 'rule', 'value', 'message']
+
+
+def _resolve_column(df: pd.DataFrame, field: str) -> Optional[str]:
+    for candidate in COLUMN_ALIASES[field]:
+        if candidate in df.columns:
+            return candidate
+    return None
+
+
+def _to_datetime_column(values: pd.Series) -> pd.Series:
+    """날짜 컬럼 일괄 변환 (변환 불가 값은 NaT)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        return pd.to_datetime(values, errors='coerce', format='mixed')
+    except (TypeError, ValueError):
+        return pd.to_datetime(values, errors='coerce')
+
+
+def validate_transaction_columns(df: pd.DataFrame, as_of: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    트랜잭션 컬럼 단위 스키마 검증 (TransactionData/TransactionType/WarehouseLocation 규칙)
+    
+    행마다 pydantic 모델을 생성하는 대신 컬럼 전체에 마스크를 적용합니다.
+    loader 원시 키(case/date/warehouse/incoming/...)와 트랜잭션 DataFrame 컬럼
+    (Case_No/Date/Location/Qty/TxType_Refined) 모두 지원합니다.
+    
+    Args:
+        df: 검증할 DataFrame
+        as_of: 미래 날짜 판정 기준 시각 (기본: 현재)
+        
+    Returns:
+        pd.DataFrame: 위반 목록 (row=원본 인덱스, column, rule, value, message)
+    """
+    as_of = as_of or datetime.now()
+    violations = []
+    
+    def add(mask: pd.Series, column: str, rule: str, message: str):
+        if mask.any():
+            hits = df.loc[mask.values, column]
+            violations.append(pd.DataFrame({
+                'row': hits.index,
+                'column': column,
+                'rule': rule,
+                'value': hits.values,
+                'message': message,
+            }))
+    
+    # 1. 필수 문자열 필드 (case, warehouse)
+    for field, label in [('case', '케이스 ID는'), ('warehouse', '창고명은')]:
+        col = _resolve_column(df, field)
+        if col is None:
+            continue
+        values = df[col]
+        add(values.isnull(), col, 'required', f"{label} 필수입니다")
+        add(values.notnull() & (values.astype(str).str.strip() == ''), col, 'not_empty',
+            f"{label} 비어있을 수 없습니다")
+    
+    # 2. 날짜 형식 / 미래 날짜
+    col = _resolve_column(df, 'date')
+    if col is not None:
+        raw = df[col]
+        parsed = _to_datetime_column(raw)
+        add(raw.isnull(), col, 'required', "트랜잭션 날짜는 필수입니다")
+        add(raw.notnull() & parsed.isnull(), col, 'date_format', "날짜 형식 오류")
+        add(parsed > as_of, col, 'future_date', "미래 날짜는 허용되지 않습니다")
+    
+    # 3. 수량 (정수, 0 이상, 10,000 이하)
+    for field in ['incoming', 'outgoing', 'inventory', 'qty']:
+        col = _resolve_column(df, field)
+        if col is None:
+            continue
+        raw = df[col]
+        numeric = pd.to_numeric(raw, errors='coerce')
+        add(raw.notnull() & numeric.isnull(), col, 'type', "수량은 숫자여야 합니다")
+        add(numeric.notnull() & (numeric % 1 != 0), col, 'integer', "수량은 정수여야 합니다")
+        add(numeric < 0, col, 'non_negative', "수량은 0 이상이어야 합니다")
+        if field in ('incoming', 'outgoing'):
+            add(numeric > MAX_QUANTITY, col, 'max_quantity', "수량은 10,000을 초과할 수 없습니다")
+    
+    # 4. 열거형 (StorageType, TransactionType)
+    for field, enum_cls in [('storage_type', StorageType), ('transaction_type', TransactionType)]:
+        col = _resolve_column(df, field)
+        if col is None:
+            continue
+        values = df[col]
+        valid = [e.value for e in enum_cls]
+        add(values.notnull() & ~values.isin(valid), col, 'enum',
+            f"허용되지 않는 {enum_cls.__name__} 값 (허용: {valid})")
+    
+    if not violations:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.concat(violations, ignore_index=True).sort_values(['row', 'column'], kind='stable').reset_index(drop=True)
+
+
+def validate_transaction_records(transactions: List[Dict[str, Any]], as_of: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    loader 트랜잭션 리스트({'source_file', 'timestamp', 'data': {...}}) 일괄 검증
+    
+    Returns:
+        pd.DataFrame: 위반 목록 (row=트랜잭션 리스트 위치, source_file 포함)
+    """
+    if not transactions:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS + ['source_file'])
+    data_df = pd.DataFrame([tx.get('data', {}) for tx in transactions])
+    violations = validate_transaction_columns(data_df, as_of=as_of)
+    source_files = pd.Series([tx.get('source_file') for tx in transactions])
+    violations['source_file'] = source_files.reindex(violations['row'].astype(int)).values
+    return violations
+
+
 # 편의 함수들
 def create_transaction_from_dict(data: Dict[str, Any]) -> TransactionRecord:
     """딕셔너리에서 트랜잭션 레코드 생성"""
@@ -0,0 +1,179 @@
+"""
+HVDC 창고 보관일수(Storage-days) 및 RENT FEE 발생 추정 엔진
+
+케이스별 창고 IN/OUT 이벤트를 점유 구간(interval)으로 변환한 뒤,
+구간 시작(+)/종료(-) 델타를 창고×일자 그리드에 한 번에 누적합(cumsum)하여
+일별 점유 Pkg, 월별 SQM-일수, 임대료 발생 추정치를 계산합니다.
+케이스 단위 루프 없이 정렬 1회 + groupby 누적 연산으로 처리합니다.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+IN_TX_TYPES = ['IN', 'TRANSFER_IN']
+OUT_TX_TYPES = ['TRANSFER_OUT', 'FINAL_OUT']
+INTERVAL_COLUMNS = ['Case_No', 'Location', 'start', 'end', 'days', 'packages', 'sqm']
+MONTHLY_COLUMNS = ['월', 'Location', '점유Pkg일수', 'SQM일수', '평균점유Pkg', '평균점유SQM', 'RENT_발생추정']
+
+
+class StorageDaysEngine:
+    """케이스 점유 구간 기반 보관일수/SQM-일수/임대료 발생 추정"""
+
+    def __init__(self, intervals: pd.DataFrame, as_of: pd.Timestamp):
+        self.intervals = intervals
+        self.as_of = as_of
+        self._daily: Optional[Dict[str, pd.DataFrame]] = None
+
+    @classmethod
+    def from_transactions(cls, df: pd.DataFrame, warehouses: Optional[List[str]] = None,
+                          as_of=None, default_sqm_per_pkg: float = 0.0) -> 'StorageDaysEngine':
+        """
+        트랜잭션 프레임에서 점유 구간 생성
+
+        케이스의 창고별 잔량은 IN(+)/OUT(-) 누적합이며, 입고 전 출고처럼 음수가 되는
+        구간은 0으로 보정합니다(잔량 - min(0, 누적 최소값)). 보관일수는 입고일 포함,
+        출고일 제외 기준입니다.
+
+        Args:
+            df: Case_No, Date, Location, TxType_Refined, Qty (선택: SQM) 컬럼 프레임
+            warehouses: 대상 창고 목록 (대소문자 무시, 기본: 전체 Location)
+            as_of: 미출고 구간 마감일 (기본: 마지막 이벤트일)
+            default_sqm_per_pkg: SQM 정보가 없는 케이스의 Pkg당 면적
+        """
+        print("🏬 창고 점유 구간 생성 중...")
+
+        events = pd.DataFrame({
+            'Case_No': df['Case_No'].astype(str).to_numpy(),
+            'Location': df['Location'].astype(str).str.strip().to_numpy(),
+            'Date': pd.to_datetime(df['Date'], errors='coerce').dt.normalize().to_numpy(),
+            'qty': pd.to_numeric(df['Qty'], errors='coerce').fillna(0).to_numpy(),
+            'sign': np.select([df['TxType_Refined'].isin(IN_TX_TYPES), df['TxType_Refined'].isin(OUT_TX_TYPES)],
+                              [1, -1], default=0),
+            'sqm': pd.to_numeric(df['SQM'], errors='coerce').fillna(0).to_numpy() if 'SQM' in df.columns else 0.0,
+        })
+        events = events[(events['sign'] != 0) & events['Date'].notnull()]
+        if warehouses is not None:
+            wanted = {w.upper() for w in warehouses}
+            events = events[events['Location'].str.upper().isin(wanted)]
+
+        as_of = pd.Timestamp(as_of).normalize() if as_of is not None else (
+            events['Date'].max() if not events.empty else pd.Timestamp.now().normalize())
+
+        # 케이스별 Pkg당 면적 (입고 SQM 합 / 입고 수량 합)
+        inbound = events[events['sign'] > 0].groupby('Case_No', observed=True)[['sqm', 'qty']].sum()
+        sqm_per_pkg = (inbound['sqm'] / inbound['qty'].where(inbound['qty'] > 0)).where(inbound['sqm'] > 0)
+
+        # 동일일자 IN → OUT 순으로 정렬 후 케이스×창고 누적 잔량
+        events = events.sort_values(['Location', 'Case_No', 'Date', 'sign'],
+                                    ascending=[True, True, True, False], kind='stable').reset_index(drop=True)
+        events['delta'] = events['qty'] * events['sign']
+        grouped = events.groupby(['Location', 'Case_No'], sort=False, observed=True)
+        balance = grouped['delta'].cumsum()
+        floor = balance.clip(upper=0).groupby([events['Location'], events['Case_No']], sort=False, observed=True).cummin()
+        events['packages'] = balance - floor
+
+        events['end'] = grouped['Date'].shift(-1).fillna(as_of + pd.Timedelta(days=1))
+        events['end'] = events['end'].where(events['end'] <= as_of + pd.Timedelta(days=1), as_of + pd.Timedelta(days=1))
+        intervals = events[(events['packages'] > 0) & (events['end'] > events['Date'])].rename(columns={'Date': 'start'})
+        intervals = intervals.assign(
+            days=(intervals['end'] - intervals['start']).dt.days,
+            sqm=intervals['packages'] * intervals['Case_No'].map(sqm_per_pkg).fillna(default_sqm_per_pkg).to_numpy(),
+        )[INTERVAL_COLUMNS].reset_index(drop=True)
+
+        print(f"✅ 점유 구간 생성 완료: {len(events):,}건 이벤트 → {len(intervals):,}개 구간")
+        return cls(intervals, as_of)
+
+    def daily_occupancy(self, measure: str = 'packages') -> pd.DataFrame:
+        """
+        창고별 일별 점유량 (일자 × 창고, 일말 기준)
+
+        Args:
+            measure: 'packages' (점유 Pkg) 또는 'sqm' (점유 SQM)
+        """
+        if self._daily is None:
+            self._daily = {}
+        if measure in self._daily:
+            return self._daily[measure]
+
+        intervals = self.intervals
+        if intervals.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='Date'))
+        deltas = pd.concat([
+            pd.DataFrame({'Date': intervals['start'], 'Location': intervals['Location'], 'delta': intervals[measure]}),
+            pd.DataFrame({'Date': intervals['end'], 'Location': intervals['Location'], 'delta': -intervals[measure]}),
+        ])
+        grid = deltas.pivot_table(index='Date', columns='Location', values='delta', aggfunc='sum', fill_value=0,
+                                  observed=True)
+        days = pd.date_range(intervals['start'].min(), self.as_of, freq='D', name='Date')
+        occupancy = grid.reindex(days.union(grid.index), fill_value=0).cumsum().reindex(days)
+        # 부동소수 누적 오차 제거
+        occupancy = occupancy.round(9)
+        occupancy.columns.name = None
+
+        self._daily[measure] = occupancy
+        return occupancy
+
+    def storage_days(self) -> pd.DataFrame:
+        """케이스×창고별 보관일수/Pkg-일수/SQM-일수"""
+        intervals = self.intervals
+        result = intervals.assign(
+            pkg_days=intervals['packages'] * intervals['days'],
+            sqm_days=intervals['sqm'] * intervals['days'],
+        ).groupby(['Case_No', 'Location'], sort=False, observed=True).agg(
+            보관일수=('days', 'sum'),
+            Pkg일수=('pkg_days', 'sum'),
+            SQM일수=('sqm_days', 'sum'),
+        )
+        return result.reset_index()
+
+    def monthly_summary(self, rent_rates: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        월×창고 SQM-일수 및 임대료 발생 추정
+
+        Args:
+            rent_rates: 창고별 월 임대 단가 (SQM당/월, 대소문자 무시). 일할 계산합니다.
+        """
+        packages = self.daily_occupancy('packages')
+        sqm = self.daily_occupancy('sqm')
+        if packages.empty:
+            return pd.DataFrame(columns=MONTHLY_COLUMNS)
+
+        months = packages.index.to_period('M')
+        pkg_days = packages.groupby(months).sum().stack().rename('점유Pkg일수')
+        sqm_days = sqm.groupby(months).sum().stack().rename('SQM일수')
+        day_counts = packages.groupby(months).size()
+
+        result = pd.concat([pkg_days, sqm_days], axis=1).reset_index()
+        result.columns = ['월', 'Location', '점유Pkg일수', 'SQM일수']
+        covered_days = result['월'].map(day_counts)
+        result['평균점유Pkg'] = result['점유Pkg일수'] / covered_days
+        result['평균점유SQM'] = result['SQM일수'] / covered_days
+
+        rates = {k.upper(): v for k, v in (rent_rates or {}).items()}
+        daily_rate = result['Location'].str.upper().map(rates) / result['월'].dt.days_in_month
+        result['RENT_발생추정'] = (result['SQM일수'] * daily_rate).fillna(0.0)
+        result['월'] = result['월'].dt.strftime('%Y-%m')
+        return result[MONTHLY_COLUMNS]
+
+
+def reconcile_rent_with_invoice(accrued: pd.DataFrame, invoiced: pd.DataFrame,
+                                invoice_col: str = 'RENT FEE') -> pd.DataFrame:
+    """
+    월별 임대료 발생 추정치와 청구 RENT FEE 대사
+
+    Args:
+        accrued: StorageDaysEngine.monthly_summary 결과
+        invoiced: '월' + invoice_col 컬럼 프레임 (generate_monthly_summary_report 결과 등)
+    """
+    monthly = accrued.groupby('월', as_index=False)[['SQM일수', 'RENT_발생추정']].sum()
+    result = monthly.merge(invoiced[['월', invoice_col]], on='월', how='outer').fillna(0)
+    result = result.rename(columns={invoice_col: 'RENT_청구'})
+    result['차이'] = result['RENT_청구'] - result['RENT_발생추정']
+    result['차이율(%)'] = np.where(result['RENT_발생추정'] != 0,
+                                 result['차이'] / result['RENT_발생추정'] * 100, 0.0)
+    return result.sort_values('월').reset_index(drop=True)
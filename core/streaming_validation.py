@@ -0,0 +1,440 @@
+"""
+HVDC 청크 단위 스트리밍 검증
+
+메모리에 올릴 수 없는 대용량 트랜잭션 로그를 청크로 읽으며
+병합 가능한 요약(sketch)만 누적하여 DataValidationEngine 검증 프로파일과
+동일한 형태의 결과를 만듭니다.
+- 건수/NULL/최소·최대/평균·분산(Welford 병합)
+- 수량 히스토그램 (정수 박스 수량 → 정확한 IQR/이상치)
+- 행 해시 Bloom filter (중복 레코드 수, 고정 메모리 - 거짓 양성으로 약간 과대 집계될 수 있음)
+- HyperLogLog (고유 Case 수 근사, 기본값 - Case별 정확 건수는 exact_case_counts=True일 때만 보관)
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.histogram import quantile_from_histogram
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['Case_No', 'Date', 'Location', 'TxType_Refined', 'Qty']
+# 행 중복 Bloom filter 크기 (2^27비트 = 16MB) / 해시 함수 수
+DEFAULT_BLOOM_BITS = 1 << 27
+DEFAULT_BLOOM_HASHES = 7
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def iter_transaction_chunks(path: Union[str, Path], chunksize: int = 100_000,
+                            columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    트랜잭션 로그를 청크 단위로 읽기
+
+    지원 형식: CSV, Parquet 파일, Parquet 데이터셋 디렉토리 (pyarrow 필요)
+    """
+    path = Path(path)
+    if path.is_dir() or path.suffix == '.parquet':
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(str(path), format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        parse_dates = ['Date'] if columns is None or 'Date' in columns else None
+        for chunk in pd.read_csv(path, chunksize=chunksize, usecols=columns, parse_dates=parse_dates):
+            yield chunk
+
+
+class HyperLogLog:
+    """고유값 수 근사 (HyperLogLog, 64bit 해시, 고정 메모리 2^p 바이트)"""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        tail_bits = 64 - self.p
+        idx = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << tail_bits) - 1)
+        # frexp 지수 = 비트 길이 (tail_bits ≤ 53 이므로 float 변환이 정확함)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def add_series(self, values: pd.Series):
+        self.add_hashes(pd.util.hash_pandas_object(values.dropna().astype(str), index=False).values)
+
+    def merge(self, other: 'HyperLogLog'):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class BloomFilter:
+    """
+    행 해시 중복 판정용 고정 크기 Bloom filter (bits/8 바이트, 행 수와 무관)
+
+    이미 본 행을 놓치지는 않지만 처음 보는 행을 중복으로 셀 수 있습니다 (거짓 양성).
+    n개 삽입 후 거짓 양성 확률은 p ≈ (1 - e^(-k·n/m))^k 이고, 중복 수는 최대 약 N·p만큼
+    과대 집계됩니다. 기본값(m=2^27비트=16MB, k=7)에서 100만 행 p ≈ 1e-9, 1,000만 행 p ≈ 0.2%입니다.
+    """
+
+    def __init__(self, bits: int = DEFAULT_BLOOM_BITS, hashes: int = DEFAULT_BLOOM_HASHES):
+        self.bits = int(bits)
+        self.hashes = int(hashes)
+        self.array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """64bit 해시 → k개 비트 위치 (상/하위 32bit 이중 해싱)"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return ((low[:, None] + steps[None, :] * high[:, None]) % np.uint64(self.bits)).astype(np.int64)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        positions = self._positions(hashes)
+        bits = (self.array[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def add(self, hashes: np.ndarray):
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.array, positions >> 3, np.left_shift(1, positions & 7).astype(np.uint8))
+
+    def merge(self, other: 'BloomFilter'):
+        if (self.bits, self.hashes) != (other.bits, other.hashes):
+            raise ValueError("크기/해시 수가 다른 Bloom filter는 병합할 수 없습니다")
+        np.bitwise_or(self.array, other.array, out=self.array)
+
+    def estimate_count(self) -> float:
+        """삽입된 고유 해시 수 추정 (설정된 비트 수 기반)"""
+        ones = int(_POPCOUNT[self.array].sum(dtype=np.int64))
+        if ones >= self.bits:
+            return float('inf')
+        return -self.bits / self.hashes * np.log1p(-ones / self.bits)
+
+
+class _Moments:
+    """병합 가능한 평균/분산 누적기 (Chan/Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values: pd.Series):
+        values = values.dropna()
+        if values.empty:
+            return
+        other = _Moments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.total = values.sum()
+        other.min = values.min()
+        other.max = values.max()
+        self.merge(other)
+
+    def merge(self, other: '_Moments'):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.total, self.min, self.max = other.total, other.min, other.max
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+
+class ValidationProfileAccumulator:
+    """청크별 검증 통계 누적기 (DataValidationEngine 프로파일과 동일 구조 산출)"""
+
+    def __init__(self, exact_case_counts: bool = False, hll_precision: int = 14,
+                 bloom_bits: int = DEFAULT_BLOOM_BITS):
+        """
+        Args:
+            exact_case_counts: Case별 건수 보관 (이력에 비례해 메모리 증가, 기본은 HyperLogLog만 사용)
+            hll_precision: HyperLogLog 레지스터 비트 수 (2^p 바이트)
+            bloom_bits: 행 중복 Bloom filter 비트 수 (거짓 양성 오차는 BloomFilter 참고)
+        """
+        self.exact_case_counts = exact_case_counts
+        self.total_records = 0
+        self.columns: List[str] = []
+        self.null_counts: Counter = Counter()
+        self.row_filter = BloomFilter(bloom_bits)
+        self.duplicate_count = 0
+
+        self.qty = _Moments()
+        self.qty_histogram: Counter = Counter()
+        self.qty_negative = 0
+        self.qty_zero = 0
+
+        self.date_min = pd.NaT
+        self.date_max = pd.NaT
+        self.date_future = 0
+        self.date_very_old = 0
+        self.date_weekend = 0
+        self.monthly_counts: Counter = Counter()
+
+        self.tx_types: Dict = {}
+        self.location_values: Dict = {}
+        self.location_empty = 0
+        self.location_unknown = 0
+
+        self.storage_counts: Counter = Counter()
+        self.storage_mismatch = None
+        self.location_storage_pairs = set()
+
+        self.case_counts: Counter = Counter()
+        self.case_sketch = HyperLogLog(hll_precision)
+
+        self.fee = _Moments()
+        self.fee_negative = 0
+        self.has_fee = False
+
+    def update(self, chunk: pd.DataFrame):
+        """청크 1개 누적"""
+        self.total_records += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+
+        for col in REQUIRED_COLUMNS:
+            if col in chunk.columns:
+                self.null_counts[col] += int(chunk[col].isnull().sum())
+
+        self._update_duplicates(chunk)
+
+        if 'Qty' in chunk.columns:
+            qty = chunk['Qty']
+            self.qty.update(qty)
+            self.qty_histogram.update(qty.dropna().value_counts().to_dict())
+            self.qty_negative += int((qty < 0).sum())
+            self.qty_zero += int((qty == 0).sum())
+
+        if 'Date' in chunk.columns:
+            dates = chunk['Date']
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates, errors='coerce')
+            chunk_min, chunk_max = dates.min(), dates.max()
+            if pd.notnull(chunk_min):
+                self.date_min = chunk_min if pd.isnull(self.date_min) else min(self.date_min, chunk_min)
+                self.date_max = chunk_max if pd.isnull(self.date_max) else max(self.date_max, chunk_max)
+            self.date_future += int((dates > datetime.now()).sum())
+            self.date_very_old += int((dates < datetime(2020, 1, 1)).sum())
+            self.date_weekend += int((dates.dt.dayofweek >= 5).sum())
+            self.monthly_counts.update(dates.dt.to_period('M').value_counts().to_dict())
+
+        if 'TxType_Refined' in chunk.columns:
+            for value in chunk['TxType_Refined'].unique():
+                self.tx_types.setdefault(value, True)
+
+        if 'Location' in chunk.columns:
+            locations = chunk['Location']
+            for value in locations.unique():
+                self.location_values.setdefault(value, True)
+            self.location_empty += int(locations.isnull().sum())
+            self.location_unknown += int((locations == 'UNKNOWN').sum())
+
+        if 'Storage_Type' in chunk.columns:
+            self.storage_counts.update(chunk['Storage_Type'].value_counts().to_dict())
+            if 'storage_type' in chunk.columns:
+                self.storage_mismatch = (self.storage_mismatch or 0) + int(
+                    (chunk['Storage_Type'] != chunk['storage_type']).sum())
+            if 'Location' in chunk.columns:
+                pairs = chunk[['Location', 'Storage_Type']].dropna().drop_duplicates()
+                self.location_storage_pairs.update(map(tuple, pairs.to_numpy().tolist()))
+
+        if 'Case_No' in chunk.columns:
+            cases = chunk['Case_No']
+            self.case_sketch.add_series(cases)
+            if self.exact_case_counts:
+                self.case_counts.update(cases.value_counts().to_dict())
+
+        if 'Handling Fee' in chunk.columns:
+            self.has_fee = True
+            fee = chunk['Handling Fee']
+            self.fee.update(fee)
+            self.fee_negative += int((fee < 0).sum())
+
+    def _update_duplicates(self, chunk: pd.DataFrame):
+        """청크 내 중복은 정확히, 이전 청크와의 중복은 Bloom filter로 누적"""
+        try:
+            hashes = pd.util.hash_pandas_object(chunk, index=False).values
+        except TypeError:
+            hashes = pd.util.hash_pandas_object(chunk.astype(str), index=False).values
+        unique_hashes = np.unique(hashes)
+        self.duplicate_count += len(hashes) - len(unique_hashes)
+        seen = self.row_filter.contains(unique_hashes)
+        self.duplicate_count += int(seen.sum())
+        self.row_filter.add(unique_hashes[~seen])
+
+    def merge(self, other: 'ValidationProfileAccumulator'):
+        """다른 누적기 병합 (병렬 처리 결과 합치기)"""
+        self.total_records += other.total_records
+        for col in other.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        self.null_counts.update(other.null_counts)
+        # 두 누적기에 모두 있는 행 수 = |A| + |B| - |A ∪ B| (Bloom filter 추정)
+        overlap = self.row_filter.estimate_count() + other.row_filter.estimate_count()
+        self.row_filter.merge(other.row_filter)
+        overlap -= self.row_filter.estimate_count()
+        self.duplicate_count += other.duplicate_count + max(int(round(overlap)), 0)
+
+        self.qty.merge(other.qty)
+        self.qty_histogram.update(other.qty_histogram)
+        self.qty_negative += other.qty_negative
+        self.qty_zero += other.qty_zero
+
+        if pd.notnull(other.date_min):
+            self.date_min = other.date_min if pd.isnull(self.date_min) else min(self.date_min, other.date_min)
+            self.date_max = other.date_max if pd.isnull(self.date_max) else max(self.date_max, other.date_max)
+        self.date_future += other.date_future
+        self.date_very_old += other.date_very_old
+        self.date_weekend += other.date_weekend
+        self.monthly_counts.update(other.monthly_counts)
+
+        for value in other.tx_types:
+            self.tx_types.setdefault(value, True)
+        for value in other.location_values:
+            self.location_values.setdefault(value, True)
+        self.location_empty += other.location_empty
+        self.location_unknown += other.location_unknown
+
+        self.storage_counts.update(other.storage_counts)
+        if other.storage_mismatch is not None:
+            self.storage_mismatch = (self.storage_mismatch or 0) + other.storage_mismatch
+        self.location_storage_pairs |= other.location_storage_pairs
+
+        self.case_sketch.merge(other.case_sketch)
+        self.case_counts.update(other.case_counts)
+
+        self.fee.merge(other.fee)
+        self.fee_negative += other.fee_negative
+        self.has_fee = self.has_fee or other.has_fee
+        return self
+
+    def unique_cases(self) -> int:
+        """고유 Case 수 (정확 집계가 없으면 HyperLogLog 근사)"""
+        if self.exact_case_counts:
+            return len(self.case_counts)
+        return self.case_sketch.count()
+
+    def to_profile(self, valid_locations: Optional[Iterable[str]] = None,
+                   valid_tx_types: Optional[Iterable[str]] = None) -> Dict:
+        """DataValidationEngine.compute_validation_profile과 동일 구조의 프로파일 생성"""
+        columns = self.columns
+        profile = {
+            'total_records': self.total_records,
+            'columns': list(columns),
+            'null_counts': pd.Series({c: self.null_counts[c] for c in REQUIRED_COLUMNS if c in columns}, dtype='int64'),
+            'duplicate_count': self.duplicate_count,
+        }
+
+        if 'Qty' in columns:
+            profile['qty'] = {
+                'negative': self.qty_negative,
+                'zero': self.qty_zero,
+                'mean': self.qty.mean if self.qty.count else np.nan,
+                'std': self.qty.std,
+                'min': self.qty.min,
+                'max': self.qty.max,
+                'outlier_count': 0,
+            }
+            if self.qty_histogram:
+                values = np.array(sorted(self.qty_histogram), dtype=float)
+                counts = np.array([self.qty_histogram[v] for v in sorted(self.qty_histogram)], dtype=np.int64)
+                q1 = quantile_from_histogram(values, counts, 0.25)
+                q3 = quantile_from_histogram(values, counts, 0.75)
+                iqr = q3 - q1
+                outlier = (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+                profile['qty']['outlier_count'] = int(counts[outlier].sum())
+
+        if 'Date' in columns:
+            monthly = pd.Series(self.monthly_counts, dtype='int64')
+            if not monthly.empty:
+                monthly.index = pd.PeriodIndex(monthly.index, freq='M')
+            profile['date'] = {
+                'min': self.date_min,
+                'max': self.date_max,
+                'future': self.date_future,
+                'very_old': self.date_very_old,
+                'monthly_counts': monthly.sort_index(),
+                'weekend': self.date_weekend,
+            }
+
+        if 'TxType_Refined' in columns:
+            tx_types = pd.Series(list(self.tx_types)).unique()
+            valid = list(valid_tx_types or [])
+            profile['invalid_tx_types'] = tx_types[~pd.Series(tx_types).isin(valid).values]
+
+        if 'Location' in columns:
+            location_values = pd.Series(list(self.location_values)).unique()
+            valid = list(valid_locations or [])
+            profile['location'] = {
+                'empty': self.location_empty,
+                'unknown': self.location_unknown,
+                'unmapped': location_values[~pd.Series(location_values).isin(valid).values],
+                'unique_count': int(pd.Series(location_values).nunique()),
+            }
+
+        if 'Storage_Type' in columns:
+            profile['storage_counts'] = pd.Series(self.storage_counts, dtype='int64').sort_values(
+                ascending=False, kind='stable')
+            if self.storage_mismatch is not None:
+                profile['storage_mismatch'] = self.storage_mismatch
+            if 'Location' in columns:
+                pairs = pd.DataFrame(list(self.location_storage_pairs), columns=['Location', 'Storage_Type'])
+                profile['location_storage_nunique'] = pairs.groupby('Location', observed=True)['Storage_Type'].nunique()
+
+        if 'Case_No' in columns and self.exact_case_counts:
+            profile['case_counts'] = pd.Series(self.case_counts, dtype='int64')
+
+        if self.has_fee:
+            profile['handling_fee'] = {
+                'mean': self.fee.mean if self.fee.count else np.nan,
+                'std': self.fee.std,
+                'total': self.fee.total,
+                'negative': self.fee_negative,
+            }
+
+        return profile
+
+
+def accumulate_chunks(chunks: Iterable[pd.DataFrame], exact_case_counts: bool = False) -> ValidationProfileAccumulator:
+    """청크 이터러블을 누적기로 집계"""
+    accumulator = ValidationProfileAccumulator(exact_case_counts=exact_case_counts)
+    for i, chunk in enumerate(chunks, 1):
+        accumulator.update(chunk)
+        logger.debug(f"청크 {i} 누적: 누계 {accumulator.total_records:,}건")
+    return accumulator
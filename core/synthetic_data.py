@@ -0,0 +1,325 @@
+"""
+HVDC 합성 데이터 생성기
+
+HITACHI/SIMENSE Case List 와이드 워크북(창고·현장별 날짜 컬럼)과 INVOICE
+워크북을 실제 파일과 같은 헤더로 생성합니다. 케이스 수, 창고, 기간(월),
+창고 간 이동(TRANSFER) 비율, 중복 행 비율을 조절해 파이프라인 확장성
+벤치마크(scripts/benchmark_pipeline.py)와 성능 회귀 테스트 입력으로 사용합니다.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START = "2024-01-01"
+DEFAULT_MONTHS = 12
+DEFAULT_TRANSFER_RATE = 0.3
+DEFAULT_DUPLICATE_RATE = 0.01
+DEFAULT_SITE_DELIVERY_RATE = 0.85
+DEFAULT_VENDOR_SPLIT = {'HITACHI': 0.7, 'SIMENSE': 0.3}
+
+SITES = ['DAS', 'MIR', 'SHU', 'AGI']
+SITE_WEIGHTS = [0.35, 0.3, 0.25, 0.1]
+
+# 공급사별 실제 워크북 레이아웃 (창고 날짜 컬럼 순서 포함)
+VENDOR_LAYOUTS = {
+    'HITACHI': {
+        'code': 'HE',
+        'file': 'HVDC WAREHOUSE_HITACHI(HE).xlsx',
+        'head': ['no.', 'Shipment Invoice No.', 'HVDC CODE', 'HVDC CODE 1', 'HVDC CODE 2', 'HVDC CODE 3',
+                 'HVDC CODE 4', 'HVDC CODE 5', 'Site', 'EQ No', 'Case No.', 'Pkg'],
+        'mid': ['Vessel', 'COE', 'POL', 'POD', 'ETD/ATD', 'ETA/ATA'],
+        'warehouses': ['DSV Indoor', 'DSV Al Markaz', 'DSV Outdoor', 'Hauler Indoor', 'DSV MZP', 'MOSB', 'Shifting'],
+    },
+    'SIMENSE': {
+        'code': 'SIM',
+        'file': 'HVDC WAREHOUSE_SIMENSE(SIM).xlsx',
+        'head': ['No.', 'HVDC CODE', 'HVDC CODE 1', 'HVDC CODE 2', 'HVDC CODE 3', 'HVDC CODE 4', 'HVDC CODE 5',
+                 'Local', 'Site', 'SERIAL NO.', 'PO. No', 'Pkg '],
+        'mid': ['Vessel', 'Bill of Lading', 'COE', 'POL', 'POD', 'ETD/ATD', 'ETA/ATA'],
+        'warehouses': ['DSV Indoor', 'DSV Al Markaz', 'DSV Outdoor', 'DSV MZD', 'JDN MZD', 'AAA  Storage', 'HALUER', 'MOSB'],
+    },
+}
+CARGO_COLUMNS = ['Storage', 'Description', 'L(CM)', 'W(CM)', 'H(CM)', 'CBM', 'N.W(kgs)', 'G.W(kgs)',
+                 'Stack', 'HS Code', 'Currency', 'Price']
+STATUS_COLUMNS = ['Status_WAREHOUSE', 'Status_SITE', 'Status_Current', 'Status_Location', 'Status_Storage']
+# 파이프라인이 실제로 인식하는 주요 창고 (첫 입고 창고 선택 가중치)
+PRIMARY_WAREHOUSES = {'DSV Indoor': 0.3, 'DSV Al Markaz': 0.2, 'DSV Outdoor': 0.3, 'MOSB': 0.15, 'DSV MZP': 0.05}
+INVOICE_COLUMNS = ['S No.', 'Operation Month', 'HVDC CODE', 'HVDC CODE 1', 'HVDC CODE 2', 'HVDC CODE 3',
+                   'HVDC CODE 4', 'Category', 'Start', 'Finish', 'pkg', 'Weight (kg)', 'CBM',
+                   'Handling In freight ton', 'Sqm', 'Amount', 'Handling In', 'TOTAL', 'Billing month']
+INVOICE_FILE = 'HVDC WAREHOUSE_INVOICE.xlsx'
+# 합성 인보이스 단가 (AED/SQM/월, AED/freight ton)
+SYNTHETIC_RENT_RATE = {'DSV Indoor': 47.0, 'DSV Al Markaz': 47.0, 'DSV Outdoor': 18.0, 'DSV MZP': 33.0, 'MOSB': 20.0}
+SYNTHETIC_HANDLING_RATE = 25.0
+
+
+def _warehouse_paths(rng: np.random.Generator, n: int, warehouses: List[str],
+                     transfer_rate: float) -> np.ndarray:
+    """케이스별 창고 방문 순서 (n × 최대 3홉, 미방문은 -1)"""
+    weights = np.array([PRIMARY_WAREHOUSES.get(w, 0.02) for w in warehouses])
+    # 가중치 기반 무작위 순열 (Gumbel 트릭) → 홉마다 서로 다른 창고
+    keys = np.log(rng.random((n, len(warehouses)))) / weights
+    order = np.argsort(-keys, axis=1)[:, :3]
+
+    hops = 1 + (rng.random(n) < transfer_rate) + (rng.random(n) < transfer_rate / 3)
+    order[hops < 2, 1] = -1
+    order[hops < 3, 2] = -1
+    return order
+
+
+def generate_case_list(vendor: str = 'HITACHI', n_cases: int = 10_000,
+                       warehouses: Optional[Sequence[str]] = None, months: int = DEFAULT_MONTHS,
+                       start: str = DEFAULT_START, transfer_rate: float = DEFAULT_TRANSFER_RATE,
+                       duplicate_rate: float = DEFAULT_DUPLICATE_RATE,
+                       site_delivery_rate: float = DEFAULT_SITE_DELIVERY_RATE, seed: int = 0) -> pd.DataFrame:
+    """
+    공급사 Case List 와이드 시트 생성 (1행 = 1패키지 케이스)
+
+    Args:
+        vendor: 'HITACHI' 또는 'SIMENSE'
+        n_cases: 케이스(행) 수 (중복 행 제외)
+        warehouses: 사용할 창고 날짜 컬럼 (기본: 공급사 레이아웃 전체)
+        months: 입고가 발생하는 기간 (월)
+        transfer_rate: 두 번째 창고로 이동하는 케이스 비율 (세 번째는 1/3)
+        duplicate_rate: 중복 입력 행 비율
+        site_delivery_rate: 기간 내 현장 배송 비율
+    """
+    layout = VENDOR_LAYOUTS[vendor]
+    warehouses = list(warehouses) if warehouses is not None else layout['warehouses']
+    rng = np.random.default_rng(seed)
+    n = int(n_cases)
+    start_ts = pd.Timestamp(start)
+    end_ts = start_ts + pd.DateOffset(months=months)
+    span_days = max((end_ts - start_ts).days, 1)
+
+    def _days(low, high, size=n):
+        return pd.to_timedelta(rng.integers(low, high, size), unit='D')
+
+    eta = start_ts + _days(0, span_days)
+    etd = eta - _days(15, 45)
+
+    # 창고 이동 경로 → 창고별 입고일 (홉마다 5~60일 체류)
+    paths = _warehouse_paths(rng, n, warehouses, transfer_rate)
+    warehouse_dates = {w: np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]') for w in warehouses}
+    current = (eta + _days(1, 10)).to_numpy(dtype='datetime64[ns]')
+    last_date = np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]')
+    last_warehouse = np.full(n, '', dtype=object)
+    for hop in range(paths.shape[1]):
+        visit = (paths[:, hop] >= 0) & (current < end_ts.to_datetime64())
+        for w_idx, name in enumerate(warehouses):
+            mask = visit & (paths[:, hop] == w_idx)
+            warehouse_dates[name][mask] = current[mask]
+        last_date[visit] = current[visit]
+        last_warehouse[visit] = np.array(warehouses, dtype=object)[paths[visit, hop]]
+        current = current + _days(5, 60).to_numpy()
+
+    # 현장 배송 (기간 내 날짜만)
+    site = rng.choice(SITES, n, p=SITE_WEIGHTS)
+    site_date = last_date + _days(3, 45).to_numpy()
+    delivered = (rng.random(n) < site_delivery_rate) & ~np.isnat(last_date) & (site_date < end_ts.to_datetime64())
+    site_dates = {s: np.where(delivered & (site == s), site_date, np.datetime64('NaT')) for s in SITES}
+
+    codes = np.sort(rng.integers(1, max(n // 3, 1) + 1, n)) if vendor == 'HITACHI' else np.arange(1, n + 1)
+    code_labels = pd.Series(codes).map(lambda c: f"HVDC-ADOPT-{layout['code']}-{c:04d}")
+    length, width, height = rng.integers(50, 450, n), rng.integers(50, 250, n), rng.integers(30, 260, n)
+    net_weight = rng.integers(50, 20_000, n)
+    storage = rng.choice(['Indoor', 'Outdoor', 'Outdoor covered'], n, p=[0.4, 0.4, 0.2])
+
+    frame = {
+        'no.': np.arange(1, n + 1), 'No.': np.arange(1, n + 1),
+        'Shipment Invoice No.': pd.Series(codes // 50).map(lambda c: f"PRL-{layout['code']}-{c:03d}-O"),
+        'HVDC CODE': code_labels, 'HVDC CODE 1': 'HVDC', 'HVDC CODE 2': 'ADOPT',
+        'HVDC CODE 3': layout['code'], 'HVDC CODE 4': codes, 'HVDC CODE 5': np.nan,
+        'Local': '', 'Site': site, 'EQ No': pd.Series(codes % 400).map(lambda c: f"EQ-{c:03d}"),
+        'Case No.': 200_000 + np.arange(n), 'SERIAL NO.': pd.Series(np.arange(n)).map(lambda i: f"SIEFA{i:013d}"),
+        'PO. No': pd.Series(codes % 30).map(lambda c: f"SCT-19LT-PRC-PO-{c:03d}"),
+        'Pkg': rng.choice([1, 1, 1, 2, 3], n), 'Storage': storage,
+        'Description': rng.choice(['Bottom Shield', 'LV Cable', 'Transformer Part', 'Surge Arrester'], n),
+        'L(CM)': length, 'W(CM)': width, 'H(CM)': height,
+        'CBM': np.round(length * width * height / 1e6, 4),
+        'N.W(kgs)': net_weight, 'G.W(kgs)': (net_weight * rng.uniform(1.05, 1.6, n)).round(0),
+        'Stack': rng.choice(['Stackable x1', 'Non Stackable'], n), 'HS Code': '85044083', 'Currency': 'EUR',
+        'Price': rng.integers(1_000, 500_000, n), 'Vessel': rng.choice(['MSC China', 'Eugen Maersk'], n),
+        'Bill of Lading': pd.Series(codes).map(lambda c: f"MEDU{c:08d}"), 'COE': rng.choice(['Sweden', 'Germany'], n),
+        'POL': rng.choice(['Gothenburg', 'Hamburg'], n), 'POD': 'Khalifa Port',
+        'ETD/ATD': etd, 'ETA/ATA': eta,
+    }
+    frame['Pkg '] = frame['Pkg']
+    frame.update(warehouse_dates)
+    frame.update(site_dates)
+    frame.update({
+        'Status_WAREHOUSE': last_warehouse,
+        'Status_SITE': np.where(delivered, site, ''),
+        'Status_Current': np.where(delivered, 'site', np.where(last_warehouse != '', 'warehouse', 'Pre Arrival')),
+        'Status_Location': np.where(delivered, site, last_warehouse),
+        'Status_Storage': storage,
+    })
+
+    columns = layout['head'] + CARGO_COLUMNS + layout['mid'] + warehouses + SITES + STATUS_COLUMNS
+    df = pd.DataFrame({col: frame[col] for col in columns})
+
+    # 중복 입력 행 (동일 내용 재입력) 섞은 뒤 행 번호 재부여
+    duplicates = int(round(n * duplicate_rate))
+    if duplicates:
+        df = pd.concat([df, df.iloc[rng.choice(n, duplicates, replace=False)]], ignore_index=True)
+        df = df.iloc[rng.permutation(len(df))].reset_index(drop=True)
+        df[layout['head'][0]] = np.arange(1, len(df) + 1)
+    return df
+
+
+def generate_transaction_frame(n_cases: int = 10_000, warehouses: Optional[Sequence[str]] = None,
+                               months: int = DEFAULT_MONTHS, start: str = DEFAULT_START,
+                               transfer_rate: float = DEFAULT_TRANSFER_RATE, orphan_rate: float = 0.05,
+                               duplicate_rate: float = DEFAULT_DUPLICATE_RATE,
+                               site_delivery_rate: float = DEFAULT_SITE_DELIVERY_RATE,
+                               seed: int = 0) -> pd.DataFrame:
+    """
+    표준 트랜잭션 프레임 직접 생성 (IN / TRANSFER_OUT·TRANSFER_IN 짝 / FINAL_OUT)
+
+    워크북 로딩 없이 보정·중복 제거·재고 커널을 측정할 때 사용합니다.
+
+    Args:
+        orphan_rate: 짝 한쪽(TRANSFER_IN 또는 TRANSFER_OUT)이 빠진 이동 비율
+        duplicate_rate: 중복 입력된 TRANSFER 행 비율
+    """
+    warehouses = list(warehouses) if warehouses is not None else list(PRIMARY_WAREHOUSES)
+    rng = np.random.default_rng(seed)
+    n = int(n_cases)
+    start_ts = pd.Timestamp(start)
+    end_ts = (start_ts + pd.DateOffset(months=months)).to_datetime64()
+    span_days = max((pd.Timestamp(end_ts) - start_ts).days, 1)
+
+    cases = np.array([f"SYN-{i:07d}" for i in range(n)], dtype=object)
+    qty = rng.choice([1, 1, 1, 2, 3], n)
+    source = np.where(rng.random(n) < DEFAULT_VENDOR_SPLIT['HITACHI'],
+                      VENDOR_LAYOUTS['HITACHI']['file'], VENDOR_LAYOUTS['SIMENSE']['file'])
+    paths = _warehouse_paths(rng, n, warehouses, transfer_rate)
+    names = np.array(warehouses, dtype=object)
+    current = (start_ts + pd.to_timedelta(rng.integers(0, span_days, n), unit='D')).to_numpy(dtype='datetime64[ns]')
+
+    frames = []
+
+    def _events(mask, tx_type, location, loc_from, target, dates):
+        frames.append(pd.DataFrame({
+            'Case_No': cases[mask], 'Date': dates[mask], 'Location': location[mask],
+            'Source_File': source[mask], 'Loc_From': loc_from[mask], 'Target_Warehouse': target[mask],
+            'TxType_Refined': tx_type, 'Qty': qty[mask],
+        }))
+
+    first = names[paths[:, 0]]
+    _events(np.ones(n, dtype=bool), 'IN', first, np.full(n, 'SOURCE', dtype=object), first, current)
+    location = first
+    for hop in range(1, paths.shape[1]):
+        moved = (paths[:, hop] >= 0)
+        moved_dates = current + pd.to_timedelta(rng.integers(5, 60, n), unit='D').to_numpy()
+        moved &= moved_dates < end_ts
+        target = np.where(moved, names[np.maximum(paths[:, hop], 0)], location)
+        orphan = rng.random(n) < orphan_rate
+        drop_in = orphan & (rng.random(n) < 0.5)
+        _events(moved & ~(orphan & ~drop_in), 'TRANSFER_OUT', location, location, target, moved_dates)
+        _events(moved & ~drop_in, 'TRANSFER_IN', target, location, target, moved_dates)
+        location = np.where(moved, target, location)
+        current = np.where(moved, moved_dates, current)
+
+    site = rng.choice(SITES, n, p=SITE_WEIGHTS).astype(object)
+    delivered_dates = current + pd.to_timedelta(rng.integers(3, 45, n), unit='D').to_numpy()
+    delivered = (rng.random(n) < site_delivery_rate) & (delivered_dates < end_ts)
+    _events(delivered, 'FINAL_OUT', location, location, site, delivered_dates)
+
+    df = pd.concat(frames, ignore_index=True)
+    transfers = np.flatnonzero(df['TxType_Refined'].str.startswith('TRANSFER').to_numpy())
+    duplicates = min(int(round(len(transfers) * duplicate_rate)), len(transfers))
+    if duplicates:
+        df = pd.concat([df, df.iloc[rng.choice(transfers, duplicates, replace=False)]], ignore_index=True)
+    return df.sort_values(['Date', 'Case_No'], kind='stable').reset_index(drop=True)
+
+
+def generate_invoice(case_lists: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Case List 첫 입고 창고/월 기준 창고 INVOICE 시트 생성 (HVDC CODE × 창고 × 월)"""
+    rows = []
+    for vendor, df in case_lists.items():
+        warehouses = [w for w in VENDOR_LAYOUTS[vendor]['warehouses'] if w in SYNTHETIC_RENT_RATE and w in df.columns]
+        if not warehouses:
+            continue
+        dates = df[warehouses]
+        first = dates.notna().any(axis=1)
+        arrivals = pd.DataFrame({
+            'HVDC CODE': df['HVDC CODE'], 'HVDC CODE 4': df['HVDC CODE 4'],
+            'Category': dates[first].idxmin(axis=1).reindex(df.index),
+            'Arrival': dates.min(axis=1),
+            'pkg': df[[c for c in ('Pkg', 'Pkg ') if c in df.columns][0]],
+            'Weight (kg)': df['G.W(kgs)'], 'CBM': df['CBM'],
+            'Sqm': df['L(CM)'] * df['W(CM)'] / 1e4,
+        })[first]
+        arrivals['HVDC CODE 3'] = VENDOR_LAYOUTS[vendor]['code']
+        arrivals['Operation Month'] = arrivals['Arrival'].dt.to_period('M').dt.to_timestamp()
+        rows.append(arrivals)
+
+    if not rows:
+        return pd.DataFrame(columns=INVOICE_COLUMNS)
+    arrivals = pd.concat(rows, ignore_index=True)
+    invoice = (arrivals.groupby(['Operation Month', 'HVDC CODE', 'HVDC CODE 3', 'HVDC CODE 4', 'Category'], sort=True)
+               .agg(Start=('Arrival', 'min'), Finish=('Arrival', 'max'), pkg=('pkg', 'sum'),
+                    **{'Weight (kg)': ('Weight (kg)', 'sum'), 'CBM': ('CBM', 'sum'), 'Sqm': ('Sqm', 'sum')})
+               .reset_index())
+    invoice['HVDC CODE 1'] = 'HVDC'
+    invoice['HVDC CODE 2'] = 'ADOPT'
+    invoice['Sqm'] = invoice['Sqm'].round(2)
+    invoice['Handling In freight ton'] = invoice['CBM'].round(2)
+    invoice['Amount'] = (invoice['Sqm'] * invoice['Category'].map(SYNTHETIC_RENT_RATE)).round(2)
+    invoice['Handling In'] = (invoice['Handling In freight ton'] * SYNTHETIC_HANDLING_RATE).round(2)
+    invoice['TOTAL'] = invoice['Amount'] + invoice['Handling In']
+    invoice['Billing month'] = invoice['Operation Month']
+    invoice['S No.'] = np.arange(1, len(invoice) + 1)
+    return invoice[INVOICE_COLUMNS]
+
+
+def _write_sheet(df: pd.DataFrame, path: Path, sheet_name: str):
+    with pd.ExcelWriter(path, engine='xlsxwriter', datetime_format='yyyy-mm-dd') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def write_synthetic_dataset(out_dir: Union[str, Path], n_cases: int = 10_000,
+                            vendor_split: Optional[Dict[str, float]] = None,
+                            include_invoice: bool = True, seed: int = 0, **options) -> Dict[str, str]:
+    """
+    합성 원본 폴더 생성 (DataLoader.load_excel_files 입력과 같은 파일명)
+
+    Args:
+        out_dir: 출력 폴더
+        n_cases: 전체 케이스 수 (vendor_split 비율로 공급사에 배분)
+        options: generate_case_list 옵션 (months, transfer_rate, duplicate_rate 등)
+
+    Returns:
+        dict: {'HITACHI': 경로, 'SIMENSE': 경로, 'INVOICE': 경로}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    vendor_split = vendor_split or DEFAULT_VENDOR_SPLIT
+    total = sum(vendor_split.values())
+
+    print(f"🧪 합성 데이터 생성 중: {n_cases:,}건 케이스 → {out_dir}")
+    case_lists, paths = {}, {}
+    for offset, (vendor, share) in enumerate(vendor_split.items()):
+        vendor_cases = int(round(n_cases * share / total))
+        if vendor_cases <= 0:
+            continue
+        case_lists[vendor] = generate_case_list(vendor, vendor_cases, seed=seed + offset, **options)
+        path = out_dir / VENDOR_LAYOUTS[vendor]['file']
+        _write_sheet(case_lists[vendor], path, 'Case List')
+        paths[vendor] = str(path)
+        print(f"   ✅ {path.name}: {len(case_lists[vendor]):,}행")
+
+    if include_invoice:
+        path = out_dir / INVOICE_FILE
+        invoice = generate_invoice(case_lists)
+        _write_sheet(invoice, path, 'Invoice')
+        paths['INVOICE'] = str(path)
+        print(f"   ✅ {path.name}: {len(invoice):,}행")
+    return paths
@@ -3,15 +3,44 @@ HVDC 케이스별 이동 타임라인 추적 모듈
 각 케이스의 이동 경로와 시간을 완전 추적
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 from collections import defaultdict, deque
 
+from core.flow_index import MovementFlowIndex
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 트랜잭션 data 필드 우선순위 (레거시 추출 함수와 컬럼형 빌더 공용)
+CASE_ID_FIELDS = ['Case', 'case', 'case_id', 'CaseID', 'ID', 'SerialNumber', 'Part']
+DATETIME_FIELDS = ['date', 'timestamp', 'Date', 'Timestamp']
+LOCATION_FIELDS = ['warehouse', 'site', 'location', 'from', 'to']
+
+# 컬럼형 타임라인 컬럼 (export_timeline_to_dataframe 결과와 동일)
+TIMELINE_COLUMNS = [
+    'case_id', 'sequence', 'timestamp', 'location', 'action',
+    'incoming', 'outgoing', 'inventory', 'source_file',
+    'movement_from', 'movement_to', 'movement_duration_hours'
+]
+
+# 비정상 패턴 프레임 컬럼 / 유형 순서 (레거시 감지 순서와 동일)
+ANOMALY_COLUMNS = ['case_id', 'sequence', 'timestamp', 'location', 'type', 'hours', 'reason']
+ANOMALY_TYPES = ['INSTANT_MOVEMENT', 'LONG_STAY', 'LOCATION_REVISIT']
+
+
+def _present_mask(values: pd.Series) -> pd.Series:
+    """레거시 `if data[field]` 판정과 같은 값 존재 마스크 (None/NaN/빈 문자열/0 제외)"""
+    mask = values.notnull()
+    if values.dtype == object:
+        mask &= ~values.isin(['', 0, False])
+    elif pd.api.types.is_numeric_dtype(values):
+        mask &= values != 0
+    return mask
+
 class TimelineTracker:
     """HVDC 케이스별 이동 타임라인 추적기"""
     
@@ -19,10 +48,14 @@ class TimelineTracker:
         self.case_timelines = {}  # case_id -> timeline
         self.location_history = defaultdict(list)  # case_id -> location history
         self.movement_chains = defaultdict(list)  # case_id -> movement chain
+        self.flow_index: Optional[MovementFlowIndex] = None  # OD 흐름/체류시간 인덱스
         self.timeline_rules = {
             'max_timeline_days': 365,  # 최대 추적 기간
             'movement_gap_hours': 24,  # 이동 간격 임계값
             'location_validation': True,  # 위치 유효성 검증
+            'instant_movement_hours': 0.1,  # 순간이동 임계값 (6분 미만)
+            'long_stay_hours': 24 * 30,  # 장기 체류 임계값 (30일 이상)
+            'revisit_window': 3,  # 반복 방문 판정 직전 위치 수
         }
         
     def create_case_timeline(self, transactions: List[Dict]) -> Dict[str, List[Dict]]:
@@ -48,6 +81,123 @@ class TimelineTracker:
         logger.info(f"✅ 타임라인 생성 완료: {len(timelines)}개 케이스")
         return timelines
     
+    def create_case_timeline_frame(self, transactions: List[Dict]) -> pd.DataFrame:
+        """
+        컬럼형 케이스 타임라인 생성
+
+        (case, timestamp) 1회 정렬 + groupby.shift로 이동(from/to/소요시간)을 계산합니다.
+        케이스/위치/액션/소스 컬럼은 category로 저장하고 raw_data는 복제하지 않습니다.
+        케이스 순서는 create_case_timeline과 동일하게 최초 등장 순서를 따릅니다.
+        """
+        logger.info(f"📅 컬럼형 타임라인 생성 시작: {len(transactions)}건")
+        
+        columns = self._transactions_to_columns(transactions)
+        columns = columns[columns['case_id'].notnull()]
+        timeline = self._derive_timeline_columns(columns)
+        
+        logger.info(f"✅ 컬럼형 타임라인 생성 완료: {timeline['case_id'].nunique()}개 케이스, {len(timeline)}행")
+        return timeline
+    
+    def _transactions_to_columns(self, transactions: List[Dict]) -> pd.DataFrame:
+        """트랜잭션 리스트에서 케이스/시간/위치/수량 컬럼 일괄 추출"""
+        data = pd.DataFrame([tx.get('data', {}) for tx in transactions])
+        source = pd.Series([tx.get('source_file', '') for tx in transactions], dtype=object)
+        n = len(transactions)
+        
+        def first_present(fields, convert):
+            result = pd.Series([None] * n, dtype=object)
+            for field in reversed(fields):
+                if field in data.columns:
+                    converted = convert(data[field])
+                    mask = _present_mask(data[field]) & converted.notnull()
+                    result = result.mask(mask.values, converted)
+            return result
+        
+        case_id = first_present(CASE_ID_FIELDS, lambda col: col.astype(str))
+        from_file = source.str.lower().str.contains('case', na=False) & case_id.isnull()
+        case_id[from_file] = 'FILE_' + source[from_file].str.split('.').str[0]
+        
+        timestamp = first_present(DATETIME_FIELDS, lambda col: pd.to_datetime(col, errors='coerce'))
+        timestamp = pd.to_datetime(timestamp.fillna(datetime.now()))
+        
+        location = first_present(LOCATION_FIELDS, lambda col: col.astype(str)).fillna('UNKNOWN')
+        
+        quantities = {
+            name: pd.to_numeric(data[name], errors='coerce').fillna(0) if name in data.columns else pd.Series(0, index=data.index)
+            for name in ['incoming', 'outgoing', 'inventory']
+        }
+        incoming, outgoing = quantities['incoming'], quantities['outgoing']
+        action = np.select(
+            [(incoming > 0) & (outgoing == 0), (outgoing > 0) & (incoming == 0), (incoming > 0) & (outgoing > 0)],
+            ['INBOUND', 'OUTBOUND', 'TRANSFER'],
+            default='STATUS_CHECK'
+        )
+        
+        return pd.DataFrame({
+            'case_id': case_id.values,
+            'timestamp': timestamp.values,
+            'location': location.values,
+            'action': action,
+            'incoming': incoming.values,
+            'outgoing': outgoing.values,
+            'inventory': quantities['inventory'].values,
+            'source_file': source.values,
+        })
+    
+    def _derive_timeline_columns(self, columns: pd.DataFrame) -> pd.DataFrame:
+        """정렬 + shift로 순번/이동 컬럼 계산"""
+        df = columns.copy()
+        df['case_id'] = pd.Categorical(df['case_id'], categories=pd.unique(df['case_id']))
+        for col in ['location', 'action', 'source_file']:
+            df[col] = df[col].astype('category')
+        
+        df = df.sort_values(['case_id', 'timestamp'], kind='stable').reset_index(drop=True)
+        grouped = df.groupby('case_id', observed=True, sort=False)
+        df['sequence'] = (grouped.cumcount() + 1).astype('int32')
+        
+        prev_location = grouped['location'].shift(1)
+        prev_timestamp = grouped['timestamp'].shift(1)
+        moved = prev_location.notnull() & (prev_location.astype(object) != df['location'].astype(object))
+        
+        df['movement_from'] = prev_location.where(moved)
+        df['movement_to'] = df['location'].where(moved)
+        df['movement_duration_hours'] = ((df['timestamp'] - prev_timestamp).dt.total_seconds() / 3600).where(moved)
+        
+        return df[TIMELINE_COLUMNS]
+    
+    def _frame_to_timelines(self, timeline: pd.DataFrame) -> Dict[str, List[Dict]]:
+        """컬럼형 타임라인 → 레거시 dict 타임라인 (무결성 검증 등 호환용)"""
+        timelines = {}
+        for rec in timeline.to_dict('records'):
+            timelines.setdefault(rec['case_id'], []).append(self._frame_entry(rec))
+        return timelines
+    
+    def _frame_entry(self, rec: Dict) -> Dict:
+        """컬럼형 타임라인 행(record) → 레거시 타임라인 엔트리"""
+        entry = {
+            'sequence': rec['sequence'],
+            'case_id': rec['case_id'],
+            'timestamp': rec['timestamp'],
+            'location': rec['location'],
+            'action': rec['action'],
+            'quantity': {'incoming': rec['incoming'], 'outgoing': rec['outgoing'], 'inventory': rec['inventory']},
+            'source': rec['source_file'],
+        }
+        if pd.notnull(rec['movement_from']):
+            hours = rec['movement_duration_hours']
+            duration = timedelta(hours=hours)
+            entry['movement'] = {
+                'from': rec['movement_from'],
+                'to': rec['movement_to'],
+                'duration': {
+                    'total_seconds': hours * 3600,
+                    'hours': hours,
+                    'days': duration.days,
+                    'human_readable': str(duration)
+                }
+            }
+        return entry
+    
     def _group_by_case_id(self, transactions: List[Dict]) -> Dict[str, List[Dict]]:
         """케이스 ID별로 트랜잭션 그룹화"""
         groups = defaultdict(list)
@@ -64,9 +214,7 @@ class TimelineTracker:
         data = transaction.get('data', {})
         
         # 여러 필드에서 케이스 ID 찾기
-        case_fields = ['Case', 'case_id', 'CaseID', 'ID', 'SerialNumber', 'Part']
-        
-        for field in case_fields:
+        for field in CASE_ID_FIELDS:
             if field in data and data[field]:
                 return str(data[field])
                 
@@ -83,9 +231,7 @@ class TimelineTracker:
         data = transaction.get('data', {})
         
         # 날짜 필드들 확인
-        date_fields = ['date', 'timestamp', 'Date', 'Timestamp']
-        
-        for field in date_fields:
+        for field in DATETIME_FIELDS:
             if field in data and data[field]:
                 try:
                     if isinstance(data[field], datetime):
@@ -135,9 +281,7 @@ class TimelineTracker:
         data = transaction.get('data', {})
         
         # 위치 필드들 우선순위별 확인
-        location_fields = ['warehouse', 'site', 'location', 'from', 'to']
-        
-        for field in location_fields:
+        for field in LOCATION_FIELDS:
             if field in data and data[field]:
                 return str(data[field])
                 
@@ -183,10 +327,13 @@ class TimelineTracker:
             'human_readable': str(duration)
         }
     
-    def analyze_movement_patterns(self, timelines: Dict[str, List[Dict]]) -> Dict[str, Any]:
-        """이동 패턴 분석"""
+    def analyze_movement_patterns(self, timelines) -> Dict[str, Any]:
+        """이동 패턴 분석 (dict 타임라인 또는 컬럼형 타임라인)"""
         logger.info("📊 이동 패턴 분석 시작")
         
+        if isinstance(timelines, pd.DataFrame):
+            return self._analyze_movement_patterns_frame(timelines)
+        
         movement_stats = {
             'total_cases': len(timelines),
             'total_movements': 0,
@@ -222,10 +369,62 @@ class TimelineTracker:
         logger.info(f"✅ 이동 패턴 분석 완료: {movement_stats['total_movements']}건 이동")
         return movement_stats
     
-    def detect_anomalous_movements(self, timelines: Dict[str, List[Dict]]) -> List[Dict]:
-        """비정상적인 이동 패턴 감지"""
+    def update_flow_index(self, timeline: pd.DataFrame) -> MovementFlowIndex:
+        """컬럼형 타임라인 배치로 흐름 인덱스 생성/증분 갱신"""
+        if self.flow_index is None:
+            self.flow_index = MovementFlowIndex()
+        self.flow_index.update(timeline)
+        return self.flow_index
+    
+    def _analyze_movement_patterns_frame(self, timeline: pd.DataFrame) -> Dict[str, Any]:
+        """
+        컬럼형 타임라인 이동 패턴 분석 (groupby 집계, 결과는 레거시와 같은 일반 dict)
+
+        흐름 인덱스가 아직 없으면 이 타임라인으로 self.flow_index를 만들어 두고,
+        이미 있으면 다시 만들지 않습니다 (증분 적재는 update_flow_index).
+        """
+        movements = timeline[timeline['movement_from'].notnull()]
+        if self.flow_index is None:
+            self.update_flow_index(timeline)
+        durations = movements['movement_duration_hours']
+        positive = durations[durations > 0]
+        routes = movements.groupby(['movement_from', 'movement_to'], observed=True, sort=False).size()
+        
+        movement_stats = {
+            'total_cases': timeline['case_id'].nunique(),
+            'total_movements': len(movements),
+            'location_frequency': timeline['location'].value_counts(sort=False).loc[lambda s: s > 0].to_dict(),
+            'movement_routes': {f"{src} → {dst}": int(count) for (src, dst), count in routes.items()},
+            'average_stay_duration': {},
+            'movement_velocity': positive.tolist()
+        }
+        if not positive.empty:
+            movement_stats['avg_movement_time'] = float(positive.mean())
+            movement_stats['fastest_movement'] = float(positive.min())
+            movement_stats['slowest_movement'] = float(positive.max())
+        
+        logger.info(f"✅ 이동 패턴 분석 완료: {movement_stats['total_movements']}건 이동")
+        return movement_stats
+    
+    def detect_anomalous_movements(self, timelines) -> List[Dict]:
+        """
+        비정상적인 이동 패턴 감지 (dict 타임라인 또는 컬럼형 타임라인)
+
+        입력 형태와 관계없이 레거시 구조({'case_id', 'type', 'entry', 'reason'}) 리스트를 반환합니다.
+        컬럼형 결과를 DataFrame으로 받으려면 detect_anomaly_frame을 사용하세요.
+        """
         logger.info("🚨 비정상 이동 패턴 감지")
         
+        if isinstance(timelines, pd.DataFrame):
+            rows = self._anomaly_rows(timelines)
+            entries = timelines.loc[rows['_row']].to_dict('records')
+            anomalies = [
+                {'case_id': str(case_id), 'type': anomaly_type, 'entry': self._frame_entry(rec), 'reason': reason}
+                for case_id, anomaly_type, reason, rec in zip(rows['case_id'], rows['type'], rows['reason'], entries)
+            ]
+            logger.info(f"⚠️ 비정상 패턴 감지: {len(anomalies)}건")
+            return anomalies
+        
         anomalies = []
         
         for case_id, timeline in timelines.items():
@@ -235,15 +434,78 @@ class TimelineTracker:
         logger.info(f"⚠️ 비정상 패턴 감지: {len(anomalies)}건")
         return anomalies
     
+    def detect_anomaly_frame(self, timeline: pd.DataFrame) -> pd.DataFrame:
+        """
+        컬럼형 타임라인 비정상 패턴 감지 (벡터 연산)
+
+        순간이동/장기 체류는 이동 소요시간 컬럼과 임계값 비교로,
+        반복 방문은 케이스 내 직전 N개 위치(shift)와의 비교로 계산합니다.
+        결과 순서는 레거시 감지(케이스 → 순번 → 유형)와 동일합니다.
+        """
+        logger.info("🚨 비정상 이동 패턴 감지 (컬럼형)")
+        
+        anomalies = self._anomaly_rows(timeline)
+        anomalies['type'] = pd.Categorical(anomalies['type'], categories=ANOMALY_TYPES)
+        
+        logger.info(f"⚠️ 비정상 패턴 감지: {len(anomalies)}건")
+        return anomalies[ANOMALY_COLUMNS]
+    
+    def _anomaly_rows(self, timeline: pd.DataFrame) -> pd.DataFrame:
+        """비정상 패턴 행 (ANOMALY_COLUMNS + 원본 타임라인 행 레이블 _row, 유형은 문자열)"""
+        instant_hours = self.timeline_rules['instant_movement_hours']
+        long_stay_hours = self.timeline_rules['long_stay_hours']
+        window = self.timeline_rules['revisit_window']
+        
+        grouped = timeline.groupby('case_id', observed=True, sort=False)
+        duration = timeline['movement_duration_hours']
+        next_duration = grouped['movement_duration_hours'].shift(-1)
+        location = timeline['location'].astype(object)
+        
+        revisit = pd.Series(False, index=timeline.index)
+        for lag in range(1, window + 1):
+            revisit |= grouped['location'].shift(lag).astype(object) == location
+        revisit &= timeline['sequence'] > 2
+        
+        base = timeline[['case_id', 'sequence', 'timestamp', 'location']]
+        parts = []
+        for type_order, (anomaly_type, mask, hours) in enumerate([
+            ('INSTANT_MOVEMENT', duration < instant_hours, duration),
+            ('LONG_STAY', next_duration > long_stay_hours, next_duration),
+            ('LOCATION_REVISIT', revisit, pd.Series(np.nan, index=timeline.index)),
+        ]):
+            part = base[mask].assign(type=anomaly_type, hours=hours[mask], _order=type_order)
+            parts.append(part)
+        
+        anomalies = pd.concat(parts)
+        anomalies['_row'] = anomalies.index
+        anomalies = anomalies.sort_values(['_row', '_order'], kind='stable').reset_index(drop=True)
+        
+        reason = pd.Series('', index=anomalies.index, dtype=object)
+        for anomaly_type, template in [
+            ('INSTANT_MOVEMENT', 'Movement in {hours:.2f} hours'),
+            ('LONG_STAY', 'Stayed {hours:.1f} hours at {location}'),
+            ('LOCATION_REVISIT', 'Revisited {location}'),
+        ]:
+            mask = anomalies['type'] == anomaly_type
+            reason[mask] = [
+                template.format(hours=h, location=loc)
+                for h, loc in zip(anomalies.loc[mask, 'hours'], anomalies.loc[mask, 'location'])
+            ]
+        anomalies['reason'] = reason
+        return anomalies
+    
     def _detect_case_anomalies(self, case_id: str, timeline: List[Dict]) -> List[Dict]:
         """단일 케이스의 비정상 패턴 감지"""
         anomalies = []
+        instant_hours = self.timeline_rules['instant_movement_hours']
+        long_stay_hours = self.timeline_rules['long_stay_hours']
+        window = self.timeline_rules['revisit_window']
         
         for i, entry in enumerate(timeline):
             # 1. 순간이동 감지 (너무 짧은 시간 내 이동)
             if 'movement' in entry:
                 duration_hours = entry['movement']['duration']['hours']
-                if duration_hours < 0.1:  # 6분 미만
+                if duration_hours < instant_hours:
                     anomalies.append({
                         'case_id': case_id,
                         'type': 'INSTANT_MOVEMENT',
@@ -256,7 +518,7 @@ class TimelineTracker:
                 next_entry = timeline[i + 1]
                 if 'movement' in next_entry:
                     stay_duration = next_entry['movement']['duration']['hours']
-                    if stay_duration > 24 * 30:  # 30일 이상
+                    if stay_duration > long_stay_hours:
                         anomalies.append({
                             'case_id': case_id,
                             'type': 'LONG_STAY',
@@ -266,7 +528,7 @@ class TimelineTracker:
                         
             # 3. 동일 위치 반복 방문
             if i > 1:
-                prev_locations = [timeline[j]['location'] for j in range(max(0, i-3), i)]
+                prev_locations = [timeline[j]['location'] for j in range(max(0, i-window), i)]
                 if entry['location'] in prev_locations:
                     anomalies.append({
                         'case_id': case_id,
@@ -277,10 +539,13 @@ class TimelineTracker:
                     
         return anomalies
     
-    def generate_movement_report(self, timelines: Dict[str, List[Dict]]) -> Dict[str, Any]:
-        """이동 리포트 생성"""
+    def generate_movement_report(self, timelines) -> Dict[str, Any]:
+        """이동 리포트 생성 (dict 타임라인 또는 컬럼형 타임라인)"""
         logger.info("📋 이동 리포트 생성")
         
+        if isinstance(timelines, pd.DataFrame):
+            return self._generate_movement_report_frame(timelines)
+        
         # 패턴 분석
         patterns = self.analyze_movement_patterns(timelines)
         
@@ -314,6 +579,48 @@ class TimelineTracker:
         logger.info("✅ 이동 리포트 생성 완료")
         return report
     
+    def _generate_movement_report_frame(self, timeline: pd.DataFrame) -> Dict[str, Any]:
+        """컬럼형 타임라인 이동 리포트 (케이스 요약은 DataFrame으로 반환)"""
+        patterns = self.analyze_movement_patterns(timeline)
+        anomalies = self.detect_anomaly_frame(timeline)
+        
+        report = {
+            'summary': {
+                'total_cases': timeline['case_id'].nunique(),
+                'total_timeline_entries': len(timeline),
+                'analysis_timestamp': datetime.now()
+            },
+            'movement_patterns': patterns,
+            'anomalies': {
+                'count': len(anomalies),
+                'types': anomalies['type'].value_counts(sort=False).loc[lambda s: s > 0].to_dict(),
+                'details': anomalies.head(10).to_dict('records')
+            },
+            'case_summaries': self._summarize_cases_frame(timeline),
+            'top_locations': dict(sorted(patterns['location_frequency'].items(),
+                                       key=lambda x: x[1], reverse=True)[:10]),
+            'top_routes': dict(sorted(patterns['movement_routes'].items(),
+                                    key=lambda x: x[1], reverse=True)[:10])
+        }
+        
+        logger.info("✅ 이동 리포트 생성 완료")
+        return report
+    
+    def _summarize_cases_frame(self, timeline: pd.DataFrame) -> pd.DataFrame:
+        """케이스별 요약 (컬럼형, case_id 인덱스)"""
+        grouped = timeline.groupby('case_id', observed=True, sort=False)
+        summaries = pd.DataFrame({
+            'total_entries': grouped.size(),
+            'total_movements': grouped['movement_from'].count(),
+            'unique_locations': grouped['location'].nunique(),
+            'start_location': grouped['location'].first(),
+            'end_location': grouped['location'].last(),
+            'start': grouped['timestamp'].first(),
+            'end': grouped['timestamp'].last(),
+        })
+        summaries['total_days'] = (summaries['end'] - summaries['start']).dt.days
+        return summaries
+    
     def _summarize_case(self, timeline: List[Dict]) -> Dict[str, Any]:
         """케이스별 요약 생성"""
         if not timeline:
@@ -345,10 +652,13 @@ class TimelineTracker:
             
         return dict(categories)
     
-    def export_timeline_to_dataframe(self, timelines: Dict[str, List[Dict]]) -> pd.DataFrame:
-        """타임라인을 DataFrame으로 변환"""
+    def export_timeline_to_dataframe(self, timelines) -> pd.DataFrame:
+        """타임라인을 DataFrame으로 변환 (컬럼형 타임라인은 그대로 복사)"""
         logger.info("📊 타임라인 DataFrame 변환")
         
+        if isinstance(timelines, pd.DataFrame):
+            return timelines[TIMELINE_COLUMNS].copy()
+        
         all_entries = []
         
         for case_id, timeline in timelines.items():
@@ -386,10 +696,13 @@ class TimelineTracker:
         
         return df
     
-    def validate_timeline_integrity(self, timelines: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def validate_timeline_integrity(self, timelines) -> Dict[str, Any]:
         """타임라인 무결성 검증"""
         logger.info("🔍 타임라인 무결성 검증")
         
+        if isinstance(timelines, pd.DataFrame):
+            timelines = self._frame_to_timelines(timelines)
+        
         validation_results = {
             'total_cases': len(timelines),
             'valid_cases': 0,
@@ -0,0 +1,171 @@
+"""
+HVDC 표준 트랜잭션 로그 (artifacts/transaction_log.parquet)
+
+TRANSFER 보정 + 중복 제거가 끝난 트랜잭션 로그를 월(month) × 공급사(vendor)
+hive 파티션 Parquet 데이터셋으로 저장하는 정본 이벤트 저장소입니다.
+문자열 컬럼은 dictionary 인코딩하고 스키마 버전을 메타데이터로 기록합니다.
+진단 스크립트/리포트/RDF 변환은 워크북을 다시 읽지 않고 read_transaction_log의
+파티션·조건 푸시다운으로 필요한 이벤트만 읽습니다.
+"""
+
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.lazy_loading import lazy_module, module_available
+
+# pyarrow.dataset은 로그 저장/조회 시에만 import
+PYARROW_AVAILABLE = module_available('pyarrow')
+pa = lazy_module('pyarrow')
+ds = lazy_module('pyarrow.dataset')
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_LOG_PATH = "artifacts/transaction_log.parquet"
+TRANSACTION_LOG_SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = b'hvdc_schema_version'
+PARTITION_COLUMNS = ['month', 'vendor']
+
+# Source_File 기반 공급사 추정 (Vendor 컬럼이 없는 로그용)
+VENDOR_FILE_PATTERNS = {
+    'HITACHI': ['HITACHI', '(HE'],
+    'SIMENSE': ['SIMENSE', 'SIEMENS', '(SIM'],
+}
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("transaction_log 저장/조회에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+
+def infer_vendor(df: pd.DataFrame) -> pd.Series:
+    """Vendor 컬럼 또는 Source_File 파일명으로 공급사 파티션 값 결정"""
+    if 'Vendor' in df.columns:
+        vendor = df['Vendor'].astype(str).str.strip().str.upper()
+        return vendor.where(df['Vendor'].notnull() & (vendor != ''), 'UNKNOWN')
+
+    vendor = pd.Series('UNKNOWN', index=df.index, dtype=object)
+    if 'Source_File' in df.columns:
+        source = df['Source_File'].astype(object).fillna('').astype(str).str.upper()
+        for name, patterns in VENDOR_FILE_PATTERNS.items():
+            mask = np.zeros(len(df), dtype=bool)
+            for pattern in patterns:
+                mask |= source.str.contains(pattern, regex=False).to_numpy()
+            vendor[mask & (vendor == 'UNKNOWN').to_numpy()] = name
+    return vendor
+
+
+def _to_arrow_table(df: pd.DataFrame) -> 'pa.Table':
+    """문자열 컬럼 dictionary 인코딩 + 스키마 버전 메타데이터"""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+            # 혼합 타입 컬럼은 문자열로 통일 (결측 유지)
+            df[col] = df[col].where(df[col].isnull(), df[col].astype(str))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        if field.name not in PARTITION_COLUMNS and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            field = pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+        fields.append(field)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SCHEMA_VERSION_KEY] = str(TRANSACTION_LOG_SCHEMA_VERSION).encode('utf-8')
+    return table.cast(pa.schema(fields, metadata=metadata))
+
+
+def write_transaction_log(df: pd.DataFrame, path: Union[str, Path] = TRANSACTION_LOG_PATH) -> str:
+    """
+    트랜잭션 로그 저장 (기존 데이터셋 전체 교체)
+
+    Args:
+        df: TRANSFER 보정/중복 제거가 끝난 트랜잭션 DataFrame (Date 컬럼 필요)
+        path: 데이터셋 폴더 경로
+    """
+    _require_pyarrow()
+    path = Path(path)
+    print(f"🗄️ 트랜잭션 로그 저장 중: {path} ({len(df):,}건)")
+
+    log = df.copy()
+    dates = pd.to_datetime(log['Date'], errors='coerce')
+    log['Date'] = dates
+    log['month'] = dates.dt.strftime('%Y-%m').fillna('UNKNOWN')
+    log['vendor'] = infer_vendor(log)
+
+    table = _to_arrow_table(log)
+    if path.exists():
+        shutil.rmtree(path) if path.is_dir() else path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        table, str(path), format='parquet',
+        partitioning=ds.partitioning(pa.schema([(col, pa.string()) for col in PARTITION_COLUMNS]), flavor='hive'),
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+    partitions = log.groupby(PARTITION_COLUMNS).ngroups
+    print(f"✅ 트랜잭션 로그 저장 완료: {partitions}개 파티션 (schema v{TRANSACTION_LOG_SCHEMA_VERSION})")
+    return str(path)
+
+
+def open_transaction_log(path: Union[str, Path] = TRANSACTION_LOG_PATH) -> 'ds.Dataset':
+    """트랜잭션 로그 데이터셋 열기 (스키마 버전 확인)"""
+    _require_pyarrow()
+    if not Path(path).exists():
+        raise FileNotFoundError(f"트랜잭션 로그가 없습니다: {path} (파이프라인을 먼저 실행하세요)")
+    dataset = ds.dataset(str(path), format='parquet', partitioning='hive')
+    version = int((dataset.schema.metadata or {}).get(SCHEMA_VERSION_KEY, b'0'))
+    if version != TRANSACTION_LOG_SCHEMA_VERSION:
+        raise ValueError(
+            f"트랜잭션 로그 스키마 버전 불일치: {version} (지원: {TRANSACTION_LOG_SCHEMA_VERSION}) - 파이프라인을 다시 실행하세요"
+        )
+    return dataset
+
+
+def read_transaction_log(path: Union[str, Path] = TRANSACTION_LOG_PATH,
+                         columns: Optional[List[str]] = None,
+                         months: Optional[Iterable[str]] = None,
+                         vendors: Optional[Iterable[str]] = None,
+                         tx_types: Optional[Iterable[str]] = None,
+                         case_nos: Optional[Iterable[str]] = None,
+                         filter=None,
+                         decode_categories: bool = False) -> pd.DataFrame:
+    """
+    트랜잭션 로그 조회 (파티션/조건 푸시다운)
+
+    Args:
+        months: 'YYYY-MM' 목록 (month 파티션 가지치기)
+        vendors: 공급사 목록 (vendor 파티션 가지치기)
+        tx_types: TxType_Refined 값 목록
+        case_nos: Case_No 목록
+        filter: 추가 pyarrow.dataset 조건식
+        decode_categories: dictionary 컬럼을 category 대신 일반 문자열로 반환
+    """
+    dataset = open_transaction_log(path)
+
+    conditions = []
+    if months is not None:
+        conditions.append(ds.field('month').isin(list(months)))
+    if vendors is not None:
+        conditions.append(ds.field('vendor').isin([str(v).upper() for v in vendors]))
+    if tx_types is not None:
+        conditions.append(ds.field('TxType_Refined').isin(list(tx_types)))
+    if case_nos is not None:
+        conditions.append(ds.field('Case_No').isin([str(c) for c in case_nos]))
+    if filter is not None:
+        conditions.append(filter)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    df = table.to_pandas()
+    if decode_categories:
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+    return df
@@ -0,0 +1,293 @@
+"""
+HVDC 트랜잭션 변환 공용 모듈
+
+DataLoader 원시 트랜잭션 → 표준 트랜잭션 DataFrame 변환과 일별 재고 계산.
+main.py / 검증 스크립트 / 스테이지 DAG(core.pipeline_dag)가 같은 구현을 공유합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.dtypes import apply_dtype_policy
+from core.mapping_utils import normalize_all_keys
+from mapping_utils import add_storage_type_to_dataframe
+
+REQUIRED_COLUMNS = ['Case_No', 'Date', 'Qty', 'TxType_Refined', 'Location', 'Loc_From', 'Target_Warehouse']
+# 일별 재고: 피벗 컬럼(TxType) → 재고 컬럼, 재고 계산에서 제외하는 위치, 출력 컬럼 순서
+INVENTORY_FLOWS = {'IN': 'Inbound', 'TRANSFER_OUT': 'Transfer_Out', 'FINAL_OUT': 'Final_Out'}
+SKIP_LOCATIONS = ['UNKNOWN', 'UNK', '']
+DAILY_STOCK_COLUMNS = ['Location', 'Date', 'Opening_Stock', 'Inbound', 'Transfer_Out', 'Final_Out',
+                       'Total_Outbound', 'Closing_Stock']
+
+
+def prepare_transaction_frame(transactions):
+    """원시 트랜잭션 → 정규화 + Storage_Type + 필수 컬럼 보장 + dtype 정책 적용 DataFrame"""
+    transaction_df = transactions_to_dataframe(transactions)
+    transaction_df = normalize_all_keys(transaction_df)
+    transaction_df = add_storage_type_to_dataframe(transaction_df, "Location")
+
+    for col in REQUIRED_COLUMNS:
+        if col not in transaction_df.columns:
+            if col == 'Loc_From':
+                transaction_df[col] = 'SOURCE'
+            elif col == 'Target_Warehouse':
+                transaction_df[col] = transaction_df.get('Location', 'UNKNOWN')
+            else:
+                transaction_df[col] = 'UNKNOWN'
+    return apply_dtype_policy(transaction_df)
+
+def transactions_to_dataframe(transactions):
+    """트랜잭션 리스트를 DataFrame으로 변환 - 개선된 버전"""
+    data = []
+    
+    print("🔄 트랜잭션 변환 중...")
+    
+    for tx in transactions:
+        tx_data = tx.get('data', {})
+        
+        # 기본 정보 추출
+        case_id = extract_case_id(tx_data)
+        warehouse = extract_warehouse(tx_data)
+        date_val = extract_datetime(tx_data)
+        
+        # 수량 처리
+        incoming = tx_data.get('incoming', 0) or 0
+        outgoing = tx_data.get('outgoing', 0) or 0
+        
+        # 기본 레코드 템플릿
+        base_record = {
+            'Case_No': case_id,
+            'Date': date_val,
+            'Location': warehouse,
+            'Source_File': tx.get('source_file', ''),
+            'Loc_From': 'SOURCE',
+            'Target_Warehouse': warehouse
+        }
+        
+        # IN 트랜잭션 생성
+        if incoming > 0:
+            record = base_record.copy()
+            record.update({
+                'TxType_Refined': 'IN',
+                'Qty': int(incoming)
+            })
+            data.append(record)
+            
+        # OUT 트랜잭션 생성
+        if outgoing > 0:
+            record = base_record.copy()
+            
+            # 사이트 구분하여 FINAL_OUT vs TRANSFER_OUT 결정
+            site = extract_site(warehouse)
+            tx_type = 'FINAL_OUT' if site in ['AGI', 'DAS', 'MIR', 'SHU'] else 'TRANSFER_OUT'
+                
+            record.update({
+                'TxType_Refined': tx_type,
+                'Qty': int(outgoing),
+                'Loc_From': warehouse,  # 출고는 해당 창고에서
+                'Target_Warehouse': 'DESTINATION'
+            })
+            data.append(record)
+    
+    result_df = pd.DataFrame(data)
+    print(f"✅ {len(result_df)}건 트랜잭션 생성")
+    
+    return result_df
+
+def extract_case_id(data):
+    """케이스 ID 추출 - 개선된 버전"""
+    case_fields = ['case', 'Case', 'case_id', 'CaseID', 'ID', 'carton', 'box', 'mr#']
+    
+    for field in case_fields:
+        if field in data and data[field]:
+            case_value = str(data[field]).strip()
+            if case_value and case_value.lower() not in ['nan', 'none', '']:
+                return case_value
+    
+    # 백업: 해시 기반 ID
+    return f"CASE_{abs(hash(str(data))) % 100000}"
+
+def extract_warehouse(data):
+    """창고명 추출 및 정규화 - 개선된 버전"""
+    warehouse_fields = ['warehouse', 'Warehouse', 'site', 'Site', 'location', 'Location']
+    
+    for field in warehouse_fields:
+        if field in data and data[field]:
+            raw_warehouse = str(data[field]).strip()
+            if raw_warehouse and raw_warehouse.lower() not in ['nan', 'none', '']:
+                return normalize_warehouse_name(raw_warehouse)
+    
+    return 'UNKNOWN'
+
+def extract_datetime(data):
+    """날짜/시간 추출 - 개선된 버전"""
+    import pandas as pd
+    from datetime import datetime
+    
+    date_fields = ['date', 'Date', 'timestamp', 'Timestamp', 'datetime']
+    
+    for field in date_fields:
+        if field in data and data[field]:
+            try:
+                date_value = data[field]
+                if isinstance(date_value, str) and date_value.lower() in ['nan', 'none', '']:
+                    continue
+                return pd.to_datetime(date_value)
+            except:
+                continue
+    
+    # 기본값: 현재 시간
+    return pd.Timestamp.now()
+
+def extract_quantity(data):
+    """수량 추출 - 개선된 버전"""
+    qty_fields = ['incoming', 'outgoing', 'inventory', 'quantity', 'qty', 'pieces']
+    total_qty = 0
+    
+    for field in qty_fields:
+        if field in data and data[field]:
+            try:
+                qty = pd.to_numeric(data[field], errors='coerce')
+                if not pd.isna(qty) and qty > 0:
+                    total_qty += qty
+            except:
+                continue
+                
+    return max(int(total_qty), 1)  # 최소 1개
+
+def normalize_warehouse_name(raw_name):
+    """창고명 표준화 - 개선된 버전"""
+    if pd.isna(raw_name) or not raw_name:
+        return 'UNKNOWN'
+        
+    name_lower = str(raw_name).lower().strip()
+    
+    # 정확한 매핑 테이블
+    warehouse_rules = {
+        'DSV Al Markaz': ['markaz', 'm1', 'al markaz', 'almarkaz', 'al_markaz', 'dsv al markaz'],
+        'DSV Indoor': ['indoor', 'm44', 'hauler indoor', 'hauler_indoor', 'dsv indoor'],
+        'DSV Outdoor': ['outdoor', 'out', 'dsv outdoor'],
+        'MOSB': ['mosb'],
+        'DSV MZP': ['mzp', 'dsv mzp'],
+        'DHL WH': ['dhl', 'dhl wh'],
+        'AAA Storage': ['aaa', 'aaa storage']
+    }
+    
+    for canonical, patterns in warehouse_rules.items():
+        if any(pattern in name_lower for pattern in patterns):
+            return canonical
+    
+    return str(raw_name).strip()
+
+def extract_site(warehouse_name):
+    """사이트명 추출 - 개선된 버전"""
+    if pd.isna(warehouse_name) or not warehouse_name:
+        return 'UNK'
+        
+    name_upper = str(warehouse_name).upper()
+    
+    site_patterns = {
+        'AGI': ['AGI'],
+        'DAS': ['DAS'], 
+        'MIR': ['MIR'],
+        'SHU': ['SHU']
+    }
+    
+    for site, patterns in site_patterns.items():
+        if any(pattern in name_upper for pattern in patterns):
+            return site
+    
+    return 'UNK'
+
+def calculate_daily_inventory(transaction_df):
+    """일별 재고 계산 - 사용자 검증된 로직"""
+    print("📊 일별 재고 계산 중...")
+    
+    if transaction_df.empty:
+        print("❌ 계산할 트랜잭션이 없습니다")
+        return pd.DataFrame()
+    
+    # 날짜별, 위치별 집계
+    transaction_df['Date'] = pd.to_datetime(transaction_df['Date']).dt.date
+    
+    daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined'], observed=True).agg({
+        'Qty': 'sum'
+    }).reset_index()
+    
+    # 피벗으로 입고/출고 분리
+    daily_pivot = daily_summary.pivot_table(
+        index=['Location', 'Date'],
+        columns='TxType_Refined', 
+        values='Qty',
+        fill_value=0,
+        observed=True
+    ).reset_index()
+    
+    # 컬럼명 정리
+    daily_pivot.columns.name = None
+    flow_types = [tx for tx in INVENTORY_FLOWS if tx in daily_pivot.columns]
+    expected_cols = ['IN', 'TRANSFER_OUT', 'FINAL_OUT']
+    for col in expected_cols:
+        if col not in daily_pivot.columns:
+            daily_pivot[col] = 0
+    
+    # 재고 계산 (위치별 누적)
+    records = {column: [] for column in DAILY_STOCK_COLUMNS}
+    
+    for location in daily_pivot['Location'].unique():
+        if location in SKIP_LOCATIONS:
+            continue
+            
+        loc_data = daily_pivot[daily_pivot['Location'] == location].copy()
+        loc_data = loc_data.sort_values('Date')
+        
+        opening_stock = 0
+        
+        for _, row in loc_data.iterrows():
+            inbound = row.get('IN', 0)
+            transfer_out = row.get('TRANSFER_OUT', 0) 
+            final_out = row.get('FINAL_OUT', 0)
+            total_outbound = transfer_out + final_out
+            
+            closing_stock = opening_stock + inbound - total_outbound
+            
+            for column, value in zip(DAILY_STOCK_COLUMNS, [location, row['Date'], opening_stock, inbound,
+                                                           transfer_out, final_out, total_outbound, closing_stock]):
+                records[column].append(value)
+            
+            opening_stock = closing_stock
+    
+    daily_stock_df = daily_stock_frame(records, flow_types)
+    print(f"✅ {len(daily_stock_df)}개 일별 재고 스냅샷 생성")
+    
+    return daily_stock_df
+
+
+def daily_stock_frame(records, flow_types) -> pd.DataFrame:
+    """
+    위치·일자 순 일별 재고 컬럼 → 일별 재고 DataFrame (pandas/polars/월 파티션 엔진 공통 dtype 규칙)
+
+    피벗에 나타난 TxType 흐름(flow_types)은 float64(pivot_table mean), 나타나지 않은 흐름은 0(int64),
+    재고는 입고 - 출고 dtype이고, 모든 위치가 한 행뿐이면 기초재고는 정수 0(int64)입니다.
+
+    Args:
+        records: DAILY_STOCK_COLUMNS 키 → 값 배열 (Total_Outbound는 다시 계산하므로 없어도 됨)
+        flow_types: 피벗 컬럼으로 나타난 TxType (INVENTORY_FLOWS 키)
+    """
+    locations = list(records['Location'])
+    if not locations:
+        return pd.DataFrame()
+    columns = {'Location': locations, 'Date': list(records['Date'])}
+    present = set(flow_types)
+    flows = {}
+    for tx, column in INVENTORY_FLOWS.items():
+        flows[column] = (np.asarray(records[column], dtype=np.float64) if tx in present
+                         else np.zeros(len(locations), dtype=np.int64))
+    flows['Total_Outbound'] = flows['Transfer_Out'] + flows['Final_Out']
+    stock_dtype = (flows['Inbound'] - flows['Total_Outbound']).dtype
+    opening = np.asarray(records['Opening_Stock']).astype(stock_dtype)
+    if stock_dtype == np.float64 and not pd.Series(locations).duplicated().any():
+        opening = opening.astype(np.int64)
+    columns.update({'Opening_Stock': opening, **flows,
+                    'Closing_Stock': np.asarray(records['Closing_Stock']).astype(stock_dtype)})
+    return pd.DataFrame(columns)[DAILY_STOCK_COLUMNS]
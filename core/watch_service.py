@@ -0,0 +1,306 @@
+"""
+HVDC 감시 모드 서비스 (data/ 폴더 변경 시 증분 재처리)
+
+현장에서 data/ 폴더에 갱신된 창고 Excel을 넣을 때마다 main.py를 콜드 스타트하지 않도록,
+파싱된 워크북 / 파일별 원시 트랜잭션 / 트랜잭션 로그 / 일별 재고 / 매핑 규칙을 메모리에
+유지하는 장기 실행 서비스입니다. 변경된 워크북만 다시 읽고(전체 실행 시간의 대부분),
+하위 스테이지(convert → reconcile → dedup → inventory)는 메모리의 원시 트랜잭션으로
+다시 계산하여 main.py 전체 실행과 같은 결과를 유지합니다.
+
+증분 처리 범위는 워크북 파싱/원시 트랜잭션 추출까지입니다. TRANSFER 짝이 파일(공급사)을
+넘나들기 때문에 convert/reconcile/dedup/inventory는 갱신마다 메모리의 전체 원시 트랜잭션으로
+다시 계산합니다 (Excel 재파싱이 없어 전체 실행 대비 수 초 이내).
+
+변경 감지는 추가 의존성 없는 폴링 방식입니다. 파일 (mtime, 크기)가 한 주기 동안
+그대로일 때만 재처리하여 복사/저장 중인 파일을 읽지 않습니다. 읽기에 실패한 파일(잠김,
+복사 중)은 이전 캐시를 유지하고 다음 폴링에서 다시 시도합니다. 매핑 규칙 파일이 바뀌면
+규칙 캐시를 다시 로드하고 메모리의 워크북에서 원시 트랜잭션을 다시 추출합니다.
+
+    python main.py --watch                 # 2초 간격 감시
+    python main.py --watch --interval 10
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+import core.lazy_loading as lazy_loading
+from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
+from core.loader import DataLoader
+from core.polars_engine import DEFAULT_ENGINE, resolve_engine, run_lazy_stages
+from core.transaction_log import PYARROW_AVAILABLE, write_transaction_log
+from core.transactions import calculate_daily_inventory, prepare_transaction_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_OUTPUT_DIR = "artifacts/watch"
+# 변경 감지 후 재처리 전까지 (mtime, 크기)가 유지되어야 하는 폴링 횟수
+SETTLE_POLLS = 1
+
+FileSignature = Tuple[int, int]
+
+
+def file_signature(path: Union[str, Path]) -> Optional[FileSignature]:
+    """(mtime_ns, 크기), 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def scan_sources(src: Union[str, Path]) -> Dict[str, FileSignature]:
+    """감시 대상 Excel 파일명 → (mtime_ns, 크기) (DataLoader 로딩 순서 유지)"""
+    signatures = {}
+    for filepath in DataLoader.source_files(str(src)):
+        signature = file_signature(filepath)
+        if signature is not None:
+            signatures[os.path.basename(filepath)] = signature
+    return signatures
+
+
+class WarehouseService:
+    """창고 데이터 웜 캐시 + 변경 파일 증분 재처리"""
+
+    def __init__(self, src: Union[str, Path] = "data", output_dir: Optional[Union[str, Path]] = DEFAULT_OUTPUT_DIR,
+                 write_log: bool = True, verbosity: Optional[str] = None, engine: str = DEFAULT_ENGINE,
+                 rules_file: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            src: 감시할 Excel 폴더
+            output_dir: 갱신 산출물(일별 재고 CSV, 상태 JSON) 폴더 (None이면 저장 안 함)
+            write_log: 갱신 시 정본 트랜잭션 로그(parquet) 재작성 여부
+            verbosity: 로더 진단 출력 수준
+            engine: 보정/중복 제거/일별 재고 엔진 (pandas / polars)
+            rules_file: 변경을 감시할 매핑 규칙 파일 (기본: core.lazy_loading.MAPPING_RULES_FILE)
+        """
+        self.src = Path(src)
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.write_log = write_log and PYARROW_AVAILABLE
+        self.loader = DataLoader(verbosity=verbosity)
+        self.engine = resolve_engine(engine)
+        self.rules_file = Path(rules_file or lazy_loading.MAPPING_RULES_FILE)
+        self.rules_signature = file_signature(self.rules_file)
+        # 파일명 → 파싱된 워크북 / 원시 트랜잭션 / 처리 시점 시그니처
+        self.workbooks: Dict[str, pd.DataFrame] = {}
+        self.file_transactions: Dict[str, List[Dict]] = {}
+        self.signatures: Dict[str, FileSignature] = {}
+        self.transaction_df: Optional[pd.DataFrame] = None
+        self.daily_stock: Optional[pd.DataFrame] = None
+        self.generation = 0
+        self.last_refresh: Dict[str, Any] = {}
+        self._pending: Dict[str, Tuple[FileSignature, int]] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[['WarehouseService'], None]] = []
+
+    def add_listener(self, callback: Callable[['WarehouseService'], None]):
+        """갱신 완료 시 호출할 콜백 등록 (예: 조회 API 인덱스 재구성)"""
+        self._listeners.append(callback)
+
+    def changed_files(self, snapshot: Dict[str, FileSignature]) -> Tuple[List[str], List[str]]:
+        """(추가/변경 파일, 삭제 파일)"""
+        changed = [name for name, sig in snapshot.items() if self.signatures.get(name) != sig]
+        removed = [name for name in self.signatures if name not in snapshot]
+        return changed, removed
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """
+        변경된 워크북만 재수집 후 하위 스테이지 갱신
+
+        Args:
+            force: 변경 여부와 무관하게 전체 파일 재수집
+        Returns:
+            갱신 요약 (변경 없으면 changed/removed가 빈 목록, generation 유지)
+        """
+        with self._lock:
+            snapshot = scan_sources(self.src)
+            if force:
+                self.signatures.clear()
+            changed, removed = self.changed_files(snapshot)
+            rules_changed = self.rules_changed()
+            if not changed and not removed and not rules_changed:
+                return {'changed': [], 'removed': [], 'generation': self.generation}
+
+            started = time.perf_counter()
+            if rules_changed:
+                self._reload_rules()
+            failed = [name for name in changed if not self._ingest(name, snapshot[name])]
+            changed = [name for name in changed if name not in failed]
+            for name in removed:
+                print(f"🗑️ 삭제된 파일 제외: {name}")
+                for cache in (self.workbooks, self.file_transactions, self.signatures):
+                    cache.pop(name, None)
+            if rules_changed:
+                # 날짜 컬럼 선택 / Storage_Type 분류가 규칙에 의존 → 파싱된 워크북에서 다시 추출
+                for name, df in self.workbooks.items():
+                    if name not in changed:
+                        self.file_transactions[name] = self.loader.extract_transactions({name: df})
+            load_seconds = time.perf_counter() - started
+            if not changed and not removed and not rules_changed:
+                return {'changed': [], 'removed': [], 'failed': failed, 'generation': self.generation}
+
+            self._rebuild(snapshot)
+            self.generation += 1
+            self.last_refresh = {
+                'generation': self.generation,
+                'refreshed_at': datetime.now().isoformat(timespec='seconds'),
+                'changed': changed,
+                'removed': removed,
+                'failed': failed,
+                'rules_reloaded': rules_changed,
+                'files': list(self.signatures),
+                'transactions': len(self.transaction_df),
+                'stock_rows': len(self.daily_stock),
+                'load_seconds': round(load_seconds, 3),
+                'total_seconds': round(time.perf_counter() - started, 3),
+            }
+            self._write_artifacts()
+
+        for callback in self._listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"갱신 콜백 실패: {e}")
+        return dict(self.last_refresh)
+
+    def rules_changed(self) -> bool:
+        """매핑 규칙 파일이 마지막 로드 이후 바뀌었는지"""
+        return file_signature(self.rules_file) != self.rules_signature
+
+    def _reload_rules(self):
+        """규칙 JSON / 지연 섹션 / MappingManager 캐시를 비워 다음 분류 시 다시 로드"""
+        print(f"📐 매핑 규칙 변경 감지: {self.rules_file} → 규칙 다시 로드")
+        lazy_loading.reload_mapping_rules()
+        self.loader.mapping_manager.reload()
+        self.rules_signature = file_signature(self.rules_file)
+
+    def _ingest(self, name: str, signature: FileSignature) -> bool:
+        """
+        워크북 1개 재파싱 + 원시 트랜잭션 재추출
+
+        읽기 실패(잠김, 복사 중인 파일 등)면 이전 캐시를 유지하고 시그니처를 기록하지 않아
+        다음 폴링에서 다시 시도합니다.
+        """
+        try:
+            df = self.loader.load_excel_file(str(self.src / name))
+        except Exception as e:
+            logger.error(f"워크북 읽기 실패: {name} ({e})")
+            df = None
+        if df is None:
+            print(f"⚠️ 워크북 읽기 실패, 이전 데이터 유지 후 다음 폴링에서 재시도: {name}")
+            return False
+        self.workbooks[name] = df
+        self.file_transactions[name] = self.loader.extract_transactions({name: df})
+        self.signatures[name] = signature
+        return True
+
+    def _rebuild(self, snapshot: Dict[str, FileSignature]):
+        """
+        메모리의 파일별 원시 트랜잭션 → 트랜잭션 로그 / 일별 재고 (main.py와 같은 스테이지)
+
+        TRANSFER 짝 보정/중복 제거가 파일을 넘나들므로 하위 스테이지는 전체 이력으로 다시 계산합니다.
+        """
+        raw_transactions = [tx for name in snapshot for tx in self.file_transactions.get(name, [])]
+        if not raw_transactions:
+            self.transaction_df = pd.DataFrame()
+            self.daily_stock = pd.DataFrame()
+            return
+        transaction_df = prepare_transaction_frame(raw_transactions)
+        if self.engine == 'polars':
+            outputs = run_lazy_stages(transaction_df)
+            self.transaction_df, self.daily_stock = outputs['dedup'], outputs['inventory']
+            return
+        transaction_df = drop_duplicate_transfers(reconcile_orphan_transfers(transaction_df))
+        self.transaction_df = transaction_df
+        self.daily_stock = calculate_daily_inventory(transaction_df.copy())
+
+    def _write_artifacts(self):
+        """트랜잭션 로그 / 일별 재고 / 상태 JSON 재작성"""
+        if self.write_log and not self.transaction_df.empty:
+            try:
+                write_transaction_log(self.transaction_df)
+            except Exception as e:
+                logger.error(f"트랜잭션 로그 저장 실패: {e}")
+        if self.output_dir is None:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.daily_stock.to_csv(self.output_dir / "daily_stock.csv", index=False, encoding='utf-8-sig')
+        (self.output_dir / "watch_status.json").write_text(
+            json.dumps(self.last_refresh, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        폴링 1회: 변경이 SETTLE_POLLS 주기 동안 유지된 파일이 있으면 refresh
+
+        Returns:
+            refresh 결과 (재처리하지 않았으면 None)
+        """
+        snapshot = scan_sources(self.src)
+        changed, removed = self.changed_files(snapshot)
+        if not changed and not removed:
+            self._pending.clear()
+            return self.refresh() if self.rules_changed() else None
+
+        # 파일별 (시그니처, 연속 유지 폴링 수) - 저장 중인 파일은 시그니처가 계속 바뀜
+        pending = {}
+        for name in changed:
+            previous = self._pending.get(name)
+            stable = previous[1] + 1 if previous and previous[0] == snapshot[name] else 0
+            pending[name] = (snapshot[name], stable)
+        self._pending = pending
+        if any(stable < SETTLE_POLLS for _, stable in pending.values()):
+            return None
+        self._pending = {}
+        return self.refresh()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 (조회 API 등 다른 스레드에서 일관된 세대를 읽기 위함)"""
+        with self._lock:
+            return {
+                'generation': self.generation,
+                'transaction_df': self.transaction_df,
+                'daily_stock': self.daily_stock,
+                'last_refresh': dict(self.last_refresh),
+            }
+
+    def watch(self, interval: float = DEFAULT_POLL_INTERVAL, max_cycles: Optional[int] = None,
+              stop_event: Optional[threading.Event] = None):
+        """
+        감시 루프 (Ctrl+C / stop_event로 종료)
+
+        Args:
+            interval: 폴링 간격(초)
+            max_cycles: 최대 폴링 횟수 (테스트용, None이면 무한)
+            stop_event: 설정 시 루프 종료
+        """
+        if self.generation == 0:
+            self._report(self.refresh())
+        print(f"👀 {self.src} 감시 중 (간격 {interval}s, Ctrl+C로 종료)")
+        cycles = 0
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set() and (max_cycles is None or cycles < max_cycles):
+                stop_event.wait(interval)
+                cycles += 1
+                result = self.poll()
+                if result is not None:
+                    self._report(result)
+        except KeyboardInterrupt:
+            print("\n🛑 감시 종료")
+
+    @staticmethod
+    def _report(result: Dict[str, Any]):
+        if not result.get('changed') and not result.get('removed') and not result.get('rules_reloaded'):
+            return
+        rules = " / 규칙 재로드" if result.get('rules_reloaded') else ""
+        print(f"🔁 갱신 #{result['generation']}: 변경 {result['changed'] or '-'} / 삭제 {result['removed'] or '-'}{rules}"
+              f" → 트랜잭션 {result['transactions']:,}건, 재고 {result['stock_rows']:,}행"
+              f" (로딩 {result['load_seconds']:.2f}s / 전체 {result['total_seconds']:.2f}s)")
@@ -13,10 +13,52 @@ import json
 from pathlib import Path
 import logging
 
+from core.streaming_validation import accumulate_chunks, iter_transaction_chunks
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+REQUIRED_COLUMNS = ['Case_No', 'Date', 'Location', 'TxType_Refined', 'Qty']
+COMPLETENESS_FIELDS = ['Case_No', 'Date', 'Location', 'Qty']
+VALID_TX_TYPES = ['IN', 'TRANSFER_OUT', 'FINAL_OUT']
+
+
+def _missing_months(monthly_counts, date_min, date_max):
+    """
+    데이터 없는 월 목록 (기존 pd.date_range(min, max, freq='M') 월말 기준과 동일)
+
+    월말 별칭이 pandas 버전마다 달라('M' → 'ME') Period 기반으로 계산합니다.
+    """
+    if pd.isnull(date_min) or pd.isnull(date_max):
+        return []
+    periods = pd.period_range(date_min.to_period('M'), date_max.to_period('M'), freq='M')
+    missing_months = []
+    for period in periods:
+        month_end = period.to_timestamp(how='end').normalize()
+        if date_min <= month_end <= date_max and period not in monthly_counts.index:
+            missing_months.append(str(period))
+    return missing_months
+
+
+def _valid_locations():
+    """매핑 규칙(warehouse_classification)에 등록된 전체 Location"""
+    from mapping_utils import mapping_manager
+
+    all_valid_locations = []
+    for locations in mapping_manager.warehouse_classification.values():
+        all_valid_locations.extend(locations)
+    return all_valid_locations
+
+
+def _count_duplicate_rows(df):
+    """행 해시 기반 중복 레코드 수 (해시 불가 컬럼이 있으면 df.duplicated 사용)"""
+    try:
+        return pd.util.hash_pandas_object(df, index=False).duplicated().sum()
+    except TypeError:
+        return df.duplicated().sum()
+
+
 class DataValidationEngine:
     """HVDC 데이터 품질 검증 엔진"""
     
@@ -25,10 +67,20 @@ class DataValidationEngine:
         self.issues_found = []
         self.recommendations = []
         
-    def validate_complete_dataset(self, transaction_df):
-        """전체 데이터셋 종합 검증"""
+    def validate_complete_dataset(self, transaction_df, fused=True):
+        """
+        전체 데이터셋 종합 검증
+
+        Args:
+            transaction_df: 트랜잭션 DataFrame (변경하지 않음)
+            fused: True면 단일 스캔 프로파일 기반 검증, False면 7개 검증기 개별 실행
+        """
         logger.info("🔍 HVDC 데이터 품질 종합 검증 시작")
         
+        if fused:
+            profile = self.compute_validation_profile(transaction_df)
+            return self.validate_from_profile(profile)
+        
         validation_summary = {
             'timestamp': datetime.now().isoformat(),
             'total_records': len(transaction_df),
@@ -74,6 +126,10 @@ class DataValidationEngine:
         quantity_results = self.validate_quantities_and_amounts(transaction_df)
         validation_summary['validation_tests']['quantities'] = quantity_results
         
+        return self._finalize_summary(validation_summary)
+    
+    def _finalize_summary(self, validation_summary):
+        """종합 점수/이슈/권장사항 산출"""
         # 종합 점수 계산
         validation_summary['data_quality_score'] = self.calculate_quality_score(validation_summary)
         
@@ -85,6 +141,276 @@ class DataValidationEngine:
         self.validation_results = validation_summary
         return validation_summary
     
+    def validate_streaming(self, chunks, exact_case_counts=False):
+        """
+        청크 단위 스트리밍 검증 (메모리보다 큰 트랜잭션 로그용)
+
+        Args:
+            chunks: DataFrame 청크 이터러블 또는 트랜잭션 로그 경로(CSV/Parquet)
+            exact_case_counts: True면 Case별 건수도 보관 (이력에 비례해 메모리 증가, 기본은 HyperLogLog만 사용)
+        """
+        logger.info("🔍 HVDC 데이터 품질 스트리밍 검증 시작")
+        if isinstance(chunks, (str, Path)):
+            chunks = iter_transaction_chunks(chunks)
+        
+        accumulator = accumulate_chunks(chunks, exact_case_counts=exact_case_counts)
+        profile = accumulator.to_profile(valid_locations=_valid_locations(), valid_tx_types=VALID_TX_TYPES)
+        logger.info(f"📦 누적 완료: {accumulator.total_records:,}건, 고유 Case {accumulator.unique_cases():,}개")
+        return self.validate_from_profile(profile)
+    
+    def compute_validation_profile(self, df):
+        """
+        검증에 필요한 모든 통계를 한 번에 계산 (입력 DataFrame 변경 없음)
+
+        NULL 수, 행 해시 중복, 수량 IQR, 월별 건수, 주말 건수, 미매핑 Location 등
+        7개 검증기가 각각 스캔하던 값을 컬럼 단위 벡터 연산으로 모읍니다.
+        """
+        n = len(df)
+        profile = {
+            'total_records': n,
+            'columns': list(df.columns),
+            'null_counts': df[[c for c in REQUIRED_COLUMNS if c in df.columns]].isnull().sum(),
+            'duplicate_count': _count_duplicate_rows(df),
+        }
+        
+        if 'Qty' in df.columns:
+            qty = df['Qty']
+            q1, q3 = qty.quantile([0.25, 0.75]).tolist()
+            iqr = q3 - q1
+            profile['qty'] = {
+                'negative': (qty < 0).sum(),
+                'zero': (qty == 0).sum(),
+                'mean': qty.mean(),
+                'std': qty.std(),
+                'min': qty.min(),
+                'max': qty.max(),
+                'outlier_count': int(((qty < q1 - 1.5 * iqr) | (qty > q3 + 1.5 * iqr)).sum()),
+            }
+        
+        if 'Date' in df.columns:
+            dates = df['Date']
+            profile['date'] = {
+                'min': dates.min(),
+                'max': dates.max(),
+                'future': (dates > datetime.now()).sum(),
+                'very_old': (dates < datetime(2020, 1, 1)).sum(),
+                'monthly_counts': dates.dt.to_period('M').value_counts().sort_index(),
+                'weekend': (dates.dt.dayofweek >= 5).sum(),
+            }
+        
+        if 'TxType_Refined' in df.columns:
+            tx_types = df['TxType_Refined'].unique()
+            profile['invalid_tx_types'] = tx_types[~pd.Series(tx_types).isin(VALID_TX_TYPES).values]
+        
+        if 'Location' in df.columns:
+            locations = df['Location']
+            location_values = locations.unique()
+            profile['location'] = {
+                'empty': locations.isnull().sum(),
+                'unknown': (locations == 'UNKNOWN').sum(),
+                'unmapped': location_values[~pd.Series(location_values).isin(_valid_locations()).values],
+            }
+        
+        if 'Storage_Type' in df.columns:
+            profile['storage_counts'] = df['Storage_Type'].value_counts()
+            if 'storage_type' in df.columns:
+                profile['storage_mismatch'] = (df['Storage_Type'] != df['storage_type']).sum()
+            if 'Location' in df.columns:
+                profile['location_storage_nunique'] = df.groupby('Location', observed=True)['Storage_Type'].nunique()
+        
+        if 'Case_No' in df.columns:
+            profile['case_counts'] = df['Case_No'].value_counts()
+        
+        if 'Handling Fee' in df.columns:
+            fee = df['Handling Fee']
+            profile['handling_fee'] = {
+                'mean': fee.mean(),
+                'std': fee.std(),
+                'total': fee.sum(),
+                'negative': (fee < 0).sum(),
+            }
+        
+        return profile
+    
+    def validate_from_profile(self, profile):
+        """검증 프로파일로 7개 검증 결과 및 품질 점수 산출 (개별 검증기와 동일한 규칙)"""
+        n = profile['total_records']
+        validation_summary = {
+            'timestamp': datetime.now().isoformat(),
+            'total_records': n,
+            'validation_tests': {},
+            'critical_issues': [],
+            'warnings': [],
+            'recommendations': [],
+            'data_quality_score': 0
+        }
+        tests = validation_summary['validation_tests']
+        new_result = lambda: {'passed': True, 'issues': [], 'details': {}}
+        
+        # 1. 기본 데이터 무결성
+        integrity = new_result()
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in profile['columns']]
+        if missing_columns:
+            integrity['passed'] = False
+            integrity['issues'].append(f"필수 컬럼 누락: {missing_columns}")
+        null_counts = profile['null_counts']
+        critical_null_columns = null_counts[null_counts > 0]
+        if not critical_null_columns.empty:
+            integrity['issues'].append(f"NULL 값 발견: {critical_null_columns.to_dict()}")
+            if critical_null_columns.max() > n * 0.1:
+                integrity['passed'] = False
+        duplicate_count = profile['duplicate_count']
+        if duplicate_count > 0:
+            integrity['issues'].append(f"중복 레코드: {duplicate_count}건")
+            if duplicate_count > n * 0.05:
+                integrity['passed'] = False
+        integrity['details'] = {
+            'total_records': n,
+            'null_counts': null_counts.to_dict(),
+            'duplicate_count': duplicate_count
+        }
+        tests['integrity'] = integrity
+        
+        # 2. 비즈니스 규칙
+        business = new_result()
+        qty = profile.get('qty')
+        if qty is not None:
+            if qty['negative'] > 0:
+                business['issues'].append(f"음수 수량: {qty['negative']}건")
+                business['passed'] = False
+            if qty['zero'] > n * 0.1:
+                business['issues'].append(f"0수량 비율 높음: {qty['zero']}건 ({qty['zero']/n*100:.1f}%)")
+        date = profile.get('date')
+        if date is not None:
+            if date['future'] > 0:
+                business['issues'].append(f"미래 날짜: {date['future']}건")
+            if date['very_old'] > 0:
+                business['issues'].append(f"과거 날짜 (2020년 이전): {date['very_old']}건")
+            business['details']['date_range'] = {
+                'min': str(date['min']),
+                'max': str(date['max']),
+                'future_dates': date['future'],
+                'very_old_dates': date['very_old']
+            }
+        invalid_types = profile.get('invalid_tx_types')
+        if invalid_types is not None and len(invalid_types) > 0:
+            business['issues'].append(f"잘못된 트랜잭션 타입: {invalid_types}")
+            business['passed'] = False
+        location = profile.get('location')
+        if location is not None:
+            if location['empty'] > 0:
+                business['issues'].append(f"빈 Location: {location['empty']}건")
+            if location['unknown'] > n * 0.05:
+                business['issues'].append(f"UNKNOWN Location 비율 높음: {location['unknown']}건")
+        tests['business_rules'] = business
+        
+        # 3. 데이터 일관성
+        consistency = new_result()
+        if profile.get('storage_mismatch') is not None and profile['storage_mismatch'] > 0:
+            consistency['issues'].append(f"Storage Type 불일치: {profile['storage_mismatch']}건")
+            consistency['passed'] = False
+        if profile.get('location_storage_nunique') is not None:
+            nunique = profile['location_storage_nunique']
+            inconsistent_locations = nunique[nunique > 1]
+            if len(inconsistent_locations) > 0:
+                consistency['issues'].append(f"Location별 Storage Type 불일치: {inconsistent_locations.to_dict()}")
+        if profile.get('case_counts') is not None:
+            case_counts = profile['case_counts']
+            multiple_cases = case_counts[case_counts > 1]
+            if len(multiple_cases) > 0:
+                consistency['details']['case_duplicates'] = {
+                    'multiple_cases_count': len(multiple_cases),
+                    'max_duplicates': multiple_cases.max()
+                }
+        tests['consistency'] = consistency
+        
+        # 4. 완전성
+        completeness = new_result()
+        completeness_rates = {}
+        for field in COMPLETENESS_FIELDS:
+            if field in profile['columns']:
+                completeness_rate = ((n - null_counts[field]) / n) * 100
+                completeness_rates[field] = completeness_rate
+                if completeness_rate < 95:
+                    completeness['issues'].append(f"{field} 완전성 낮음: {completeness_rate:.1f}%")
+                    if completeness_rate < 80:
+                        completeness['passed'] = False
+        if date is not None:
+            monthly_counts = date['monthly_counts']
+            missing_months = _missing_months(monthly_counts, date['min'], date['max'])
+            if missing_months:
+                completeness['issues'].append(f"데이터 없는 월: {missing_months}")
+            completeness['details']['temporal_completeness'] = {
+                'monthly_distribution': monthly_counts.to_dict(),
+                'avg_monthly_records': monthly_counts.mean(),
+                'std_monthly_records': monthly_counts.std(),
+                'missing_months': missing_months
+            }
+        completeness['details']['completeness_rates'] = completeness_rates
+        tests['completeness'] = completeness
+        
+        # 5. 통합 매핑
+        mapping = new_result()
+        if profile.get('storage_counts') is not None:
+            storage_type_counts = profile['storage_counts']
+            unknown_storage = storage_type_counts.get('Unknown', 0)
+            if unknown_storage > 0:
+                mapping['issues'].append(f"Unknown Storage Type: {unknown_storage}건")
+                if unknown_storage > n * 0.1:
+                    mapping['passed'] = False
+            mapping['details']['storage_type_distribution'] = storage_type_counts.to_dict()
+        if location is not None and len(location['unmapped']) > 0:
+            mapping['issues'].append(f"매핑되지 않은 Location: {location['unmapped']}")
+            mapping['passed'] = False
+        tests['mapping'] = mapping
+        
+        # 6. 시간적 일관성
+        temporal = new_result()
+        if date is not None:
+            monthly_counts = date['monthly_counts']
+            if len(monthly_counts) > 1:
+                monthly_changes = monthly_counts.pct_change().abs()
+                sudden_changes = monthly_changes[monthly_changes > 2.0]
+                if len(sudden_changes) > 0:
+                    temporal['issues'].append(f"급격한 월별 변화: {sudden_changes.to_dict()}")
+            weekend_ratio = date['weekend'] / n
+            if weekend_ratio > 0.3:
+                temporal['issues'].append(f"주말 트랜잭션 비율 높음: {weekend_ratio:.1%}")
+            temporal['details']['temporal_analysis'] = {
+                'total_months': len(monthly_counts),
+                'weekend_ratio': weekend_ratio,
+                'monthly_distribution': monthly_counts.to_dict()
+            }
+        tests['temporal'] = temporal
+        
+        # 7. 수량 및 금액
+        quantities = new_result()
+        if qty is not None:
+            if qty['outlier_count'] > 0:
+                quantities['issues'].append(f"수량 이상치: {qty['outlier_count']}건")
+                if qty['outlier_count'] > n * 0.05:
+                    quantities['passed'] = False
+            quantities['details']['quantity_analysis'] = {
+                'mean': qty['mean'],
+                'std': qty['std'],
+                'min': qty['min'],
+                'max': qty['max'],
+                'outlier_count': qty['outlier_count']
+            }
+        fee = profile.get('handling_fee')
+        if fee is not None:
+            if fee['negative'] > 0:
+                quantities['issues'].append(f"음수 Handling Fee: {fee['negative']}건")
+            quantities['details']['handling_fee_analysis'] = {
+                'mean': fee['mean'],
+                'std': fee['std'],
+                'total': fee['total'],
+                'negative_count': fee['negative']
+            }
+        tests['quantities'] = quantities
+        
+        return self._finalize_summary(validation_summary)
+    
     def validate_data_integrity(self, df):
         """데이터 무결성 검증"""
         results = {
@@ -94,7 +420,7 @@ class DataValidationEngine:
         }
         
         # 필수 컬럼 존재 확인
-        required_columns = ['Case_No', 'Date', 'Location', 'TxType_Refined', 'Qty']
+        required_columns = REQUIRED_COLUMNS
         missing_columns = [col for col in required_columns if col not in df.columns]
         
         if missing_columns:
@@ -166,7 +492,7 @@ class DataValidationEngine:
         
         # 3. 트랜잭션 타입 검증
         if 'TxType_Refined' in df.columns:
-            valid_types = ['IN', 'TRANSFER_OUT', 'FINAL_OUT']
+            valid_types = VALID_TX_TYPES
             invalid_types = df[~df['TxType_Refined'].isin(valid_types)]['TxType_Refined'].unique()
             
             if len(invalid_types) > 0:
@@ -203,7 +529,7 @@ class DataValidationEngine:
         
         # 2. Location과 Storage Type 일관성
         if 'Location' in df.columns and 'Storage_Type' in df.columns:
-            location_storage_mapping = df.groupby('Location')['Storage_Type'].nunique()
+            location_storage_mapping = df.groupby('Location', observed=True)['Storage_Type'].nunique()
             inconsistent_locations = location_storage_mapping[location_storage_mapping > 1]
             
             if len(inconsistent_locations) > 0:
@@ -211,7 +537,7 @@ class DataValidationEngine:
         
         # 3. Case_No 일관성
         if 'Case_No' in df.columns:
-            case_duplicates = df.groupby('Case_No').size()
+            case_duplicates = df.groupby('Case_No', observed=True).size()
             multiple_cases = case_duplicates[case_duplicates > 1]
             
             if len(multiple_cases) > 0:
@@ -246,19 +572,14 @@ class DataValidationEngine:
         
         # 2. 시간적 완전성 (월별 데이터 분포)
         if 'Date' in df.columns:
-            df['YearMonth'] = df['Date'].dt.to_period('M')
-            monthly_distribution = df['YearMonth'].value_counts().sort_index()
+            monthly_distribution = df['Date'].dt.to_period('M').value_counts().sort_index()
             
             # 월별 데이터 분포 분석
             avg_monthly_records = monthly_distribution.mean()
             std_monthly_records = monthly_distribution.std()
             
             # 데이터가 없는 월 확인
-            date_range = pd.date_range(df['Date'].min(), df['Date'].max(), freq='M')
-            missing_months = []
-            for month in date_range:
-                if month.to_period('M') not in monthly_distribution.index:
-                    missing_months.append(str(month.to_period('M')))
+            missing_months = _missing_months(monthly_distribution, df['Date'].min(), df['Date'].max())
             
             if missing_months:
                 results['issues'].append(f"데이터 없는 월: {missing_months}")
@@ -296,11 +617,7 @@ class DataValidationEngine:
         # 2. Location 매핑 검증
         if 'Location' in df.columns:
             # 매핑 규칙에 없는 Location 확인
-            from mapping_utils import mapping_manager
-            
-            all_valid_locations = []
-            for locations in mapping_manager.warehouse_classification.values():
-                all_valid_locations.extend(locations)
+            all_valid_locations = _valid_locations()
             
             unmapped_locations = df[~df['Location'].isin(all_valid_locations)]['Location'].unique()
             
@@ -321,13 +638,8 @@ class DataValidationEngine:
         if 'Date' not in df.columns:
             return results
         
-        # 1. 날짜 순서 검증
-        df_sorted = df.sort_values('Date')
-        date_sequence_issues = 0
-        
-        # 2. 월별 데이터 분포 검증
-        df['YearMonth'] = df['Date'].dt.to_period('M')
-        monthly_counts = df['YearMonth'].value_counts().sort_index()
+        # 1. 월별 데이터 분포 검증
+        monthly_counts = df['Date'].dt.to_period('M').value_counts().sort_index()
         
         # 급격한 변화 감지
         if len(monthly_counts) > 1:
@@ -337,9 +649,8 @@ class DataValidationEngine:
             if len(sudden_changes) > 0:
                 results['issues'].append(f"급격한 월별 변화: {sudden_changes.to_dict()}")
         
-        # 3. 주말/공휴일 패턴 검증
-        df['DayOfWeek'] = df['Date'].dt.dayofweek
-        weekend_transactions = (df['DayOfWeek'] >= 5).sum()
+        # 2. 주말/공휴일 패턴 검증
+        weekend_transactions = (df['Date'].dt.dayofweek >= 5).sum()
         weekend_ratio = weekend_transactions / len(df)
         
         if weekend_ratio > 0.3:  # 30% 이상 주말 트랜잭션
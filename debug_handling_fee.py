@@ -16,7 +16,7 @@ except Exception as e:
         return {}
         
 from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
-from core.loader import DataLoader
+from core.pipeline_dag import build_transaction_graph
 from excel_reporter import (
     generate_monthly_in_out_stock_report,
     normalize_location_column
@@ -176,15 +176,11 @@ def main():
     try:
         # 1. 데이터 로딩
         print("📄 데이터 로딩 중...")
-        loader = DataLoader()
-        excel_files = loader.load_excel_files("data")
+        raw_transactions = build_transaction_graph("data").run('load')
         
-        if not excel_files:
+        if not raw_transactions:
             print("❌ Excel 파일이 없습니다!")
             return False
-            
-        raw_transactions = loader.extract_transactions(excel_files)
-        print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
 
         # 2. 원시 데이터에서 Handling Fee 필드 확인
         print("\n🔍 원시 데이터 Handling Fee 필드 확인:")
@@ -252,7 +248,7 @@ def main():
         print(f"  총 Handling Fee: {handling_by_month['Handling Fee'].sum():,.2f}")
         
         # 창고별 집계
-        handling_by_location = transaction_df.groupby('Location')['Handling Fee'].sum().reset_index()
+        handling_by_location = transaction_df.groupby('Location', observed=True)['Handling Fee'].sum().reset_index()
         print(f"  창고별 집계: {len(handling_by_location)}개 창고/현장")
         print(f"  최고 창고: {handling_by_location.loc[handling_by_location['Handling Fee'].idxmax(), 'Location']} ({handling_by_location['Handling Fee'].max():,.2f})")
         
@@ -13,27 +13,23 @@ from pathlib import Path
 import logging
 
 # 🆕 NEW: mapping_utils에서 새로운 함수들 import
+from core.lazy_loading import LazyMapping, load_mapping_rules, rules_section
 from core.mapping_utils import classify_storage_type, normalize_all_keys, normalize_str
+from core.olap_cube import InventoryCube
+from core.case_position import CasePositionIndex
+from core.storage_days import StorageDaysEngine, reconcile_rent_with_invoice
 
 logger = logging.getLogger(__name__)
 
-# 최신 mapping_rules 불러오기
-try:
-    with open('mapping_rules_v2.6.json', encoding='utf-8') as f:
-        RULES = json.load(f)
-    FIELD_MAP = RULES['field_map']
-    PROPERTY_MAPPINGS = RULES['property_mappings']
-    # 🆕 NEW: 새로운 설정들 로드
-    HVDC_CODE3_VALID = RULES.get('hvdc_code3_valid', ['HE', 'SIM'])
-    WAREHOUSE_CODES = RULES.get('warehouse_codes', ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP'])
-    MONTH_MATCHING = RULES.get('month_matching', 'operation_month_eq_eta_month')
-except Exception as e:
-    logger.warning(f"mapping_rules_v2.6.json 로드 실패, 기본값 사용: {e}")
-    FIELD_MAP = {}
-    PROPERTY_MAPPINGS = {}
-    HVDC_CODE3_VALID = ['HE', 'SIM']
-    WAREHOUSE_CODES = ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP']
-    MONTH_MATCHING = 'operation_month_eq_eta_month'
+# 최신 mapping_rules (첫 조회 시 로드)
+RULES = LazyMapping(load_mapping_rules)
+FIELD_MAP = rules_section('field_map', {})
+PROPERTY_MAPPINGS = rules_section('property_mappings', {})
+# 🆕 NEW: 새로운 설정들
+HVDC_CODE3_VALID = rules_section('hvdc_code3_valid', ['HE', 'SIM'])
+WAREHOUSE_CODES = rules_section('warehouse_codes', ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP'])
+MONTH_MATCHING = rules_section('month_matching', 'operation_month_eq_eta_month')
+RENT_RATES = rules_section('rent_rates_per_sqm_month', {})
 
 def apply_hvdc_filters(df):
     """
@@ -106,18 +102,25 @@ def normalize_location_column(df, location_col='Location'):
         df[location_col] = df[location_col].astype(str).str.strip()
     return df
 
-def generate_monthly_in_out_stock_report(df):
+def generate_monthly_in_out_stock_report(df, sql=None):
     """
     월별 IN/OUT/재고 리포트 생성 (기존 기능 유지 + 🆕 NEW: HVDC 필터 적용)
     
     Args:
         df: 트랜잭션 DataFrame
+        sql: HVDC 필터 적용 프레임을 적재한 AnalyticsDB (있으면 SQL 뷰에서 조회)
         
     Returns:
         tuple: (in_df, out_df, stock_df)
     """
     print("📊 월별 IN/OUT/재고 리포트 생성 중...")
     
+    if sql is not None:
+        in_summary, out_summary = sql.view('v_monthly_in'), sql.view('v_monthly_out')
+        stock_df = sql.view('v_monthly_stock')
+        print(f"✅ 리포트 생성 완료 (SQL 뷰): IN={len(in_summary)}건, OUT={len(out_summary)}건, 재고={len(stock_df)}건")
+        return in_summary, out_summary, stock_df
+    
     # 🆕 NEW: HVDC 필터 적용
     df = apply_hvdc_filters(df)
     
@@ -134,7 +137,7 @@ def generate_monthly_in_out_stock_report(df):
     # IN 트랜잭션 집계
     in_df = df[df['TxType_Refined'] == 'IN'].copy()
     if not in_df.empty:
-        in_summary = in_df.groupby(['월', 'Location']).agg({
+        in_summary = in_df.groupby(['월', 'Location'], observed=True).agg({
             'Qty': 'sum',
             'Amount': 'sum',
             'Handling Fee': 'sum' if 'Handling Fee' in in_df.columns else lambda x: 0
@@ -146,7 +149,7 @@ def generate_monthly_in_out_stock_report(df):
     # OUT 트랜잭션 집계
     out_df = df[df['TxType_Refined'].isin(['TRANSFER_OUT', 'FINAL_OUT'])].copy()
     if not out_df.empty:
-        out_summary = out_df.groupby(['월', 'Location']).agg({
+        out_summary = out_df.groupby(['월', 'Location'], observed=True).agg({
             'Qty': 'sum',
             'Amount': 'sum',
             'Handling Fee': 'sum' if 'Handling Fee' in out_df.columns else lambda x: 0
@@ -205,9 +208,46 @@ def mark_rent_fee(row, warehouse_list=None):
         return "RENT FEE"
     return ""
 
-def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output_file=None, debug=False):
+def mark_rent_fee_frame(df, warehouse_list=None):
+    """mark_rent_fee의 벡터 버전 (프레임 전체 Remark Series 반환)"""
+    if warehouse_list is None:
+        warehouse_list = ["DSV OUTDOOR", "DSV INDOOR", "DSV AL MARKAZ", "DSV MZP"]
+    if 'HVDC CODE 1' not in df.columns:
+        return pd.Series("", index=df.index)
+    codes = df['HVDC CODE 1'].fillna('').astype(str).str.upper()
+    return pd.Series(np.where(codes.isin([w.upper() for w in warehouse_list]), "RENT FEE", ""), index=df.index)
+
+def generate_rent_accrual_report(df, warehouse_list=None, rent_rates=None, as_of=None):
+    """
+    창고 점유 구간 기반 월×창고 SQM-일수/임대료 발생 추정
+
+    임대 단가(mapping_rules rent_rates_per_sqm_month 또는 rent_rates)가 없으면 발생 추정이 모두 0이 되어
+    청구액 전체가 오차로 보이므로, SQM-일수만 반환하고 RENT_발생추정 컬럼과 대사는 생략합니다.
+
+    Returns:
+        (월별 SQM-일수/발생 추정 DataFrame, 청구 RENT FEE 대사 DataFrame 또는 None)
+    """
+    if warehouse_list is None:
+        warehouse_list = ['DSV OUTDOOR', 'DSV INDOOR', 'DSV AL MARKAZ', 'DSV MZP', 'MOSB', 'HAULER INDOOR']
+    rates = dict(rent_rates if rent_rates is not None else RENT_RATES)
+    engine = StorageDaysEngine.from_transactions(df, warehouses=warehouse_list, as_of=as_of)
+    accrual = engine.monthly_summary(rates)
+    if not rates:
+        print("⚠️ 창고 임대 단가(rent_rates_per_sqm_month) 미설정 - RENT FEE 발생추정/대사를 생략하고 SQM-일수만 기록합니다")
+        return accrual.drop(columns='RENT_발생추정'), None
+
+    reconciliation = None
+    if 'Amount' in df.columns and ('Billing month' in df.columns or 'Operation Month' in df.columns):
+        invoiced = generate_monthly_summary_report(df.copy())
+        reconciliation = reconcile_rent_with_invoice(accrual, invoiced)
+    return accrual, reconciliation
+
+def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output_file=None, debug=False, cube=None):
     """
     통합 엑셀 리포트 생성 (최신 실전 자동 리포트 예제 + 미매핑/RENT FEE 반영)
+
+    월/창고/공급사/TxType 집계 시트는 OLAP 큐브에서 롤업합니다.
+    cube를 넘기지 않으면 정규화된 transaction_df로 1회 생성합니다.
     """
     if output_file is None:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -268,52 +308,53 @@ def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output
         # 1. [월별 IN/OUT/재고 시트] - 이미 금액 포함
         # 2. [월별 Amount 합계 시트] - "월별 실제 청구 금액" 별도 표
         transaction_df['월'] = pd.to_datetime(transaction_df['Date'], errors='coerce').dt.strftime('%Y-%m')
+        numeric_fields = get_numeric_fields_from_mapping()
+        if cube is None:
+            cube = InventoryCube.from_transactions(transaction_df, measures=numeric_fields)
         
         # --- 월별 Amount 합계 ---
-        monthly_amount = transaction_df.groupby('월')['Amount'].sum().reset_index()
+        monthly_amount = cube.rollup('월', 'Amount')
         monthly_amount.columns = ['월', '월별청구금액(합계)']
         monthly_amount.to_excel(writer, sheet_name='월별청구금액', index=False)
         
         # --- 창고별/월별 Amount 합계 ---
-        by_wh_month = transaction_df.groupby(['월', 'Location'])['Amount'].sum().reset_index()
+        by_wh_month = cube.rollup(['월', 'Location'], 'Amount')
         by_wh_month.columns = ['월', '창고명', '월별청구금액']
         by_wh_month.to_excel(writer, sheet_name='창고별월별청구금액', index=False)
 
         # --- 현장별/월별 Amount 합계 (Site 구분) ---
         site_list = ['AGI', 'DAS', 'MIR', 'SHU']
-        is_site = transaction_df['Location'].isin(site_list)
-        by_site_month = transaction_df[is_site].groupby(['월', 'Location'])['Amount'].sum().reset_index()
+        by_site_month = cube.slice(Location=site_list).rollup(['월', 'Location'], 'Amount')
         by_site_month.columns = ['월', '현장명', '월별청구금액']
         by_site_month.to_excel(writer, sheet_name='현장별월별청구금액', index=False)
         
         # --- 벤더별/월별 Amount 합계 ---
         if 'Vendor' in transaction_df.columns:
-            by_vendor_month = transaction_df.groupby(['월', 'Vendor'])['Amount'].sum().reset_index()
+            by_vendor_month = cube.rollup(['월', 'Vendor'], 'Amount')
             by_vendor_month.columns = ['월', '공급사명', '월별청구금액']
             by_vendor_month.to_excel(writer, sheet_name='공급사별월별청구금액', index=False)
 
         # 1. 월별 IN 집계
-        in_df = transaction_df[transaction_df['TxType_Refined'] == 'IN']
-        if not in_df.empty:
-            monthly_in = in_df.groupby(['월', 'Location'])['Qty'].sum().reset_index()
+        in_cube = cube.slice(TxType_Refined='IN')
+        if not in_cube.cells.empty:
+            monthly_in = in_cube.rollup(['월', 'Location'], 'Qty')
             monthly_in.to_excel(writer, sheet_name='01_월별IN_창고현장', index=False)
             print("  ✅ 월별 IN 집계 완료")
         
         # 2. 월별 OUT 집계
-        out_df = transaction_df[transaction_df['TxType_Refined'].isin(['TRANSFER_OUT', 'FINAL_OUT'])]
-        if not out_df.empty:
-            monthly_out = out_df.groupby(['월', 'Location'])['Qty'].sum().reset_index()
+        out_cube = cube.slice(TxType_Refined=['TRANSFER_OUT', 'FINAL_OUT'])
+        if not out_cube.cells.empty:
+            monthly_out = out_cube.rollup(['월', 'Location'], 'Qty')
             monthly_out.to_excel(writer, sheet_name='02_월별OUT_창고현장', index=False)
             print("  ✅ 월별 OUT 집계 완료")
         
         # 3. 비용 집계 (mapping_rules 기반 자동 확장)
-        numeric_fields = get_numeric_fields_from_mapping()
         sheet_counter = 3
         
         for field in numeric_fields:
-            if field in transaction_df.columns and transaction_df[field].sum() > 0:
+            if cube.has_measure(field) and cube.total(field) > 0:
                 # 월별 집계
-                monthly_agg = transaction_df.groupby('월')[field].sum().reset_index()
+                monthly_agg = cube.rollup('월', field)
                 monthly_agg.columns = ['월', f'월별{field}합계']
                 sheet_name = f'{sheet_counter:02d}_월별{field}'
                 monthly_agg.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -321,7 +362,7 @@ def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output
                 print(f"  ✅ {field} 월별 집계 완료")
                 
                 # 창고별 집계
-                location_agg = transaction_df.groupby('Location')[field].sum().reset_index()
+                location_agg = cube.rollup('Location', field)
                 location_agg.columns = ['창고/현장', f'총{field}합계']
                 location_agg = location_agg.sort_values(f'총{field}합계', ascending=False)
                 sheet_name = f'{sheet_counter:02d}_창고별{field}'
@@ -364,14 +405,14 @@ def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output
         if not unmatched_df.empty:
             # RENT FEE 자동 분류
             warehouse_list = ["DSV OUTDOOR", "DSV INDOOR", "DSV AL MARKAZ", "DSV MZP"]
-            unmatched_df['Remark'] = unmatched_df.apply(lambda row: mark_rent_fee(row, warehouse_list), axis=1)
+            unmatched_df['Remark'] = mark_rent_fee_frame(unmatched_df, warehouse_list)
             # GROUP BY HVDC CODE 1, 2
             group_cols = [col for col in ['HVDC CODE 1', 'HVDC CODE 2'] if col in unmatched_df.columns]
             agg_dict = {}
             for col in ['Amount', 'Qty', 'SQM', 'Handling In freight ton', 'Handling out Freight Ton']:
                 if col in unmatched_df.columns:
                     agg_dict[col] = 'sum'
-            unmatched_group = unmatched_df.groupby(group_cols).agg(agg_dict).reset_index() if group_cols else pd.DataFrame()
+            unmatched_group = unmatched_df.groupby(group_cols, observed=True).agg(agg_dict).reset_index() if group_cols else pd.DataFrame()
             # RENT FEE 시트
             rent_fee_df = unmatched_df[unmatched_df['Remark'] == "RENT FEE"].copy()
         else:
@@ -448,15 +489,48 @@ def generate_excel_comprehensive_report(transaction_df, daily_stock=None, output
         monthly_summary_df.to_excel(writer, sheet_name='월별정산집계', index=False)
         print(f"✅ 월별정산집계 시트 저장 ({len(monthly_summary_df)}개월)")
 
-        # === [실제_최종재고 시트 추가] ===
-        real_inventory_table = calc_actual_inventory_precise(transaction_df)
+        # === [창고 점유 SQM-일수 / RENT FEE 발생추정 시트 추가] ===
+        if {'Case_No', 'Date', 'TxType_Refined', 'Qty'}.issubset(transaction_df.columns):
+            rent_accrual_df, rent_reconcile_df = generate_rent_accrual_report(transaction_df)
+            if 'RENT_발생추정' in rent_accrual_df.columns:
+                rent_accrual_df.to_excel(writer, sheet_name='RENT FEE 발생추정', index=False)
+                print(f"✅ RENT FEE 발생추정 시트 저장 ({len(rent_accrual_df)}행)")
+            else:
+                rent_accrual_df.to_excel(writer, sheet_name='창고점유 SQM일수', index=False)
+                print(f"✅ 창고점유 SQM일수 시트 저장 ({len(rent_accrual_df)}행)")
+            if rent_reconcile_df is not None:
+                rent_reconcile_df.to_excel(writer, sheet_name='RENT FEE 대사', index=False)
+
+        # === [실제_최종재고 / 현장재고_대사 시트 추가] ===
+        position_index = CasePositionIndex.from_transactions(transaction_df)
+        real_inventory_table = calc_actual_inventory_precise(transaction_df, position_index=position_index)
         real_inventory_table.to_excel(writer, sheet_name='실제_최종재고', index=False)
+        site_reconcile_df = reconcile_site_inventory(transaction_df, position_index=position_index)
+        site_reconcile_df.to_excel(writer, sheet_name='현장재고_대사', index=False)
 
     if debug:
         print(f"✅ 통합 리포트 저장: {output_file}")
     print(f"✅ 미매핑/RENT FEE 시트 추가 완료: {output_file}")
     return output_file
 
+def generate_report_from_transaction_log(output_file=None, log_path=None, months=None, vendors=None):
+    """
+    정본 트랜잭션 로그(artifacts/transaction_log.parquet)에서 통합 엑셀 리포트 생성
+
+    Args:
+        months / vendors: 파티션 푸시다운 조건 (기본: 전체)
+    """
+    from core.transaction_log import read_transaction_log, TRANSACTION_LOG_PATH
+
+    df = read_transaction_log(log_path or TRANSACTION_LOG_PATH, months=months, vendors=vendors,
+                              decode_categories=True)
+    print(f"📥 트랜잭션 로그 로드: {len(df):,}건")
+    if '월' not in df.columns:
+        df['월'] = df['month']
+    if 'Operation Month' not in df.columns:
+        df['Operation Month'] = df['Date']
+    return generate_excel_comprehensive_report(df, output_file=output_file)
+
 def get_numeric_fields_from_mapping():
     """mapping_rules에서 숫자형 필드 목록 반환"""
     numeric_fields = []
@@ -494,7 +568,7 @@ def generate_automated_summary_report(df, output_dir="reports"):
             sheet_counter += 1
             
             # 창고별 트랜잭션 수
-            location_tx_count = df.groupby('Location').size().reset_index(name='트랜잭션수')
+            location_tx_count = df.groupby('Location', observed=True).size().reset_index(name='트랜잭션수')
             location_tx_count = location_tx_count.sort_values('트랜잭션수', ascending=False)
             location_tx_count.to_excel(writer, sheet_name=f'{sheet_counter:02d}_창고별트랜잭션수', index=False)
             sheet_counter += 1
@@ -513,7 +587,7 @@ def generate_automated_summary_report(df, output_dir="reports"):
         
         # 3. 벤더별 집계 (Vendor 컬럼이 있는 경우)
         if 'Vendor' in df.columns:
-            vendor_agg = df.groupby('Vendor').agg({
+            vendor_agg = df.groupby('Vendor', observed=True).agg({
                 'Qty': 'sum',
                 'Amount': 'sum'
             }).reset_index()
@@ -737,7 +811,7 @@ def visualize_out_transactions(df):
         print(f"      {out_type}: {count:,}건")
     
     # 창고별 OUT 분석
-    location_out = out_df.groupby('Location')['Qty'].sum().sort_values(ascending=False)
+    location_out = out_df.groupby('Location', observed=True)['Qty'].sum().sort_values(ascending=False)
     print("   🏢 창고별 OUT 수량:")
     for location, qty in location_out.head(5).items():
         print(f"      {location}: {qty:,}")
@@ -823,7 +897,11 @@ def append_summary_row(df):
     
     return pd.concat([df, pd.DataFrame([summary_row])], ignore_index=True)
 
-def generate_monthly_summary_report(df):
+def generate_monthly_summary_report(df, sql=None):
+    """월별정산집계 (Handling Fee / RENT FEE / OTHERS), sql이 있으면 v_monthly_settlement 뷰 조회"""
+    if sql is not None:
+        return sql.view('v_monthly_settlement')
+
     # 1. Billing month 기준 월 컬럼 생성 (YYYY-MM)
     if 'Billing month' in df.columns:
         df['집계월'] = pd.to_datetime(df['Billing month'], errors='coerce').dt.strftime('%Y-%m')
@@ -874,10 +952,10 @@ def calc_real_imported_stock(df):
     site_list = ['AGI', 'DAS', 'MIR', 'SHU']
     df_site = df[df['Location'].isin(site_list)]
     stock_pivot = (
-        df_site.groupby(['Vendor', 'Storage_Type', 'Location'], as_index=False)['Qty'].sum()
+        df_site.groupby(['Vendor', 'Storage_Type', 'Location'], as_index=False, observed=True)['Qty'].sum()
     )
     result = stock_pivot.pivot_table(index=['Vendor', 'Storage_Type'],
-                                     columns='Location', values='Qty', fill_value=0).reset_index()
+                                     columns='Location', values='Qty', fill_value=0, observed=True).reset_index()
     for site in site_list:
         if site not in result.columns:
             result[site] = 0
@@ -885,30 +963,36 @@ def calc_real_imported_stock(df):
     result = result[['Vendor', 'Storage_Type'] + site_list + ['TOTAL']]
     return result
 
-def calc_actual_inventory_precise(df):
+def calc_actual_inventory_precise(df, as_of=None, position_index=None):
+    """
+    현장(AGI/DAS/MIR/SHU) 실재고 집계 - 케이스 위치 인덱스 기준
+
+    Args:
+        as_of: 기준 시점 (기본: 최신 상태)
+        position_index: 재사용할 CasePositionIndex (없으면 df로 생성)
+    """
     site_list = ['AGI', 'DAS', 'MIR', 'SHU']
-    df = df.sort_values('Date')
-    last_row = df.groupby('Case_No', as_index=False).last()
-    mask = (last_row['Location'].isin(site_list)) & \
-           (last_row['TxType_Refined'].isin(['IN', 'TRANSFER_IN']))
-    real_stock = last_row[mask]
-    print(f"🎯 실제 재고(실재고) 개수(최신 상태 기준): {len(real_stock):,}")
+    if position_index is None:
+        position_index = CasePositionIndex.from_transactions(df)
+    real_stock = position_index.in_stock(site_list, as_of=as_of)
+    print(f"🎯 실제 재고(실재고) 개수({'최신 상태' if as_of is None else as_of} 기준): {len(real_stock):,}")
     # 이벤트 없는/누락 케이스 진단
-    event_cases = set(df['Case_No'])
+    event_cases = set(df['Case_No'].astype(str))
     real_cases = set(real_stock['Case_No']) if 'Case_No' in real_stock.columns else set(real_stock.index)
     missing_cases = event_cases - real_cases
     print(f"실재고 집계에서 누락된 케이스 수: {len(missing_cases)}")
     print("샘플 누락 Case_No:", list(missing_cases)[:10])
     # 현장/Storage Type별 집계
-    if 'Vendor' not in real_stock.columns: real_stock['Vendor'] = 'UNKNOWN'
-    if 'Storage_Type' not in real_stock.columns:
-        real_stock['Storage_Type'] = real_stock['Location'].apply(classify_storage_type)
+    real_stock['Vendor'] = real_stock['Vendor'].fillna('UNKNOWN')
+    missing_type = real_stock['Storage_Type'].isnull()
+    real_stock.loc[missing_type, 'Storage_Type'] = real_stock.loc[missing_type, 'Location'].apply(classify_storage_type)
     pivot = real_stock.pivot_table(
         index=['Vendor', 'Storage_Type'],
         columns='Location',
         values='Case_No',
         aggfunc='count',
-        fill_value=0
+        fill_value=0,
+        observed=True
     ).reset_index()
     for site in site_list:
         if site not in pivot.columns:
@@ -916,6 +1000,32 @@ def calc_actual_inventory_precise(df):
     pivot['TOTAL'] = pivot[site_list].sum(axis=1)
     return pivot
 
+def reconcile_site_inventory(df, as_of=None, position_index=None):
+    """
+    현장별 재고 대사: 거래 누계(IN - OUT > 0) 케이스 수 vs 위치 인덱스상 현장 체류 케이스 수
+    """
+    site_list = ['AGI', 'DAS', 'MIR', 'SHU']
+    if position_index is None:
+        position_index = CasePositionIndex.from_transactions(df)
+
+    site_df = df[df['Location'].isin(site_list)]
+    if as_of is not None:
+        site_df = site_df[pd.to_datetime(site_df['Date']) <= pd.Timestamp(as_of)]
+    signed_qty = site_df['Qty'] * np.where(site_df['TxType_Refined'].isin(['IN', 'TRANSFER_IN']), 1, -1)
+    net = signed_qty.groupby([site_df['Location'], site_df['Case_No']], observed=True).sum()
+    ledger_cases = (net > 0).groupby(level=0, observed=True).sum().reindex(site_list, fill_value=0)
+
+    positioned = position_index.in_stock(site_list, as_of=as_of)
+    position_cases = positioned['Location'].value_counts().reindex(site_list, fill_value=0)
+
+    result = pd.DataFrame({
+        '현장': site_list,
+        '거래누계_재고케이스': ledger_cases.to_numpy(),
+        '위치기준_재고케이스': position_cases.to_numpy(),
+    })
+    result['차이'] = result['거래누계_재고케이스'] - result['위치기준_재고케이스']
+    return result
+
 def real_inventory_table(df):
     df = normalize_all_keys(df)
     # ... pivot, groupby, 집계 ...
@@ -945,4 +1055,4 @@ def get_grouped_pkg_sum(df, group_cols=['Location']):
     pkg_col = find_pkg_column(df)
     if not pkg_col:
         raise ValueError("Pkg 컬럼이 존재하지 않습니다.")
-    return df.groupby(group_cols)[pkg_col].sum().reset_index() 
\ No newline at end of file
+    return df.groupby(group_cols, observed=True)[pkg_col].sum().reset_index() 
\ No newline at end of file
@@ -4,6 +4,7 @@ HVDC 통합 자동화 파이프라인 v2.6
 최신 실무 기준: 확장형 매핑 + 온톨로지 연계 + 자동화 리포트
 """
 
+import argparse
 import pandas as pd
 import json
 from pathlib import Path
@@ -15,6 +16,8 @@ from mapping_utils import (
     normalize_code_num, codes_match, is_valid_hvdc_vendor, is_warehouse_code
 )
 
+from core.profiler import PROFILE_MODES, StageProfiler
+
 # 핵심 모듈 임포트
 try:
     from excel_reporter import generate_excel_comprehensive_report
@@ -249,44 +252,59 @@ class HVDCAutomationPipeline:
             self.logger.error(f"❌ 온톨로지 변환 실패: {e}")
             return None
     
-    def run_full_pipeline(self, input_file: str, output_file: str = "HVDC_최종통합리포트_v2.6.xlsx") -> dict:
-        """전체 파이프라인 실행"""
+    def run_full_pipeline(self, input_file: str, output_file: str = "HVDC_최종통합리포트_v2.6.xlsx",
+                          profile_mode: str = None) -> dict:
+        """전체 파이프라인 실행 (profile_mode: cpu/mem/both 프로파일 산출물을 리포트 옆에 저장)"""
         start_time = datetime.now()
+        result = {'success': False}
         
-        try:
-            # 1. 데이터 처리
-            df = self.process_logistics_data(input_file)
-            
-            # 2. 통합 리포트 생성
-            report_success = self.generate_comprehensive_report(df, output_file)
-            
-            # 3. 온톨로지 변환
-            rdf_path = self.convert_to_ontology(df)
-            
-            # 4. 결과 요약
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            result = {
-                'success': report_success,
-                'input_file': input_file,
-                'output_file': output_file,
-                'rdf_path': rdf_path,
-                'data_rows': len(df),
-                'data_columns': len(df.columns),
-                'duration_seconds': duration,
-                'timestamp': end_time.isoformat()
-            }
-            
-            self.logger.info(f"🎉 전체 파이프라인 완료: {duration:.2f}초")
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"❌ 파이프라인 실패: {e}")
-            return {'success': False, 'error': str(e)}
+        with StageProfiler("hvdc_v2.6", profile_mode=profile_mode) as profiler:
+            try:
+                # 1. 데이터 처리
+                df = profiler.track('process', self.process_logistics_data, input_file)
+                
+                # 2. 통합 리포트 생성
+                report_success = profiler.track('report', self.generate_comprehensive_report, df, output_file)
+                
+                # 3. 온톨로지 변환
+                rdf_path = profiler.track('rdf', self.convert_to_ontology, df)
+                
+                # 4. 결과 요약
+                end_time = datetime.now()
+                duration = (end_time - start_time).total_seconds()
+                
+                result = {
+                    'success': report_success,
+                    'input_file': input_file,
+                    'output_file': output_file,
+                    'rdf_path': rdf_path,
+                    'data_rows': len(df),
+                    'data_columns': len(df.columns),
+                    'duration_seconds': duration,
+                    'timestamp': end_time.isoformat(),
+                }
+                
+                self.logger.info(f"🎉 전체 파이프라인 완료: {duration:.2f}초")
+                
+            except Exception as e:
+                self.logger.error(f"❌ 파이프라인 실패: {e}")
+                result = {'success': False, 'error': str(e)}
+            finally:
+                # 실패한 실행도 실패 지점까지의 프로파일을 남김 (tracemalloc은 저장 전에 종료)
+                profiler.close()
+                if profiler.stages:
+                    result['profile_path'] = profiler.write()
+                    result['profile_reports'] = profiler.write_profile_reports(Path(output_file).parent)
+        
+        return result
 
 def main():
     """메인 실행 함수"""
+    ap = argparse.ArgumentParser(description="HVDC 통합 자동화 파이프라인 v2.6")
+    ap.add_argument("--profile", nargs="?", const="cpu", choices=PROFILE_MODES,
+                    help="스테이지별 cpu/mem 프로파일 + flamegraph(collapsed) / 핫스팟 요약을 리포트 옆에 저장")
+    args = ap.parse_args()
+
     print("🚀 HVDC 통합 자동화 파이프라인 v2.6 시작")
     print("=" * 60)
     
@@ -305,7 +323,7 @@ def main():
             print(f"📄 입력 파일 발견: {input_file}")
             
             # 전체 파이프라인 실행
-            result = pipeline.run_full_pipeline(input_file)
+            result = pipeline.run_full_pipeline(input_file, profile_mode=args.profile)
             
             if result['success']:
                 print(f"✅ 성공: {result['output_file']}")
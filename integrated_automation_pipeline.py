@@ -6,6 +6,7 @@ HVDC 통합 자동화 파이프라인 - mapping_rules_v2.6.json 기반
 집계, 피벗, 엑셀 리포트, RDF, SPARQL 쿼리까지 모두 자동 확장됨
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -21,10 +22,16 @@ except Exception as e:
     def load_expected_stock(as_of=None):
         return {}
         
+from core.analytics_db import AnalyticsDB, SQL_ENGINES
 from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
-from core.loader import DataLoader
+from core.olap_cube import InventoryCube
+from core.pipeline_dag import build_transaction_graph
+from core.profiler import PROFILE_MODES, StageProfiler
+from core.transaction_log import write_transaction_log, PYARROW_AVAILABLE
 from excel_reporter import (
+    apply_hvdc_filters,
     generate_monthly_in_out_stock_report,
+    generate_monthly_summary_report,
     normalize_location_column,
     generate_excel_comprehensive_report
 )
@@ -44,6 +51,8 @@ except ImportError:
         print(f"RDF 변환 건너뜀: {output_path}")
         return output_path
 
+INVOICE_PATH = "data/HVDC WAREHOUSE_INVOICE.xlsx"
+
 def load_mapping_rules():
     """mapping_rules_v2.6.json 로드"""
     try:
@@ -86,8 +95,13 @@ def apply_mapping_rules_to_dataframe(df, mapping_rules):
     print(f"✅ DataFrame 전처리 완료: {len(df.columns)}개 컬럼")
     return df
 
-def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
-    """통합 리포트 생성 (mapping_rules 기반 자동 확장)"""
+def generate_comprehensive_reports(df, mapping_rules, output_dir="reports", cube=None, sql=None):
+    """
+    통합 리포트 생성 (mapping_rules 기반 자동 확장, 수치 집계는 OLAP 큐브 롤업)
+
+    sql(AnalyticsDB)을 넘기면 월별 IN/OUT/재고 시트를 SQL 뷰에서 조회하고
+    공급사별/현장별 월별, 월별정산집계 시트를 추가합니다.
+    """
     print("📊 통합 리포트 생성 중...")
     
     # 출력 디렉토리 생성
@@ -95,7 +109,7 @@ def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # 1. 기본 월별 IN/OUT/재고 리포트
-    in_df, out_df, stock_df = generate_monthly_in_out_stock_report(df)
+    in_df, out_df, stock_df = generate_monthly_in_out_stock_report(df, sql=sql)
     
     # 2. mapping_rules 기반 자동 집계 리포트 생성
     field_map = mapping_rules.get('field_map', {})
@@ -108,6 +122,8 @@ def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
             numeric_fields.append(field)
     
     print(f"  📈 자동 집계 필드: {numeric_fields}")
+    if cube is None:
+        cube = InventoryCube.from_transactions(df, measures=numeric_fields)
     
     # 3. 통합 엑셀 리포트 생성
     excel_report_path = f"{output_dir}/HVDC_통합자동화리포트_{timestamp}.xlsx"
@@ -123,8 +139,8 @@ def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
         
         # 월별 집계 (각 숫자 필드별)
         for field in numeric_fields:
-            if field in df.columns and df[field].sum() > 0:
-                monthly_agg = df.groupby('월')[field].sum().reset_index()
+            if cube.has_measure(field) and cube.total(field) > 0:
+                monthly_agg = cube.rollup('월', field)
                 monthly_agg.columns = ['월', f'월별{field}합계']
                 sheet_name = f'{sheet_counter:02d}_월별{field}'
                 monthly_agg.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -133,8 +149,8 @@ def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
         
         # 창고별 집계 (각 숫자 필드별)
         for field in numeric_fields:
-            if field in df.columns and df[field].sum() > 0:
-                location_agg = df.groupby('Location')[field].sum().reset_index()
+            if cube.has_measure(field) and cube.total(field) > 0:
+                location_agg = cube.rollup('Location', field)
                 location_agg.columns = ['창고/현장', f'총{field}합계']
                 location_agg = location_agg.sort_values(f'총{field}합계', ascending=False)
                 sheet_name = f'{sheet_counter:02d}_창고별{field}'
@@ -142,6 +158,18 @@ def generate_comprehensive_reports(df, mapping_rules, output_dir="reports"):
                 sheet_counter += 1
                 print(f"    ✅ {field} 창고별 집계 완료")
         
+        # SQL 뷰 기반 시트들
+        if sql is not None:
+            sql_sheets = [('공급사월별', sql.view('v_vendor_monthly')),
+                          ('현장월별', sql.view('v_site_monthly')),
+                          ('월별정산집계', generate_monthly_summary_report(df, sql=sql))]
+            if 'v_invoice_vs_report' in sql.views:
+                sql_sheets.append(('인보이스대사', sql.view('v_invoice_vs_report')))
+            for title, view_df in sql_sheets:
+                view_df.to_excel(writer, sheet_name=f'{sheet_counter:02d}_{title}', index=False)
+                sheet_counter += 1
+                print(f"    ✅ {title} SQL 뷰 조회 완료")
+        
         # 통계 요약 시트
         stats_data = []
         for field in numeric_fields:
@@ -241,11 +269,30 @@ ORDER BY ?month ?warehouse
     print(f"✅ SPARQL 쿼리 생성 완료: {sparql_file}")
     return sparql_file
 
-def main():
-    """통합 자동화 파이프라인 메인 함수"""
+def load_invoice_frame(path=INVOICE_PATH):
+    """인보이스 워크북 로드 (없거나 읽기 실패 시 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_excel(path)
+    except Exception as e:
+        print(f"⚠️ 인보이스 로드 실패: {e}")
+        return None
+
+def main(profile_mode=None, sql_engine=None):
+    """
+    통합 자동화 파이프라인 메인 함수
+
+    Args:
+        profile_mode: cpu/mem/both 프로파일 산출물을 리포트 옆에 저장
+        sql_engine: auto/duckdb/sqlite - 트랜잭션/인보이스를 임베디드 DB에 1회 적재하고 리포트 집계를 SQL 뷰로 조회
+    """
     print("🚀 HVDC 통합 자동화 파이프라인 시작")
     print("=" * 60)
     
+    profiler = StageProfiler("integrated_pipeline", profile_mode=profile_mode)
+    excel_report_path = None
     try:
         # 1. mapping_rules 로드
         print("📋 mapping_rules_v2.6.json 로드 중...")
@@ -256,52 +303,74 @@ def main():
         
         print(f"✅ mapping_rules 로드 완료: v{mapping_rules.get('version', 'unknown')}")
         
-        # 2. 데이터 로딩
+        # 2. 데이터 로딩 (원시 트랜잭션은 main.py/검증 스크립트와 스테이지 캐시 공유)
         print("\n📄 데이터 로딩 중...")
-        loader = DataLoader()
-        excel_files = loader.load_excel_files("data")
+        raw_transactions = build_transaction_graph("data", profiler=profiler).run('load')
         
-        if not excel_files:
+        if not raw_transactions:
             print("❌ Excel 파일이 없습니다!")
             return False
-            
-        raw_transactions = loader.extract_transactions(excel_files)
-        print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
 
         # 3. DataFrame 변환
         print("\n🔄 DataFrame 변환 중...")
-        transaction_df = transactions_to_dataframe(raw_transactions)
+        transaction_df = profiler.track('convert', transactions_to_dataframe, raw_transactions)
         print(f"✅ {len(transaction_df)}건 트랜잭션 생성")
         
         # 4. mapping_rules 기반 전처리 및 확장
-        transaction_df = apply_mapping_rules_to_dataframe(transaction_df, mapping_rules)
+        transaction_df = profiler.track('mapping', apply_mapping_rules_to_dataframe, transaction_df, mapping_rules)
         
         # 5. 데이터 전처리
         print("\n🛠️ 데이터 전처리 중...")
-        transaction_df = reconcile_orphan_transfers(transaction_df)
-        transaction_df = drop_duplicate_transfers(transaction_df)
+        transaction_df = profiler.track('reconcile', reconcile_orphan_transfers, transaction_df)
+        transaction_df = profiler.track('dedup', drop_duplicate_transfers, transaction_df)
         print("✅ 데이터 검증 완료")
         
-        # 6. 통합 리포트 생성
-        excel_report_path = generate_comprehensive_reports(transaction_df, mapping_rules)
+        # 정본 트랜잭션 로그 저장 (월 × 공급사 파티션)
+        if PYARROW_AVAILABLE:
+            profiler.track('transaction_log', write_transaction_log, transaction_df)
+        
+        # 6. OLAP 큐브 생성 (런당 1회, 모든 리포트가 공유)
+        numeric_fields = [field for field, props in mapping_rules.get('property_mappings', {}).items()
+                          if props.get('datatype') in ['xsd:decimal', 'xsd:integer']]
+        with profiler.stage('olap_cube', rows_in=len(transaction_df)):
+            cube = InventoryCube.from_transactions(transaction_df, measures=numeric_fields)
+            cube_path = cube.save(Path("artifacts") / "inventory_cube")
+        
+        # 6-1. SQL 분석 DB 적재 (리포트와 같은 HVDC 필터 기준, 실행 후에도 조회 가능)
+        sql_db = None
+        if sql_engine:
+            with profiler.stage('sql_load', rows_in=len(transaction_df)):
+                sql_db = AnalyticsDB(engine=sql_engine).load(
+                    apply_hvdc_filters(transaction_df.copy()), load_invoice_frame(), measures=numeric_fields)
+        
+        # 7. 통합 리포트 생성
+        try:
+            excel_report_path = profiler.track('report', generate_comprehensive_reports,
+                                               transaction_df, mapping_rules, cube=cube, sql=sql_db)
+        finally:
+            if sql_db is not None:
+                sql_db.close()
         
-        # 7. RDF 변환
-        rdf_path = generate_rdf_from_dataframe(transaction_df, mapping_rules)
+        # 8. RDF 변환
+        rdf_path = profiler.track('rdf', generate_rdf_from_dataframe, transaction_df, mapping_rules)
         
-        # 8. SPARQL 쿼리 생성
-        sparql_path = generate_sparql_queries(mapping_rules)
+        # 9. SPARQL 쿼리 생성
+        sparql_path = profiler.track('sparql', generate_sparql_queries, mapping_rules)
         
-        # 9. 결과 요약
+        # 10. 결과 요약
         print("\n" + "=" * 60)
         print("🎉 통합 자동화 파이프라인 완료!")
         print("=" * 60)
         print(f"📊 DataFrame 컬럼 수: {len(transaction_df.columns)}개")
         print(f"📄 엑셀 리포트: {excel_report_path}")
+        print(f"🧊 OLAP 큐브: {cube_path}")
+        if sql_db is not None:
+            print(f"🗃️ SQL 분석 DB: {sql_db.path}")
         if rdf_path:
             print(f"🔗 RDF 파일: {rdf_path}")
         print(f"🔍 SPARQL 쿼리: {sparql_path}")
         
-        # 10. mapping_rules 확장 가능성 안내
+        # 11. mapping_rules 확장 가능성 안내
         print("\n📋 mapping_rules 확장 가이드:")
         print("  - 새로운 필드 추가: field_map과 property_mappings에 한 줄 추가")
         print("  - 벤더 매핑: vendor_mappings에 추가")
@@ -316,6 +385,11 @@ def main():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        if profiler.stages:
+            profiler.print_summary()
+            profiler.write()
+            profiler.write_profile_reports(Path(excel_report_path).parent if excel_report_path else None)
 
 def transactions_to_dataframe(transactions):
     """트랜잭션 리스트를 DataFrame으로 변환"""
@@ -452,7 +526,13 @@ def extract_site(warehouse_name):
     return 'UNK'
 
 if __name__ == "__main__":
-    success = main()
+    ap = argparse.ArgumentParser(description="HVDC 통합 자동화 파이프라인")
+    ap.add_argument("--profile", nargs="?", const="cpu", choices=PROFILE_MODES,
+                    help="스테이지별 cpu/mem 프로파일 + flamegraph(collapsed) / 핫스팟 요약을 리포트 옆에 저장")
+    ap.add_argument("--sql", nargs="?", const="auto", choices=SQL_ENGINES,
+                    help="트랜잭션/인보이스를 임베디드 DB(DuckDB, 없으면 SQLite)에 적재하고 리포트 집계를 SQL 뷰로 조회")
+    args = ap.parse_args()
+    success = main(profile_mode=args.profile, sql_engine=args.sql)
     if success:
         print("\n🎉 통합 자동화 파이프라인 성공!")
         sys.exit(0)
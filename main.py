@@ -1,21 +1,73 @@
 # main.py - 최종 수정된 버전
 
 import argparse
+import threading
 import pandas as pd
 import pathlib as pl
 
 # 핵심 모듈 임포트
 from config import load_expected_stock
-from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers, validate_transfer_pairs_fixed, validate_date_sequence_fixed
-from core.loader import DataLoader
-from core.mapping import normalize_all_keys, add_storage_type_to_dataframe
+from core.diagnostics import VERBOSITY_LEVELS, set_default_verbosity
+from core.partitioned_inventory import DEFAULT_OUTPUT_DIR as PARTITION_OUTPUT_DIR, calculate_partitioned_inventory
+from core.deduplication import validate_transfer_pairs_fixed, validate_date_sequence_fixed
+from core.pipeline_dag import build_transaction_graph, DEFAULT_CACHE_DIR
+from core.polars_engine import DEFAULT_ENGINE, TRANSACTION_ENGINES
+from core.profiler import PROFILE_MODES, StageProfiler
+from core.transaction_log import write_transaction_log, PYARROW_AVAILABLE
+from core.watch_service import DEFAULT_POLL_INTERVAL, WarehouseService
+from variance_ledger import DEFAULT_LEDGER_PATH
+from core.transactions import (
+    transactions_to_dataframe, extract_case_id, extract_warehouse, extract_datetime,
+    extract_quantity, normalize_warehouse_name, extract_site, calculate_daily_inventory
+)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--asof", help="스냅샷 기준일 (YYYY-MM-DD)")
     ap.add_argument("--src",  default="data", help="Excel 폴더 경로")
     ap.add_argument("--debug", action="store_true", help="디버그 모드")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="스테이지 산출물 캐시 폴더")
+    ap.add_argument("--no-cache", action="store_true", help="스테이지 캐시 미사용 (전체 재계산)")
+    ap.add_argument("--profile-out", help="스테이지 프로파일 JSON 경로 (기본: artifacts/profiles/main_<시각>.json)")
+    ap.add_argument("--trace-alloc", action="store_true", help="tracemalloc 상위 할당 기록 (실행이 느려짐)")
+    ap.add_argument("--profile", nargs="?", const="cpu", choices=PROFILE_MODES,
+                    help="스테이지별 cpu/mem 프로파일 + flamegraph(collapsed) / 핫스팟 요약 저장 (mem은 실행이 느려짐)")
+    ap.add_argument("--engine", choices=TRANSACTION_ENGINES, default=DEFAULT_ENGINE,
+                    help="TRANSFER 보정/중복 제거/일별 재고 엔진 (polars: 지연 쿼리 계획, pandas와 같은 결과)")
+    ap.add_argument("--partitioned", action="store_true",
+                    help="월 파티션 재고 계산: 트랜잭션 로그를 한 달씩 읽어 기초재고 이월, 월별 산출물 즉시 기록 (pyarrow 필요)")
+    ap.add_argument("--partition-dir", default=PARTITION_OUTPUT_DIR, help="월 파티션 일별/월별 재고 출력 폴더")
+    ap.add_argument("--verbosity", choices=list(VERBOSITY_LEVELS), default="summary",
+                    help="로더 행 단위 진단 출력 수준 (파일별 요약 1회, 기본: summary)")
+    ap.add_argument("--watch", action="store_true",
+                    help="감시 모드: --src 폴더 변경 시 변경 워크북만 재처리 (웜 캐시 유지, Ctrl+C로 종료)")
+    ap.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="감시 모드 폴링 간격(초)")
+    ap.add_argument("--serve", action="store_true",
+                    help="로컬 조회 API(HTTP/JSON) 실행 - 재고/케이스/공급사 월별/오차 (--watch와 함께 쓰면 갱신 반영)")
+    ap.add_argument("--port", type=int, help="조회 API 포트 (기본: core.query_api.DEFAULT_PORT)")
+    ap.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="조회 API 오차 원장 SQLite 경로")
     args = ap.parse_args()
+    set_default_verbosity(args.verbosity)
+
+    if args.watch or args.serve:
+        service = WarehouseService(args.src, engine=args.engine)
+        service.add_listener(lambda svc: print_final_inventory_summary(svc.daily_stock))
+        if args.serve:
+            # http.server/urllib는 조회 API 실행 시에만 import
+            from core.query_api import DEFAULT_PORT, QueryAPIServer, load_variance_ledger
+
+            server = QueryAPIServer(port=args.port or DEFAULT_PORT)
+            server.attach(service, variance=load_variance_ledger(args.ledger))
+            server.start()
+        if args.watch:
+            service.watch(interval=args.interval)
+        else:
+            service.refresh()
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                print("\n🛑 조회 API 종료")
+        return True
 
     # 시스템 정보 출력
     print_system_info()
@@ -25,66 +77,60 @@ def main():
         print("❌ 시스템 진단 실패 - 필수 파일이나 모듈을 확인하세요")
         return False
 
+    profiler = StageProfiler("main", trace_memory=args.trace_alloc, profile_mode=args.profile)
     try:
         print("\n🚀 메인 처리 시작")
         
-        # ① 데이터 로딩
-        loader = DataLoader()
+        # ①~④ 로딩 → 변환 → TRANSFER 보정 → 중복 제거 (스테이지 캐시 재사용, 스테이지별 성능 측정)
+        graph = build_transaction_graph(args.src, cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                                        profiler=profiler, engine=args.engine)
         print("📄 데이터 파일 로딩 중...")
         
-        excel_files = loader.load_excel_files(args.src)
-        if not excel_files:
+        # 원시 트랜잭션(전체 이력 dict 리스트)은 그래프에만 보관 - --partitioned에서 graph.release()로 함께 해제
+        if not graph.run('load'):
             print("❌ 로딩할 Excel 파일이 없습니다!")
             return False
-            
-        raw_transactions = loader.extract_transactions(excel_files)
-        print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
 
-        # ② 트랜잭션 DataFrame 변환
-        transaction_df = transactions_to_dataframe(raw_transactions)
-        transaction_df = normalize_all_keys(transaction_df)
-        transaction_df = add_storage_type_to_dataframe(transaction_df, "Location")
-        
+        transaction_df = graph.run('convert')
         if args.debug:
             debug_transaction_flow(transaction_df)
-        
-        # 필수 컬럼 확인 및 추가
-        required_columns = ['Case_No', 'Date', 'Qty', 'TxType_Refined', 'Location', 'Loc_From', 'Target_Warehouse']
-        for col in required_columns:
-            if col not in transaction_df.columns:
-                if col == 'Loc_From':
-                    transaction_df[col] = 'SOURCE'
-                elif col == 'Target_Warehouse':
-                    transaction_df[col] = transaction_df.get('Location', 'UNKNOWN')
-                else:
-                    transaction_df[col] = 'UNKNOWN'
-
         print(f"🔄 트랜잭션 로그 생성 완료: {len(transaction_df)}건")
         
-        # ③ TRANSFER 보정 (한 번만 실행)
         print("🛠️ TRANSFER 짝 보정 중...")
-        transaction_df = reconcile_orphan_transfers(transaction_df)
-        
-        # ④ 중복 제거
-        before_dedup = len(transaction_df)
-        transaction_df = drop_duplicate_transfers(transaction_df)
+        before_dedup = len(graph.run('reconcile'))
+        transaction_df = graph.run('dedup')
         after_dedup = len(transaction_df)
         print(f"🗑️ 중복 제거: {before_dedup} → {after_dedup}건")
         
         # ⑤ 검증
-        validate_transfer_pairs_fixed(transaction_df)
-        validate_date_sequence_fixed(transaction_df)
+        with profiler.stage('validate', rows_in=len(transaction_df)):
+            validate_transfer_pairs_fixed(transaction_df)
+            validate_date_sequence_fixed(transaction_df)
         print("✅ TRANSFER 짝 모두 일치")
         
-        # ⑥ 일별 재고 계산
-        daily_stock = calculate_daily_inventory(transaction_df)
+        # 정본 트랜잭션 로그 저장 (진단 스크립트/리포트/RDF 공용)
+        if PYARROW_AVAILABLE:
+            with profiler.stage('transaction_log', rows_in=len(transaction_df)):
+                write_transaction_log(transaction_df)
+        else:
+            print("⚠️ pyarrow 미설치 - 트랜잭션 로그 저장을 건너뜁니다")
         
-        # ⑦ 기대값과 비교 (기대값 제거)
-        expected = load_expected_stock(args.asof)
-        compare_stock_vs_expected(daily_stock, expected)
+        # ⑥ 일별 재고 계산 (--partitioned: 메모리의 전체 이력을 해제하고 로그를 월 단위로 재처리)
+        if args.partitioned and PYARROW_AVAILABLE:
+            graph.release()
+            transaction_df = None
+            with profiler.stage('inventory_partitioned', rows_in=after_dedup):
+                daily_stock = calculate_partitioned_inventory(output_dir=args.partition_dir)
+        else:
+            if args.partitioned:
+                print("⚠️ pyarrow 미설치 - 월 파티션 재고 계산 대신 전체 계산을 사용합니다")
+            daily_stock = graph.run('inventory')
         
-        # ⑧ 최종 결과 출력 및 엑셀 생성
-        print_final_inventory_summary(daily_stock)
+        # ⑦ 기대값과 비교 (기대값 제거) + ⑧ 최종 결과 출력
+        with profiler.stage('report', rows_in=len(daily_stock)):
+            expected = load_expected_stock(args.asof)
+            compare_stock_vs_expected(daily_stock, expected)
+            print_final_inventory_summary(daily_stock)
         
         return True
         
@@ -94,237 +140,12 @@ def main():
             import traceback
             traceback.print_exc()
         return False
-
-def transactions_to_dataframe(transactions):
-    """트랜잭션 리스트를 DataFrame으로 변환 - 개선된 버전"""
-    data = []
-    
-    print("🔄 트랜잭션 변환 중...")
-    
-    for tx in transactions:
-        tx_data = tx.get('data', {})
-        
-        # 기본 정보 추출
-        case_id = extract_case_id(tx_data)
-        warehouse = extract_warehouse(tx_data)
-        date_val = extract_datetime(tx_data)
-        
-        # 수량 처리
-        incoming = tx_data.get('incoming', 0) or 0
-        outgoing = tx_data.get('outgoing', 0) or 0
-        
-        # 기본 레코드 템플릿
-        base_record = {
-            'Case_No': case_id,
-            'Date': date_val,
-            'Location': warehouse,
-            'Source_File': tx.get('source_file', ''),
-            'Loc_From': 'SOURCE',
-            'Target_Warehouse': warehouse
-        }
-        
-        # IN 트랜잭션 생성
-        if incoming > 0:
-            record = base_record.copy()
-            record.update({
-                'TxType_Refined': 'IN',
-                'Qty': int(incoming)
-            })
-            data.append(record)
-            
-        # OUT 트랜잭션 생성
-        if outgoing > 0:
-            record = base_record.copy()
-            
-            # 사이트 구분하여 FINAL_OUT vs TRANSFER_OUT 결정
-            site = extract_site(warehouse)
-            tx_type = 'FINAL_OUT' if site in ['AGI', 'DAS', 'MIR', 'SHU'] else 'TRANSFER_OUT'
-                
-            record.update({
-                'TxType_Refined': tx_type,
-                'Qty': int(outgoing),
-                'Loc_From': warehouse,  # 출고는 해당 창고에서
-                'Target_Warehouse': 'DESTINATION'
-            })
-            data.append(record)
-    
-    result_df = pd.DataFrame(data)
-    print(f"✅ {len(result_df)}건 트랜잭션 생성")
-    
-    return result_df
-
-def extract_case_id(data):
-    """케이스 ID 추출 - 개선된 버전"""
-    case_fields = ['case', 'Case', 'case_id', 'CaseID', 'ID', 'carton', 'box', 'mr#']
-    
-    for field in case_fields:
-        if field in data and data[field]:
-            case_value = str(data[field]).strip()
-            if case_value and case_value.lower() not in ['nan', 'none', '']:
-                return case_value
-    
-    # 백업: 해시 기반 ID
-    return f"CASE_{abs(hash(str(data))) % 100000}"
-
-def extract_warehouse(data):
-    """창고명 추출 및 정규화 - 개선된 버전"""
-    warehouse_fields = ['warehouse', 'Warehouse', 'site', 'Site', 'location', 'Location']
-    
-    for field in warehouse_fields:
-        if field in data and data[field]:
-            raw_warehouse = str(data[field]).strip()
-            if raw_warehouse and raw_warehouse.lower() not in ['nan', 'none', '']:
-                return normalize_warehouse_name(raw_warehouse)
-    
-    return 'UNKNOWN'
-
-def extract_datetime(data):
-    """날짜/시간 추출 - 개선된 버전"""
-    import pandas as pd
-    from datetime import datetime
-    
-    date_fields = ['date', 'Date', 'timestamp', 'Timestamp', 'datetime']
-    
-    for field in date_fields:
-        if field in data and data[field]:
-            try:
-                date_value = data[field]
-                if isinstance(date_value, str) and date_value.lower() in ['nan', 'none', '']:
-                    continue
-                return pd.to_datetime(date_value)
-            except:
-                continue
-    
-    # 기본값: 현재 시간
-    return pd.Timestamp.now()
-
-def extract_quantity(data):
-    """수량 추출 - 개선된 버전"""
-    qty_fields = ['incoming', 'outgoing', 'inventory', 'quantity', 'qty', 'pieces']
-    total_qty = 0
-    
-    for field in qty_fields:
-        if field in data and data[field]:
-            try:
-                qty = pd.to_numeric(data[field], errors='coerce')
-                if not pd.isna(qty) and qty > 0:
-                    total_qty += qty
-            except:
-                continue
-                
-    return max(int(total_qty), 1)  # 최소 1개
-
-def normalize_warehouse_name(raw_name):
-    """창고명 표준화 - 개선된 버전"""
-    if pd.isna(raw_name) or not raw_name:
-        return 'UNKNOWN'
-        
-    name_lower = str(raw_name).lower().strip()
-    
-    # 정확한 매핑 테이블
-    warehouse_rules = {
-        'DSV Al Markaz': ['markaz', 'm1', 'al markaz', 'almarkaz', 'al_markaz', 'dsv al markaz'],
-        'DSV Indoor': ['indoor', 'm44', 'hauler indoor', 'hauler_indoor', 'dsv indoor'],
-        'DSV Outdoor': ['outdoor', 'out', 'dsv outdoor'],
-        'MOSB': ['mosb'],
-        'DSV MZP': ['mzp', 'dsv mzp'],
-        'DHL WH': ['dhl', 'dhl wh'],
-        'AAA Storage': ['aaa', 'aaa storage']
-    }
-    
-    for canonical, patterns in warehouse_rules.items():
-        if any(pattern in name_lower for pattern in patterns):
-            return canonical
-    
-    return str(raw_name).strip()
-
-def extract_site(warehouse_name):
-    """사이트명 추출 - 개선된 버전"""
-    if pd.isna(warehouse_name) or not warehouse_name:
-        return 'UNK'
-        
-    name_upper = str(warehouse_name).upper()
-    
-    site_patterns = {
-        'AGI': ['AGI'],
-        'DAS': ['DAS'], 
-        'MIR': ['MIR'],
-        'SHU': ['SHU']
-    }
-    
-    for site, patterns in site_patterns.items():
-        if any(pattern in name_upper for pattern in patterns):
-            return site
-    
-    return 'UNK'
-
-def calculate_daily_inventory(transaction_df):
-    """일별 재고 계산 - 사용자 검증된 로직"""
-    print("📊 일별 재고 계산 중...")
-    
-    if transaction_df.empty:
-        print("❌ 계산할 트랜잭션이 없습니다")
-        return pd.DataFrame()
-    
-    # 날짜별, 위치별 집계
-    transaction_df['Date'] = pd.to_datetime(transaction_df['Date']).dt.date
-    
-    daily_summary = transaction_df.groupby(['Location', 'Date', 'TxType_Refined']).agg({
-        'Qty': 'sum'
-    }).reset_index()
-    
-    # 피벗으로 입고/출고 분리
-    daily_pivot = daily_summary.pivot_table(
-        index=['Location', 'Date'],
-        columns='TxType_Refined', 
-        values='Qty',
-        fill_value=0
-    ).reset_index()
-    
-    # 컬럼명 정리
-    daily_pivot.columns.name = None
-    expected_cols = ['IN', 'TRANSFER_OUT', 'FINAL_OUT']
-    for col in expected_cols:
-        if col not in daily_pivot.columns:
-            daily_pivot[col] = 0
-    
-    # 재고 계산 (위치별 누적)
-    stock_records = []
-    
-    for location in daily_pivot['Location'].unique():
-        if location in ['UNKNOWN', 'UNK', '']:
-            continue
-            
-        loc_data = daily_pivot[daily_pivot['Location'] == location].copy()
-        loc_data = loc_data.sort_values('Date')
-        
-        opening_stock = 0
-        
-        for _, row in loc_data.iterrows():
-            inbound = row.get('IN', 0)
-            transfer_out = row.get('TRANSFER_OUT', 0) 
-            final_out = row.get('FINAL_OUT', 0)
-            total_outbound = transfer_out + final_out
-            
-            closing_stock = opening_stock + inbound - total_outbound
-            
-            stock_records.append({
-                'Location': location,
-                'Date': row['Date'],
-                'Opening_Stock': opening_stock,
-                'Inbound': inbound,
-                'Transfer_Out': transfer_out,
-                'Final_Out': final_out,
-                'Total_Outbound': total_outbound,
-                'Closing_Stock': closing_stock
-            })
-            
-            opening_stock = closing_stock
-    
-    daily_stock_df = pd.DataFrame(stock_records)
-    print(f"✅ {len(daily_stock_df)}개 일별 재고 스냅샷 생성")
-    
-    return daily_stock_df
+    finally:
+        profiler.close()
+        if profiler.stages:
+            profiler.print_summary()
+            profile_path = profiler.write(args.profile_out)
+            profiler.write_profile_reports(pl.Path(profile_path).parent)
 
 def compare_stock_vs_expected(daily_stock, expected, tol=2):
     """재고와 기대값 비교 - 기대값 없어도 정상 동작"""
@@ -403,7 +224,7 @@ def run_diagnostic_check():
     for file_path in required_files:
         if os.path.exists(file_path):
             print(f"   ✅ {file_path}")
-    else:
+        else:
             print(f"   ❌ {file_path} (없음)")
             all_files_exist = False
     
@@ -12,24 +12,20 @@ import re
 from pathlib import Path
 import logging
 
+import numpy as np
+
+from core.diagnostics import DiagnosticsCollector
+from core.lazy_loading import LazyMapping, load_mapping_rules, rules_section
+
 logger = logging.getLogger(__name__)
 
-# 최신 mapping_rules 불러오기
-try:
-    with open('mapping_rules_v2.6.json', encoding='utf-8') as f:
-        RULES = json.load(f)
-    VENDOR_MAP = RULES['vendor_mappings']
-    CONTAINER_GROUPS = RULES['container_column_groups']
-    WAREHOUSE_CLASS = RULES['warehouse_classification']
-    FIELD_MAP = RULES['field_map']
-    PROPERTY_MAPPINGS = RULES['property_mappings']
-except Exception as e:
-    logger.warning(f"mapping_rules_v2.6.json 로드 실패, 기본값 사용: {e}")
-    VENDOR_MAP = {}
-    CONTAINER_GROUPS = {}
-    WAREHOUSE_CLASS = {}
-    FIELD_MAP = {}
-    PROPERTY_MAPPINGS = {}
+# 최신 mapping_rules (첫 조회 시 로드)
+RULES = LazyMapping(load_mapping_rules)
+VENDOR_MAP = rules_section('vendor_mappings', {})
+CONTAINER_GROUPS = rules_section('container_column_groups', {})
+WAREHOUSE_CLASS = rules_section('warehouse_classification', {})
+FIELD_MAP = rules_section('field_map', {})
+PROPERTY_MAPPINGS = rules_section('property_mappings', {})
 
 def normalize_code_num(code):
     """HVDC CODE 숫자 부분 0제거 정규화(예: 0014, 014, 14 모두 → 14)"""
@@ -59,8 +55,24 @@ class MappingManager:
     
     def __init__(self, mapping_file: str = "mapping_rules_v2.6.json"):
         self.mapping_file = mapping_file
-        self.mapping_rules = self._load_mapping_rules()
-        self.warehouse_classification = self.mapping_rules.get("warehouse_classification", {})
+        # 규칙 파일은 첫 분류 시 로드 (전역 mapping_manager import 비용 제거)
+        self._mapping_rules = None
+        self._reported_unmapped = set()
+    
+    @property
+    def mapping_rules(self) -> dict:
+        if self._mapping_rules is None:
+            self._mapping_rules = self._load_mapping_rules()
+        return self._mapping_rules
+    
+    def reload(self):
+        """규칙 파일 변경 후 다음 분류 시 다시 로드"""
+        self._mapping_rules = None
+        self._reported_unmapped = set()
+    
+    @property
+    def warehouse_classification(self) -> dict:
+        return self.mapping_rules.get("warehouse_classification", {})
         
     def _load_mapping_rules(self):
         """매핑 규칙 파일 로드"""
@@ -78,15 +90,12 @@ class MappingManager:
             logger.error(f"매핑 규칙 로드 실패: {e}")
             return {}
     
-    def classify_storage_type(self, location: str) -> str:
+    def match_storage_type(self, location: str):
         """
-        Location을 Storage Type으로 분류
+        Location → Storage Type 매칭 (로그 없음)
         
-        Args:
-            location: 창고/현장명
-            
         Returns:
-            str: Storage Type (Indoor, Outdoor, Site, dangerous_cargo, Unknown)
+            str | None: Storage Type (빈 값은 "Unknown"), 매핑되지 않으면 None
         """
         if not location or pd.isna(location):
             return "Unknown"
@@ -105,16 +114,39 @@ class MappingManager:
                 if pattern.lower() in loc_lower or loc_lower in pattern.lower():
                     return storage_type
         
-        logger.warning(f"⚠️ 매핑되지 않은 Location: {location}")
+        return None
+    
+    def classify_storage_type(self, location: str, diagnostics: DiagnosticsCollector = None) -> str:
+        """
+        Location을 Storage Type으로 분류
+        
+        Args:
+            location: 창고/현장명
+            diagnostics: 매핑되지 않은 Location을 기록할 진단 수집기 (없으면 Location별 1회만 경고)
+            
+        Returns:
+            str: Storage Type (Indoor, Outdoor, Site, dangerous_cargo, Unknown)
+        """
+        storage_type = self.match_storage_type(location)
+        if storage_type is not None:
+            return storage_type
+        
+        if diagnostics is not None:
+            diagnostics.record('unmapped_location', location=location)
+        elif location not in self._reported_unmapped:
+            self._reported_unmapped.add(location)
+            logger.warning(f"⚠️ 매핑되지 않은 Location: {location}")
         return "Unknown"
     
-    def add_storage_type_to_dataframe(self, df: pd.DataFrame, location_col: str = "Location") -> pd.DataFrame:
+    def add_storage_type_to_dataframe(self, df: pd.DataFrame, location_col: str = "Location",
+                                      diagnostics: DiagnosticsCollector = None) -> pd.DataFrame:
         """
         DataFrame에 Storage_Type 컬럼 추가
         
         Args:
             df: 대상 DataFrame
             location_col: Location 컬럼명
+            diagnostics: 매핑되지 않은 Location 행 수를 기록할 진단 수집기 (없으면 자체 요약 1회 출력)
             
         Returns:
             pd.DataFrame: Storage_Type 컬럼이 추가된 DataFrame
@@ -124,8 +156,22 @@ class MappingManager:
             df['Storage_Type'] = 'Unknown'
             return df
             
-        # ✅ Location 기준으로 Storage_Type 새로 생성 (기존 값 무시)
-        df['Storage_Type'] = df[location_col].apply(self.classify_storage_type)
+        # ✅ Location 기준으로 Storage_Type 새로 생성 (기존 값 무시) - 고유 Location별 1회 분류
+        codes, uniques = pd.factorize(df[location_col])
+        matched = [self.match_storage_type(location) for location in uniques]
+        storage_types = np.array([t if t is not None else "Unknown" for t in matched] + ["Unknown"], dtype=object)
+        df['Storage_Type'] = storage_types[codes]
+        
+        unmapped = [i for i, t in enumerate(matched) if t is None]
+        if unmapped:
+            report = diagnostics is None
+            if report:
+                diagnostics = DiagnosticsCollector(f"Storage_Type 분류 ({location_col})")
+            rows = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            for i in unmapped:
+                diagnostics.record('unmapped_location', count=int(rows[i]), location=uniques[i])
+            if report:
+                diagnostics.report()
         
         # 검증 로그
         storage_counts = df['Storage_Type'].value_counts()
@@ -6,7 +6,6 @@ mapping_rules_v2.6.json 기반으로 DataFrame을 RDF로 변환하는 최신 실
 """
 
 import pandas as pd
-from rdflib import Graph, Namespace, Literal, RDF, RDFS, XSD
 import json
 from pathlib import Path
 import logging
@@ -14,35 +13,35 @@ from datetime import datetime
 
 # 🆕 NEW: mapping_utils에서 새로운 함수들 import
 from mapping_utils import normalize_code_num, codes_match, is_valid_hvdc_vendor, is_warehouse_code
+from core.lazy_loading import LazyMapping, lazy_attribute, load_mapping_rules, rules_section
+
+# rdflib은 첫 RDF 변환 시 import (재고/검증 전용 실행은 로드하지 않음)
+Graph = lazy_attribute('rdflib', 'Graph')
+Namespace = lazy_attribute('rdflib', 'Namespace')
+Literal = lazy_attribute('rdflib', 'Literal')
+RDF = lazy_attribute('rdflib', 'RDF')
+RDFS = lazy_attribute('rdflib', 'RDFS')
+XSD = lazy_attribute('rdflib', 'XSD')
 
 logger = logging.getLogger(__name__)
 
-# 최신 mapping_rules 불러오기
-try:
-    with open('mapping_rules_v2.6.json', encoding='utf-8') as f:
-        RULES = json.load(f)
-    NS = {k: Namespace(v) for k, v in RULES["namespaces"].items()}
-    FIELD_MAP = RULES["field_map"]
-    PROPERTY_MAPPINGS = RULES["property_mappings"]
-    CLASS_MAPPINGS = RULES["class_mappings"]
-    # 🆕 NEW: 새로운 설정들 로드
-    HVDC_CODE3_VALID = RULES.get('hvdc_code3_valid', ['HE', 'SIM'])
-    WAREHOUSE_CODES = RULES.get('warehouse_codes', ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP'])
-    MONTH_MATCHING = RULES.get('month_matching', 'operation_month_eq_eta_month')
-except Exception as e:
-    logger.warning(f"mapping_rules_v2.6.json 로드 실패, 기본값 사용: {e}")
-    NS = {
-        "ex": Namespace("http://samsung.com/project-logistics#"),
-        "rdf": Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#"),
-        "rdfs": Namespace("http://www.w3.org/2000/01/rdf-schema#"),
-        "xsd": Namespace("http://www.w3.org/2001/XMLSchema#")
-    }
-    FIELD_MAP = {}
-    PROPERTY_MAPPINGS = {}
-    CLASS_MAPPINGS = {}
-    HVDC_CODE3_VALID = ['HE', 'SIM']
-    WAREHOUSE_CODES = ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP']
-    MONTH_MATCHING = 'operation_month_eq_eta_month'
+DEFAULT_NAMESPACES = {
+    "ex": "http://samsung.com/project-logistics#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#"
+}
+
+# 최신 mapping_rules (첫 조회 시 로드)
+RULES = LazyMapping(load_mapping_rules)
+NS = LazyMapping(lambda: {k: Namespace(v) for k, v in RULES.get("namespaces", DEFAULT_NAMESPACES).items()})
+FIELD_MAP = rules_section("field_map", {})
+PROPERTY_MAPPINGS = rules_section("property_mappings", {})
+CLASS_MAPPINGS = rules_section("class_mappings", {})
+# 🆕 NEW: 새로운 설정들
+HVDC_CODE3_VALID = rules_section('hvdc_code3_valid', ['HE', 'SIM'])
+WAREHOUSE_CODES = rules_section('warehouse_codes', ['DSV Outdoor', 'DSV Indoor', 'DSV Al Markaz', 'DSV MZP'])
+MONTH_MATCHING = rules_section('month_matching', 'operation_month_eq_eta_month')
 
 def apply_hvdc_filters_to_rdf(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -427,6 +426,27 @@ def create_rdf_schema(output_path="rdf_output/schema.ttl"):
     
     return output_path
 
+def transaction_log_to_rdf(output_path="rdf_output/transaction_log.ttl", log_path=None,
+                           months=None, vendors=None):
+    """
+    정본 트랜잭션 로그(artifacts/transaction_log.parquet)에서 직접 RDF 변환
+    
+    Args:
+        output_path: 출력 파일 경로
+        log_path: 트랜잭션 로그 경로 (기본: artifacts/transaction_log.parquet)
+        months: 변환할 'YYYY-MM' 목록 (파티션 푸시다운)
+        vendors: 변환할 공급사 목록 (파티션 푸시다운)
+        
+    Returns:
+        str: 생성된 RDF 파일 경로
+    """
+    from core.transaction_log import read_transaction_log, TRANSACTION_LOG_PATH
+    
+    df = read_transaction_log(log_path or TRANSACTION_LOG_PATH, months=months, vendors=vendors,
+                              decode_categories=True)
+    print(f"📥 트랜잭션 로그 로드: {len(df):,}건")
+    return dataframe_to_rdf(df, output_path)
+
 # 편의 함수들
 def quick_rdf_convert(df: pd.DataFrame, output_dir="rdf_output"):
     """
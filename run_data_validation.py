@@ -13,188 +13,42 @@ import os
 
 # 핵심 모듈 임포트
 from data_validation_engine import DataValidationEngine
-from core.loader import DataLoader
-from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
-from mapping_utils import add_storage_type_to_dataframe, normalize_location_column
+from core.pipeline_dag import build_transaction_graph
+from mapping_utils import normalize_location_column
 
-def load_actual_transaction_data():
-    """실제 HVDC 트랜잭션 데이터 로드"""
+def load_actual_transaction_data(src="data"):
+    """실제 HVDC 트랜잭션 데이터 로드 (main.py와 스테이지 캐시 공유)"""
     print("📄 실제 HVDC 트랜잭션 데이터 로딩 중...")
     
     try:
-        # DataLoader를 사용하여 실제 데이터 로드
-        loader = DataLoader()
-        excel_files = loader.load_excel_files("data")
-        
-        if not excel_files:
+        # load → convert → reconcile → dedup 산출물은 main.py 실행분을 재사용
+        graph = build_transaction_graph(src)
+        transaction_df = graph.run('dedup')
+        if transaction_df.empty:
             print("❌ Excel 파일이 없습니다!")
             return None
-            
-        raw_transactions = loader.extract_transactions(excel_files)
-        print(f"📊 총 {len(raw_transactions):,}건의 원시 트랜잭션 수집")
-
-        # 트랜잭션 DataFrame 변환
-        print("🔄 트랜잭션 변환 중...")
-        transaction_df = transactions_to_dataframe(raw_transactions)
-        print(f"✅ {len(transaction_df)}건 트랜잭션 생성")
-        
-        # 통합 매핑 적용
-        print("🔄 통합 매핑 적용 중...")
-        transaction_df = add_storage_type_to_dataframe(transaction_df, "Location")
-        
-        # 데이터 전처리
-        print("🛠️ 데이터 전처리 중...")
-        transaction_df = reconcile_orphan_transfers(transaction_df)
-        transaction_df = drop_duplicate_transfers(transaction_df)
+        print(f"✅ {len(transaction_df)}건 트랜잭션 로드 (스테이지: {graph.last_run})")
         
-        return transaction_df
+        return add_validation_columns(transaction_df)
         
     except Exception as e:
         print(f"❌ 데이터 로딩 실패: {e}")
         return None
 
-def transactions_to_dataframe(transactions):
-    """트랜잭션 리스트를 DataFrame으로 변환"""
-    data = []
-    
-    for tx in transactions:
-        tx_data = tx.get('data', {})
-        
-        # 기본 정보 추출
-        case_id = extract_case_id(tx_data)
-        warehouse = extract_warehouse(tx_data)
-        date_val = extract_datetime(tx_data)
-        
-        # 수량 처리
-        incoming = tx_data.get('incoming', 0) or 0
-        outgoing = tx_data.get('outgoing', 0) or 0
-        
-        # 기본 레코드 템플릿
-        base_record = {
-            'Case_No': case_id,
-            'Date': date_val,
-            'Location': warehouse,
-            'Source_File': tx.get('source_file', ''),
-            'Loc_From': 'SOURCE',
-            'Target_Warehouse': warehouse,
-            'Amount': tx_data.get('amount', 0),
-            'Handling Fee': tx_data.get('handling_fee', 0) or 0
-        }
-        
-        # IN 트랜잭션 생성
-        if incoming > 0:
-            record = base_record.copy()
-            record.update({
-                'TxType_Refined': 'IN',
-                'Qty': int(incoming),
-                'Incoming': int(incoming),
-                'Outgoing': 0
-            })
-            data.append(record)
-            
-        # OUT 트랜잭션 생성
-        if outgoing > 0:
-            record = base_record.copy()
-            
-            # 사이트 구분하여 FINAL_OUT vs TRANSFER_OUT 결정
-            site = extract_site(warehouse)
-            tx_type = 'FINAL_OUT' if site in ['AGI', 'DAS', 'MIR', 'SHU'] else 'TRANSFER_OUT'
-                
-            record.update({
-                'TxType_Refined': tx_type,
-                'Qty': int(outgoing),
-                'Loc_From': warehouse,
-                'Target_Warehouse': 'DESTINATION',
-                'Incoming': 0,
-                'Outgoing': int(outgoing)
-            })
-            data.append(record)
-    
-    df = pd.DataFrame(data)
-    if not df.empty:
-        # Location 정규화 적용
-        df = normalize_location_column(df)
-        
-        # 날짜 처리
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df['Date'] = df['Date'].fillna(pd.Timestamp.now())
-        df['Billing month'] = df['Date'].dt.strftime('%Y-%m')
-        df['Category'] = 'General'
-        
+def add_validation_columns(df):
+    """검증 리포트용 파생 컬럼 추가 (Incoming/Outgoing, Billing month, Category)"""
+    df = normalize_location_column(df)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce').fillna(pd.Timestamp.now())
+    is_in = df['TxType_Refined'].isin(['IN', 'TRANSFER_IN'])
+    df['Incoming'] = np.where(is_in, df['Qty'], 0).astype(int)
+    df['Outgoing'] = np.where(is_in, 0, df['Qty']).astype(int)
+    for col in ['Amount', 'Handling Fee']:
+        if col not in df.columns:
+            df[col] = 0
+    df['Billing month'] = df['Date'].dt.strftime('%Y-%m')
+    df['Category'] = 'General'
     return df
 
-def extract_case_id(data):
-    """케이스 ID 추출"""
-    case_fields = ['case', 'Case', 'case_id', 'CaseID', 'ID', 'carton', 'box', 'mr#']
-    
-    for field in case_fields:
-        if field in data and data[field]:
-            case_value = str(data[field]).strip()
-            if case_value and case_value.lower() not in ['nan', 'none', '']:
-                return case_value
-    
-    return f"CASE_{abs(hash(str(data))) % 100000}"
-
-def extract_warehouse(data):
-    """창고명 추출 및 정규화"""
-    warehouse_fields = ['warehouse', 'Warehouse', 'site', 'Site', 'location', 'Location']
-    
-    for field in warehouse_fields:
-        if field in data and data[field]:
-            raw_warehouse = str(data[field]).strip()
-            if raw_warehouse and raw_warehouse.lower() not in ['nan', 'none', '']:
-                return normalize_warehouse_name(raw_warehouse)
-    
-    return 'UNKNOWN'
-
-def extract_datetime(data):
-    """날짜/시간 추출"""
-    date_fields = ['date', 'Date', 'timestamp', 'Timestamp', 'datetime']
-    
-    for field in date_fields:
-        if field in data and data[field]:
-            try:
-                date_value = data[field]
-                if isinstance(date_value, str) and date_value.lower() in ['nan', 'none', '']:
-                    continue
-                return pd.to_datetime(date_value)
-            except:
-                continue
-    
-    return pd.Timestamp.now()
-
-def normalize_warehouse_name(raw_name):
-    """창고명 정규화"""
-    if pd.isna(raw_name) or not raw_name:
-        return 'UNKNOWN'
-    
-    # 매핑 규칙의 모든 Location으로 정규화
-    from mapping_utils import mapping_manager
-    
-    all_locations = []
-    for locations in mapping_manager.warehouse_classification.values():
-        all_locations.extend(locations)
-    
-    name_lower = str(raw_name).lower().strip()
-    
-    for location in all_locations:
-        if location.lower() in name_lower or name_lower in location.lower():
-            return location
-    
-    return str(raw_name).strip()
-
-def extract_site(warehouse_name):
-    """사이트명 추출"""
-    if pd.isna(warehouse_name):
-        return 'UNK'
-    
-    # Site 타입인지 확인
-    from mapping_utils import mapping_manager
-    if mapping_manager.classify_storage_type(warehouse_name) == 'Site':
-        return warehouse_name
-    
-    return 'UNK'
-
 def run_comprehensive_validation():
     """종합 데이터 검증 실행"""
     print("🔍 HVDC 데이터 품질 종합 검증 시작")
@@ -0,0 +1,206 @@
+# scripts/benchmark_pipeline.py
+"""
+HVDC 파이프라인 확장성 벤치마크
+
+합성 데이터(core.synthetic_data)를 케이스 규모별(기본 10k / 100k / 1M)로 생성하고
+load → convert → reconcile → dedup → inventory 스테이지별 시간, 처리량(케이스/초),
+피크 메모리를 측정해 저장된 기준값(benchmarks/pipeline_scaling_baseline.json)과 비교합니다.
+규모별 측정은 별도 프로세스에서 실행하여 피크 RSS가 섞이지 않게 합니다.
+
+사용 예:
+    python scripts/benchmark_pipeline.py --sizes 10000 100000
+    python scripts/benchmark_pipeline.py --sizes 10000 --update-baseline
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DATA_DIR = ROOT / "artifacts" / "benchmarks" / "data"
+RESULT_DIR = ROOT / "artifacts" / "benchmarks"
+BASELINE_PATH = ROOT / "benchmarks" / "pipeline_scaling_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+# 이보다 짧은 스테이지는 측정 잡음이 커서 회귀 판정에서 제외
+MIN_COMPARABLE_SECONDS = 0.05
+BENCHMARK_STAGES = ['load', 'convert', 'reconcile', 'dedup', 'inventory']
+
+
+def ensure_dataset(n_cases, seed=0, data_dir=DATA_DIR):
+    """규모별 합성 데이터 폴더 (이미 있으면 재사용)"""
+    from core.synthetic_data import write_synthetic_dataset
+
+    out_dir = Path(data_dir) / f"cases_{n_cases}_seed{seed}"
+    marker = out_dir / "dataset.json"
+    if marker.exists():
+        return out_dir, json.loads(marker.read_text(encoding='utf-8'))
+
+    started = time.perf_counter()
+    paths = write_synthetic_dataset(out_dir, n_cases, seed=seed)
+    info = {'cases': n_cases, 'seed': seed, 'files': paths,
+            'generate_seconds': round(time.perf_counter() - started, 2)}
+    marker.write_text(json.dumps(info, ensure_ascii=False, indent=2), encoding='utf-8')
+    return out_dir, info
+
+
+def run_worker(src, n_cases, result_file):
+    """단일 규모 측정 (하위 프로세스)"""
+    from core.pipeline_dag import build_transaction_graph
+    from core.profiler import StageProfiler
+
+    profiler = StageProfiler(f"benchmark_{n_cases}")
+    graph = build_transaction_graph(src, use_cache=False, profiler=profiler)
+    graph.run('inventory')
+
+    stages = {}
+    for record in profiler.stages:
+        wall = record['wall_seconds']
+        stages[record['stage']] = {
+            'wall_seconds': wall,
+            'cpu_seconds': record['cpu_seconds'],
+            'rows_out': record['rows_out'],
+            'cases_per_second': round(n_cases / wall, 1) if wall > 0 else None,
+            'peak_rss_mb': record['peak_rss_mb'],
+        }
+    totals = profiler.to_dict()['totals']
+    result = {
+        'cases': n_cases,
+        'stages': stages,
+        'total_wall_seconds': totals['stage_wall_seconds'],
+        'cases_per_second': round(n_cases / totals['stage_wall_seconds'], 1) if totals['stage_wall_seconds'] else None,
+        'peak_rss_mb': totals['peak_rss_mb'],
+    }
+    Path(result_file).write_text(json.dumps(result, indent=2), encoding='utf-8')
+
+
+def measure_size(n_cases, seed=0, data_dir=DATA_DIR, verbose=False):
+    """합성 데이터 준비 후 별도 프로세스에서 측정"""
+    src, info = ensure_dataset(n_cases, seed, data_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp) / "result.json"
+        command = [sys.executable, str(Path(__file__).resolve()), '--worker',
+                   '--src', str(src), '--cases', str(n_cases), '--result-file', str(result_file)]
+        output = None if verbose else subprocess.DEVNULL
+        subprocess.run(command, check=True, cwd=str(ROOT), stdout=output, stderr=output)
+        result = json.loads(result_file.read_text(encoding='utf-8'))
+    result['generate_seconds'] = info.get('generate_seconds')
+    return result
+
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    기준값 대비 회귀 목록 (스테이지 시간 / 피크 메모리가 tolerance 이상 증가)
+
+    Returns:
+        list: {'cases', 'stage', 'metric', 'baseline', 'current', 'ratio'}
+    """
+    regressions = []
+    baseline_runs = {str(run['cases']): run for run in baseline.get('runs', [])}
+    for run in results:
+        base = baseline_runs.get(str(run['cases']))
+        if base is None:
+            continue
+        checks = [(stage, 'wall_seconds', metrics.get('wall_seconds'), base['stages'].get(stage, {}).get('wall_seconds'))
+                  for stage, metrics in run['stages'].items()]
+        checks.append(('total', 'peak_rss_mb', run.get('peak_rss_mb'), base.get('peak_rss_mb')))
+        for stage, metric, current, reference in checks:
+            if not current or not reference:
+                continue
+            if metric == 'wall_seconds' and reference < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = current / reference
+            if ratio > 1 + tolerance:
+                regressions.append({'cases': run['cases'], 'stage': stage, 'metric': metric,
+                                    'baseline': reference, 'current': current, 'ratio': round(ratio, 2)})
+    return regressions
+
+
+def print_results(results, baseline=None):
+    baseline_runs = {str(run['cases']): run for run in (baseline or {}).get('runs', [])}
+    print("\n📈 파이프라인 확장성 벤치마크")
+    print(f"{'케이스':>10} {'스테이지':<12}{'시간(s)':>10}{'케이스/초':>12}{'RSS(MB)':>10}{'기준대비':>10}")
+    for run in results:
+        base = baseline_runs.get(str(run['cases']), {}).get('stages', {})
+        for stage, metrics in run['stages'].items():
+            reference = base.get(stage, {}).get('wall_seconds')
+            ratio = f"{metrics['wall_seconds'] / reference:.2f}x" if reference else '-'
+            throughput = f"{metrics['cases_per_second']:,.0f}" if metrics['cases_per_second'] else '-'
+            print(f"{run['cases']:>10,} {stage:<12}{metrics['wall_seconds']:>10.2f}{throughput:>12}"
+                  f"{metrics['peak_rss_mb'] or 0:>10.1f}{ratio:>10}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="HVDC 파이프라인 확장성 벤치마크")
+    ap.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="케이스 규모 목록")
+    ap.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="합성 데이터 캐시 폴더")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH), help="기준값 JSON 경로")
+    ap.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="회귀 허용 비율 (0.25 = 25%%)")
+    ap.add_argument("--update-baseline", action="store_true", help="측정 결과로 기준값 갱신")
+    ap.add_argument("--verbose", action="store_true", help="측정 프로세스 출력 표시")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--src", help=argparse.SUPPRESS)
+    ap.add_argument("--cases", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        run_worker(args.src, args.cases, args.result_file)
+        return 0
+
+    results = []
+    for n_cases in args.sizes:
+        print(f"⏱️ {n_cases:,}건 케이스 측정 중...")
+        results.append(measure_size(n_cases, args.seed, args.data_dir, args.verbose))
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else None
+    print_results(results, baseline)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'seed': args.seed,
+        'runs': results,
+    }
+    RESULT_DIR.mkdir(parents=True, exist_ok=True)
+    result_path = RESULT_DIR / f"scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    result_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n💾 벤치마크 결과 저장: {result_path}")
+
+    if args.update_baseline:
+        if baseline:
+            # 이번에 측정하지 않은 규모의 기준값은 유지
+            measured = {run['cases'] for run in results}
+            report['runs'] = [run for run in baseline.get('runs', []) if run['cases'] not in measured] + results
+            report['runs'].sort(key=lambda run: run['cases'])
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"📌 기준값 갱신: {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print("⚠️ 기준값 없음 - --update-baseline으로 생성하세요")
+        return 0
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})")
+        for item in regressions:
+            print(f"   {item['cases']:,}건 {item['stage']} {item['metric']}: "
+                  f"{item['baseline']} → {item['current']} ({item['ratio']}x)")
+        return 1
+    print(f"\n✅ 기준값 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
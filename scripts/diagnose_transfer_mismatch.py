@@ -1,18 +1,26 @@
 # scripts/diagnose_transfer_mismatch.py
-import pandas as pd
+import sys
 from pathlib import Path
 
-log = pd.read_parquet("artifacts/transaction_log.parquet")   # 현재 로그
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# 1. Tx 열 자동 탐지
-tx_col = next(c for c in ['Transaction_Type','TxType_Refined'] if c in log.columns)
+from core.transaction_log import read_transaction_log
 
-# 2. TRANSFER 짝 Pivot
-pvt = (log[log[tx_col].str.contains('TRANSFER', na=False)]
-       .pivot_table(index=['Case_No','Loc_From','Loc_To'],
-                    columns=tx_col, values='Qty', aggfunc='sum')
+# TRANSFER 이벤트만 푸시다운 조회 (현재 정본 로그)
+log = read_transaction_log(
+    columns=['Case_No', 'Loc_From', 'Target_Warehouse', 'TxType_Refined', 'Qty'],
+    tx_types=['TRANSFER_IN', 'TRANSFER_OUT'],
+    decode_categories=True,
+)
+tx_col = 'TxType_Refined'
+log = log.rename(columns={'Target_Warehouse': 'Loc_To'})
+
+# TRANSFER 짝 Pivot
+pvt = (log.pivot_table(index=['Case_No', 'Loc_From', 'Loc_To'],
+                       columns=tx_col, values='Qty', aggfunc='sum')
+       .reindex(columns=['TRANSFER_IN', 'TRANSFER_OUT'])
        .fillna(0))
 
-mismatch = pvt[(pvt.get('TRANSFER_IN',0) - pvt.get('TRANSFER_OUT',0)).abs() != 0]
+mismatch = pvt[(pvt['TRANSFER_IN'] - pvt['TRANSFER_OUT']).abs() != 0]
 print(f"⚠️ 짝 안 맞은 Transfer: {len(mismatch)} 건")
-print(mismatch.head(10)) 
\ No newline at end of file
+print(mismatch.head(10))
@@ -0,0 +1,88 @@
+# scripts/import_audit.py
+"""
+HVDC CLI import 시간 점검
+
+`python -X importtime`으로 진입 모듈을 새 프로세스에서 import하여
+누적 시간 상위 모듈, pandas/numpy 기준선 대비 추가 시간,
+import 시점에 로드된 무거운 의존성(rdflib / plotly / yaml / pyarrow.dataset)을 출력합니다.
+무거운 의존성은 core.lazy_loading으로 첫 사용 시점까지 미뤄야 합니다.
+
+사용 예:
+    python scripts/import_audit.py
+    python scripts/import_audit.py --modules main ontology_mapper --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ['main', 'integrated_automation_pipeline', 'excel_reporter', 'ontology_mapper', 'bi_dashboard']
+BASELINE_IMPORTS = ['pandas', 'numpy']
+HEAVY_MODULES = ['rdflib', 'plotly', 'yaml', 'pyarrow.dataset']
+DEFAULT_TOP = 10
+
+
+def _run_importtime(statement):
+    """새 프로세스에서 statement 실행 → (importtime 행 목록, 로드된 무거운 모듈)"""
+    probe = f"{statement}; import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.getenv('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{statement} 실패:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: self [us] | cumulative | imported package" (들여쓰기 = 중첩 깊이)
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                     'top_level': not name[1:].startswith(" ")})
+    heavy = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return rows, heavy
+
+
+def audit_module(module):
+    """모듈 import 점검 결과 (총 시간, 기준선 제외 추가 시간, 상위 모듈, 로드된 무거운 모듈)"""
+    rows, heavy = _run_importtime(f"import {', '.join(BASELINE_IMPORTS)}; import {module}")
+    baseline_names = {name.split('.')[0] for name in BASELINE_IMPORTS}
+    # importtime 행은 import 완료 순서 → 마지막 기준선 최상위 행 이후가 대상 모듈 import 구간
+    last_baseline = max((i for i, r in enumerate(rows) if r['top_level'] and r['module'] in baseline_names), default=-1)
+    added = rows[last_baseline + 1:]
+    top_level = [r for r in rows if r['top_level']]
+    return {
+        'module': module,
+        'total_seconds': sum(r['cumulative_us'] for r in top_level) / 1e6,
+        'added_seconds': sum(r['cumulative_us'] for r in added if r['top_level']) / 1e6,
+        'top': sorted((r for r in added if r['module'] != module), key=lambda r: r['cumulative_us'], reverse=True),
+        'heavy_loaded': heavy,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="HVDC CLI import 시간 점검")
+    ap.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="점검할 진입 모듈")
+    ap.add_argument("--top", type=int, default=DEFAULT_TOP, help="출력할 상위 모듈 수")
+    args = ap.parse_args()
+
+    print(f"🔍 import 시간 점검 (기준선: {', '.join(BASELINE_IMPORTS)} 제외)")
+    heavy_found = False
+    for module in args.modules:
+        result = audit_module(module)
+        print(f"\n📦 {module}: 전체 {result['total_seconds']:.3f}s, 기준선 외 추가 {result['added_seconds']:.3f}s")
+        for row in result['top'][:args.top]:
+            print(f"   {row['cumulative_us'] / 1000:8.1f} ms  {row['module']}")
+        if result['heavy_loaded']:
+            heavy_found = True
+            print(f"   ⚠️ import 시점 로드된 무거운 의존성: {', '.join(result['heavy_loaded'])}")
+        else:
+            print("   ✅ 무거운 의존성 지연 로딩 유지")
+    return 1 if heavy_found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
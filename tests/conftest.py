@@ -0,0 +1,67 @@
+"""
+pytest 공용 설정 - 성능 회귀 게이트 옵션, 검증 테스트용 샘플 트랜잭션 픽스처
+
+    pytest tests/test_performance_gate.py --perf                    # 기준값 대비 회귀 검사
+    pytest tests/test_performance_gate.py --perf --perf-tolerance 0.5
+    pytest tests/test_performance_gate.py --perf --perf-update-baseline
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DEFAULT_PERF_TOLERANCE = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("hvdc-perf", "HVDC 성능 회귀 게이트")
+    group.addoption("--perf", action="store_true", default=False,
+                    help="perf 마커 테스트 실행 (기본은 건너뜀)")
+    group.addoption("--perf-tolerance", type=float,
+                    default=float(os.getenv("HVDC_PERF_TOLERANCE", DEFAULT_PERF_TOLERANCE)),
+                    help="기준값 대비 허용 증가 비율 (0.5 = 50%%, 환경변수 HVDC_PERF_TOLERANCE)")
+    group.addoption("--perf-update-baseline", action="store_true", default=False,
+                    help="측정값으로 benchmarks/perf_gate_baseline.json 갱신")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: 성능 회귀 게이트 (--perf 옵션으로 실행)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf") or config.getoption("--perf-update-baseline"):
+        return
+    skip_perf = pytest.mark.skip(reason="성능 게이트는 --perf 옵션으로 실행")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip_perf)
+
+
+def _sample_transactions(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    locations = rng.choice(['DSV Indoor', 'DSV Outdoor', 'MIR', 'SHU', 'UNKNOWN', 'Shifting'], n)
+    storage = pd.Series(locations).map({
+        'DSV Indoor': 'Indoor', 'DSV Outdoor': 'Outdoor', 'MIR': 'Site', 'SHU': 'Site'
+    }).fillna('Unknown')
+    df = pd.DataFrame({
+        'Case_No': [f"CASE_{i % 150:04d}" for i in range(n)],
+        'Date': pd.to_datetime('2024-01-01') + pd.to_timedelta(rng.integers(0, 240, n), unit='D'),
+        'Location': locations,
+        'TxType_Refined': rng.choice(['IN', 'TRANSFER_OUT', 'FINAL_OUT', 'TRANSFER_IN'], n),
+        'Qty': rng.integers(-1, 12, n),
+        'Storage_Type': storage,
+        'storage_type': storage,
+        'Handling Fee': rng.normal(100, 40, n),
+    })
+    df.loc[::37, 'Date'] = pd.NaT
+    df.loc[::53, 'Location'] = None
+    df = pd.concat([df, df.iloc[:12]], ignore_index=True)
+    return df
+
+
+@pytest.fixture
+def sample_transactions():
+    """검증 테스트용 트랜잭션 생성 함수 (결측/음수 수량/중복 행 포함)"""
+    return _sample_transactions
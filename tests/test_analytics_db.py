@@ -0,0 +1,82 @@
+"""
+임베디드 SQL 분석 백엔드 테스트 - 뷰 결과가 pandas 리포트 집계와 일치, 실행 후 DB 재조회
+"""
+
+import pandas as pd
+import pytest
+
+from core.analytics_db import DUCKDB_AVAILABLE, AnalyticsDB, resolve_engine
+from core.synthetic_data import generate_transaction_frame
+from excel_reporter import generate_monthly_in_out_stock_report, generate_monthly_summary_report
+from variance_analyzer import create_sample_data
+
+ENGINES = ['sqlite', pytest.param('duckdb', marks=pytest.mark.skipif(not DUCKDB_AVAILABLE, reason="duckdb 미설치"))]
+
+
+@pytest.fixture(scope="module")
+def transactions():
+    df = generate_transaction_frame(1500, seed=21)
+    df['Amount'] = df['Qty'] * 12.5
+    df['Handling Fee'] = df['Qty'] * 2.0
+    df['Vendor'] = df['Source_File'].str.contains('HITACHI').map({True: 'Hitachi', False: 'SIM'})
+    df['Operation Month'] = df['Date'].dt.to_period('M').dt.to_timestamp()
+    return df
+
+
+def _sorted(df, keys):
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_monthly_views_match_pandas_report(tmp_path, transactions, engine):
+    """월별 IN/OUT/재고 뷰 = generate_monthly_in_out_stock_report pandas 집계"""
+    expected = generate_monthly_in_out_stock_report(transactions.copy())
+    with AnalyticsDB(tmp_path / f"hvdc.{engine}", engine=engine).load(transactions) as db:
+        result = generate_monthly_in_out_stock_report(transactions.copy(), sql=db)
+
+    for want, got in zip(expected, result):
+        keys = ['월', '창고/현장']
+        pd.testing.assert_frame_equal(_sorted(got, keys), _sorted(want, keys), check_dtype=False)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_settlement_and_vendor_views(tmp_path, transactions, engine):
+    """월별정산집계 뷰 = pandas 정산 로직, 공급사 월별 = groupby"""
+    expected = generate_monthly_summary_report(transactions.copy())
+    with AnalyticsDB(tmp_path / f"hvdc.{engine}", engine=engine).load(transactions) as db:
+        settlement = generate_monthly_summary_report(transactions.copy(), sql=db)
+        vendor = db.view('v_vendor_monthly')
+        hitachi = db.query('SELECT * FROM v_vendor_monthly WHERE "Vendor" = ?', ['HITACHI'])
+    pd.testing.assert_frame_equal(settlement, expected, check_dtype=False)
+
+    df = transactions.assign(Vendor=transactions['Vendor'].str.upper(), 월=transactions['Date'].dt.strftime('%Y-%m'))
+    in_qty = df[df['TxType_Refined'] == 'IN'].groupby(['Vendor', '월', 'Location'])['Qty'].sum()
+    got = vendor.set_index(['Vendor', '월', 'Location'])['입고']
+    assert got[got > 0].sort_index().to_dict() == in_qty[in_qty > 0].sort_index().to_dict()
+    assert set(hitachi['Vendor']) == {'HITACHI'}
+
+
+def test_db_file_queryable_after_run_with_invoice_views(tmp_path, transactions):
+    """인보이스 대사 뷰 생성, 닫은 뒤 open으로 임의 SQL 조회"""
+    invoice = create_sample_data()[0]
+    path = tmp_path / "hvdc.sqlite"
+    AnalyticsDB(path, engine='sqlite').load(transactions, invoice).close()
+
+    with AnalyticsDB.open(path) as db:
+        assert 'v_invoice_vs_report' in db.views
+        reconcile = db.view('v_invoice_vs_report').set_index('년월')
+        month = '2024-01'
+        assert reconcile.loc[month, 'Invoice_Amount'] == 1_000_000
+        expected = transactions.loc[transactions['Date'].dt.strftime('%Y-%m') == month, 'Amount'].sum()
+        assert reconcile.loc[month, 'Report_Amount'] == pytest.approx(expected)
+        assert db.query('SELECT COUNT(*) AS n FROM transactions')['n'].iloc[0] == len(transactions)
+        with pytest.raises(KeyError):
+            db.view('v_missing')
+
+
+def test_engine_resolution():
+    """auto는 duckdb 설치 여부에 따라 결정, 지원하지 않는 엔진은 ValueError"""
+    assert resolve_engine('auto') == ('duckdb' if DUCKDB_AVAILABLE else 'sqlite')
+    assert resolve_engine('sqlite') == 'sqlite'
+    with pytest.raises(ValueError):
+        resolve_engine('postgres')
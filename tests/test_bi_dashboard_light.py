@@ -0,0 +1,73 @@
+"""
+경량 대시보드 모드 테스트
+"""
+
+import json
+
+import pandas as pd
+
+from bi_dashboard import LIGHT_DATA_VAR, BIDashboard, downsample_series
+
+
+def _variance_data(n_months):
+    months = pd.period_range('2000-01', periods=n_months, freq='M').astype(str).tolist()
+    rates = [float(i % 7) for i in range(n_months)]
+    rates[n_months // 2] = 95.0  # 스파이크
+    merged = pd.DataFrame({
+        '년월': months,
+        'Invoice_Amount': [1000.0] * n_months,
+        'Report_Amount': [1000.0 - r * 10 for r in rates],
+        '절대오차율(%)': rates,
+        '오차사유': ['정상'] * n_months,
+    })
+    return {
+        'merged_data': merged,
+        'dashboard_data': {'trend_analysis': {'months': months, 'variance_trend': rates}},
+    }
+
+
+def _read_payload(path):
+    """<script src> 데이터 파일(window.__DASHBOARD_DATA__ = {...};)에서 figure 추출"""
+    text = path.read_text(encoding='utf-8').strip()
+    prefix = f"window.{LIGHT_DATA_VAR} = "
+    assert text.startswith(prefix) and text.endswith(';')
+    return json.loads(text[len(prefix):-1])
+
+
+def test_downsample_keeps_endpoints_and_spikes():
+    """다운샘플링 시 시작/끝 및 스파이크 유지"""
+    x = list(range(5000))
+    y = [0.0] * 5000
+    y[3210] = 100.0
+    xs, ys = downsample_series(x, y, max_points=100)
+    assert len(xs) <= 100
+    assert xs[0] == 0 and xs[-1] == 4999
+    assert 3210 in xs
+    assert xs == sorted(xs)
+
+
+def test_light_dashboard_refresh_writes_only_data(tmp_path):
+    """light 모드: 공유 asset/HTML 셸은 1회 생성, 갱신 시 JS 데이터 파일만 재작성"""
+    dashboard = BIDashboard(output_dir=str(tmp_path))
+    html_path = dashboard.create_variance_dashboard(_variance_data(1200), mode="light", max_points=200)
+
+    asset = tmp_path / "assets" / "plotly.min.js"
+    data_file = tmp_path / "월별오차분석_대시보드.data.js"
+    assert asset.exists() and data_file.exists()
+
+    shell = open(html_path, encoding='utf-8').read()
+    assert "assets/plotly.min.js" in shell and data_file.name in shell
+    assert "fetch(" not in shell  # file:// 에서도 열리도록 <script>로 로드
+    assert len(shell) < 5000
+
+    fig = _read_payload(data_file)
+    trend = fig['data'][0]
+    assert len(trend['x']) <= 200
+    assert 95.0 in trend['y']
+
+    asset_mtime = asset.stat().st_mtime_ns
+    shell_mtime = (tmp_path / "월별오차분석_대시보드.html").stat().st_mtime_ns
+    dashboard.create_variance_dashboard(_variance_data(24), mode="light")
+    assert asset.stat().st_mtime_ns == asset_mtime
+    assert (tmp_path / "월별오차분석_대시보드.html").stat().st_mtime_ns == shell_mtime
+    assert len(_read_payload(data_file)['data'][0]['x']) == 24
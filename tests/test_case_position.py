@@ -0,0 +1,94 @@
+"""
+케이스 위치 인덱스 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.case_position import CasePositionIndex
+from excel_reporter import calc_actual_inventory_precise, reconcile_site_inventory
+
+
+def _sample_events(n=2000, seed=9):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Case_No': [f"C{v:04d}" for v in rng.integers(0, 300, n)],
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 200 * 24, n), unit='h'),
+        'Location': rng.choice(['DSV Indoor', 'MOSB', 'AGI', 'DAS', 'MIR', 'SHU'], n),
+        'TxType_Refined': rng.choice(['IN', 'TRANSFER_IN', 'TRANSFER_OUT', 'FINAL_OUT'], n),
+        'Qty': rng.integers(1, 5, n),
+        'Vendor': rng.choice(['HITACHI', 'SIMENSE'], n),
+    })
+
+
+def _last_rows(df, as_of):
+    subset = df[df['Date'] <= as_of].sort_values('Date', kind='stable')
+    return subset.groupby('Case_No').tail(1).set_index('Case_No')
+
+
+def test_positions_match_sorted_groupby():
+    """searchsorted 조회가 정렬 + groupby 마지막 행과 일치"""
+    df = _sample_events()
+    index = CasePositionIndex.from_transactions(df)
+
+    for as_of in [pd.Timestamp('2024-02-15'), pd.Timestamp('2024-05-01 12:00'), None]:
+        expected = _last_rows(df, as_of or df['Date'].max())
+        snapshot = index.snapshot(as_of).set_index('Case_No')
+        assert sorted(snapshot.index) == sorted(expected.index)
+        assert (snapshot.loc[expected.index, 'Location'] == expected['Location']).all()
+        assert (snapshot.loc[expected.index, 'Vendor'] == expected['Vendor']).all()
+
+        at_mir = expected[expected['Location'] == 'MIR'].index
+        assert sorted(index.cases_at('MIR', as_of)) == sorted(at_mir)
+
+    case = df['Case_No'].iloc[0]
+    first_date = df.loc[df['Case_No'] == case, 'Date'].min()
+    assert index.position_of(case, first_date - pd.Timedelta(hours=1)) is None
+    assert index.position_of(case)['Location'] == _last_rows(df, df['Date'].max()).loc[case, 'Location']
+    assert index.position_of('UNKNOWN_CASE') is None
+
+
+def test_history_matches_sorted_case_events():
+    """케이스 이력 = 해당 케이스 이벤트의 시각 안정 정렬 (as_of까지)"""
+    df = _sample_events()
+    index = CasePositionIndex.from_transactions(df)
+    case_no = df['Case_No'].iloc[0]
+    as_of = pd.Timestamp('2024-04-01')
+    expected = df[(df['Case_No'] == case_no) & (df['Date'] <= as_of)].sort_values('Date', kind='stable')
+
+    history = index.history(case_no, as_of)
+    assert history['Location'].tolist() == expected['Location'].tolist()
+    assert [e['Date'] for e in index.events(case_no, as_of)] == list(history['Date'].to_numpy())
+    assert index.position_of(case_no, as_of)['Location'] == expected['Location'].iloc[-1]
+    assert index.history('NO-SUCH-CASE').empty and index.events('NO-SUCH-CASE') == []
+
+
+def test_incremental_add_matches_full_build():
+    """증분 삽입 결과가 전체 재구성과 동일"""
+    df = _sample_events(seed=21)
+    full = CasePositionIndex.from_transactions(df)
+
+    incremental = CasePositionIndex.from_transactions(df.iloc[:1200])
+    incremental.add_events(df.iloc[1200:])
+
+    assert len(incremental) == len(full)
+    left = incremental.snapshot().sort_values('Case_No').reset_index(drop=True)
+    right = full.snapshot().sort_values('Case_No').reset_index(drop=True)
+    assert left.equals(right)
+
+
+def test_site_inventory_uses_position_index():
+    """실제_최종재고/현장재고 대사가 위치 인덱스 기준으로 집계"""
+    df = _sample_events(seed=2)
+    as_of = pd.Timestamp('2024-04-01')
+    expected = _last_rows(df, as_of)
+    expected = expected[expected['Location'].isin(['AGI', 'DAS', 'MIR', 'SHU'])
+                        & expected['TxType_Refined'].isin(['IN', 'TRANSFER_IN'])]
+
+    index = CasePositionIndex.from_transactions(df)
+    pivot = calc_actual_inventory_precise(df, as_of=as_of, position_index=index)
+    assert pivot['TOTAL'].sum() == len(expected)
+
+    reconciled = reconcile_site_inventory(df, as_of=as_of, position_index=index)
+    assert reconciled['위치기준_재고케이스'].sum() == len(expected)
+    assert list(reconciled.columns) == ['현장', '거래누계_재고케이스', '위치기준_재고케이스', '차이']
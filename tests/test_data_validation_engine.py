@@ -0,0 +1,50 @@
+"""
+단일 스캔(fused) 데이터 품질 검증 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_validation_engine import DataValidationEngine
+
+
+def _normalize(value):
+    """numpy 스칼라/배열을 비교 가능한 파이썬 값으로 변환"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def test_fused_matches_individual_validators(sample_transactions):
+    """fused 검증 결과/점수/권장사항이 개별 검증기 결과와 동일한지 확인"""
+    df = sample_transactions()
+
+    legacy = DataValidationEngine().validate_complete_dataset(df.copy(), fused=False)
+    fused = DataValidationEngine().validate_complete_dataset(df, fused=True)
+
+    assert list(fused['validation_tests']) == list(legacy['validation_tests'])
+    for name, legacy_result in legacy['validation_tests'].items():
+        fused_result = fused['validation_tests'][name]
+        assert fused_result['passed'] == legacy_result['passed'], name
+        assert fused_result['issues'] == legacy_result['issues'], name
+        assert _normalize(fused_result['details']) == _normalize(legacy_result['details']), name
+
+    assert fused['data_quality_score'] == legacy['data_quality_score']
+    assert fused['critical_issues'] == legacy['critical_issues']
+    assert fused['warnings'] == legacy['warnings']
+    assert fused['recommendations'] == legacy['recommendations']
+
+
+def test_validation_does_not_mutate_input(sample_transactions):
+    """검증 후 입력 DataFrame 컬럼이 추가되지 않아야 함"""
+    df = sample_transactions()
+    columns = list(df.columns)
+
+    DataValidationEngine().validate_complete_dataset(df)
+    DataValidationEngine().validate_complete_dataset(df, fused=False)
+
+    assert list(df.columns) == columns
@@ -0,0 +1,78 @@
+"""
+행 단위 진단 이벤트 수집기 테스트
+"""
+
+import logging
+
+import pandas as pd
+
+from core.diagnostics import DiagnosticsCollector
+from core.loader import DataLoader
+from mapping_utils import MappingManager
+
+
+def test_collector_counts_samples_and_verbosity(capsys):
+    """건수는 모두, 샘플은 sample_size개까지 / 출력 수준별 요약"""
+    quiet = DiagnosticsCollector("a.xlsx", verbosity='quiet', sample_size=2)
+    for idx in range(10):
+        quiet.record('no_events', row=idx)
+    quiet.record('date_column', column='DSV Indoor')
+    quiet.record('unmapped_location', count=7, location='XYZ')
+    assert quiet.count('no_events') == 10 and len(quiet.samples['no_events']) == 2
+    assert quiet.total == 17
+    quiet.report()
+    assert capsys.readouterr().out == ""
+
+    summary = DiagnosticsCollector("a.xlsx", verbosity='summary', sample_size=2)
+    summary.merge(quiet)
+    summary.report()
+    out = capsys.readouterr().out
+    assert out.count("진단 요약") == 1
+    assert "이벤트 없는 행: 10건 (예: row=0, row=1 ...)" in out
+    assert "매핑되지 않은 Location: 7건" in out
+    assert "날짜 컬럼" not in out
+
+    verbose = DiagnosticsCollector("a.xlsx", verbosity='verbose')
+    verbose.merge(quiet)
+    verbose.report()
+    assert "날짜 컬럼 발견: 1건 (예: column=DSV Indoor)" in capsys.readouterr().out
+
+
+def test_loader_aggregates_row_events_per_file(capsys):
+    """로더 행 루프는 출력 없이 집계, 파일당 요약 1회"""
+    df = pd.DataFrame({
+        'SERIAL NO.': ['S1', 'S2', 'S3', 'S4'],
+        'Pkg': [2, 'x', 1, 3],
+        'DSV Indoor': [pd.Timestamp('2024-01-05'), pd.NaT, 'not a date', pd.Timestamp('2024-02-01')],
+        'MIR': [pd.NaT, pd.Timestamp('2024-01-20'), pd.NaT, pd.NaT],
+    })
+    loader = DataLoader(verbosity='summary')
+    transactions = loader._extract_file_transactions(df, 'T.xlsx')
+    out = capsys.readouterr().out
+
+    assert len(transactions) == 3
+    assert transactions[1]['data']['pkg'] == 1 and transactions[1]['data']['storage_type'] == 'Site'
+    assert "행 " not in out
+    assert out.count("진단 요약") == 1
+    counts = loader.diagnostics['T.xlsx']['counts']
+    assert counts['qty_conversion_failed'] == 1
+    assert counts['date_parse_failed'] == 1
+    assert counts['no_events'] == 1
+    assert counts['date_column'] == 2
+
+
+def test_storage_type_unmapped_counted_once_per_location(caplog, capsys):
+    """매핑되지 않은 Location: 행 수 집계 요약 1회, 단건 분류 경고는 Location당 1회"""
+    manager = MappingManager()
+    df = pd.DataFrame({'Location': ['DSV Indoor', 'XYZ Yard', 'XYZ Yard', None, 'MIR', 'XYZ Yard']})
+    manager.add_storage_type_to_dataframe(df)
+    assert df['Storage_Type'].tolist() == ['Indoor', 'Unknown', 'Unknown', 'Unknown', 'Site', 'Unknown']
+    assert "매핑되지 않은 Location: 3건 (예: location=XYZ Yard)" in capsys.readouterr().out
+
+    collector = DiagnosticsCollector("rows", verbosity='quiet')
+    with caplog.at_level(logging.WARNING, logger='mapping_utils'):
+        for _ in range(3):
+            assert manager.classify_storage_type('Nowhere') == 'Unknown'
+        manager.classify_storage_type('Nowhere', collector)
+    assert len([r for r in caplog.records if 'Nowhere' in r.getMessage()]) == 1
+    assert collector.count('unmapped_location') == 1
@@ -0,0 +1,86 @@
+"""
+트랜잭션 프레임 dtype 정책 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
+from core.dtypes import TX_TYPES, apply_dtype_policy, contains_mask, has_dtype_policy
+from core.transactions import calculate_daily_inventory, daily_stock_frame
+
+
+def _object_frame(n=3000, seed=7):
+    """object 컬럼 기반 트랜잭션 프레임 (고아 TRANSFER/중복 포함)"""
+    rng = np.random.default_rng(seed)
+    locations = np.array(['DSV Indoor', 'DSV Outdoor', 'MOSB', 'DSV Al Markaz', None], dtype=object)
+    df = pd.DataFrame({
+        'Case_No': [f"HE-{i:05d}" for i in rng.integers(0, n // 3, n)],
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120, n), unit='D'),
+        'Location': locations[rng.integers(0, len(locations), n)],
+        'Source_File': rng.choice(['HVDC WAREHOUSE_HITACHI(HE).xlsx', 'HVDC WAREHOUSE_SIMENSE(SIM).xlsx'], n),
+        'Loc_From': 'SOURCE',
+        'Target_Warehouse': locations[rng.integers(0, len(locations), n)],
+        'TxType_Refined': rng.choice(TX_TYPES, n),
+        'Qty': rng.integers(1, 5, n).astype(np.int64),
+    })
+    df = pd.concat([df, df.iloc[:50]], ignore_index=True)
+    for col in df.columns:
+        if col not in ('Date', 'Qty'):
+            df[col] = df[col].astype(object)
+    return df
+
+
+def test_policy_reduces_memory_and_keeps_values():
+    """카테고리/정수 다운캐스트 적용 후 메모리 감소, 값은 동일"""
+    raw = _object_frame()
+    typed = apply_dtype_policy(raw)
+
+    assert has_dtype_policy(typed) and not has_dtype_policy(raw)
+    assert list(typed['TxType_Refined'].cat.categories) == TX_TYPES
+    assert isinstance(typed['Case_No'].dtype, pd.CategoricalDtype)
+    assert typed['Qty'].dtype == np.int32
+    assert typed.memory_usage(deep=True).sum() * 3 < raw.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(typed.astype(object), raw.astype(object))
+
+    assert contains_mask(typed['TxType_Refined'], 'TRANSFER').equals(
+        raw['TxType_Refined'].str.contains('TRANSFER', na=False))
+
+
+def test_policy_survives_reconcile_dedup_and_matches_object_path():
+    """TRANSFER 보정/중복 제거 후에도 dtype 유지, 결과와 일별 재고는 object 경로와 동일"""
+    raw = _object_frame()
+    typed = drop_duplicate_transfers(reconcile_orphan_transfers(apply_dtype_policy(raw, report=False)))
+    plain = drop_duplicate_transfers(reconcile_orphan_transfers(raw.copy()))
+
+    assert has_dtype_policy(typed)
+    for col in ['Case_No', 'Location', 'Source_File', 'Target_Warehouse']:
+        assert isinstance(typed[col].dtype, pd.CategoricalDtype), col
+    assert len(typed) == len(plain)
+
+    sort_cols = ['Case_No', 'Date', 'TxType_Refined', 'Location', 'Target_Warehouse', 'Source_File']
+    left = typed.astype(object).sort_values(sort_cols).reset_index(drop=True)
+    right = plain.astype(object).sort_values(sort_cols).reset_index(drop=True)
+    pd.testing.assert_frame_equal(left, right)
+
+    inventory_typed = calculate_daily_inventory(typed).sort_values(['Location', 'Date']).reset_index(drop=True)
+    inventory_plain = calculate_daily_inventory(plain).sort_values(['Location', 'Date']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(inventory_typed, inventory_plain, check_dtype=False)
+
+
+def test_daily_stock_frame_dtype_rules():
+    """공용 일별 재고 dtype 규칙: 피벗에 없는 흐름은 int64 0, 위치별 한 행뿐이면 기초재고 int64"""
+    single = daily_stock_frame({
+        'Location': ['X', 'Y'], 'Date': ['d1', 'd1'], 'Opening_Stock': [0, 0], 'Inbound': [3.0, 4.0],
+        'Transfer_Out': [0, 0], 'Final_Out': [0, 0], 'Closing_Stock': [3.0, 4.0],
+    }, flow_types=['IN'])
+    assert single['Opening_Stock'].dtype == np.int64 and single['Closing_Stock'].dtype == np.float64
+    assert single['Transfer_Out'].dtype == np.int64 and single['Total_Outbound'].dtype == np.int64
+
+    repeated = daily_stock_frame({
+        'Location': ['X', 'X'], 'Date': ['d1', 'd2'], 'Opening_Stock': [0, 3.0], 'Inbound': [3.0, 0.0],
+        'Transfer_Out': [0, 0], 'Final_Out': [0.0, 1.0], 'Closing_Stock': [3.0, 2.0],
+    }, flow_types=['IN', 'FINAL_OUT'])
+    assert repeated['Opening_Stock'].tolist() == [0.0, 3.0] and repeated['Opening_Stock'].dtype == np.float64
+    assert repeated['Total_Outbound'].dtype == np.float64
+    assert daily_stock_frame({'Location': []}, flow_types=[]).empty
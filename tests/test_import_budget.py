@@ -0,0 +1,99 @@
+"""
+CLI import 시간 예산 테스트
+
+진입 모듈 import 시 무거운 의존성(rdflib / plotly / yaml / pyarrow.dataset)을 로드하지 않는지 새 프로세스에서 확인합니다.
+pandas/numpy 기준선 대비 추가 import 시간 예산은 perf 마커 (--perf 옵션으로 실행).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ['rdflib', 'plotly', 'yaml', 'pyarrow.dataset']
+# pandas/numpy 이후 main import 추가 시간 예산 (측정값 약 0.03~0.07s)
+IMPORT_BUDGET_SECONDS = float(os.getenv("HVDC_IMPORT_BUDGET", "0.25"))
+
+
+def _run(code):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["main", "excel_reporter", "ontology_mapper", "bi_dashboard"])
+def test_import_does_not_load_heavy_dependencies(module):
+    """진입 모듈 import만으로는 무거운 의존성이 로드되지 않음"""
+    loaded = _run(f"import sys, json; import {module}; "
+                  f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    assert loaded == []
+
+
+@pytest.mark.perf
+def test_main_import_within_budget():
+    """pandas/numpy 기준선 대비 main import 추가 시간이 예산 이내 (3회 중 최소값, --perf 옵션으로 실행)"""
+    code = ("import json, time; import pandas, numpy; started = time.perf_counter(); import main; "
+            "print(json.dumps(time.perf_counter() - started))")
+    elapsed = min(_run(code) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"main import {elapsed:.3f}s > 예산 {IMPORT_BUDGET_SECONDS}s"
+
+
+def test_lazy_dependencies_load_on_first_use(tmp_path):
+    """지연 로딩된 규칙/rdflib가 첫 사용 시 정상 동작"""
+    out = tmp_path / "lazy.ttl"
+    code = (
+        "import sys, json; import pandas as pd; "
+        "from mapping_utils import MappingManager, VENDOR_MAP; import ontology_mapper; "
+        "before = 'rdflib' in sys.modules; "
+        "df = pd.DataFrame({'Case_No': ['C1'], 'Qty': [2], 'Location': ['DSV Indoor']}); "
+        f"ontology_mapper.dataframe_to_rdf(df, {str(out)!r}); "
+        "print(json.dumps({'before': before, 'after': 'rdflib' in sys.modules, 'vendors': len(VENDOR_MAP), "
+        "'storage': MappingManager().classify_storage_type('DSV Indoor')}))"
+    )
+    result = _run(code)
+    assert result['before'] is False
+    assert result['after'] is True
+    assert result['vendors'] > 0
+    assert result['storage'] == 'Indoor'
+    assert out.exists() and out.stat().st_size > 0
+
+
+def test_lazy_mapping_behaves_like_dict():
+    """LazyMapping / LazySequence / LazyString은 첫 조회 시 1회만 로드, reload_mapping_rules 후 다시 로드"""
+    from core.lazy_loading import LazyMapping, LazySequence, LazyString, reload_mapping_rules
+
+    calls = []
+    mapping = LazyMapping(lambda: calls.append('m') or {'a': 1})
+    sequence = LazySequence(lambda: calls.append('s') or ['x', 'y'])
+    assert calls == []
+    assert dict(mapping) == {'a': 1} and mapping.get('b', 2) == 2 and 'a' in mapping
+    assert list(sequence) == ['x', 'y'] and 'y' in sequence
+    assert calls == ['m', 's']
+
+    text = LazyString(lambda: calls.append('t') or 'eta')
+    assert text == 'eta' and text.upper() == 'ETA'
+    assert calls == ['m', 's', 't']
+
+    reload_mapping_rules()
+    assert mapping['a'] == 1 and sequence[0] == 'x' and text == 'eta'
+    assert calls == ['m', 's', 't', 'm', 's', 't']
+
+
+def test_month_matching_is_read_from_rules(tmp_path):
+    """MONTH_MATCHING은 mapping_rules의 month_matching 값을 따름 (하드코딩 아님)"""
+    from core.lazy_loading import rules_section
+
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({'month_matching': 'custom_rule'}), encoding='utf-8')
+    assert rules_section('month_matching', 'operation_month_eq_eta_month', path=str(rules)) == 'custom_rule'
+    assert rules_section('month_matching', 'operation_month_eq_eta_month', path=str(tmp_path / "x.json")) \
+        == 'operation_month_eq_eta_month'
+
+    import excel_reporter
+    import ontology_mapper
+    assert excel_reporter.MONTH_MATCHING == ontology_mapper.MONTH_MATCHING == 'operation_month_eq_eta_month'
@@ -0,0 +1,55 @@
+"""
+OLAP 큐브 롤업/슬라이스 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.olap_cube import InventoryCube
+
+
+def _sample_transactions():
+    rng = np.random.default_rng(7)
+    n = 500
+    return pd.DataFrame({
+        'Date': pd.to_datetime('2024-01-01') + pd.to_timedelta(rng.integers(0, 180, n), unit='D'),
+        'Location': rng.choice(['DSV Indoor', 'DSV Outdoor', 'MIR', 'SHU', None], n),
+        'Vendor': rng.choice(['HITACHI', 'SIMENSE'], n),
+        'Storage_Type': rng.choice(['Indoor', 'Outdoor', 'Site'], n),
+        'TxType_Refined': rng.choice(['IN', 'TRANSFER_OUT', 'FINAL_OUT'], n),
+        'Qty': rng.integers(1, 20, n),
+        'Amount': rng.random(n) * 1000,
+        'Handling Fee': rng.random(n) * 50,
+    })
+
+
+def test_rollup_matches_raw_groupby():
+    """큐브 롤업이 원본 groupby 합계와 일치하는지 확인"""
+    df = _sample_transactions()
+    df['월'] = df['Date'].dt.strftime('%Y-%m')
+    cube = InventoryCube.from_transactions(df)
+
+    assert cube.measures == ['Qty', 'Amount', 'Handling Fee']
+    assert len(cube.cells) < len(df)
+
+    expected = df.groupby(['월', 'Location'])['Amount'].sum().reset_index()
+    result = cube.rollup(['월', 'Location'], 'Amount')
+    assert result[['월', 'Location']].equals(expected[['월', 'Location']])
+    assert np.allclose(result['Amount'], expected['Amount'])
+
+    out_expected = df[df['TxType_Refined'].isin(['TRANSFER_OUT', 'FINAL_OUT'])].groupby(['월', 'Location'])['Qty'].sum()
+    out_result = cube.slice(TxType_Refined=['TRANSFER_OUT', 'FINAL_OUT']).rollup(['월', 'Location'], 'Qty')
+    assert out_result['Qty'].tolist() == out_expected.tolist()
+
+    counts = cube.count('Vendor')
+    assert counts['트랜잭션수'].sum() == len(df)
+
+
+def test_cube_save_and_load(tmp_path):
+    """큐브 저장 후 재로드 시 롤업 결과 유지"""
+    cube = InventoryCube.from_transactions(_sample_transactions())
+    path = cube.save(tmp_path / "inventory_cube")
+    loaded = InventoryCube.load(path)
+
+    assert loaded.measures == cube.measures
+    assert np.allclose(loaded.rollup('Vendor', 'Amount')['Amount'], cube.rollup('Vendor', 'Amount')['Amount'])
@@ -0,0 +1,120 @@
+"""
+월 파티션 재고 계산 테스트 - 기초재고 이월, 월별 산출물 기록, 전체 계산과 같은 일별 재고
+"""
+
+import pandas as pd
+import pytest
+
+from core.deduplication import drop_duplicate_transfers, reconcile_orphan_transfers
+from core.dtypes import apply_dtype_policy
+from core.partitioned_inventory import PartitionedInventory, log_months, read_monthly_stock
+from core.synthetic_data import generate_transaction_frame
+from core.transaction_log import PYARROW_AVAILABLE, write_transaction_log
+from core.transactions import calculate_daily_inventory
+
+pytestmark = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow 미설치")
+
+
+def _deduped(df):
+    return drop_duplicate_transfers(reconcile_orphan_transfers(apply_dtype_policy(df, report=False)))
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_partitioned_matches_full_inventory(tmp_path, seed):
+    """합성 로그 월 순차 처리 결과 = calculate_daily_inventory (값·dtype·행 순서)"""
+    df = _deduped(generate_transaction_frame(2000, seed=seed))
+    log = write_transaction_log(df, tmp_path / "log.parquet")
+    inventory = PartitionedInventory(log, tmp_path / "out")
+
+    result = inventory.run()
+    pd.testing.assert_frame_equal(result, calculate_daily_inventory(df.copy()), check_exact=True)
+    assert inventory.months_done == log_months(log)
+    assert inventory.peak_partition_rows < len(df)
+
+
+def test_opening_balance_carries_and_monthly_outputs(tmp_path):
+    """거래 없는 달도 기말재고 이월, 월 요약은 완료된 월마다 파티션으로 기록"""
+    df = pd.DataFrame({
+        'Case_No': ['a', 'b', 'c', 'd'],
+        'Date': pd.to_datetime(['2024-01-05', '2024-01-20', '2024-02-10', '2024-03-01']),
+        'Location': ['X', 'X', 'Y', 'X'],
+        'TxType_Refined': ['IN', 'IN', 'IN', 'FINAL_OUT'],
+        'Qty': [3, 2, 7, 4],
+        'Source_File': 'HVDC WAREHOUSE_HITACHI(HE).xlsx',
+    })
+    log = write_transaction_log(df, tmp_path / "log.parquet")
+    out = tmp_path / "out"
+    inventory = PartitionedInventory(log, out)
+
+    first = inventory.process_month('2024-01')
+    assert first['Closing_Stock'].tolist() == [3, 5]
+    assert sorted(p.name for p in (out / "monthly_stock").iterdir()) == ['month=2024-01']
+
+    inventory.process_month('2024-02')
+    march = inventory.process_month('2024-03')
+    assert march.iloc[0]['Opening_Stock'] == 5 and march.iloc[0]['Closing_Stock'] == 1
+
+    monthly = read_monthly_stock(out).set_index(['월', 'Location'])
+    assert monthly.loc[('2024-02', 'X'), 'Closing_Stock'] == 5
+    assert monthly.loc[('2024-02', 'X'), 'Active_Days'] == 0
+    assert monthly.loc[('2024-03', 'Y'), 'Opening_Stock'] == 7
+    pd.testing.assert_frame_equal(inventory.daily_stock(), calculate_daily_inventory(df.copy()), check_exact=True)
+
+
+def test_missing_log_raises(tmp_path):
+    """트랜잭션 로그가 없으면 FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        PartitionedInventory(tmp_path / "missing.parquet").run()
+
+
+
+class _TrackedRecords(list):
+    """weakref 추적용 원시 트랜잭션 리스트"""
+
+
+class _InMemoryGraph:
+    """main 파이프라인용 가짜 스테이지 그래프 (결과를 복사 없이 넘겨 참조 해제를 추적)"""
+
+    def __init__(self, results):
+        self._results = results
+
+    def run(self, target):
+        return self._results[target]
+
+    def release(self):
+        self._results.clear()
+
+
+def test_main_partitioned_releases_full_history(tmp_path, monkeypatch):
+    """--partitioned: 월 파티션 계산 전에 원시 트랜잭션/전체 DataFrame 참조가 모두 해제됨"""
+    import gc
+    import sys
+    import weakref
+
+    import main
+
+    df = _deduped(generate_transaction_frame(500, seed=1))
+    df = df[~df['TxType_Refined'].astype(str).str.startswith('TRANSFER')].reset_index(drop=True)
+    records = _TrackedRecords(df.to_dict('records'))
+    refs = {'raw_transactions': weakref.ref(records), 'transaction_df': weakref.ref(df)}
+    graphs = [_InMemoryGraph({'load': records, 'convert': df, 'reconcile': df, 'dedup': df})]
+    del records, df
+
+    log_path = tmp_path / "log.parquet"
+    alive = {}
+
+    def partitioned(output_dir):
+        gc.collect()
+        alive.update({name: ref() is not None for name, ref in refs.items()})
+        return PartitionedInventory(log_path, output_dir).run()
+
+    monkeypatch.setattr(main, 'build_transaction_graph', lambda *args, **kwargs: graphs.pop())
+    monkeypatch.setattr(main, 'write_transaction_log', lambda frame: write_transaction_log(frame, log_path))
+    monkeypatch.setattr(main, 'calculate_partitioned_inventory', partitioned)
+    monkeypatch.setattr(main, 'print_system_info', lambda: None)
+    monkeypatch.setattr(main, 'run_diagnostic_check', lambda: True)
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--partitioned', '--partition-dir', str(tmp_path / "out"),
+                                      '--profile-out', str(tmp_path / "profile.json")])
+
+    assert main.main() is True
+    assert alive == {'raw_transactions': False, 'transaction_df': False}
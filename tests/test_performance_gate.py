@@ -0,0 +1,140 @@
+"""
+성능 회귀 게이트 (--perf 옵션으로 실행)
+
+고정 합성 입력으로 핵심 커널의 중앙값 시간과 tracemalloc 피크 메모리를 측정하여
+benchmarks/perf_gate_baseline.json 기준값 대비 --perf-tolerance 이상 느려지거나
+메모리가 늘면 실패합니다. 기준값 갱신: pytest tests/test_performance_gate.py --perf-update-baseline
+"""
+
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from core.deduplication import DeduplicationEngine, reconcile_orphan_transfers
+from core.loader import DataLoader
+from core.synthetic_data import PRIMARY_WAREHOUSES, generate_case_list, generate_transaction_frame
+from core.transactions import calculate_daily_inventory
+from excel_reporter import aggregate_vendor_monthly, get_all_months
+from ontology_mapper import dataframe_to_rdf
+
+pytestmark = pytest.mark.perf
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "perf_gate_baseline.json"
+REPEATS = 5
+SEED = 42
+# 측정 잡음이 큰 구간은 회귀 판정 제외
+MIN_COMPARABLE_SECONDS = 0.01
+MIN_COMPARABLE_MB = 1.0
+KERNELS = ['loader_extraction', 'reconcile_orphan_transfers', 'comprehensive_deduplication',
+           'daily_inventory', 'aggregate_vendor_monthly', 'dataframe_to_rdf']
+
+_measured = {}
+
+
+@pytest.fixture(scope="module")
+def inputs(tmp_path_factory):
+    """커널별 고정 합성 입력 (시드 고정)"""
+    loader = DataLoader()
+    case_list = generate_case_list('HITACHI', 3000, seed=SEED)
+    raw_transactions = loader._extract_file_transactions(generate_case_list('SIMENSE', 500, seed=SEED), 'SIM.xlsx')
+    frame = generate_transaction_frame(20000, seed=SEED)
+    monthly = frame.assign(월=frame['Date'].dt.strftime('%Y-%m'), Amount=frame['Qty'] * 100.0)
+    return {
+        'loader': loader,
+        'case_list': case_list,
+        'raw_transactions': raw_transactions,
+        'reconcile_frame': generate_transaction_frame(3000, seed=SEED),
+        'frame': frame,
+        'monthly': monthly,
+        'months': get_all_months(monthly),
+        'rdf_frame': frame.head(400),
+        'rdf_path': str(tmp_path_factory.mktemp("perf_rdf") / "perf.ttl"),
+    }
+
+
+def _kernel(name, data):
+    if name == 'loader_extraction':
+        return lambda: data['loader']._extract_file_transactions(data['case_list'], 'HE.xlsx')
+    if name == 'reconcile_orphan_transfers':
+        return lambda: reconcile_orphan_transfers(data['reconcile_frame'].copy())
+    if name == 'comprehensive_deduplication':
+        return lambda: DeduplicationEngine().apply_comprehensive_deduplication(list(data['raw_transactions']))
+    if name == 'daily_inventory':
+        return lambda: calculate_daily_inventory(data['frame'].copy())
+    if name == 'aggregate_vendor_monthly':
+        return lambda: aggregate_vendor_monthly(data['monthly'], data['months'], list(PRIMARY_WAREHOUSES))
+    if name == 'dataframe_to_rdf':
+        return lambda: dataframe_to_rdf(data['rdf_frame'], data['rdf_path'])
+    raise KeyError(name)
+
+
+def _measure(func, repeats=REPEATS):
+    """예열 1회 후 중앙값 시간 (GC 정지, 추적 없이 반복) + 별도 1회 tracemalloc 피크"""
+    func()
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'median_seconds': round(statistics.median(timings), 4), 'peak_mb': round(peak / (1024 * 1024), 3)}
+
+
+def _regressions(current, reference, tolerance):
+    failures = []
+    for metric, floor in (('median_seconds', MIN_COMPARABLE_SECONDS), ('peak_mb', MIN_COMPARABLE_MB)):
+        base = reference.get(metric)
+        if not base or base < floor:
+            continue
+        ratio = current[metric] / base
+        if ratio > 1 + tolerance:
+            failures.append(f"{metric}: {base} → {current[metric]} ({ratio:.2f}x, 허용 {1 + tolerance:.2f}x)")
+    return failures
+
+
+@pytest.fixture(scope="module")
+def baseline(request):
+    baseline = json.loads(BASELINE_PATH.read_text(encoding='utf-8')) if BASELINE_PATH.exists() else {}
+    yield baseline
+    if request.config.getoption("--perf-update-baseline") and _measured:
+        kernels = dict(baseline.get('kernels', {}))
+        kernels.update(_measured)
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+            'repeats': REPEATS,
+            'kernels': dict(sorted(kernels.items())),
+        }, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+@pytest.mark.parametrize("name", KERNELS)
+def test_kernel_within_baseline(name, inputs, baseline, request):
+    """커널 중앙값 시간/피크 메모리가 기준값 허용치 이내"""
+    current = _measure(_kernel(name, inputs))
+    _measured[name] = current
+    if request.config.getoption("--perf-update-baseline"):
+        return
+
+    reference = baseline.get('kernels', {}).get(name)
+    if reference is None:
+        pytest.skip(f"{name} 기준값 없음 - --perf-update-baseline으로 생성")
+    failures = _regressions(current, reference, request.config.getoption("--perf-tolerance"))
+    assert not failures, f"{name} 성능 회귀: " + "; ".join(failures)
@@ -0,0 +1,87 @@
+"""
+스테이지 DAG 실행기 / 내용 주소 캐시 테스트
+"""
+
+import pandas as pd
+
+import core.lazy_loading as lazy_loading
+from core.pipeline_dag import StageGraph, build_transaction_graph, file_fingerprint
+
+CALLS = []
+
+
+def _load(path):
+    CALLS.append('load')
+    return pd.read_csv(path)
+
+
+def _double(df, factor=2):
+    CALLS.append('double')
+    df['Qty'] = df['Qty'] * factor
+    return df
+
+
+def _total(df):
+    CALLS.append('total')
+    return int(df['Qty'].sum())
+
+
+def _build(tmp_path, source, factor=2):
+    graph = StageGraph(cache_dir=tmp_path / "cache")
+    graph.add_stage('load', _load, config={'path': str(source)}, fingerprint=lambda: file_fingerprint([source]))
+    graph.add_stage('double', _double, inputs=['load'], config={'factor': factor})
+    graph.add_stage('total', _total, inputs=['double'])
+    return graph
+
+
+def test_second_graph_reuses_all_upstream_artifacts(tmp_path):
+    """동일 입력/코드/설정이면 다른 그래프 인스턴스에서도 캐시 재사용"""
+    source = tmp_path / "tx.csv"
+    pd.DataFrame({'Qty': [1, 2, 3]}).to_csv(source, index=False)
+    CALLS.clear()
+
+    first = _build(tmp_path, source)
+    assert first.run('total') == 12
+    assert first.last_run == {'load': 'miss', 'double': 'miss', 'total': 'miss'}
+
+    # 하위 스테이지가 변경해도 공유 산출물은 그대로
+    assert first.run('load')['Qty'].tolist() == [1, 2, 3]
+
+    second = _build(tmp_path, source)
+    assert second.run('double')['Qty'].tolist() == [2, 4, 6]
+    assert second.run('total') == 12
+    assert second.last_run == {'double': 'hit', 'total': 'hit'}
+    assert CALLS == ['load', 'double', 'total']
+
+
+def test_config_and_input_changes_invalidate_downstream(tmp_path):
+    """설정 변경은 해당 스테이지부터, 입력 파일 변경은 전체 재계산"""
+    source = tmp_path / "tx.csv"
+    pd.DataFrame({'Qty': [1, 2, 3]}).to_csv(source, index=False)
+    _build(tmp_path, source).run('total')
+
+    CALLS.clear()
+    graph = _build(tmp_path, source, factor=3)
+    assert graph.run('total') == 18
+    assert CALLS == ['double', 'total']
+    assert graph.last_run['load'] == 'hit'
+
+    CALLS.clear()
+    pd.DataFrame({'Qty': [5]}).to_csv(source, index=False)
+    assert _build(tmp_path, source).run('total') == 10
+    assert CALLS == ['load', 'double', 'total']
+
+    assert graph.clear_cache() > 0
+
+
+def test_mapping_rules_change_invalidates_load_and_convert(tmp_path, monkeypatch):
+    """매핑 규칙 파일이 바뀌면 load/convert부터 캐시 키가 달라짐 (원시 트랜잭션/Storage_Type 재계산)"""
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"warehouse_classification": {}}', encoding='utf-8')
+    monkeypatch.setattr(lazy_loading, 'MAPPING_RULES_FILE', str(rules))
+    before = build_transaction_graph(tmp_path / "data", cache_dir=tmp_path / "cache")
+    keys = {name: before.stage_key(name) for name in ['load', 'convert', 'inventory']}
+
+    rules.write_text('{"warehouse_classification": {"indoor": ["DSV Indoor"]}}', encoding='utf-8')
+    after = build_transaction_graph(tmp_path / "data", cache_dir=tmp_path / "cache")
+    assert all(after.stage_key(name) != key for name, key in keys.items())
@@ -0,0 +1,137 @@
+"""
+로컬 조회 API 테스트 - 인덱스 응답이 원본 프레임 계산과 일치, 밀리초 단위 응답
+"""
+
+import statistics
+import time
+
+import pandas as pd
+import pytest
+
+from core.query_api import InventoryQueryIndex, QueryAPIServer, QueryClient
+from core.synthetic_data import generate_transaction_frame
+from core.transaction_log import infer_vendor
+from core.transactions import calculate_daily_inventory
+from variance_analyzer import create_sample_data
+from variance_ledger import VarianceLedger
+
+
+@pytest.fixture(scope="module")
+def frames(tmp_path_factory):
+    transactions = generate_transaction_frame(2000, seed=9)
+    transactions['Amount'] = transactions['Qty'] * 10.0
+    daily_stock = calculate_daily_inventory(transactions.copy())
+    ledger = VarianceLedger(tmp_path_factory.mktemp("ledger") / "ledger.sqlite")
+    ledger.ingest(*create_sample_data())
+    return transactions, daily_stock, ledger.get_ledger()
+
+
+@pytest.fixture(scope="module")
+def client(frames):
+    server = QueryAPIServer(InventoryQueryIndex(*frames, generation=3), port=0)
+    server.start()
+    yield QueryClient(server.url)
+    server.shutdown()
+    server.server_close()
+
+
+def test_stock_as_of_matches_daily_stock(frames, client):
+    """기준일 재고 = 해당 일 이전 마지막 Closing_Stock"""
+    _, daily_stock, _ = frames
+    as_of = '2024-03-15'
+    stock = daily_stock.assign(Date=pd.to_datetime(daily_stock['Date']))
+    expected = (stock[stock['Date'] <= as_of].sort_values('Date').groupby('Location')['Closing_Stock'].last())
+
+    result = client.stock(as_of)
+    assert result['generation'] == 3
+    for location, value in expected.items():
+        assert result['stock'][location] == value
+    warehouse = expected.index[0]
+    assert client.stock(as_of, warehouse)['stock'] == {warehouse: expected.iloc[0]}
+    latest = client.stock()['stock']
+    assert latest == stock.sort_values('Date').groupby('Location')['Closing_Stock'].last().to_dict()
+
+
+def test_case_position_and_history(frames, client):
+    """케이스 위치/이력 = 원본 이벤트 정렬 결과"""
+    transactions, _, _ = frames
+    case_no = transactions['Case_No'].iloc[0]
+    events = transactions[transactions['Case_No'] == case_no].sort_values('Date', kind='stable')
+
+    result = client.case(case_no)
+    assert len(result['history']) == len(events)
+    assert result['position']['Location'] == events['Location'].iloc[-1]
+    first = client.case(case_no, date=events['Date'].iloc[0].strftime('%Y-%m-%d'))
+    assert first['history'][0]['Location'] == events['Location'].iloc[0]
+
+    with pytest.raises(KeyError):
+        client.case('NO-SUCH-CASE')
+    with pytest.raises(ValueError):
+        client.stock('not-a-date')
+
+
+def test_vendor_monthly_matches_groupby(frames, client):
+    """공급사 월별 입고/출고 수량, 입고 금액 = 원본 groupby"""
+    transactions, _, _ = frames
+    df = transactions.assign(Vendor=infer_vendor(transactions), 월=transactions['Date'].dt.strftime('%Y-%m'))
+    vendor = df['Vendor'].iloc[0]
+    month = df['월'].iloc[0]
+    rows = df[(df['Vendor'] == vendor) & (df['월'] == month)]
+    tx = rows['TxType_Refined'].astype(str)
+
+    result = client.vendor_monthly(vendor, month)['vendors'][vendor]
+    assert result == [{
+        '월': month,
+        'IN': int(rows.loc[tx == 'IN', 'Qty'].sum()),
+        'OUT': int(rows.loc[tx.isin(['TRANSFER_OUT', 'FINAL_OUT']), 'Qty'].sum()),
+        'Amount': float(rows.loc[tx == 'IN', 'Amount'].sum()),
+    }]
+    assert len(client.vendor_monthly(vendor)['vendors'][vendor]) == df.loc[df['Vendor'] == vendor, '월'].nunique()
+
+
+def test_variance_by_month(frames, client):
+    """오차 원장 월별 조회"""
+    _, _, ledger = frames
+    month = ledger['년월'].iloc[0]
+    result = client.variance(month)['months']
+    assert result[0]['년월'] == month
+    assert result[0]['오차'] == pytest.approx(ledger['오차'].iloc[0])
+    assert len(client.variance()['months']) == len(ledger)
+
+
+@pytest.mark.perf
+def test_lookups_are_millisecond_latency(frames, client):
+    """인덱스 조회 중앙값 1ms 미만, HTTP 왕복 중앙값 50ms 미만 (--perf 옵션으로 실행)"""
+    transactions, _, _ = frames
+    index = InventoryQueryIndex(*frames)
+    cases = transactions['Case_No'].drop_duplicates().head(100).tolist()
+
+    def median_ms(func, args):
+        timings = []
+        for arg in args:
+            started = time.perf_counter()
+            func(arg)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    assert median_ms(index.case, cases) < 1.0
+    assert median_ms(index.stock, ['2024-02-01'] * 100) < 1.0
+    assert median_ms(client.case, cases[:30]) < 50.0
+
+
+def test_index_swap_and_empty_service_state():
+    """update_index로 세대 교체, 빈 상태도 조회 가능"""
+    server = QueryAPIServer(port=0)
+    server.start()
+    try:
+        client = QueryClient(server.url)
+        with pytest.raises(RuntimeError):
+            client.health()
+        server.update_index(InventoryQueryIndex(pd.DataFrame(), pd.DataFrame(), generation=1))
+        assert client.health()['generation'] == 1
+        assert client.stock()['stock'] == {}
+        with pytest.raises(KeyError):
+            client.variance()
+    finally:
+        server.shutdown()
+        server.server_close()
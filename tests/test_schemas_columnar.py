@@ -0,0 +1,63 @@
+"""
+컬럼 단위 스키마 검증 테스트 (pydantic 모델 규칙과 동일한지 확인)
+"""
+
+from datetime import datetime
+
+import pandas as pd
+from pydantic import ValidationError
+
+from core.schemas import (
+    TransactionData, validate_transaction_columns, validate_transaction_records
+)
+
+
+def _records():
+    return [
+        {'case': 'HE-0001', 'date': datetime(2024, 3, 1), 'warehouse': 'DSV Indoor', 'incoming': 5, 'outgoing': 0},
+        {'case': 'HE-0002', 'date': datetime(2099, 1, 1), 'warehouse': 'MIR', 'incoming': 1, 'outgoing': 0},
+        {'case': 'HE-0003', 'date': '2024-02-30', 'warehouse': 'SHU', 'incoming': 1, 'outgoing': 0},
+        {'case': 'HE-0004', 'date': datetime(2024, 3, 2), 'warehouse': 'DAS', 'incoming': -3, 'outgoing': 0},
+        {'case': 'HE-0005', 'date': datetime(2024, 3, 3), 'warehouse': 'AGI', 'incoming': 0, 'outgoing': 12000},
+        {'case': 'HE-0006', 'date': datetime(2024, 3, 4), 'warehouse': 'DSV Outdoor', 'incoming': 2, 'outgoing': 0,
+         'storage_type': 'Basement'},
+        {'case': 'HE-0007', 'date': datetime(2024, 3, 5), 'warehouse': 'DSV Al Markaz', 'incoming': 4, 'outgoing': 0,
+         'storage_type': 'Indoor'},
+    ]
+
+
+def test_columnar_rules_match_pydantic_models():
+    """위반 행 집합이 행 단위 pydantic 검증과 동일한지 확인"""
+    records = _records()
+    pydantic_invalid = set()
+    for i, rec in enumerate(records):
+        try:
+            TransactionData(**rec)
+        except ValidationError:
+            pydantic_invalid.add(i)
+
+    violations = validate_transaction_columns(pd.DataFrame(records))
+    assert set(violations['row']) == pydantic_invalid == {1, 2, 3, 4, 5}
+    assert set(violations['rule']) == {'future_date', 'date_format', 'non_negative', 'max_quantity', 'enum'}
+
+
+def test_transaction_frame_columns_and_records():
+    """트랜잭션 DataFrame 컬럼명 지원 및 loader 레코드 source_file 연결"""
+    df = pd.DataFrame({
+        'Case_No': ['A', ' ', 'C'],
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-02', None]),
+        'Location': ['DSV Indoor', 'MIR', 'SHU'],
+        'Qty': [1, 2.5, 3],
+        'TxType_Refined': ['IN', 'FINAL_OUT', 'RETURN'],
+    }, index=[10, 11, 12])
+    violations = validate_transaction_columns(df)
+    assert violations[['row', 'column', 'rule']].values.tolist() == [
+        [11, 'Case_No', 'not_empty'],
+        [11, 'Qty', 'integer'],
+        [12, 'Date', 'required'],
+        [12, 'TxType_Refined', 'enum'],
+    ]
+
+    transactions = [{'source_file': f"file_{i}.xlsx", 'data': rec} for i, rec in enumerate(_records())]
+    record_violations = validate_transaction_records(transactions)
+    assert record_violations.loc[record_violations['row'] == 3, 'source_file'].tolist() == ['file_3.xlsx']
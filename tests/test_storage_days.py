@@ -0,0 +1,98 @@
+"""
+창고 보관일수/RENT FEE 발생 추정 엔진 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.storage_days import StorageDaysEngine, reconcile_rent_with_invoice
+from excel_reporter import generate_rent_accrual_report, mark_rent_fee, mark_rent_fee_frame
+
+
+def _tx(case, date, location, tx_type, qty, sqm=None):
+    return {'Case_No': case, 'Date': pd.Timestamp(date), 'Location': location,
+            'TxType_Refined': tx_type, 'Qty': qty, 'SQM': sqm}
+
+
+def test_intervals_and_monthly_rent():
+    """입고일 포함/출고일 제외 보관일수, 월 경계 분할, 일할 임대료"""
+    df = pd.DataFrame([
+        _tx('C1', '2024-01-30', 'DSV Indoor', 'IN', 2, 4.0),
+        _tx('C1', '2024-02-02', 'DSV Indoor', 'TRANSFER_OUT', 2),
+        _tx('C2', '2024-02-01', 'DSV Indoor', 'IN', 1, 1.5),
+        # 입고 전 출고는 음수 점유로 잡히지 않고, 이후 입고분만 점유
+        _tx('C3', '2024-01-15', 'MOSB', 'TRANSFER_OUT', 5),
+        _tx('C3', '2024-01-20', 'MOSB', 'IN', 5, 10.0),
+    ])
+    engine = StorageDaysEngine.from_transactions(df, as_of='2024-02-03')
+
+    days = engine.storage_days().set_index(['Case_No', 'Location'])
+    assert days.loc[('C1', 'DSV Indoor'), '보관일수'] == 3
+    assert days.loc[('C1', 'DSV Indoor'), 'SQM일수'] == 12.0
+    assert days.loc[('C2', 'DSV Indoor'), '보관일수'] == 3
+    assert days.loc[('C3', 'MOSB'), '보관일수'] == 15
+
+    daily = engine.daily_occupancy()
+    assert daily.loc['2024-02-01', 'DSV Indoor'] == 3
+    assert daily.loc['2024-02-02', 'DSV Indoor'] == 1
+    assert (daily >= 0).all().all()
+
+    monthly = engine.monthly_summary({'DSV INDOOR': 31.0}).set_index(['월', 'Location'])
+    assert monthly.loc[('2024-01', 'DSV Indoor'), 'SQM일수'] == 8.0
+    assert monthly.loc[('2024-02', 'DSV Indoor'), 'SQM일수'] == 4.0 + 4.5
+    assert np.isclose(monthly.loc[('2024-01', 'DSV Indoor'), 'RENT_발생추정'], 8.0)
+    assert np.isclose(monthly.loc[('2024-02', 'DSV Indoor'), 'RENT_발생추정'], 8.5 * 31 / 29)
+
+    invoiced = pd.DataFrame({'월': ['2024-01', '2024-02'], 'RENT FEE': [10.0, 9.0]})
+    reconciled = reconcile_rent_with_invoice(engine.monthly_summary({'DSV INDOOR': 31.0}), invoiced)
+    assert reconciled['월'].tolist() == ['2024-01', '2024-02']
+    assert np.isclose(reconciled.loc[0, '차이'], 2.0)
+
+
+def test_daily_occupancy_matches_day_by_day_count():
+    """누적합 그리드가 일자별 재고 직접 계산과 일치"""
+    rng = np.random.default_rng(4)
+    rows = []
+    for case in range(200):
+        start = pd.Timestamp('2024-01-01') + pd.Timedelta(days=int(rng.integers(0, 60)))
+        location = rng.choice(['DSV Indoor', 'DSV Outdoor'])
+        qty = int(rng.integers(1, 5))
+        rows.append(_tx(f'C{case}', start, location, 'IN', qty))
+        if rng.random() < 0.7:
+            rows.append(_tx(f'C{case}', start + pd.Timedelta(days=int(rng.integers(0, 40))), location, 'FINAL_OUT', qty))
+    df = pd.DataFrame(rows)
+    engine = StorageDaysEngine.from_transactions(df)
+    daily = engine.daily_occupancy()
+
+    signed = df['Qty'] * np.where(df['TxType_Refined'] == 'IN', 1, -1)
+    for day in [pd.Timestamp('2024-01-20'), pd.Timestamp('2024-02-15'), engine.as_of]:
+        for location in ['DSV Indoor', 'DSV Outdoor']:
+            mask = (df['Location'] == location) & (df['Date'] <= day)
+            assert daily.loc[day, location] == signed[mask].sum()
+
+
+def test_mark_rent_fee_frame_matches_row_version():
+    """벡터 RENT FEE 분류가 행 단위 분류와 동일"""
+    df = pd.DataFrame({'HVDC CODE 1': ['DSV Indoor', 'mosb', None, 'DSV MZP', 'dsv outdoor']})
+    expected = df.apply(mark_rent_fee, axis=1).tolist()
+    assert mark_rent_fee_frame(df).tolist() == expected
+
+
+def test_rent_accrual_skipped_without_rates():
+    """임대 단가 미설정 시 발생추정/대사 생략 (청구 전체가 오차로 보이지 않도록), 단가가 있으면 대사"""
+    df = pd.DataFrame([
+        _tx('C1', '2024-01-10', 'DSV Indoor', 'IN', 2, 4.0),
+        _tx('C1', '2024-01-20', 'DSV Indoor', 'FINAL_OUT', 2),
+    ])
+    df['Amount'] = [100.0, 0.0]
+    df['Operation Month'] = '2024-01'
+    df['Vendor'] = 'HITACHI'
+    df['Handling Fee'] = 0.0
+
+    accrual, reconciliation = generate_rent_accrual_report(df, rent_rates={}, as_of='2024-01-31')
+    assert 'RENT_발생추정' not in accrual.columns and reconciliation is None
+    assert accrual['SQM일수'].sum() == 40.0
+
+    accrual, reconciliation = generate_rent_accrual_report(df, rent_rates={'DSV INDOOR': 31.0}, as_of='2024-01-31')
+    assert np.isclose(accrual['RENT_발생추정'].sum(), 40.0)
+    assert reconciliation is not None
@@ -0,0 +1,105 @@
+"""
+청크 단위 스트리밍 검증 테스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.schemas import validate_transaction_chunks, validate_transaction_dataframe
+from core.streaming_validation import BloomFilter, HyperLogLog, ValidationProfileAccumulator
+from data_validation_engine import DataValidationEngine
+
+
+def _chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_streaming_matches_in_memory_validation(sample_transactions):
+    """청크 스트리밍 결과의 점수/이슈/권장사항이 메모리 검증과 동일한지 확인"""
+    df = sample_transactions(n=900)
+
+    in_memory = DataValidationEngine().validate_complete_dataset(df)
+    streamed = DataValidationEngine().validate_streaming(_chunks(df, 128))
+
+    assert streamed['total_records'] == in_memory['total_records']
+    assert streamed['data_quality_score'] == in_memory['data_quality_score']
+    assert streamed['recommendations'] == in_memory['recommendations']
+    assert len(streamed['critical_issues']) == len(in_memory['critical_issues'])
+    assert len(streamed['warnings']) == len(in_memory['warnings'])
+
+    for name in ['integrity', 'quantities']:
+        assert streamed['validation_tests'][name]['passed'] == in_memory['validation_tests'][name]['passed']
+    mem_qty = in_memory['validation_tests']['quantities']['details']['quantity_analysis']
+    str_qty = streamed['validation_tests']['quantities']['details']['quantity_analysis']
+    assert str_qty['outlier_count'] == mem_qty['outlier_count']
+    assert np.isclose(str_qty['std'], mem_qty['std'])
+    assert (streamed['validation_tests']['integrity']['details']['duplicate_count']
+            == in_memory['validation_tests']['integrity']['details']['duplicate_count'])
+
+
+def test_accumulator_merge_equals_single_pass(sample_transactions):
+    """병합한 누적기와 단일 누적기의 결과 일치"""
+    df = sample_transactions(n=600)
+    single = ValidationProfileAccumulator()
+    for chunk in _chunks(df, 100):
+        single.update(chunk)
+
+    left, right = ValidationProfileAccumulator(), ValidationProfileAccumulator()
+    left.update(df.iloc[:300])
+    right.update(df.iloc[300:])
+    merged = left.merge(right)
+
+    assert merged.total_records == single.total_records
+    assert merged.duplicate_count == single.duplicate_count
+    assert merged.qty_histogram == single.qty_histogram
+    assert np.isclose(merged.fee.std, single.fee.std)
+    assert merged.unique_cases() == single.unique_cases()
+
+
+def test_duplicate_filter_memory_is_fixed():
+    """행 중복 판정 메모리는 행 수와 무관 (Bloom filter), 기본 크기에서 10만 행 중복 수 정확"""
+    accumulator = ValidationProfileAccumulator()
+    size = accumulator.row_filter.array.nbytes
+    rows = pd.DataFrame({'Case_No': [f"C{i:06d}" for i in range(100_000)], 'Qty': 1})
+    for chunk in _chunks(rows, 5_000) + [rows.iloc[:5_000]]:
+        accumulator.update(chunk)
+    assert accumulator.row_filter.array.nbytes == size
+    assert accumulator.duplicate_count == 5_000
+    assert 'case_counts' not in accumulator.to_profile()
+
+
+def test_bloom_filter_false_positive_rate():
+    """작은 필터의 거짓 양성 비율이 문서화된 p ≈ (1 - e^(-kn/m))^k 수준"""
+    hashes = pd.util.hash_pandas_object(pd.Series(np.arange(48_000)), index=False).values
+    bloom = BloomFilter(bits=1 << 16, hashes=4)
+    bloom.add(hashes[:8_000])
+    assert bloom.contains(hashes[:8_000]).all()
+    expected = (1 - np.exp(-4 * 8_000 / (1 << 16))) ** 4
+    assert bloom.contains(hashes[8_000:]).mean() < expected * 1.5
+    assert abs(bloom.estimate_count() - 8_000) / 8_000 < 0.01
+
+
+def test_hyperloglog_estimate():
+    """HyperLogLog 고유 Case 수 근사 오차 2% 이내"""
+    sketch = HyperLogLog()
+    cases = pd.Series([f"HE-{i:07d}" for i in range(50_000)])
+    sketch.add_series(cases)
+    sketch.add_series(cases.iloc[:10_000])
+    assert abs(sketch.count() - 50_000) / 50_000 < 0.02
+
+
+def test_schema_chunk_validation_from_csv(tmp_path, sample_transactions):
+    """CSV 트랜잭션 로그 청크 검증이 DataFrame 검증과 같은 경고를 내는지 확인"""
+    df = sample_transactions(n=500)
+    path = tmp_path / "transaction_log.csv"
+    df.to_csv(path, index=False)
+    reloaded = pd.read_csv(path, parse_dates=['Date'])
+
+    expected = validate_transaction_dataframe(reloaded)
+    result = validate_transaction_chunks(path)
+
+    assert result.is_valid == expected.is_valid
+    assert [w.split(':')[0] for w in result.warnings] == [w.split(':')[0] for w in expected.warnings]
+    assert result.summary['total_records'] == expected.summary['total_records']
+    assert result.summary['unique_locations'] == expected.summary['unique_locations']
+    assert abs(result.summary['unique_cases'] - expected.summary['unique_cases']) <= 3
@@ -0,0 +1,76 @@
+"""
+합성 HVDC 데이터 생성기 / 벤치마크 비교 테스트
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+from core.loader import DataLoader
+from core.synthetic_data import (
+    SITES, VENDOR_LAYOUTS, generate_case_list, generate_invoice, write_synthetic_dataset,
+)
+
+
+def _benchmark_module():
+    path = Path(__file__).resolve().parent.parent / "scripts" / "benchmark_pipeline.py"
+    spec = importlib.util.spec_from_file_location("benchmark_pipeline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_case_list_layout_rates_and_date_order():
+    """실제 워크북 헤더, 이동/중복 비율, 창고→현장 날짜 순서"""
+    df = generate_case_list('SIMENSE', 2000, transfer_rate=0.5, duplicate_rate=0.05, seed=3)
+    layout = VENDOR_LAYOUTS['SIMENSE']
+    assert list(df.columns[:len(layout['head'])]) == layout['head']
+    assert len(df) == 2100
+    assert df.duplicated(subset=[c for c in df.columns if c != 'No.']).sum() == 100
+
+    unique = df.drop_duplicates(subset='SERIAL NO.')
+    visits = unique[layout['warehouses']].notna().sum(axis=1)
+    assert 0.4 < (visits >= 2).mean() < 0.75
+    last_warehouse = unique[layout['warehouses']].max(axis=1)
+    site_date = unique[SITES].max(axis=1)
+    delivered = site_date.notna()
+    assert delivered.mean() > 0.5
+    assert (site_date[delivered] > last_warehouse[delivered]).all()
+    assert (unique['ETA/ATA'] > unique['ETD/ATD']).all()
+
+
+def test_dataset_round_trips_through_loader(tmp_path):
+    """생성 파일이 DataLoader에서 공급사별로 읽히고 인보이스와 일치"""
+    paths = write_synthetic_dataset(tmp_path, 300, duplicate_rate=0.0, seed=1)
+    assert set(paths) == {'HITACHI', 'SIMENSE', 'INVOICE'}
+
+    loader = DataLoader()
+    files = loader.load_excel_files(str(tmp_path))
+    assert sorted(files) == sorted(Path(paths[v]).name for v in ('HITACHI', 'SIMENSE'))
+    transactions = loader.extract_transactions(files)
+    case_lists = {v: pd.read_excel(paths[v]) for v in ('HITACHI', 'SIMENSE')}
+    expected_events = sum(
+        df[[c for c in VENDOR_LAYOUTS[v]['warehouses'] + SITES
+            if loader._extract_warehouse_from_column(c) != 'UNKNOWN']].notna().sum().sum()
+        for v, df in case_lists.items())
+    assert len(transactions) == expected_events
+
+    invoice = pd.read_excel(paths['INVOICE'])
+    assert invoice['pkg'].sum() == generate_invoice(case_lists)['pkg'].sum()
+    assert (invoice['TOTAL'] >= invoice['Handling In']).all()
+
+
+def test_benchmark_regression_comparison():
+    """기준 대비 허용치 초과 스테이지만 회귀로 판정 (짧은 스테이지 제외)"""
+    benchmark = _benchmark_module()
+    baseline = {'runs': [{'cases': 10000, 'peak_rss_mb': 200.0,
+                          'stages': {'load': {'wall_seconds': 5.0}, 'dedup': {'wall_seconds': 0.001}}}]}
+    results = [{'cases': 10000, 'peak_rss_mb': 210.0,
+                'stages': {'load': {'wall_seconds': 7.0}, 'dedup': {'wall_seconds': 0.01}}},
+               {'cases': 100000, 'peak_rss_mb': 900.0, 'stages': {'load': {'wall_seconds': 60.0}}}]
+
+    regressions = benchmark.compare_with_baseline(results, baseline, tolerance=0.25)
+    assert [(r['stage'], r['metric']) for r in regressions] == [('load', 'wall_seconds')]
+    assert regressions[0]['ratio'] == 1.4
+    assert benchmark.compare_with_baseline(results, baseline, tolerance=0.5) == []
@@ -0,0 +1,175 @@
+"""
+컬럼형 케이스 타임라인 테스트
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.timeline import TimelineTracker, TIMELINE_COLUMNS
+
+
+def _values(series):
+    return [None if pd.isnull(v) else v for v in series.astype(object)]
+
+
+def _sample_transactions(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-01-01')
+    transactions = []
+    for i in range(n):
+        incoming = int(rng.choice([0, 0, 5]))
+        outgoing = int(rng.choice([0, 3]))
+        transactions.append({
+            'source_file': 'HVDC WAREHOUSE_HITACHI(HE).xlsx',
+            'timestamp': start,
+            'data': {
+                'Case': f"CASE{rng.integers(0, 40):03d}",
+                'date': start + pd.Timedelta(hours=int(rng.integers(0, 24 * 90))),
+                'warehouse': str(rng.choice(['DSV Indoor', 'DSV Outdoor', 'MOSB', 'MIR'])),
+                'incoming': incoming,
+                'outgoing': outgoing,
+                'inventory': incoming - outgoing,
+            }
+        })
+    return transactions
+
+
+def test_frame_matches_legacy_export():
+    """컬럼형 타임라인이 레거시 dict 타임라인 export 결과와 일치"""
+    tracker = TimelineTracker()
+    transactions = _sample_transactions()
+
+    legacy = tracker.export_timeline_to_dataframe(tracker.create_case_timeline(transactions))
+    frame = tracker.create_case_timeline_frame(transactions)
+
+    assert list(frame.columns) == TIMELINE_COLUMNS
+    assert isinstance(frame['case_id'].dtype, pd.CategoricalDtype)
+    assert 'raw_data' not in frame.columns
+
+    result = tracker.export_timeline_to_dataframe(frame)
+    for col in ['case_id', 'location', 'action', 'source_file', 'movement_from', 'movement_to']:
+        assert _values(result[col]) == _values(legacy[col])
+    for col in ['sequence', 'incoming', 'outgoing', 'inventory']:
+        assert result[col].tolist() == legacy[col].tolist()
+    assert (result['timestamp'] == legacy['timestamp']).all()
+    assert np.allclose(result['movement_duration_hours'].fillna(-1), legacy['movement_duration_hours'].fillna(-1))
+
+
+def test_frame_patterns_and_report():
+    """컬럼형 이동 패턴/리포트가 레거시 결과와 일치"""
+    tracker = TimelineTracker()
+    transactions = _sample_transactions(seed=11)
+
+    timelines = tracker.create_case_timeline(transactions)
+    frame = tracker.create_case_timeline_frame(transactions)
+
+    legacy = tracker.analyze_movement_patterns(timelines)
+    result = tracker.analyze_movement_patterns(frame)
+    assert result['total_movements'] == legacy['total_movements']
+    assert result['movement_routes'] == legacy['movement_routes']
+    assert result['location_frequency'] == legacy['location_frequency']
+    assert np.isclose(result['avg_movement_time'], legacy['avg_movement_time'])
+
+    report = tracker.generate_movement_report(frame)
+    assert report['anomalies']['count'] == len(tracker.detect_anomalous_movements(timelines))
+    summaries = report['case_summaries']
+    assert summaries['total_entries'].sum() == len(frame)
+    assert tracker.validate_timeline_integrity(frame)['valid_cases'] == len(timelines)
+
+
+def test_anomaly_frame_matches_legacy():
+    """벡터 비정상 패턴 감지가 레거시 엔트리 순회 결과와 일치"""
+    tracker = TimelineTracker()
+    tracker.timeline_rules['long_stay_hours'] = 24 * 7
+    tracker.timeline_rules['instant_movement_hours'] = 12
+    transactions = _sample_transactions(seed=5)
+
+    legacy = tracker.detect_anomalous_movements(tracker.create_case_timeline(transactions))
+    anomalies = tracker.detect_anomaly_frame(tracker.create_case_timeline_frame(transactions))
+
+    assert set(anomalies['type'].unique()) == {'INSTANT_MOVEMENT', 'LONG_STAY', 'LOCATION_REVISIT'}
+    assert anomalies['case_id'].astype(str).tolist() == [a['case_id'] for a in legacy]
+    assert anomalies['sequence'].tolist() == [a['entry']['sequence'] for a in legacy]
+    assert anomalies['type'].astype(str).tolist() == [a['type'] for a in legacy]
+    assert anomalies['reason'].tolist() == [a['reason'] for a in legacy]
+
+    # 컬럼형 입력도 detect_anomalous_movements는 레거시 구조 (entry 포함)
+    from_frame = tracker.detect_anomalous_movements(tracker.create_case_timeline_frame(transactions))
+    assert [set(a) for a in from_frame] == [set(a) for a in legacy]
+    assert [(a['case_id'], a['type'], a['reason']) for a in from_frame] == \
+        [(a['case_id'], a['type'], a['reason']) for a in legacy]
+    assert [(a['entry']['sequence'], a['entry']['location'], 'movement' in a['entry']) for a in from_frame] == \
+        [(a['entry']['sequence'], a['entry']['location'], 'movement' in a['entry']) for a in legacy]
+
+
+def test_flow_index_lookup_and_incremental_update(tmp_path):
+    """흐름 인덱스 조회값이 원본 재계산과 일치하고 증분 갱신/저장이 가능"""
+    from core.flow_index import MovementFlowIndex
+
+    tracker = TimelineTracker()
+    frame = tracker.create_case_timeline_frame(_sample_transactions(n=600, seed=8))
+    moves = frame[frame['movement_from'].notnull()]
+
+    # 케이스 절반씩 나누어 증분 적재
+    cases = frame['case_id'].cat.categories
+    first = frame[frame['case_id'].isin(cases[:20])]
+    second = frame[~frame['case_id'].isin(cases[:20])]
+    tracker.update_flow_index(first)
+    index = tracker.update_flow_index(second)
+    assert index.total_movements == len(moves)
+
+    route = moves[(moves['movement_from'] == 'DSV Indoor') & (moves['movement_to'] == 'MIR')]
+    expected = route['movement_duration_hours'].round().median() / 24
+    assert index.route_count('DSV Indoor', 'MIR') == len(route)
+    assert np.isclose(index.median_days('DSV Indoor', 'MIR'), expected)
+    assert index.median_days('MIR', 'NOWHERE') is None
+
+    matrix = index.flow_matrix('count')
+    assert matrix.loc['DSV Indoor', 'MIR'] == len(route)
+    assert index.dwell_histogram('MOSB').sum() == (moves['movement_from'] == 'MOSB').sum()
+
+    loaded = MovementFlowIndex.load(index.save(tmp_path / "flow_index"))
+    assert loaded.route_stats().equals(index.route_stats())
+
+
+def test_flow_index_update_carries_moves_across_batches(tmp_path):
+    """같은 케이스가 시간 순 배치에 걸쳐 있어도 배치 경계 이동까지 전체 인덱스와 일치"""
+    from core.flow_index import MovementFlowIndex
+
+    tracker = TimelineTracker()
+    transactions = _sample_transactions(n=600, seed=8)
+    full = MovementFlowIndex.from_timeline(tracker.create_case_timeline_frame(transactions))
+
+    cutoff = pd.Timestamp('2024-02-15')
+    early = [tx for tx in transactions if tx['data']['date'] < cutoff]
+    late = [tx for tx in transactions if tx['data']['date'] >= cutoff]
+    index = MovementFlowIndex.from_timeline(tracker.create_case_timeline_frame(early))
+    loaded = MovementFlowIndex.load(index.save(tmp_path / "flow_index"))
+    for target in (index, loaded):
+        target.update(tracker.create_case_timeline_frame(late))
+        assert target.total_movements == full.total_movements
+        stats = target.route_stats().sort_values(['from', 'to']).reset_index(drop=True)
+        pd.testing.assert_frame_equal(stats, full.route_stats().sort_values(['from', 'to']).reset_index(drop=True))
+        assert target.dwell == full.dwell
+
+    # 이전 배치보다 앞선 시각의 배치는 거부, 케이스가 겹치는 인덱스 병합도 거부
+    with pytest.raises(ValueError):
+        index.update(tracker.create_case_timeline_frame(early))
+    with pytest.raises(ValueError):
+        index.merge(full)
+
+
+def test_frame_patterns_are_plain_and_reuse_flow_index():
+    """컬럼형 패턴 결과는 JSON 직렬화 가능하고 기존 흐름 인덱스를 다시 만들지 않음"""
+    tracker = TimelineTracker()
+    frame = tracker.create_case_timeline_frame(_sample_transactions(seed=5))
+    patterns = tracker.analyze_movement_patterns(frame)
+    json.dumps(patterns)
+
+    index = tracker.flow_index
+    assert index.total_movements == patterns['total_movements']
+    tracker.analyze_movement_patterns(frame)
+    assert tracker.flow_index is index and index.total_movements == patterns['total_movements']
@@ -0,0 +1,83 @@
+"""
+정본 트랜잭션 로그(Parquet 데이터셋) 저장/조회 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from core.transaction_log import (
+    TRANSACTION_LOG_SCHEMA_VERSION, SCHEMA_VERSION_KEY,
+    open_transaction_log, read_transaction_log, write_transaction_log
+)
+
+
+def _sample_log(n=400, seed=6):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Case_No': [f"C{v:03d}" for v in rng.integers(0, 80, n)],
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120, n), unit='D'),
+        'Location': rng.choice(['DSV Indoor', 'MOSB', 'MIR'], n),
+        'TxType_Refined': rng.choice(['IN', 'TRANSFER_IN', 'TRANSFER_OUT', 'FINAL_OUT'], n),
+        'Qty': rng.integers(1, 10, n),
+        'Loc_From': 'SOURCE',
+        'Target_Warehouse': 'DESTINATION',
+        'Source_File': rng.choice(['HVDC WAREHOUSE_HITACHI(HE).xlsx', 'HVDC WAREHOUSE_SIMENSE(SIM).xlsx'], n),
+    })
+
+
+def test_roundtrip_partitions_and_schema(tmp_path):
+    """월×공급사 파티션, dictionary 인코딩, 스키마 버전 기록"""
+    df = _sample_log()
+    path = tmp_path / "transaction_log.parquet"
+    write_transaction_log(df, path)
+
+    vendors = sorted(p.name for p in path.glob('month=2024-01/*'))
+    assert vendors == ['vendor=HITACHI', 'vendor=SIMENSE']
+
+    dataset = open_transaction_log(path)
+    assert dataset.schema.metadata[SCHEMA_VERSION_KEY] == str(TRANSACTION_LOG_SCHEMA_VERSION).encode()
+    assert pa.types.is_dictionary(dataset.schema.field('Location').type)
+
+    log = read_transaction_log(path)
+    assert len(log) == len(df)
+    assert log['Qty'].sum() == df['Qty'].sum()
+    assert isinstance(log['Case_No'].dtype, pd.CategoricalDtype)
+
+
+def test_filtered_reads_match_pandas_filters(tmp_path):
+    """푸시다운 조건 조회 결과가 pandas 필터와 일치"""
+    df = _sample_log(seed=13)
+    path = write_transaction_log(df, tmp_path / "log.parquet")
+
+    result = read_transaction_log(path, months=['2024-02'], vendors=['hitachi'],
+                                  tx_types=['TRANSFER_IN', 'TRANSFER_OUT'], decode_categories=True)
+    expected = df[(df['Date'].dt.strftime('%Y-%m') == '2024-02')
+                  & df['Source_File'].str.contains('HITACHI')
+                  & df['TxType_Refined'].isin(['TRANSFER_IN', 'TRANSFER_OUT'])]
+    assert len(result) == len(expected)
+    assert result['Qty'].sum() == expected['Qty'].sum()
+    assert result['TxType_Refined'].dtype == object
+
+    cases = read_transaction_log(path, columns=['Case_No', 'Qty'], case_nos=['C001'])
+    assert list(cases.columns) == ['Case_No', 'Qty']
+    assert cases['Qty'].sum() == df.loc[df['Case_No'] == 'C001', 'Qty'].sum()
+
+
+def test_missing_log_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_transaction_log(tmp_path / "missing.parquet")
+
+
+def test_policy_frame_with_missing_source_file(tmp_path):
+    """dtype 정책 적용(카테고리) 프레임 - Source_File 결측 행은 UNKNOWN 공급사 파티션"""
+    from core.dtypes import apply_dtype_policy
+
+    df = _sample_log(n=60, seed=2)
+    df.loc[:4, 'Source_File'] = None
+    df = apply_dtype_policy(df, report=False)
+    assert isinstance(df['Source_File'].dtype, pd.CategoricalDtype)
+
+    path = write_transaction_log(df, tmp_path / "log.parquet")
+    assert len(read_transaction_log(path, vendors=['UNKNOWN'])) == 5
@@ -0,0 +1,84 @@
+"""
+월별 오차 원장 증분 적재 테스트
+"""
+
+import pandas as pd
+
+from variance_analyzer import VarianceAnalyzer, create_sample_data
+from variance_ledger import VarianceLedger
+
+
+def test_ledger_matches_full_recompute(tmp_path):
+    """원장 결과가 전체 재계산 결과와 일치하는지 확인"""
+    df_invoice, df_report = create_sample_data()
+    df_invoice['HVDC CODE 1'] = 'HVDC-ADOPT'
+    df_report['HVDC CODE 1'] = 'HVDC-ADOPT'
+    analyzer = VarianceAnalyzer()
+
+    full = analyzer.create_monthly_variance_report(
+        df_invoice, df_report, output_file=str(tmp_path / "full.xlsx")
+    )['merged_data'].sort_values('년월').reset_index(drop=True)
+
+    ledger = VarianceLedger(tmp_path / "ledger.sqlite", analyzer=analyzer)
+    # 월별로 나누어 적재
+    for i in range(len(df_invoice)):
+        ledger.ingest(df_invoice.iloc[[i]], df_report.iloc[[i]])
+
+    result = ledger.get_ledger()
+    assert result['년월'].tolist() == full['년월'].tolist()
+    for col in ['Invoice_Amount', 'Report_Amount', '오차', '오차율(%)', '절대오차율(%)', '오차사유']:
+        assert result[col].tolist() == full[col].tolist()
+
+
+def test_ledger_recomputes_only_revised_months(tmp_path):
+    """정정 청구분만 재계산되고 이력이 남는지 확인"""
+    df_invoice, df_report = create_sample_data()
+    ledger = VarianceLedger(tmp_path / "ledger.sqlite")
+    assert len(ledger.ingest(df_invoice, df_report)) == 5
+
+    # 동일 데이터 재적재 → 변경 없음
+    assert ledger.ingest(df_invoice, df_report) == []
+
+    # 3월 Report 정정 → 3월만 재계산
+    revised = df_report[df_report['Billing month'] == 3].copy()
+    revised['Report Amount'] = 500000
+    assert ledger.ingest(df_report=revised) == ['2024-03']
+
+    history = ledger.get_history('2024-03')
+    assert history['revision'].tolist() == [1, 2]
+    assert history['Report_Amount'].tolist() == [1050000.0, 500000.0]
+
+    alerts = ledger.generate_automated_alerts(threshold=30.0)
+    assert alerts['alert_count'] == 1
+    assert alerts['alert_details'][0]['년월'] == '2024-03'
+
+    # 신규 월 적재 → 트렌드에 추가
+    new_invoice = pd.DataFrame({'Billing Year': [2024], 'Billing month': [6], 'Original Amount': [1000000]})
+    assert ledger.ingest(df_invoice=new_invoice) == ['2024-06']
+    assert ledger.get_trend(last_n=2)['months'] == ['2024-05', '2024-06']
+
+
+def test_analyzer_report_and_alerts_use_ledger(tmp_path):
+    """ledger_path 지정 시 리포트/알람이 원장 증분 적재·정정 이력을 사용"""
+    df_invoice, df_report = create_sample_data()
+    analyzer = VarianceAnalyzer(ledger_path=str(tmp_path / "ledger.sqlite"))
+
+    first = analyzer.create_monthly_variance_report(df_invoice, df_report, output_file=str(tmp_path / "r1.xlsx"))
+    assert first['changed_months'] == ['2024-01', '2024-02', '2024-03', '2024-04', '2024-05']
+    assert first['merged_data']['revision'].tolist() == [1] * 5
+
+    # 3월 정정분만 입력 → 3월만 재계산, 리포트는 원장 전체 월 + 정정 이력 시트
+    revised = df_report[df_report['Billing month'] == 3].copy()
+    revised['Report Amount'] = 500000
+    second = analyzer.create_monthly_variance_report(
+        df_invoice[df_invoice['Billing month'] == 3], revised, output_file=str(tmp_path / "r2.xlsx"))
+    assert second['changed_months'] == ['2024-03']
+    assert len(second['merged_data']) == 5
+    assert second['revision_history']['revision'].tolist() == [1, 2]
+    history_sheet = pd.read_excel(tmp_path / "r2.xlsx", sheet_name='05_정정이력')
+    assert history_sheet['Report_Amount'].tolist() == [1050000.0, 500000.0]
+
+    alerts = analyzer.generate_automated_alerts(threshold=30.0)
+    assert [a['년월'] for a in alerts['alert_details']] == ['2024-03']
+    assert alerts['alert_details'][0]['정정차수'] == 2
+    assert analyzer.generate_automated_alerts(threshold=30.0, months=['2024-01'])['alert_count'] == 0
@@ -0,0 +1,133 @@
+"""
+감시 모드 서비스 테스트 - 변경 워크북만 재수집, 전체 실행과 같은 결과
+"""
+
+import os
+
+import pandas as pd
+
+from core.pipeline_dag import build_transaction_graph
+from core.synthetic_data import VENDOR_LAYOUTS, generate_case_list, write_synthetic_dataset
+from core.watch_service import SETTLE_POLLS, WarehouseService, scan_sources
+
+
+def _full_run(src, cache_dir):
+    graph = build_transaction_graph(src, cache_dir=cache_dir, use_cache=False)
+    return graph.run('dedup'), graph.run('inventory')
+
+
+def _touch_later(path, df):
+    """같은 mtime 해상도 문제를 피하도록 시각을 뒤로 미뤄 재작성"""
+    df.to_excel(path, sheet_name='Case List', index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_refresh_matches_full_pipeline_and_reingests_only_changed(tmp_path, monkeypatch):
+    """초기 적재/변경 후 결과가 전체 실행과 같고, 변경된 파일만 다시 읽음"""
+    src = tmp_path / "data"
+    paths = write_synthetic_dataset(src, n_cases=300, seed=5)
+    service = WarehouseService(src, output_dir=tmp_path / "watch", write_log=False, verbosity='quiet')
+
+    first = service.refresh()
+    assert first['generation'] == 1 and sorted(first['changed']) == sorted(scan_sources(src))
+    expected_tx, expected_stock = _full_run(src, tmp_path / "cache")
+    pd.testing.assert_frame_equal(service.transaction_df, expected_tx)
+    pd.testing.assert_frame_equal(service.daily_stock, expected_stock)
+    assert (tmp_path / "watch" / "daily_stock.csv").exists()
+    assert service.refresh()['changed'] == []
+
+    loaded = []
+    original = service.loader.load_excel_file
+    monkeypatch.setattr(service.loader, 'load_excel_file', lambda path: loaded.append(path) or original(path))
+    _touch_later(paths['SIMENSE'], generate_case_list('SIMENSE', 150, seed=11))
+
+    # 변경 직후 1주기는 저장 완료 대기, SETTLE_POLLS 이후 재처리
+    results = [service.poll() for _ in range(SETTLE_POLLS + 1)]
+    assert results[:-1] == [None] * SETTLE_POLLS
+    assert results[-1]['changed'] == [VENDOR_LAYOUTS['SIMENSE']['file']]
+    assert [os.path.basename(p) for p in loaded] == [VENDOR_LAYOUTS['SIMENSE']['file']]
+
+    expected_tx, expected_stock = _full_run(src, tmp_path / "cache")
+    pd.testing.assert_frame_equal(service.transaction_df, expected_tx)
+    pd.testing.assert_frame_equal(service.daily_stock, expected_stock)
+    assert service.generation == 2
+
+
+def test_removed_file_is_dropped_and_listeners_notified(tmp_path):
+    """삭제된 워크북은 캐시에서 제외되고 갱신 콜백 호출"""
+    src = tmp_path / "data"
+    paths = write_synthetic_dataset(src, n_cases=200, include_invoice=False, seed=1)
+    service = WarehouseService(src, output_dir=None, write_log=False, verbosity='quiet')
+    generations = []
+    service.add_listener(lambda svc: generations.append(svc.generation))
+    service.refresh()
+
+    os.remove(paths['HITACHI'])
+    result = service.poll()
+    assert result['removed'] == [VENDOR_LAYOUTS['HITACHI']['file']]
+    assert list(service.file_transactions) == [VENDOR_LAYOUTS['SIMENSE']['file']]
+    sources = set(service.transaction_df['Source_File'].astype(str))
+    assert VENDOR_LAYOUTS['HITACHI']['file'] not in sources
+    assert generations == [1, 2]
+
+
+def test_watch_loop_stops_after_max_cycles(tmp_path):
+    """watch는 초기 적재 후 max_cycles 폴링하고 종료"""
+    src = tmp_path / "data"
+    write_synthetic_dataset(src, n_cases=100, include_invoice=False, seed=2)
+    service = WarehouseService(src, output_dir=None, write_log=False, verbosity='quiet')
+    service.watch(interval=0.01, max_cycles=2)
+    assert service.generation == 1
+    assert not service.daily_stock.empty
+
+
+def test_failed_read_keeps_previous_data_and_retries(tmp_path, monkeypatch):
+    """읽기 실패한 워크북은 이전 트랜잭션을 유지하고 시그니처를 기록하지 않아 다음 폴링에서 재시도"""
+    src = tmp_path / "data"
+    paths = write_synthetic_dataset(src, n_cases=200, include_invoice=False, seed=3)
+    service = WarehouseService(src, output_dir=None, write_log=False, verbosity='quiet')
+    service.refresh()
+    name = VENDOR_LAYOUTS['HITACHI']['file']
+    before_tx, before_stock = service.transaction_df.copy(), service.daily_stock.copy()
+    old_signature = service.signatures[name]
+
+    original = service.loader.load_excel_file
+    monkeypatch.setattr(service.loader, 'load_excel_file', lambda path: None)
+    _touch_later(paths['HITACHI'], generate_case_list('HITACHI', 80, seed=9))
+    result = service.refresh()
+    assert result['failed'] == [name] and result['generation'] == 1
+    assert service.signatures[name] == old_signature
+    pd.testing.assert_frame_equal(service.transaction_df, before_tx)
+    pd.testing.assert_frame_equal(service.daily_stock, before_stock)
+
+    monkeypatch.setattr(service.loader, 'load_excel_file', original)
+    results = [service.poll() for _ in range(SETTLE_POLLS + 1)]
+    assert results[-1]['changed'] == [name] and results[-1]['failed'] == []
+    expected_tx, expected_stock = _full_run(src, tmp_path / "cache")
+    pd.testing.assert_frame_equal(service.transaction_df, expected_tx)
+
+
+def test_rules_file_change_reloads_rules_and_reextracts(tmp_path, monkeypatch):
+    """매핑 규칙 파일 변경 시 규칙 캐시 재로드 + 메모리 워크북에서 재추출 (Excel 재파싱 없음)"""
+    import core.watch_service as watch_service
+
+    src = tmp_path / "data"
+    write_synthetic_dataset(src, n_cases=100, include_invoice=False, seed=4)
+    rules = tmp_path / "rules.json"
+    rules.write_text('{}', encoding='utf-8')
+    service = WarehouseService(src, output_dir=None, write_log=False, verbosity='quiet', rules_file=rules)
+    service.refresh()
+    assert service.poll() is None
+
+    reloads, loaded = [], []
+    monkeypatch.setattr(watch_service.lazy_loading, 'reload_mapping_rules', lambda: reloads.append(True))
+    monkeypatch.setattr(service.loader, 'load_excel_file', lambda path: loaded.append(path))
+    rules.write_text('{"warehouse_classification": {}}', encoding='utf-8')
+    stat = os.stat(rules)
+    os.utime(rules, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    result = service.poll()
+    assert result['rules_reloaded'] and result['changed'] == [] and result['generation'] == 2
+    assert reloads == [True] and loaded == []
+    assert not service.rules_changed()
@@ -19,9 +19,19 @@ logger = logging.getLogger(__name__)
 class VarianceAnalyzer:
     """월별 오차 심층 분석 자동화 시스템"""
     
-    def __init__(self, mapping_rules_file: str = "mapping_rules_v2.6.json"):
+    def __init__(self, mapping_rules_file: str = "mapping_rules_v2.6.json", ledger_path: Optional[str] = None):
+        """
+        Args:
+            mapping_rules_file: 매핑 규칙 파일
+            ledger_path: 월별 오차 원장(SQLite) 경로 - 지정하면 리포트/알람이 원장 증분 적재와 정정 이력을 사용
+        """
         self.mapping_rules_file = mapping_rules_file
         self.load_mapping_rules()
+        self.ledger = None
+        if ledger_path is not None:
+            # variance_ledger가 이 모듈을 import하므로 사용 시점에 import
+            from variance_ledger import VarianceLedger
+            self.ledger = VarianceLedger(ledger_path, analyzer=self)
         
     def load_mapping_rules(self):
         """매핑 규칙 로드"""
@@ -40,31 +50,46 @@ class VarianceAnalyzer:
         """
         1️⃣ 청구액-실적액 월별 대조 리포트 생성
         
+        원장(ledger_path)을 사용하면 입력 청구/실적을 원장에 증분 적재하여 금액이 바뀐 월만
+        재계산하고, 리포트는 원장 전체 월 기준으로 작성합니다 (변경 월 정정 이력 시트 포함).
+        
         Args:
             df_invoice: Invoice(원본 청구) 데이터
             df_report: Report(실적) 데이터
             output_file: 출력 파일 경로
             
         Returns:
-            Dict: 분석 결과 및 리포트 파일 경로
+            Dict: 분석 결과 및 리포트 파일 경로 (원장 사용 시 changed_months, revision_history 포함)
         """
         print("📊 월별 오차 심층 분석 시작...")
+        raw_invoice, raw_report = df_invoice, df_report
         
         # 1. 년월 Key 생성
         df_invoice = self._prepare_invoice_data(df_invoice)
         df_report = self._prepare_report_data(df_report)
         
-        # 2. 년월 Key로 Join
-        df_merge = self._merge_invoice_report(df_invoice, df_report)
-        
-        # 3. 오차/오차율 계산
-        df_merge = self._calculate_variance(df_merge)
-        
-        # 4. 누락/중복 검증
-        validation_results = self._validate_data_integrity(df_invoice, df_report, df_merge)
-        
-        # 5. 오차 원인 자동 태깅
-        df_merge = self._auto_tag_error_reasons(df_merge)
+        ledger_results = {}
+        if self.ledger is not None:
+            # 2~5. 원장 증분 적재 (변경 월만 오차/사유 재계산) → 원장 전체 월 + 변경 월 정정 이력
+            changed_months = self.ledger.ingest(raw_invoice, raw_report)
+            df_merge = self.ledger.get_ledger()
+            validation_results = self._validate_data_integrity(df_invoice, df_report, df_merge)
+            ledger_results = {
+                'changed_months': changed_months,
+                'revision_history': self.ledger.get_history(changed_months)
+            }
+        else:
+            # 2. 년월 Key로 Join
+            df_merge = self._merge_invoice_report(df_invoice, df_report)
+            
+            # 3. 오차/오차율 계산
+            df_merge = self._calculate_variance(df_merge)
+            
+            # 4. 누락/중복 검증
+            validation_results = self._validate_data_integrity(df_invoice, df_report, df_merge)
+            
+            # 5. 오차 원인 자동 태깅
+            df_merge = self._auto_tag_error_reasons(df_merge)
         
         # 6. BI 대시보드 데이터 생성
         dashboard_data = self._generate_dashboard_data(df_merge)
@@ -74,13 +99,15 @@ class VarianceAnalyzer:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_file = f"월별오차분석리포트_{timestamp}.xlsx"
         
-        self._save_variance_report(df_merge, validation_results, dashboard_data, output_file)
+        self._save_variance_report(df_merge, validation_results, dashboard_data, output_file,
+                                   ledger_results.get('revision_history'))
         
         return {
             'merged_data': df_merge,
             'validation_results': validation_results,
             'dashboard_data': dashboard_data,
-            'output_file': output_file
+            'output_file': output_file,
+            **ledger_results
         }
     
     def _prepare_invoice_data(self, df_invoice: pd.DataFrame) -> pd.DataFrame:
@@ -302,7 +329,8 @@ class VarianceAnalyzer:
         return dashboard_data
     
     def _save_variance_report(self, df_merge: pd.DataFrame, validation_results: Dict, 
-                            dashboard_data: Dict, output_file: str):
+                            dashboard_data: Dict, output_file: str,
+                            revision_history: Optional[pd.DataFrame] = None):
         """월별 오차 분석 리포트 저장"""
         print(f"  💾 리포트 저장 중: {output_file}")
         
@@ -331,13 +359,26 @@ class VarianceAnalyzer:
             summary_df = pd.DataFrame(list(dashboard_data['summary_stats'].items()), 
                                     columns=['지표', '값'])
             summary_df.to_excel(writer, sheet_name='04_요약통계', index=False)
+            
+            # 5. 정정 이력 시트 (원장 사용 시 이번 적재에서 바뀐 월)
+            if revision_history is not None and not revision_history.empty:
+                revision_history.to_excel(writer, sheet_name='05_정정이력', index=False)
         
         print(f"  ✅ 리포트 저장 완료: {output_file}")
     
-    def generate_automated_alerts(self, df_merge: pd.DataFrame, threshold: float = 30.0) -> Dict:
+    def generate_automated_alerts(self, df_merge: Optional[pd.DataFrame] = None, threshold: float = 30.0,
+                                  months: Optional[List[str]] = None) -> Dict:
         """
         자동화 알람 생성 (RPA/슬랙/메일 연계용)
+        
+        df_merge 없이 호출하면 원장(ledger_path)에서 대상 월(기본: 직전 적재에서 재계산된 월)만
+        조회하므로 신규/정정 월만 알람 대상이 되고, 원장 행의 정정 차수가 함께 기록됩니다.
         """
+        if df_merge is None:
+            if self.ledger is None:
+                raise ValueError("df_merge 또는 원장(ledger_path)이 필요합니다")
+            df_merge = self.ledger.get_ledger(self.ledger.last_changed_months if months is None else months)
+        
         print(f"🚨 자동화 알람 생성 (임계값: {threshold}%)...")
         
         # 임계값 이상 오차 추출
@@ -358,7 +399,8 @@ class VarianceAnalyzer:
                     '실적액': row['Report_Amount'],
                     '오차': row['오차'],
                     '오차율': row['오차율(%)'],
-                    '오차사유': row['오차사유']
+                    '오차사유': row['오차사유'],
+                    **({'정정차수': int(row['revision'])} if 'revision' in row.index else {})
                 })
             
             # 요약 메시지 생성
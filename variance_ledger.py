@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+HVDC 월별 오차 원장 (Variance Ledger)
+
+월별 Invoice/Report 집계값과 오차 결과를 SQLite에 영속화하여
+신규 청구월·정정 청구분만 재계산하는 증분 오차 분석 저장소
+- 년월 Key 단위 upsert (변경된 월만 재계산)
+- 변경 이력(revision) 보관
+- 알람/트렌드 생성은 변경 월 기준 O(신규 월)
+
+VarianceAnalyzer(ledger_path=...)로 생성하면 create_monthly_variance_report /
+generate_automated_alerts가 이 원장을 통해 증분 적재·알람을 수행합니다.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+import logging
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from variance_analyzer import VarianceAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_PATH = "artifacts/variance_ledger.sqlite"
+
+# 원장 컬럼 (VarianceAnalyzer 병합 결과와 동일한 이름 사용)
+LEDGER_COLUMNS = ['년월', 'Invoice_Amount', 'Report_Amount', '오차', '오차율(%)', '절대오차율(%)', '오차사유']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS variance_ledger (
+    "년월" TEXT PRIMARY KEY,
+    "Invoice_Amount" REAL NOT NULL DEFAULT 0,
+    "Report_Amount" REAL NOT NULL DEFAULT 0,
+    "오차" REAL NOT NULL DEFAULT 0,
+    "오차율(%)" REAL NOT NULL DEFAULT 0,
+    "절대오차율(%)" REAL NOT NULL DEFAULT 0,
+    "오차사유" TEXT,
+    "revision" INTEGER NOT NULL DEFAULT 0,
+    "updated_at" TEXT
+);
+CREATE TABLE IF NOT EXISTS variance_history (
+    "년월" TEXT NOT NULL,
+    "revision" INTEGER NOT NULL,
+    "Invoice_Amount" REAL,
+    "Report_Amount" REAL,
+    "오차" REAL,
+    "오차율(%)" REAL,
+    "절대오차율(%)" REAL,
+    "오차사유" TEXT,
+    "recorded_at" TEXT,
+    PRIMARY KEY ("년월", "revision")
+);
+"""
+
+
+class VarianceLedger:
+    """월별 오차 원장 - 증분 적재/재계산 저장소"""
+
+    def __init__(self, db_path: str = DEFAULT_LEDGER_PATH, analyzer: Optional[VarianceAnalyzer] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.analyzer = analyzer or VarianceAnalyzer()
+        self.last_changed_months: List[str] = []
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    def ingest(self, df_invoice: Optional[pd.DataFrame] = None,
+               df_report: Optional[pd.DataFrame] = None) -> List[str]:
+        """
+        신규/정정 청구분 적재
+
+        적재 단위는 월 전체입니다. 입력에 포함된 년월의 Invoice(또는 Report) 합계가
+        기존 원장 값을 대체하며, 금액이 실제로 바뀐 월만 오차를 재계산합니다.
+
+        Args:
+            df_invoice: 신규/정정 Invoice 데이터 (해당 월 전체)
+            df_report: 신규/정정 Report 데이터 (해당 월 전체)
+
+        Returns:
+            List[str]: 재계산된 년월 목록
+        """
+        print("📒 오차 원장 증분 적재 시작...")
+
+        incoming = {}
+        if df_invoice is not None and not df_invoice.empty:
+            prepared = self.analyzer._prepare_invoice_data(df_invoice)
+            incoming['Invoice_Amount'] = prepared.groupby('년월')['Invoice_Amount'].sum()
+        if df_report is not None and not df_report.empty:
+            prepared = self.analyzer._prepare_report_data(df_report)
+            incoming['Report_Amount'] = prepared.groupby('년월')['Report_Amount'].sum()
+
+        touched_months = sorted(set().union(*[s.index for s in incoming.values()])) if incoming else []
+        if not touched_months:
+            print("  ℹ️ 적재할 월이 없습니다")
+            self.last_changed_months = []
+            return []
+
+        with self._connect() as conn:
+            current = self._read_months(conn, touched_months).set_index('년월')
+
+            rows = []
+            for month in touched_months:
+                invoice_amount = float(current.at[month, 'Invoice_Amount']) if month in current.index else 0.0
+                report_amount = float(current.at[month, 'Report_Amount']) if month in current.index else 0.0
+                new_invoice = float(incoming['Invoice_Amount'].get(month, invoice_amount)) if 'Invoice_Amount' in incoming else invoice_amount
+                new_report = float(incoming['Report_Amount'].get(month, report_amount)) if 'Report_Amount' in incoming else report_amount
+
+                if month in current.index and new_invoice == invoice_amount and new_report == report_amount:
+                    continue
+                rows.append({'년월': month, 'Invoice_Amount': new_invoice, 'Report_Amount': new_report})
+
+            if not rows:
+                print(f"  ✅ 변경 없음: {len(touched_months)}개월 확인")
+                self.last_changed_months = []
+                return []
+
+            # 변경된 월만 오차/사유 재계산
+            df_changed = pd.DataFrame(rows)
+            df_changed = self.analyzer._calculate_variance(df_changed)
+            df_changed = self.analyzer._auto_tag_error_reasons(df_changed)
+
+            self._upsert(conn, df_changed, current)
+
+        self.last_changed_months = df_changed['년월'].tolist()
+        print(f"  ✅ 원장 갱신 완료: {len(self.last_changed_months)}개월 재계산 / {len(touched_months)}개월 입력")
+        return self.last_changed_months
+
+    def _read_months(self, conn: sqlite3.Connection, months: List[str]) -> pd.DataFrame:
+        """지정 년월의 원장 행 조회"""
+        placeholders = ','.join('?' for _ in months)
+        return pd.read_sql_query(
+            f'SELECT * FROM variance_ledger WHERE "년월" IN ({placeholders})',
+            conn, params=list(months)
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, df_changed: pd.DataFrame, current: pd.DataFrame):
+        """변경 월 upsert 및 이력 기록"""
+        now = datetime.now().isoformat(timespec='seconds')
+        ledger_rows = []
+        history_rows = []
+        for rec in df_changed[LEDGER_COLUMNS].to_dict('records'):
+            month = rec['년월']
+            revision = int(current.at[month, 'revision']) + 1 if month in current.index else 1
+            values = (
+                month,
+                float(rec['Invoice_Amount']),
+                float(rec['Report_Amount']),
+                float(rec['오차']),
+                float(rec['오차율(%)']),
+                float(rec['절대오차율(%)']),
+                rec['오차사유'],
+            )
+            ledger_rows.append(values + (revision, now))
+            history_rows.append(values[:1] + (revision,) + values[1:] + (now,))
+
+        conn.executemany(
+            'INSERT INTO variance_ledger ("년월", "Invoice_Amount", "Report_Amount", "오차", "오차율(%)", '
+            '"절대오차율(%)", "오차사유", "revision", "updated_at") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT("년월") DO UPDATE SET '
+            '"Invoice_Amount"=excluded."Invoice_Amount", "Report_Amount"=excluded."Report_Amount", '
+            '"오차"=excluded."오차", "오차율(%)"=excluded."오차율(%)", "절대오차율(%)"=excluded."절대오차율(%)", '
+            '"오차사유"=excluded."오차사유", "revision"=excluded."revision", "updated_at"=excluded."updated_at"',
+            ledger_rows
+        )
+        conn.executemany(
+            'INSERT INTO variance_history ("년월", "revision", "Invoice_Amount", "Report_Amount", "오차", '
+            '"오차율(%)", "절대오차율(%)", "오차사유", "recorded_at") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            history_rows
+        )
+
+    def get_ledger(self, months: Optional[List[str]] = None) -> pd.DataFrame:
+        """원장 조회 (년월 오름차순, VarianceAnalyzer 병합 결과와 동일 컬럼)"""
+        with self._connect() as conn:
+            if months is None:
+                df = pd.read_sql_query('SELECT * FROM variance_ledger ORDER BY "년월"', conn)
+            elif not months:
+                df = pd.DataFrame(columns=LEDGER_COLUMNS + ['revision', 'updated_at'])
+            else:
+                df = self._read_months(conn, months).sort_values('년월').reset_index(drop=True)
+        return df
+
+    def get_history(self, months: Union[str, List[str]]) -> pd.DataFrame:
+        """년월(또는 년월 목록)의 정정 이력 조회 (년월, revision 순)"""
+        months = [months] if isinstance(months, str) else list(months)
+        placeholders = ','.join('?' for _ in months) or 'NULL'
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                f'SELECT * FROM variance_history WHERE "년월" IN ({placeholders}) ORDER BY "년월", "revision"',
+                conn, params=months
+            )
+
+    def get_trend(self, last_n: Optional[int] = None) -> Dict:
+        """오차율 트렌드 (최근 N개월, 원장 인덱스 조회만 수행)"""
+        query = 'SELECT "년월", "절대오차율(%)" FROM variance_ledger ORDER BY "년월" DESC'
+        params = []
+        if last_n is not None:
+            query += ' LIMIT ?'
+            params.append(int(last_n))
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params).iloc[::-1]
+        return {
+            'variance_trend': df['절대오차율(%)'].tolist(),
+            'months': df['년월'].tolist()
+        }
+
+    def generate_automated_alerts(self, threshold: float = 30.0,
+                                  months: Optional[List[str]] = None) -> Dict:
+        """
+        변경 월 기준 자동화 알람 생성
+
+        Args:
+            threshold: 알람 임계값 (절대오차율 %)
+            months: 대상 년월 (기본: 직전 ingest에서 재계산된 월)
+        """
+        if months is None:
+            months = self.last_changed_months
+        return self.analyzer.generate_automated_alerts(self.get_ledger(months), threshold=threshold)
@@ -25,7 +25,7 @@ def visualize_out_transactions(transaction_df, threshold_std=2.0):
 
     # 2. 월별/창고별 OUT 집계
     pivot = (
-        out_df.groupby(['월', 'Location'])['Qty']
+        out_df.groupby(['월', 'Location'], observed=True)['Qty']
         .sum()
         .unstack(fill_value=0)
     )
@@ -40,7 +40,7 @@ def visualize_out_transactions(transaction_df, threshold_std=2.0):
     plt.show()
 
     # 4. 이상치 탐지 (월별 합계 기준)
-    out_monthly = out_df.groupby(['월', 'Location'])['Qty'].sum().reset_index()
+    out_monthly = out_df.groupby(['월', 'Location'], observed=True)['Qty'].sum().reset_index()
     for location in out_monthly['Location'].unique():
         vals = out_monthly[out_monthly['Location'] == location]['Qty']
         mean = vals.mean()